@@ -1,8 +1,63 @@
 from django.contrib import admin
-from .models import Concert, Review, Seat
+from .models import Actor, Concert, Review, RoundCasting, Seat, SeatState, SeatSnapshot, SentimentBatch, SentimentCache, CrawlCheckpoint, CrawlJob, CrawlRun, CrawlStep
 
 # Register your models here.
 
 admin.site.register(Concert)
 admin.site.register(Review)
 admin.site.register(Seat)
+admin.site.register(SeatState)
+admin.site.register(SeatSnapshot)
+admin.site.register(Actor)
+admin.site.register(CrawlCheckpoint)
+
+
+@admin.register(RoundCasting)
+class RoundCastingAdmin(admin.ModelAdmin):
+    list_display = ("concert", "year", "month", "day_num", "round_name", "round_time", "actor", "position")
+    list_filter = ("concert",)
+    search_fields = ("actor__name",)
+
+
+class CrawlStepInline(admin.TabularInline):
+    model = CrawlStep
+    extra = 0
+    fields = ("concert", "kind", "label", "started_at", "duration_seconds", "inserted_count", "skipped_count", "retry_count", "error")
+    readonly_fields = fields
+    can_delete = False
+
+
+@admin.register(CrawlRun)
+class CrawlRunAdmin(admin.ModelAdmin):
+    list_display = ("task", "started_at", "status", "duration_seconds", "concert_count", "inserted_count", "skipped_count", "retry_count", "error_count")
+    list_filter = ("task", "status")
+    date_hierarchy = "started_at"
+    inlines = [CrawlStepInline]
+
+
+@admin.register(CrawlStep)
+class CrawlStepAdmin(admin.ModelAdmin):
+    list_display = ("run", "concert", "kind", "label", "duration_seconds", "inserted_count", "skipped_count", "retry_count")
+    list_filter = ("kind", "run__task", "concert")
+    ordering = ("-duration_seconds",)
+
+
+@admin.register(CrawlJob)
+class CrawlJobAdmin(admin.ModelAdmin):
+    list_display = ("concert", "kind", "source", "status", "priority", "attempts", "worker", "heartbeat_at", "created_at", "finished_at")
+    list_filter = ("kind", "status", "source")
+    date_hierarchy = "created_at"
+
+
+@admin.register(SentimentCache)
+class SentimentCacheAdmin(admin.ModelAdmin):
+    list_display = ("text_hash", "prompt_version", "sentiment", "created_at")
+    list_filter = ("prompt_version", "sentiment")
+    search_fields = ("text_hash",)
+
+
+@admin.register(SentimentBatch)
+class SentimentBatchAdmin(admin.ModelAdmin):
+    list_display = ("batch_id", "status", "remote_status", "review_count", "applied_count", "created_at", "checked_at", "completed_at")
+    list_filter = ("status", "remote_status")
+    exclude = ("chunks", "duplicates")
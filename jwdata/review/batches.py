@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import now
+
+from openai import OpenAI
+
+from .classifiers import classify_reviews_locally
+from .models import Review, SentimentBatch
+from .sentiments import (
+    apply_sentiment_cache,
+    batch_sentiment_request,
+    copy_duplicate_sentiments,
+    enabled_concert_ids,
+    fill_sentiment_cache,
+    parse_batch_sentiments,
+    review_text_hash,
+    sentiment_prompt_version,
+)
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+# 결과를 더 기다리지 않는 배치 작업 상태 (expired/cancelled는 일부 결과가 있을 수 있음)
+FINISHED_REMOTE_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def get_batch_client():
+    """배치 작업 API 클라이언트 (SENTIMENT_BATCH_JOB_API_BASE로 다른 서버를 지정할 수 있음)"""
+    return OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.SENTIMENT_BATCH_JOB_API_BASE or None)
+
+
+def empty_results(total=0):
+    return {"total": total, "success": 0, "failed": 0, "skipped": 0, "errors": []}
+
+
+def active_review_ids():
+    """제출 후 결과를 기다리는 배치 작업에 들어 있는 리뷰 id (다른 감정 분석에서 다시 요청하지 않도록)"""
+    review_ids = set()
+    for chunks, duplicates in SentimentBatch.objects.filter(status=SentimentBatch.STATUS_SUBMITTED).values_list("chunks", "duplicates"):
+        for ids in chunks.values():
+            review_ids.update(ids)
+        for ids in duplicates.values():
+            review_ids.update(ids)
+    return review_ids
+
+
+def pending_reviews(concert=None):
+    """감정 분석이 활성화된 공연의 미분석 리뷰 (결과를 기다리는 배치 작업의 리뷰 제외, id 순)"""
+    reviews = Review.objects.filter(
+        emotion__isnull=True,
+        description__isnull=False,
+        concert__is_sentiment_enabled=True,
+    ).exclude(description="")
+    if concert is not None:
+        reviews = reviews.filter(concert=concert)
+    active_ids = active_review_ids()
+    return [review for review in reviews.order_by("id") if review.id not in active_ids]
+
+
+def write_batch_requests(path, reviews, batch_size=None):
+    """
+    리뷰를 SENTIMENT_BATCH_SIZE개씩 묶어 배치 작업 요청 파일(JSONL, 한 줄에 요청 하나)로 씁니다.
+    {custom_id: [리뷰 id, ...]}를 반환합니다.
+    """
+    batch_size = batch_size or settings.SENTIMENT_BATCH_SIZE
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    chunks = {}
+    with open(path, "w", encoding="utf-8") as f:
+        for start in range(0, len(reviews), batch_size):
+            batch = reviews[start:start + batch_size]
+            custom_id = f"reviews-{start // batch_size}"
+            chunks[custom_id] = [review.id for review in batch]
+            f.write(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": batch_sentiment_request([(review.id, review.description) for review in batch]),
+            }, ensure_ascii=False) + "\n")
+    return chunks
+
+
+def submit_sentiment_batch(concert=None, limit=None, client=None):
+    """
+    미분석 리뷰를 요청 파일로 만들어 배치 작업으로 제출하고 SentimentBatch를 반환합니다. 제출할 리뷰가 없으면 None.
+    캐시에 있거나 로컬 분류기가 확신하는 리뷰는 제출하지 않고 바로 저장합니다.
+    결과는 poll_sentiment_batches()가 완료를 확인한 뒤 저장합니다. (프로세스가 결과를 기다리지 않음)
+    """
+    reviews = pending_reviews(concert)
+    if limit:
+        reviews = reviews[:limit]
+    if not reviews:
+        logger.info("[batches] 제출할 리뷰가 없습니다.")
+        return None
+
+    results = empty_results(len(reviews))
+    reviews, duplicates, _ = apply_sentiment_cache(reviews, results)
+    classified, reviews = classify_reviews_locally(reviews, results)
+    copy_duplicate_sentiments(classified, duplicates, results)
+    if not reviews:
+        logger.info(f"[batches] 리뷰 {results['total']}개 모두 캐시/로컬 분류로 저장하여 제출하지 않습니다.")
+        return None
+
+    batch = SentimentBatch.objects.create(
+        prompt_version=sentiment_prompt_version(),
+        duplicates={str(review.id): [duplicate.id for duplicate in duplicates[review.id]] for review in reviews if review.id in duplicates},
+        review_count=len(reviews) + sum(len(duplicates.get(review.id, [])) for review in reviews),
+    )
+    batch.request_path = os.path.join(settings.SENTIMENT_BATCH_JOB_DIR, f"sentiment_batch_{batch.pk}.jsonl")
+    batch.chunks = write_batch_requests(batch.request_path, reviews)
+
+    try:
+        client = client or get_batch_client()
+        with open(batch.request_path, "rb") as f:
+            input_file = client.files.create(file=f, purpose="batch")
+        remote = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=settings.SENTIMENT_BATCH_JOB_COMPLETION_WINDOW,
+            metadata={"description": f"review sentiment batch {batch.pk}"},
+        )
+    except Exception as e:
+        batch.status = SentimentBatch.STATUS_FAILED
+        batch.error = f"제출 실패: {e}"
+        batch.save()
+        raise
+
+    batch.input_file_id = input_file.id
+    batch.batch_id = remote.id
+    batch.remote_status = remote.status
+    batch.save()
+    logger.info(f"[batches] 배치 작업 {remote.id} 제출: 리뷰 {batch.review_count}개, 요청 {len(batch.chunks)}개 ({batch.request_path})")
+    return batch
+
+
+def parse_batch_output(batch, content):
+    """배치 작업 결과 파일(JSONL)에서 {리뷰 id: 감정}을 읽습니다. 실패한 요청과 응답에 빠진 리뷰는 포함되지 않습니다."""
+    sentiments = {}
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        review_ids = batch.chunks.get(record.get("custom_id"))
+        response = record.get("response") or {}
+        if not review_ids or record.get("error") or response.get("status_code") != 200:
+            continue
+        try:
+            message = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            continue
+        sentiments.update(parse_batch_sentiments(message, review_ids))
+    return sentiments
+
+
+def apply_batch_output(batch, content):
+    """
+    결과를 아직 감정이 없는 리뷰에 저장하고, 캐시와 같은 내용의 리뷰에도 반영합니다. 저장한 리뷰 수를 반환합니다.
+    결과가 없는 리뷰는 미분석으로 남아 다음 감정 분석(또는 다음 배치 작업)에서 다시 요청됩니다.
+    감정분석이 비활성화된 공연의 리뷰는 저장하지 않지만 결과는 캐시에 남깁니다. (이미 비용을 낸 결과)
+    """
+    sentiments = parse_batch_output(batch, content)
+    results = empty_results(batch.review_count)
+    reviews = Review.objects.filter(id__in=list(sentiments), emotion__isnull=True).in_bulk()
+    enabled_ids = enabled_concert_ids(reviews.values())
+
+    for review_id, review in reviews.items():
+        review.emotion = sentiments[review_id]
+    analyzed = [review for review in reviews.values() if review.concert_id in enabled_ids]
+    duplicate_ids = [duplicate_id for review in reviews.values() for duplicate_id in batch.duplicates.get(str(review.id), [])]
+    duplicate_reviews = Review.objects.filter(id__in=duplicate_ids, emotion__isnull=True).in_bulk()
+    duplicates = {
+        review.id: [duplicate_reviews[duplicate_id] for duplicate_id in batch.duplicates.get(str(review.id), []) if duplicate_id in duplicate_reviews]
+        for review in reviews.values()
+    }
+
+    with transaction.atomic():
+        Review.objects.bulk_update(analyzed, ["emotion"], batch_size=settings.SENTIMENT_WRITE_BATCH_SIZE)
+        fill_sentiment_cache(
+            reviews.values(),
+            duplicates,
+            {review.id: review_text_hash(review.description) for review in reviews.values()},
+            results,
+            version=batch.prompt_version,
+        )
+    return len(analyzed) + results["success"]
+
+
+def check_sentiment_batch(batch, client=None):
+    """배치 작업 상태를 확인하고, 끝났으면 결과를 저장합니다. 갱신한 SentimentBatch를 반환합니다."""
+    client = client or get_batch_client()
+    remote = client.batches.retrieve(batch.batch_id)
+    batch.remote_status = remote.status
+    batch.checked_at = now()
+
+    if remote.status in FINISHED_REMOTE_STATUSES:
+        if remote.output_file_id:
+            batch.output_file_id = remote.output_file_id
+            batch.applied_count = apply_batch_output(batch, client.files.content(remote.output_file_id).text)
+        batch.completed_at = batch.checked_at
+        if remote.status == "completed":
+            batch.status = SentimentBatch.STATUS_COMPLETED
+        else:
+            batch.status = SentimentBatch.STATUS_FAILED
+            errors = getattr(remote, "errors", None)
+            batch.error = f"배치 작업 {remote.status}" + (f": {errors}" if errors else "")
+        logger.info(f"[batches] 배치 작업 {batch.batch_id} {remote.status}: 리뷰 {batch.review_count}개 중 {batch.applied_count}개 저장")
+    batch.save()
+    return batch
+
+
+def poll_sentiment_batches(client=None):
+    """결과를 기다리는 배치 작업을 모두 확인합니다. 이번에 끝난 작업 목록을 반환합니다."""
+    submitted = list(SentimentBatch.objects.filter(status=SentimentBatch.STATUS_SUBMITTED).exclude(batch_id=""))
+    if not submitted:
+        return []
+    client = client or get_batch_client()
+    finished = []
+    for batch in submitted:
+        try:
+            check_sentiment_batch(batch, client)
+        except Exception as e:
+            logger.error(f"[batches] 배치 작업 {batch.batch_id} 확인 실패: {e}")
+            continue
+        if batch.status != SentimentBatch.STATUS_SUBMITTED:
+            finished.append(batch)
+    return finished
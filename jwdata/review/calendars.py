@@ -0,0 +1,368 @@
+import logging
+
+from django.conf import settings
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, WebDriverException
+
+from .captures import SeatNetworkCapture
+from .extractors import extract_seat_round, extraction_mode
+from .parsers import SEAT_ACTORS_XPATH, parse_seat_count
+from .waits import (
+    wait_for,
+    content_changed,
+    snapshot,
+    text_changed,
+)
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+CURRENT_MONTH_LOCATOR = (By.XPATH, '//li[@data-view="month current"]')
+NEXT_MONTH_XPATH = '//li[@data-view="month next" and not(contains(@class, "disabled"))]'
+ACTIVE_DAYS_XPATH = '//ul[@data-view="days"]/li[not(contains(@class, "disabled")) and not(contains(@class, "muted"))]'
+ROUND_LOCATOR = (By.CLASS_NAME, 'timeTableLabel')
+SEAT_ITEM_LOCATOR = (By.CLASS_NAME, 'seatTableItem')
+ACTORS_XPATH = SEAT_ACTORS_XPATH
+
+SEAT_CRAWL_MODES = ("dom", "network")
+
+# 상태
+MONTH = "month"
+DAY = "day"
+ROUND = "round"
+NEXT_MONTH = "next_month"
+DONE = "done"
+
+
+def extract_seat_items(driver):
+    """현재 선택된 회차의 좌석 테이블에서 [(seat_class, seat_count), ...]를 추출합니다. (lxml 버전: parsers.parse_seat_items)"""
+    seats = []
+    for seat_el in driver.find_elements(*SEAT_ITEM_LOCATOR):
+        seat_class = seat_el.find_element(By.CLASS_NAME, 'seatTableName').text
+        count_text = seat_el.find_element(By.CLASS_NAME, 'seatTableStatus').text
+        seats.append((seat_class, parse_seat_count(count_text)))
+    return seats
+
+
+def extract_actors(driver):
+    """현재 선택된 회차의 캐스팅 배우 문자열. 없으면 빈 문자열."""
+    try:
+        return driver.find_element(By.XPATH, ACTORS_XPATH).text
+    except NoSuchElementException:
+        return ""
+
+
+def extract_round_seats(driver, mode=None):
+    """
+    현재 선택된 회차의 (배우 문자열, [(seat_class, seat_count), ...]).
+    mode(기본 CRAWL_EXTRACTION_MODE)가 'script'이면 스크립트 한 번으로 추출하고, 실패하면 요소별로 다시 읽습니다.
+    """
+    if extraction_mode(mode) == "script":
+        try:
+            return extract_seat_round(driver)
+        except (WebDriverException, ValueError) as e:
+            print(f"[좌석] 스크립트 추출 실패 -> 요소별 추출로 재시도: {e}")
+    return extract_actors(driver), extract_seat_items(driver)
+
+
+class SeatCalendarWalker:
+    """
+    상세 페이지의 예매 달력을 한 번 로드한 상태에서 월 → 날짜 → 회차 순으로 순회하는 상태 기계.
+    - driver.back() 등 페이지 이동 없이 달력 안에서 클릭만으로 이동
+    - 날짜/회차 요소는 미리 잡아두지 않고, 클릭 직전에 텍스트/순번으로 다시 조회 (stale 요소 방지)
+    - 각 회차의 좌석 정보를 dict로 yield:
+      {year, month, day_num, round_name, round_time, actors, seats: [(seat_class, seat_count), ...]}
+    - resume_after=(year, month, day_num)을 주면 그 날짜까지는 클릭하지 않고 건너뜀 (체크포인트 이어서 진행)
+    """
+
+    def __init__(self, driver, resume_after=None):
+        self.driver = driver
+        self.resume_after = resume_after
+        self.state = MONTH
+        self.current_month = None
+        self.year = None
+        self.month = None
+        self.pending_days = []
+        self.day_num = None
+        self.round_count = 0
+        self.round_index = 0
+        self.retry_count = 0
+
+    def walk(self):
+        while self.state != DONE:
+            if self.state == MONTH:
+                self._enter_month()
+            elif self.state == DAY:
+                self._enter_day()
+            elif self.state == ROUND:
+                result = self._read_round()
+                if result is not None:
+                    yield result
+            elif self.state == NEXT_MONTH:
+                self._next_month()
+
+    def _click(self, element):
+        self.driver.execute_script("arguments[0].click();", element)
+
+    def _enter_month(self):
+        self.current_month = self.driver.find_element(*CURRENT_MONTH_LOCATOR).text
+        date_parts = self.current_month.split('.')  # 예: ["2025","01"]
+        self.year = int(date_parts[0])
+        self.month = int(date_parts[1])
+
+        # 이미 저장된 달은 날짜를 클릭하지 않고 다음 달로
+        if self.resume_after and (self.year, self.month) < self.resume_after[:2]:
+            print(f"[좌석] 현재 달: {self.current_month} 저장 완료된 달 -> 건너뜀")
+            self.state = NEXT_MONTH
+            return
+
+        # 날짜는 요소가 아닌 텍스트로 기억해 두고 클릭 직전에 다시 조회
+        self.pending_days = [day.text.strip() for day in self.driver.find_elements(By.XPATH, ACTIVE_DAYS_XPATH)]
+        if self.resume_after and (self.year, self.month) == self.resume_after[:2]:
+            self.pending_days = [day for day in self.pending_days if int(day) > self.resume_after[2]]
+            print(f"[좌석] {self.resume_after[2]}일까지 저장 완료 -> 이후 날짜부터 이어서 진행")
+        print(f"[좌석] 현재 달: {self.current_month}, 활성화된 날짜 수: {len(self.pending_days)}")
+        self.state = DAY
+
+    def _find_day(self, day_text):
+        return self.driver.find_element(By.XPATH, f'{ACTIVE_DAYS_XPATH}[normalize-space(.)="{day_text}"]')
+
+    def _enter_day(self):
+        if not self.pending_days:
+            self.state = NEXT_MONTH
+            return
+
+        day_text = self.pending_days.pop(0)
+        previous_rounds = snapshot(self.driver, ROUND_LOCATOR)
+
+        # 클릭 직전에 다시 조회하고, 그 사이 달력이 다시 그려졌으면 한 번 더 조회
+        for attempt in range(2):
+            try:
+                self._click(self._find_day(day_text))
+                break
+            except StaleElementReferenceException:
+                self.retry_count += 1
+                if attempt == 1:
+                    print(f"[좌석] 날짜 클릭 실패(stale): {self.current_month}-{day_text}")
+                    return
+            except NoSuchElementException:
+                print(f"[좌석] 날짜를 찾을 수 없음: {self.current_month}-{day_text}")
+                return
+        print(f"[좌석] 날짜 클릭: {self.current_month}-{day_text}")
+
+        self.day_num = int(day_text)
+        self.round_count = self._wait_for_rounds(previous_rounds)
+        self.round_index = 0
+        self.state = ROUND
+
+    def _wait_for_rounds(self, previous_rounds):
+        """날짜를 클릭한 뒤 회차 목록이 준비될 때까지 기다리고 회차 수를 반환합니다."""
+        # 회차 목록(timeTableLabel)이 새로 그려질 때까지 대기
+        # (앞 날짜와 회차 구성이 같아 DOM이 그대로면 CRAWL_WAIT_UNCHANGED_GRACE초 후 진행)
+        rounds = wait_for(
+            self.driver,
+            content_changed(ROUND_LOCATOR, previous_rounds, unchanged_after=settings.CRAWL_WAIT_UNCHANGED_GRACE),
+            "seat_date",
+        )
+        if rounds is None:
+            rounds = self.driver.find_elements(*ROUND_LOCATOR)
+        return len(rounds)
+
+    def _read_round(self):
+        if self.round_index >= self.round_count:
+            self.state = DAY
+            return None
+
+        index = self.round_index
+        self.round_index += 1
+
+        previous_seats = snapshot(self.driver, SEAT_ITEM_LOCATOR)
+        round_text = self._click_round(index)
+        if round_text is None:
+            return None
+        round_name, round_time = round_text
+        self._wait_for_seats(previous_seats)
+
+        # 배우 정보 (회차당 한 번만 조회)와 좌석 등급별 잔여석
+        actors, seats = extract_round_seats(self.driver)
+        return self._round_result(round_name, round_time, actors, seats)
+
+    def _wait_for_seats(self, previous_seats):
+        """회차를 클릭한 뒤 좌석 테이블이 새 회차의 잔여석으로 바뀔 때까지 기다립니다."""
+        # 앞 회차와 좌석 등급이 같아도 잔여석 텍스트가 바뀌면 진행
+        # (잔여석까지 같아 DOM이 그대로면 CRAWL_WAIT_UNCHANGED_GRACE초 후 진행)
+        wait_for(
+            self.driver,
+            content_changed(SEAT_ITEM_LOCATOR, previous_seats, unchanged_after=settings.CRAWL_WAIT_UNCHANGED_GRACE),
+            "seat_round",
+        )
+
+    def _click_round(self, index):
+        """index번째 회차를 클릭하고 (round_name, round_time)을 반환합니다. 실패하면 None."""
+        rounds = self.driver.find_elements(*ROUND_LOCATOR)
+        if index >= len(rounds):
+            print(f"[좌석] 회차 목록이 바뀌어 {index + 1}번째 회차를 찾을 수 없음")
+            return None
+
+        round_element = rounds[index]
+        round_text = (round_element.get_attribute('data-text') or '').split()
+        if not round_text:
+            return None
+
+        try:
+            self._click(round_element)
+        except Exception as e:
+            print(f"[좌석] 회차 클릭 실패: {e}")
+            return None
+        return round_text[0], round_text[1] if len(round_text) > 1 else ""
+
+    def _round_result(self, round_name, round_time, actors, seats):
+        return {
+            "year": self.year,
+            "month": self.month,
+            "day_num": self.day_num,
+            "round_name": round_name,
+            "round_time": round_time,
+            "actors": actors,
+            "seats": seats,
+        }
+
+    def _next_month(self):
+        try:
+            next_month_btn = self.driver.find_element(By.XPATH, NEXT_MONTH_XPATH)
+        except NoSuchElementException:
+            print("[좌석] 더 이상 다음 달 없음 -> 종료")
+            self.state = DONE
+            return
+
+        self._click(next_month_btn)
+        if wait_for(self.driver, text_changed(CURRENT_MONTH_LOCATOR, self.current_month), "seat_month") is None:
+            print("[좌석] 다음 달로 넘어가지 않음 -> 종료")
+            self.state = DONE
+            return
+        self.state = MONTH
+
+
+class NetworkSeatCalendarWalker(SeatCalendarWalker):
+    """
+    SEAT_CRAWL_MODE='network'용 달력 순회.
+    달력 클릭은 그대로 하되, 회차 목록과 잔여석은 화면 대신 페이지가 호출한 좌석 API 응답(JSON)을
+    DevTools 성능 로그로 가로채 읽습니다. (드라이버를 성능 로그와 함께 띄워야 함: drivers.build_chrome_options)
+    - 날짜 클릭 후 그 날짜의 회차 목록 응답이 오면 바로 진행 (회차 DOM이 다시 그려지기를 기다리지 않음)
+    - 이미 받은 응답(월 단위 응답 등)에 회차의 잔여석과 캐스팅이 있으면 회차를 클릭하지 않음
+    - 응답을 받지 못한 날짜/회차는 기존 화면 추출로 대체
+    - 성능 로그를 읽을 수 없는 드라이버면(capture.available=False) 응답을 기다리지 않고 모두 화면에서 추출
+    """
+
+    def __init__(self, driver, resume_after=None):
+        super().__init__(driver, resume_after=resume_after)
+        self.capture = SeatNetworkCapture(driver)
+        self.day_rounds = []
+        self.network_count = 0
+        self.dom_count = 0
+
+    def walk(self):
+        self.capture.start()
+        if not self.capture.available:
+            print("[좌석][network] 성능 로그를 사용할 수 없음 -> 화면에서 수집")
+        yield from super().walk()
+        print(
+            f"[좌석][network] API 응답 {self.capture.response_count}건 "
+            f"(읽기 실패 {self.capture.error_count}건), 회차 {self.network_count}개 응답에서 / {self.dom_count}개 화면에서 수집"
+        )
+
+    def _captured(self, read):
+        """새 응답을 반영한 뒤 read()가 참 값을 돌려줄 때까지 기다리는 대기 조건."""
+        def _condition(driver):
+            self.capture.collect()
+            return read()
+        return _condition
+
+    def _enter_day(self):
+        # 이미 받은 응답(월 단위 응답 등)에 그 날짜 모든 회차의 잔여석과 캐스팅이 있으면 날짜도 클릭하지 않음
+        if self.pending_days and self.capture.available:
+            day = (self.year, self.month, int(self.pending_days[0]))
+            rounds = self.capture.rounds_for(day)
+            if rounds and all(
+                self.capture.seats_for(r["play_seq"]) is not None and r["actors"] is not None for r in rounds
+            ):
+                self.pending_days.pop(0)
+                self.day_num = day[2]
+                self.day_rounds = rounds
+                self.round_count = len(rounds)
+                self.round_index = 0
+                self.state = ROUND
+                return
+        super()._enter_day()
+
+    def _wait_for_rounds(self, previous_rounds):
+        if not self.capture.available:
+            self.day_rounds = []
+            return super()._wait_for_rounds(previous_rounds)
+        day = (self.year, self.month, self.day_num)
+        self.day_rounds = wait_for(
+            self.driver,
+            self._captured(lambda: self.capture.rounds_for(day)),
+            "seat_date_network",
+            timeout=settings.SEAT_NETWORK_TIMEOUT,
+        ) or []
+        if not self.day_rounds:
+            print(f"[좌석][network] {self.current_month}-{self.day_num} 회차 응답 없음 -> 화면에서 회차 확인")
+            return super()._wait_for_rounds(previous_rounds)
+        return len(self.day_rounds)
+
+    def _read_round(self):
+        if not self.day_rounds:
+            result = super()._read_round()
+            if result is not None:
+                self.dom_count += 1
+            return result
+
+        if self.round_index >= self.round_count:
+            self.state = DAY
+            return None
+        index = self.round_index
+        self.round_index += 1
+        round_info = self.day_rounds[index]
+        play_seq = round_info["play_seq"]
+
+        # 이미 받은 응답에 잔여석과 캐스팅이 모두 있으면 클릭하지 않음
+        seats = self.capture.seats_for(play_seq)
+        if seats is not None and round_info["actors"] is not None:
+            self.network_count += 1
+            return self._round_result(round_info["round_name"], round_info["round_time"], round_info["actors"], seats)
+
+        previous_seats = snapshot(self.driver, SEAT_ITEM_LOCATOR)
+        if self._click_round(index) is None:
+            return None
+        seats = wait_for(
+            self.driver,
+            self._captured(lambda: self.capture.seats_for(play_seq)),
+            "seat_round_network",
+            timeout=settings.SEAT_NETWORK_TIMEOUT,
+        ) if self.capture.available else None
+        if seats is None:
+            # 응답을 받지 못한 회차는 화면에서 읽음
+            self._wait_for_seats(previous_seats)
+            actors, seats = extract_round_seats(self.driver)
+            self.dom_count += 1
+        else:
+            actors = round_info["actors"] if round_info["actors"] is not None else extract_actors(self.driver)
+            self.network_count += 1
+        return self._round_result(round_info["round_name"], round_info["round_time"], actors, seats)
+
+
+def seat_crawl_mode(mode=None):
+    """좌석 크롤링 방식. mode를 주지 않으면 SEAT_CRAWL_MODE 설정을 사용합니다."""
+    mode = mode or settings.SEAT_CRAWL_MODE
+    if mode not in SEAT_CRAWL_MODES:
+        raise ValueError(f"알 수 없는 좌석 크롤링 방식: {mode} (사용 가능: {', '.join(SEAT_CRAWL_MODES)})")
+    return mode
+
+
+def seat_calendar_walker(driver, resume_after=None, mode=None):
+    """좌석 크롤링 방식(dom/network)에 맞는 달력 순회 객체."""
+    if seat_crawl_mode(mode) == "network":
+        return NetworkSeatCalendarWalker(driver, resume_after=resume_after)
+    return SeatCalendarWalker(driver, resume_after=resume_after)
@@ -0,0 +1,162 @@
+import base64
+import json
+import logging
+import re
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+
+from selenium.common.exceptions import WebDriverException
+
+from .parsers import parse_remain_seat_json, parse_round_json
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+PLAY_SEQ_URL_PATTERN = re.compile(r"/playSeq/(?:PlaySeq/)?(\w+)/", re.IGNORECASE)
+
+
+def performance_logging_enabled():
+    """드라이버를 성능 로그(네트워크 이벤트)와 함께 띄워야 하는지. (SEAT_CRAWL_MODE='network')"""
+    return settings.SEAT_CRAWL_MODE == "network"
+
+
+def clear_performance_log(driver):
+    """쌓인 성능 로그를 비웁니다. (읽지 않으면 chromedriver에 계속 쌓임)"""
+    if not performance_logging_enabled():
+        return
+    try:
+        driver.get_log("performance")
+    except WebDriverException:
+        pass
+
+
+def play_seq_from_url(url):
+    """잔여석 API URL에서 회차 번호(playSeq)를 찾습니다. 경로(/playSeq/PlaySeq/001/...) 또는 쿼리(?playSeq=001)."""
+    match = PLAY_SEQ_URL_PATTERN.search(url)
+    if match:
+        return match.group(1)
+    values = parse_qs(urlparse(url).query).get("playSeq")
+    return values[0] if values else None
+
+
+class NetworkCapture:
+    """
+    Chrome 성능 로그(goog:loggingPrefs performance)에서 url_pattern에 맞는 응답을 찾아
+    DevTools(Network.getResponseBody)로 JSON 본문을 읽습니다.
+    drain()을 호출할 때마다 그 사이 완료된 응답을 [(url, data), ...]로 반환합니다.
+    드라이버가 성능 로그 없이 떠 있어 로그를 읽지 못하면 available이 False가 되고 drain()은 빈 목록을 반환합니다.
+    (호출하는 쪽은 화면 추출로 대체)
+    """
+
+    def __init__(self, driver, url_pattern=None):
+        self.driver = driver
+        self.url_pattern = re.compile(url_pattern or settings.SEAT_NETWORK_URL_PATTERN)
+        self._pending = {}  # requestId -> url (응답 헤더는 받았고 본문 수신 대기 중)
+        self.response_count = 0
+        self.error_count = 0
+        self.available = True
+
+    def _read_log(self):
+        """성능 로그를 읽습니다. 읽지 못하면 available을 False로 바꾸고 빈 목록을 반환합니다."""
+        if not self.available:
+            return []
+        try:
+            return self.driver.get_log("performance")
+        except WebDriverException as e:
+            self.available = False
+            logger.warning(f"[capture] 성능 로그를 읽을 수 없어 화면 추출로 대체합니다: {e}")
+            return []
+
+    def start(self):
+        """이전 페이지의 로그를 버리고 네트워크 이벤트 수집을 시작합니다."""
+        self._read_log()
+        self._pending.clear()
+        if not self.available:
+            return self
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+        except WebDriverException as e:
+            logger.warning(f"[capture] Network.enable 실패 (무시): {e}")
+        return self
+
+    def _response_body(self, request_id):
+        result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        body = result.get("body", "")
+        if result.get("base64Encoded"):
+            body = base64.b64decode(body).decode("utf-8")
+        return json.loads(body)
+
+    def drain(self):
+        responses = []
+        for entry in self._read_log():
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.responseReceived":
+                url = params.get("response", {}).get("url", "")
+                if self.url_pattern.search(url):
+                    self._pending[params.get("requestId")] = url
+            elif method == "Network.loadingFinished" and params.get("requestId") in self._pending:
+                url = self._pending.pop(params["requestId"])
+                try:
+                    responses.append((url, self._response_body(params["requestId"])))
+                    self.response_count += 1
+                except (WebDriverException, ValueError, UnicodeDecodeError) as e:
+                    # 본문이 이미 버려졌거나 JSON이 아닌 응답
+                    self.error_count += 1
+                    logger.debug(f"[capture] 응답 본문 읽기 실패: {url} ({e})")
+            elif method == "Network.loadingFailed":
+                self._pending.pop(params.get("requestId"), None)
+        return responses
+
+
+class SeatNetworkCapture(NetworkCapture):
+    """
+    좌석 API 응답을 모아 두는 캡처.
+    - 회차 목록 응답 → 날짜별 회차 목록 (회차별 잔여석이 함께 오면 잔여석도 저장)
+    - 잔여석 응답 → 회차 번호(playSeq)별 잔여석 (응답에 회차 번호가 없으면 URL에서 찾음)
+    """
+
+    def __init__(self, driver, url_pattern=None):
+        super().__init__(driver, url_pattern)
+        self.rounds = {}  # (year, month, day_num) -> {play_seq: 회차}
+        self.seats = {}   # play_seq -> [(seat_class, seat_count), ...]
+
+    def collect(self):
+        """새로 받은 응답을 반영합니다. 반영한 응답 수를 반환합니다."""
+        collected = 0
+        for url, data in self.drain():
+            rounds = parse_round_json(data)
+            if rounds:
+                for round_info in rounds:
+                    day = (round_info["year"], round_info["month"], round_info["day_num"])
+                    day_rounds = self.rounds.setdefault(day, {})
+                    previous = day_rounds.get(round_info["play_seq"])
+                    if previous is not None and round_info["actors"] is None:
+                        round_info["actors"] = previous["actors"]  # 캐스팅이 없는 응답이 나중에 와도 유지
+                    day_rounds[round_info["play_seq"]] = round_info
+                    if round_info["seats"] is not None:
+                        self.seats[round_info["play_seq"]] = round_info["seats"]
+                collected += 1
+                continue
+
+            play_seq, seats = parse_remain_seat_json(data)
+            play_seq = play_seq or play_seq_from_url(url)
+            if seats and play_seq:
+                self.seats[play_seq] = seats
+                collected += 1
+        return collected
+
+    def rounds_for(self, day):
+        """날짜의 회차 목록 (시간 순). 여러 응답에서 모은 경우에도 round_name을 '1회', '2회', ... 순서로 다시 매깁니다."""
+        rounds = sorted(self.rounds.get(day, {}).values(), key=lambda r: (r["round_time"], r["play_seq"]))
+        for number, round_info in enumerate(rounds, start=1):
+            round_info["round_name"] = f"{number}회"
+        return rounds
+
+    def seats_for(self, play_seq):
+        return self.seats.get(play_seq)
@@ -0,0 +1,98 @@
+from collections import defaultdict
+import logging
+
+from django.db import transaction
+from django.utils.timezone import now
+
+from .models import Actor, Concert, RoundCasting, SeatState
+from .parsers import split_actors
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+ACTOR_NAME_MAX_LENGTH = Actor._meta.get_field("name").max_length
+
+
+def round_key(year, month, day_num, round_name):
+    """회차 하나를 구분하는 키."""
+    return (year, month, day_num, round_name)
+
+
+def actor_ids(names):
+    """배우 이름 목록의 {이름: Actor id}. 없는 배우는 새로 만듭니다."""
+    names = {name[:ACTOR_NAME_MAX_LENGTH] for name in names}
+    if not names:
+        return {}
+    ids = dict(Actor.objects.filter(name__in=names).values_list("name", "id"))
+    missing = names - set(ids)
+    if missing:
+        # 다른 프로세스가 동시에 만든 배우는 무시하고 다시 읽음
+        Actor.objects.bulk_create([Actor(name=name) for name in missing], ignore_conflicts=True)
+        ids.update(Actor.objects.filter(name__in=missing).values_list("name", "id"))
+    return ids
+
+
+def replace_round_castings(concert, rounds, updated_at=None):
+    """
+    회차별 캐스팅 색인을 교체합니다.
+    rounds: {(year, month, day_num, round_name): (round_time, 캐스팅 문자열), ...}
+    캐스팅 문자열이 비어 있으면 그 회차의 색인을 지웁니다. 저장한 RoundCasting 행 수를 반환합니다.
+    """
+    if not rounds:
+        return 0
+    updated_at = updated_at or now()
+    names_by_round = {key: split_actors(actors) for key, (_, actors) in rounds.items()}
+    ids = actor_ids({name for names in names_by_round.values() for name in names})
+
+    # 날짜별로 한 번씩 지움 (좌석 저장도 날짜 단위)
+    round_names_by_day = defaultdict(list)
+    for year, month, day_num, round_name in rounds:
+        round_names_by_day[(year, month, day_num)].append(round_name)
+
+    castings = [
+        RoundCasting(
+            concert=concert,
+            actor_id=ids[name[:ACTOR_NAME_MAX_LENGTH]],
+            year=key[0],
+            month=key[1],
+            day_num=key[2],
+            round_name=key[3],
+            round_time=rounds[key][0],
+            position=position,
+            updated_at=updated_at,
+        )
+        for key, names in names_by_round.items()
+        for position, name in enumerate(names)
+    ]
+    with transaction.atomic():
+        for (year, month, day_num), round_names in round_names_by_day.items():
+            RoundCasting.objects.filter(
+                concert=concert, year=year, month=month, day_num=day_num, round_name__in=round_names
+            ).delete()
+        RoundCasting.objects.bulk_create(castings, batch_size=500)
+    return len(castings)
+
+
+def rebuild_castings(concert=None):
+    """
+    좌석 최신 상태(SeatState)의 캐스팅 문자열로 회차별 캐스팅 색인을 다시 만듭니다. (파싱 규칙을 바꾼 경우 등)
+    concert를 주지 않으면 모든 공연. 저장한 RoundCasting 행 수를 반환합니다.
+    """
+    concerts = [concert] if concert is not None else Concert.objects.all()
+    total = 0
+    for target in concerts:
+        rounds = {}
+        states = SeatState.objects.filter(concert=target).order_by("changed_at").values(
+            "year", "month", "day_num", "round_name", "round_time", "actors"
+        )
+        for state in states:
+            # 좌석 등급별 상태 중 마지막으로 바뀐 값이 그 회차의 최신 캐스팅
+            rounds[round_key(state["year"], state["month"], state["day_num"], state["round_name"])] = (
+                state["round_time"], state["actors"]
+            )
+        with transaction.atomic():
+            RoundCasting.objects.filter(concert=target).delete()
+            count = replace_round_castings(target, rounds)
+        logger.info(f"[castings] [{target}] 회차 {len(rounds)}개, 캐스팅 {count}건 색인")
+        total += count
+    return total
@@ -6,34 +6,31 @@ from django.test import RequestFactory
 
 import time
 
-from review.models import Review
+from review.models import Concert, Review
 
 from openai import OpenAI
 
 from review.slacks import chatgpt_review_send_slack_message
+from review.batches import active_review_ids
+from review.classifiers import classify_reviews_locally
+from review.sentiments import (
+    SENTIMENT_CRITERIA,
+    SENTIMENT_SYSTEM_PROMPT,
+    apply_sentiment_cache,
+    build_batch_sentiment_prompt,
+    copy_duplicate_sentiments,
+    fill_sentiment_cache,
+    normalize_sentiment,
+    parse_batch_sentiments,
+    update_reviews_sentiment_async,
+)
 
 client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
 def analyze_sentiment(review_text):
     prompt = f"""
     아래 공연 리뷰의 감정을 분석해주세요.
-
-    분석 기준:
-    1. 공연 특수성 고려
-    - 슬픈 내용의 공연에서 울었다는 것은 긍정적 반응
-    - 배우의 연기가 너무 실감나서 불편했다는 것은 긍정적 반응
-    - 공연장 시설, 관람 환경 관련 내용은 별도로 구분
-
-    2. 감정 판단 기준
-    - 긍정: 감동, 재미, 만족, 호평, 추천 의사 등
-    - 중립: 장단점 공존, 객관적 서술만 있는 경우
-    - 부정: 실망, 불만족, 비추천, 부정적 경험
-
-    3. 주의사항
-    - 공연 자체의 내용과 관람 경험을 구분하여 판단
-    - 티켓 가격 대비 만족도 고려
-    - 공연의 장르별 특성 반영
-
+{SENTIMENT_CRITERIA}
     위 기준을 바탕으로 '긍정', '중립', '부정' 중 하나로만 답변해주세요.
 
     리뷰 내용: {review_text}
@@ -41,30 +38,145 @@ def analyze_sentiment(review_text):
     
     response = client.chat.completions.create(
         messages=[
-            {"role": "system", "content": "당신은 공연 리뷰 감정 분석 전문가입니다."},
+            {"role": "system", "content": SENTIMENT_SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
-        model="gpt-3.5-turbo",
+        model=settings.SENTIMENT_MODEL,
     )
     
     # 응답 후 로그 출력
     print("analyze_sentiment 응답:")
     print(response)
     
-    sentiment = response.choices[0].message.content.strip()
-    
-    if "긍정" in sentiment:
-        return "긍정"
-    elif "중립" in sentiment:
-        return "중립"
-    elif "부정" in sentiment:
-        return "부정"
-    else:
-        return None
+    return normalize_sentiment(response.choices[0].message.content.strip())
+
+def analyze_sentiments_batch(items):
+    """리뷰 여러 개를 요청 한 번으로 분류하여 {review_id: 감정}을 반환합니다. (응답에 빠진 리뷰는 포함되지 않음)"""
+    response = client.chat.completions.create(
+        messages=[
+            {"role": "system", "content": SENTIMENT_SYSTEM_PROMPT},
+            {"role": "user", "content": build_batch_sentiment_prompt(items)}
+        ],
+        model=settings.SENTIMENT_MODEL,
+        response_format={"type": "json_object"},
+        temperature=0,
+    )
+    return parse_batch_sentiments(response.choices[0].message.content, [review_id for review_id, _ in items])
+
+def analyze_sentiments(items, batch_size=None, max_retries=None):
+    """
+    리뷰 목록을 SENTIMENT_BATCH_SIZE개씩 묶어 분류하고 {review_id: 감정}을 반환합니다.
+    응답에서 빠지거나 잘못된 리뷰만 최대 SENTIMENT_BATCH_MAX_RETRIES번 다시 요청합니다.
+    items: [(review_id, 리뷰 내용), ...]
+    """
+    batch_size = batch_size or settings.SENTIMENT_BATCH_SIZE
+    max_retries = settings.SENTIMENT_BATCH_MAX_RETRIES if max_retries is None else max_retries
+    sentiments = {}
+    for start in range(0, len(items), batch_size):
+        pending = items[start:start + batch_size]
+        for attempt in range(max_retries + 1):
+            if attempt:
+                print(f"[감정 분석] 응답에 없는 리뷰 {len(pending)}개 다시 요청 ({attempt}/{max_retries})")
+            sentiments.update(analyze_sentiments_batch(pending))
+            pending = [(review_id, text) for review_id, text in pending if review_id not in sentiments]
+            if not pending:
+                break
+        if pending:
+            print(f"[감정 분석] 재시도 후에도 결과가 없는 리뷰 {len(pending)}개")
+    return sentiments
+
+def _update_reviews_sentiment(reviews_to_update, results):
+    """
+    미분석 리뷰의 감정을 분석하여 저장합니다.
+    감정 분석 캐시에 있는 내용은 바로 저장하고, 같은 내용의 리뷰는 하나만 요청한 뒤 결과를 복사합니다. (sentiments.apply_sentiment_cache)
+    로컬 분류기가 확신하는 리뷰도 바로 저장하고 나머지만 GPT에 보냅니다. (classifiers.classify_reviews_locally)
+    SENTIMENT_ENGINE이 'async'이면 동시 요청/속도 제한을 적용하는 비동기 엔진(sentiments.SentimentEngine)으로,
+    'sync'이면 배치를 하나씩 요청합니다.
+    제출 후 결과를 기다리는 배치 작업(batches.submit_sentiment_batch)에 들어 있는 리뷰는 건너뜁니다.
+    """
+    active_ids = active_review_ids()
+    reviews = [review for review in reviews_to_update.order_by("id") if review.id not in active_ids]
+    if len(reviews) < results["total"]:
+        results["skipped"] += results["total"] - len(reviews)
+        print(f"배치 작업 결과를 기다리는 리뷰 {results['total'] - len(reviews)}개는 건너뜁니다.")
+    reviews, duplicates, hashes = apply_sentiment_cache(reviews, results)
+    classified, reviews = classify_reviews_locally(reviews, results)
+    copy_duplicate_sentiments(classified, duplicates, results)
+    try:
+        if settings.SENTIMENT_ENGINE == "async":
+            update_reviews_sentiment_async(reviews, results)
+        else:
+            _update_reviews_sentiment_sync(reviews, results)
+    finally:
+        # 중간에 실패해도 받은 결과는 캐시에 저장
+        fill_sentiment_cache(reviews, duplicates, hashes, results)
+
+def _update_reviews_sentiment_sync(reviews, results):
+    """
+    리뷰를 SENTIMENT_BATCH_SIZE개씩 묶어 감정 분석하고 배치마다 한 번에 저장합니다.
+    배치 사이에는 SENTIMENT_BATCH_SLEEP_SECONDS초 쉽니다.
+    """
+    total_count = len(reviews)
+    batch_size = settings.SENTIMENT_BATCH_SIZE
+    done_count = 0
+
+    for start in range(0, total_count, batch_size):
+        batch = reviews[start:start + batch_size]
+
+        # 배치 처리 전에 공연의 감정분석 활성화 상태 다시 확인
+        enabled_ids = set(Concert.objects.filter(
+            id__in={review.concert_id for review in batch}, is_sentiment_enabled=True
+        ).values_list("id", flat=True))
+        for review in batch:
+            if review.concert_id not in enabled_ids:
+                results["skipped"] += 1
+                results["errors"].append({
+                    "review_id": review.id,
+                    "title": review.title,
+                    "error": "공연의 감정분석이 비활성화되어 있음"
+                })
+        batch = [review for review in batch if review.concert_id in enabled_ids]
+        if not batch:
+            continue
+
+        try:
+            sentiments = analyze_sentiments([(review.id, review.description) for review in batch])
+        except Exception as e:
+            for review in batch:
+                results["failed"] += 1
+                results["errors"].append({
+                    "review_id": review.id,
+                    "title": review.title,
+                    "error": str(e)
+                })
+            print(f"오류 발생 - 리뷰 {len(batch)}개 (ID {batch[0].id}~{batch[-1].id}), 오류: {str(e)}")
+            continue
+
+        updated = []
+        for review in batch:
+            sentiment = sentiments.get(review.id)
+            if sentiment:
+                review.emotion = sentiment
+                updated.append(review)
+                results["success"] += 1
+            else:
+                results["skipped"] += 1
+                results["errors"].append({
+                    "review_id": review.id,
+                    "title": review.title,
+                    "error": "감정 분석 결과가 없음"
+                })
+        with transaction.atomic():
+            Review.objects.bulk_update(updated, ["emotion"])
+
+        done_count = min(start + batch_size, total_count)
+        print(f"[{done_count}/{total_count}] 리뷰 {len(batch)}개 중 {len(updated)}개 감정 저장")
+
+        if done_count < total_count:
+            time.sleep(settings.SENTIMENT_BATCH_SLEEP_SECONDS)
 
 def update_reviews_with_sentiment_cron():
     """스케줄러용 감정 분석 함수 (request 매개변수 불필요)"""
-    sleep_time = 3
     results = {
         "total": 0,
         "success": 0,
@@ -89,50 +201,13 @@ def update_reviews_with_sentiment_cron():
     results["total"] = total_count
     print(f"총 {total_count}개의 리뷰에 대해 감정 분석을 시작합니다.")
 
-    for index, review in enumerate(reviews_to_update, 1):
-        # 리뷰 처리 전에 공연의 감정분석 활성화 상태 다시 확인
-        if not review.concert.is_sentiment_enabled:
-            results["skipped"] += 1
-            results["errors"].append({
-                "review_id": review.id,
-                "title": review.title,
-                "error": "공연의 감정분석이 비활성화되어 있음"
-            })
-            continue
-
-        try:
-            with transaction.atomic():
-                sentiment = analyze_sentiment(review.description)
-                if sentiment:
-                    review.emotion = sentiment
-                    review.save(update_fields=["emotion"])
-                    results["success"] += 1
-                else:
-                    results["skipped"] += 1
-                    results["errors"].append({
-                        "review_id": review.id,
-                        "title": review.title,
-                        "error": "감정 분석 결과가 없음"
-                    })
-                
-                print(f"[{index}/{total_count}] 공연 명: {review.concert} / 리뷰 제목: {review.title} >>> 감정: {sentiment}")
-                
-        except Exception as e:
-            results["failed"] += 1
-            results["errors"].append({
-                "review_id": review.id,
-                "title": review.title,
-                "error": str(e)
-            })
-            print(f"오류 발생 - 리뷰 ID: {review.id}, 제목: {review.title}, 오류: {str(e)}")
-        
-        time.sleep(sleep_time)
+    _update_reviews_sentiment(reviews_to_update, results)
 
     message = f"감정 분석 완료 - 총 {results['total']}개 중 성공: {results['success']}, 실패: {results['failed']}, 건너뜀: {results['skipped']}"
     print(message)
+    return results
 
 def update_reviews_with_sentiment(request):
-    sleep_time = 3
     results = {
         "total": 0,
         "success": 0,
@@ -159,44 +234,7 @@ def update_reviews_with_sentiment(request):
     results["total"] = total_count
     print(f"총 {total_count}개의 리뷰에 대해 감정 분석을 시작합니다.")
 
-    for index, review in enumerate(reviews_to_update, 1):
-        # 리뷰 처리 전에 공연의 감정분석 활성화 상태 다시 확인
-        if not review.concert.is_sentiment_enabled:
-            results["skipped"] += 1
-            results["errors"].append({
-                "review_id": review.id,
-                "title": review.title,
-                "error": "공연의 감정분석이 비활성화되어 있음"
-            })
-            continue
-
-        try:
-            with transaction.atomic():
-                sentiment = analyze_sentiment(review.description)
-                if sentiment:
-                    review.emotion = sentiment
-                    review.save(update_fields=["emotion"])
-                    results["success"] += 1
-                else:
-                    results["skipped"] += 1
-                    results["errors"].append({
-                        "review_id": review.id,
-                        "title": review.title,
-                        "error": "감정 분석 결과가 없음"
-                    })
-                
-                print(f"[{index}/{total_count}] 공연 명: {review.concert} / 리뷰 제목: {review.title} >>> 감정: {sentiment}")
-                
-        except Exception as e:
-            results["failed"] += 1
-            results["errors"].append({
-                "review_id": review.id,
-                "title": review.title,
-                "error": str(e)
-            })
-            print(f"오류 발생 - 리뷰 ID: {review.id}, 제목: {review.title}, 오류: {str(e)}")
-        
-        time.sleep(sleep_time)
+    _update_reviews_sentiment(reviews_to_update, results)
 
     message = f"감정 분석 완료 - 총 {results['total']}개 중 성공: {results['success']}, 실패: {results['failed']}, 건너뜀: {results['skipped']}"
     print(message)
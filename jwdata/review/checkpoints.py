@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+import logging
+
+from django.conf import settings
+from django.utils.timezone import now
+
+from .models import CrawlCheckpoint
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+def window_hours(kind):
+    """크롤링 종류별 스케줄 구간 길이(시간)."""
+    if kind == CrawlCheckpoint.KIND_SEAT:
+        return settings.CRAWL_SEAT_WINDOW_HOURS
+    return settings.CRAWL_REVIEW_WINDOW_HOURS
+
+
+def current_window(kind, at=None):
+    """
+    at(기본 현재 시각)이 속한 스케줄 구간의 시작 시각.
+    자정부터 window_hours(kind)시간 단위로 나눕니다. (예: 좌석 6시간 → 00시, 06시, 12시, 18시)
+    """
+    at = at or now()
+    hours = window_hours(kind)
+    midnight = datetime(at.year, at.month, at.day)
+    return midnight + timedelta(hours=(at.hour // hours) * hours)
+
+
+def open_checkpoint(concert, kind, at=None, restart_done=False):
+    """
+    현재 스케줄 구간의 체크포인트를 가져오고, 없으면 새로 만듭니다.
+    이전 실행이 중단된 체크포인트라면 저장된 진행 위치가 그대로 남아 있습니다.
+    restart_done=True이면 이미 완료된 체크포인트를 처음부터 다시 진행하도록 초기화합니다.
+    (스케줄러가 같은 구간 안에서 다시 크롤링하는 경우)
+    """
+    checkpoint, created = CrawlCheckpoint.objects.get_or_create(
+        concert=concert,
+        kind=kind,
+        window_start=current_window(kind, at),
+    )
+    if restart_done and checkpoint.is_done:
+        checkpoint.restart()
+        return checkpoint
+    if not created and not checkpoint.is_done:
+        logger.info(f"[checkpoint] [{concert}] {kind} 크롤링 이어서 진행: {checkpoint}")
+    return checkpoint
+
+
+def done_concert_ids(kind, at=None):
+    """현재 스케줄 구간에서 이미 완료된 공연 id 집합."""
+    return set(
+        CrawlCheckpoint.objects.filter(
+            kind=kind,
+            window_start=current_window(kind, at),
+            status=CrawlCheckpoint.STATUS_DONE,
+        ).values_list("concert_id", flat=True)
+    )
+
+
+def prune_checkpoints(days=None):
+    """보관 기간(기본 CRAWL_CHECKPOINT_RETENTION_DAYS일)이 지난 체크포인트를 삭제합니다."""
+    if days is None:
+        days = settings.CRAWL_CHECKPOINT_RETENTION_DAYS
+    deleted, _ = CrawlCheckpoint.objects.filter(window_start__lt=now() - timedelta(days=days)).delete()
+    if deleted:
+        logger.info(f"[checkpoint] 오래된 체크포인트 {deleted}개 삭제")
+    return deleted
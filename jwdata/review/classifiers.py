@@ -0,0 +1,191 @@
+from datetime import datetime
+import logging
+import os
+
+from django.conf import settings
+from django.db import transaction
+
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+
+from .models import Review
+from .sentiments import SENTIMENT_LABELS, normalize_review_text
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 보고서에 확신도 기준별 처리 비율/일치율을 보여줄 기준값
+REPORT_THRESHOLDS = (0.6, 0.7, 0.8, 0.85, 0.9, 0.95)
+
+_loaded = {}  # 모델 파일 경로 -> (수정 시각, SentimentClassifier)
+
+
+def training_reviews():
+    """학습 데이터: GPT가 감정을 정한 리뷰 [(리뷰 내용, 감정), ...] (로컬 분류기가 정한 감정은 제외)"""
+    return list(
+        Review.objects.filter(emotion__in=SENTIMENT_LABELS, description__isnull=False)
+        .exclude(description="")
+        .exclude(emotion_source=Review.EMOTION_SOURCE_LOCAL)
+        .order_by("id")
+        .values_list("description", "emotion")
+    )
+
+
+def build_pipeline():
+    """글자 n-gram TF-IDF + 로지스틱 회귀 (한국어 조사/어미 변화에 강하도록 형태소 분석 대신 글자 단위)"""
+    return make_pipeline(
+        TfidfVectorizer(
+            preprocessor=normalize_review_text,
+            analyzer="char_wb",
+            ngram_range=(2, 4),
+            min_df=2,
+            max_features=100000,
+            sublinear_tf=True,
+        ),
+        LogisticRegression(max_iter=1000, class_weight="balanced"),
+    )
+
+
+def threshold_report(labels, predictions, confidences, thresholds=REPORT_THRESHOLDS):
+    """확신도 기준별 로컬 처리 비율(coverage)과 그 리뷰들의 GPT 감정 일치율(agreement)"""
+    rows = []
+    for threshold in thresholds:
+        confident = [(label, prediction) for label, prediction, confidence in zip(labels, predictions, confidences) if confidence >= threshold]
+        rows.append({
+            "threshold": threshold,
+            "coverage": len(confident) / len(labels) if labels else 0,
+            "agreement": sum(label == prediction for label, prediction in confident) / len(confident) if confident else None,
+        })
+    return rows
+
+
+class SentimentClassifier:
+    """
+    GPT 감정 결과로 학습한 로컬 감정 분류기.
+    predict()는 (감정, 확신도) 목록을 반환하고, 확신도가 threshold 이상인 결과만 감정으로 저장합니다. (classify_reviews_locally)
+    """
+
+    def __init__(self, pipeline, threshold=None, report=None, trained_at=None):
+        self.pipeline = pipeline
+        self.threshold = settings.SENTIMENT_CLASSIFIER_THRESHOLD if threshold is None else threshold
+        self.report = report or {}
+        self.trained_at = trained_at or datetime.now()
+
+    @classmethod
+    def train(cls, samples, test_size=0.2, threshold=None, random_state=42):
+        """
+        samples([(리뷰 내용, 감정), ...])로 학습합니다.
+        test_size 비율을 떼어 정확도와 확신도 기준별 일치율을 보고서로 남긴 뒤, 전체 데이터로 다시 학습합니다.
+        """
+        if len(samples) < settings.SENTIMENT_CLASSIFIER_MIN_SAMPLES:
+            raise ValueError(f"학습 데이터가 부족합니다: {len(samples)}개 (최소 {settings.SENTIMENT_CLASSIFIER_MIN_SAMPLES}개)")
+        texts = [text for text, _ in samples]
+        labels = [label for _, label in samples]
+
+        train_texts, test_texts, train_labels, test_labels = train_test_split(
+            texts, labels, test_size=test_size, random_state=random_state, stratify=labels
+        )
+        classifier = cls(build_pipeline().fit(train_texts, train_labels), threshold=threshold)
+        report = classifier.evaluate(test_texts, test_labels)
+        report.update({"train_count": len(train_texts), "test_count": len(test_texts)})
+
+        classifier.pipeline = build_pipeline().fit(texts, labels)
+        classifier.report = report
+        return classifier
+
+    def predict(self, texts):
+        if not texts:
+            return []
+        probabilities = self.pipeline.predict_proba(texts)
+        classes = self.pipeline.classes_
+        return [(classes[row.argmax()], float(row.max())) for row in probabilities]
+
+    def evaluate(self, texts, labels):
+        """정확도, 감정별 precision/recall, 현재 기준의 로컬 처리 비율/일치율, 기준별 표"""
+        predicted = self.predict(texts)
+        predictions = [label for label, _ in predicted]
+        confidences = [confidence for _, confidence in predicted]
+        current = threshold_report(labels, predictions, confidences, [self.threshold])[0]
+        return {
+            "accuracy": accuracy_score(labels, predictions),
+            "labels": classification_report(labels, predictions, output_dict=True, zero_division=0),
+            "threshold": self.threshold,
+            "coverage": current["coverage"],
+            "agreement": current["agreement"],
+            "thresholds": threshold_report(labels, predictions, confidences),
+        }
+
+    def save(self, path=None):
+        path = path or settings.SENTIMENT_CLASSIFIER_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump({
+            "pipeline": self.pipeline,
+            "threshold": self.threshold,
+            "report": self.report,
+            "trained_at": self.trained_at,
+        }, path)
+        return path
+
+    @classmethod
+    def load(cls, path=None):
+        data = joblib.load(path or settings.SENTIMENT_CLASSIFIER_PATH)
+        return cls(data["pipeline"], threshold=data["threshold"], report=data["report"], trained_at=data["trained_at"])
+
+
+def load_sentiment_classifier(path=None):
+    """저장된 분류기. 파일이 없으면 None. (파일이 바뀌면 다시 읽음)"""
+    path = path or settings.SENTIMENT_CLASSIFIER_PATH
+    try:
+        modified = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != modified:
+        cached = (modified, SentimentClassifier.load(path))
+        _loaded[path] = cached
+    return cached[1]
+
+
+def train_sentiment_classifier(path=None, test_size=0.2, threshold=None):
+    """GPT 감정 결과로 분류기를 다시 학습하여 저장하고 반환합니다."""
+    samples = training_reviews()
+    classifier = SentimentClassifier.train(samples, test_size=test_size, threshold=threshold)
+    path = classifier.save(path)
+    logger.info(
+        f"[classifiers] 리뷰 {len(samples)}개로 학습, 정확도 {classifier.report['accuracy']:.3f}, "
+        f"기준 {classifier.threshold} 처리 비율 {classifier.report['coverage']:.1%} -> {path}"
+    )
+    return classifier
+
+
+def classify_reviews_locally(reviews, results, classifier=None):
+    """
+    로컬 분류기의 확신도가 기준 이상인 리뷰는 감정을 바로 저장하고 (분류된 리뷰 목록, GPT에 보낼 리뷰 목록)을 반환합니다.
+    SENTIMENT_CLASSIFIER_ENABLED가 꺼져 있거나 학습된 분류기가 없으면 모든 리뷰를 GPT로 보냅니다.
+    """
+    if not settings.SENTIMENT_CLASSIFIER_ENABLED or not reviews:
+        return [], reviews
+    classifier = classifier or load_sentiment_classifier()
+    if classifier is None:
+        return [], reviews
+
+    classified = []
+    remaining = []
+    for review, (label, confidence) in zip(reviews, classifier.predict([review.description for review in reviews])):
+        if confidence >= classifier.threshold:
+            review.emotion = label
+            review.emotion_source = Review.EMOTION_SOURCE_LOCAL
+            classified.append(review)
+        else:
+            remaining.append(review)
+
+    if classified:
+        with transaction.atomic():
+            Review.objects.bulk_update(classified, ["emotion", "emotion_source"], batch_size=settings.SENTIMENT_WRITE_BATCH_SIZE)
+        results["success"] += len(classified)
+    logger.info(f"[classifiers] 리뷰 {len(reviews)}개 중 {len(classified)}개 로컬 분류 (기준 {classifier.threshold}), GPT 요청 {len(remaining)}개")
+    return classified, remaining
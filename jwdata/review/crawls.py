@@ -3,17 +3,35 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
 
 from datetime import datetime
-import time
 import logging
 
-from .models import Concert, Review, Seat
+from .models import Concert, CrawlStep
+from .parsers import normalize_reviews
+from .writers import ReviewWriter, SeatSnapshotWriter
+from .calendars import seat_calendar_walker
+from .extractors import extract_review_rows, extraction_mode
+from .pipelines import WriterPipeline
+from .telemetry import StepTimer
+from .waits import (
+    wait_for,
+    any_element_present,
+    content_changed,
+    snapshot,
+)
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# 대기 조건에 사용하는 locator
+REVIEW_ITEM_LOCATOR = (By.XPATH, '//ul[@class="bbsList reviewList"]/li[@class="bbsItem"]')
+REVIEW_TOTAL_LOCATORS = (
+    (By.XPATH, '//*[@id="prdReview"]/div/div[3]/div[1]/div[1]/div[1]/strong/span'),
+    (By.XPATH, '//*[@id="prdReview"]/div/div[4]/div[1]/div[1]/div[1]/strong/span'),
+)
+
 def crawl_concert_info(driver):
     # 공연 정보 파싱
     name = driver.find_element(By.XPATH, '//*[@id="container"]/div[2]/div[1]/div[2]/div[1]/div/div[1]/h2').text
@@ -50,15 +68,64 @@ def crawl_concert_info(driver):
 
     return concert
 
-def crawl_concert_reviews(driver, concert):
+def extract_review_element(rev_el):
+    """Selenium 리뷰 li 요소에서 리뷰 원본 문자열 필드를 추출합니다."""
+    return {
+        "nickname": rev_el.find_element(By.CLASS_NAME, 'name').text,
+        "date": rev_el.find_element(By.XPATH, './/li[@class="bbsItemInfoList"][2]').text,
+        "view_count": rev_el.find_element(By.XPATH, './/li[@class="bbsItemInfoList"][3]').text,
+        "like_count": rev_el.find_element(By.XPATH, './/li[@class="bbsItemInfoList"][4]').text,
+        "title": rev_el.find_element(By.CLASS_NAME, 'bbsTitleText').text,
+        "description": rev_el.find_element(By.CLASS_NAME, 'bbsText').text,
+        "star_rating": rev_el.find_element(By.CLASS_NAME, 'prdStarIcon').get_attribute('data-star'),
+    }
+
+def resume_review_page(writer, checkpoint):
     """
-    1) 리뷰 크롤링
-    2) DB에 중복 없으면 저장
-    3) 시트에 없으면 append / 있으면 update
-    4) 끝나면 sync_reviews_sheet_to_db()로 시트→DB 동기화
+    체크포인트에 저장된 페이지 다음부터 이어서 진행하도록 시작 페이지를 반환합니다. (체크포인트가 없으면 1)
+    이어서 진행하는 경우 중단된 크롤링의 첫 페이지 최신 리뷰 키를 복원하여 커서 저장에 사용합니다.
     """
+    if checkpoint is None or not checkpoint.page:
+        return 1
+    writer.newest_key = checkpoint.head_key
+    print(f"[리뷰] 체크포인트: {checkpoint.page} 페이지까지 저장됨 -> {checkpoint.page + 1} 페이지부터 이어서 진행")
+    return checkpoint.page + 1
 
-    # 관람후기 탭 버튼 클릭
+def store_review_page(writer, page, raw_reviews, full_crawl=False, checkpoint=None, step=None):
+    """
+    한 페이지의 원본 리뷰 필드를 정규화해 중복 제외 후 한 번에 저장합니다. (Selenium/HTTP 크롤러 공용)
+    저장 후 checkpoint가 있으면 진행 위치(페이지, 마지막 리뷰 키)를 기록하고,
+    step(StepTimer)이 있으면 저장/중복 건수를 기록합니다.
+    이미 수집한 구간에 도달해 더 이상 페이지를 넘길 필요가 없으면 True를 반환합니다.
+    """
+    parsed_count, known_count, cursor_reached = writer.add_page(normalize_reviews(raw_reviews))
+
+    # 페이지 단위로 한 번에 DB 저장
+    saved_count = writer.flush()
+    if saved_count:
+        print(f"[리뷰][DB 저장] {page} 페이지 신규 리뷰 {saved_count}개")
+    if checkpoint is not None:
+        checkpoint.save_review_page(page, writer.last_key, writer.newest_key)
+    if step is not None:
+        step.inserted += saved_count
+        step.skipped += known_count
+
+    # 지난 크롤링이 끝까지 완료된 구간(지난 최신 리뷰)에 도달하면 이후 페이지는 모두 저장된 리뷰이므로 중단
+    # (리뷰가 모두 저장된 페이지라도 지난 최신 리뷰 전이면 계속 진행: 중간에 끊긴 크롤링이 남긴 빈 구간을 채움)
+    if full_crawl or parsed_count == 0:
+        return False
+    if cursor_reached:
+        print(f"[리뷰] {page} 페이지에서 지난 최신 리뷰 도달 -> 페이지 이동 중단")
+        return True
+    if known_count == parsed_count:
+        print(f"[리뷰] {page} 페이지 리뷰가 모두 저장되어 있지만 지난 최신 리뷰 전 -> 계속 진행")
+    return False
+
+def open_review_tab(driver, concert):
+    """
+    상세 페이지에서 관람후기 탭을 열고 관람후기 총 개수를 반환합니다.
+    탭을 열지 못하면 None, 총 개수를 찾지 못하면 0을 반환합니다.
+    """
     concert_type = None
 
     if '뮤지컬' in concert.name:
@@ -80,15 +147,16 @@ def crawl_concert_reviews(driver, concert):
     try:
         review_button = driver.find_element(By.XPATH, review_button_xpath)
         driver.execute_script("arguments[0].click();", review_button)
-        time.sleep(2)
         print(f"[리뷰] 관람후기 탭 클릭 성공: {concert_type}")
     except NoSuchElementException:
         print(f"[리뷰] 관람후기 탭 버튼 찾을 수 없음: {concert_type}")
-        return
+        return None
     except Exception as e:
         print(f"[리뷰] 관람후기 탭 클릭 중 오류 발생: {e}")
-        return
-    time.sleep(2)
+        return None
+
+    # 관람후기 총 개수 영역이 그려질 때까지 대기
+    wait_for(driver, any_element_present(*REVIEW_TOTAL_LOCATORS), "review_tab")
 
     # 관람후기 총 개수 파악
     review_total_count = 0
@@ -101,190 +169,240 @@ def crawl_concert_reviews(driver, concert):
             review_total_count = int(review_total_count_element.text)
         except NoSuchElementException:
             print("[리뷰] 총 개수를 찾을 수 없습니다.")
+    return review_total_count
 
-    review_num_pages = (review_total_count + 14) // 15
-
-    for page in range(1, review_num_pages + 1):
-        print(f"[리뷰] {page}/{review_num_pages} 페이지 처리 중")
+def extract_review_elements(driver):
+    """리뷰 li 요소마다 필드를 하나씩 조회해 원본 필드 목록을 추출합니다. (리뷰당 WebDriver 요청 8회 내외)"""
+    raw_reviews = []
+    for rev_el in driver.find_elements(*REVIEW_ITEM_LOCATOR):
+        try:
+            raw_reviews.append(extract_review_element(rev_el))
+        except Exception as e:
+            print(f"[리뷰] 처리 중 오류 발생: {e}")
+    return raw_reviews
 
-        review_elements = driver.find_elements(By.XPATH, '//ul[@class="bbsList reviewList"]/li[@class="bbsItem"]')
+def extract_review_page(driver, mode=None):
+    """
+    현재 리뷰 목록 페이지의 리뷰 원본 필드 목록. (lxml 버전: parsers.parse_review_items)
+    mode(기본 CRAWL_EXTRACTION_MODE)가 'script'이면 페이지 전체를 스크립트 한 번으로 추출하고,
+    스크립트 실행이나 결과 검증에 실패하면 요소별 추출('element')로 다시 읽습니다.
+    """
+    if extraction_mode(mode) == "script":
+        try:
+            return extract_review_rows(driver)
+        except (WebDriverException, ValueError) as e:
+            print(f"[리뷰] 스크립트 추출 실패 -> 요소별 추출로 재시도: {e}")
+    return extract_review_elements(driver)
 
-        for rev_el in review_elements:
-            try:
-                nickname = rev_el.find_element(By.CLASS_NAME, 'name').text.strip()
-                date_raw = rev_el.find_element(By.XPATH, './/li[@class="bbsItemInfoList"][2]').text.strip()
-                view_count = int(''.join(filter(str.isdigit, rev_el.find_element(By.XPATH, './/li[@class="bbsItemInfoList"][3]').text)))
-                like_count = int(''.join(filter(str.isdigit, rev_el.find_element(By.XPATH, './/li[@class="bbsItemInfoList"][4]').text)))
-                title = rev_el.find_element(By.CLASS_NAME, 'bbsTitleText').text.strip()
-                description = rev_el.find_element(By.CLASS_NAME, 'bbsText').text.strip()
-                star_rating = float(rev_el.find_element(By.CLASS_NAME, 'prdStarIcon').get_attribute('data-star'))
-                date = datetime.strptime(date_raw, "%Y.%m.%d").strftime("%Y-%m-%d")
-
-                # DB 중복 체크 (concert, nickname, date, title 기준)
-                existed = Review.objects.filter(
-                    concert=concert,
-                    nickname=nickname,
-                    date=date,
-                    title=title
-                ).exists()
-                
-                # DB 저장
-                if not existed:
-                    new_review = Review.objects.create(
-                        concert=concert,
-                        nickname=nickname,
-                        date=date,
-                        view_count=view_count,
-                        like_count=like_count,
-                        title=title,
-                        description=description,
-                        star_rating=star_rating
-                    )
-                    print(f"[리뷰][DB 저장] Review: {new_review}")
-
-                    # create_or_update_review_in_sheet(new_review)
-                    # print(f"[리뷰][시트 저장] Review: {new_review}")
-
-            except Exception as e:
-                print(f"[리뷰] 처리 중 오류 발생: {e}")
-
-        # 페이지 이동
-        if page < review_num_pages:
+def go_to_next_review_page(driver, page):
+    """
+    리뷰 목록을 page에서 page + 1 페이지로 넘기고 목록이 새로 그려질 때까지 기다립니다.
+    10페이지마다 다음 그룹 버튼을 누릅니다. 이동하지 못하면 예외가 발생합니다.
+    """
+    previous_reviews = snapshot(driver, REVIEW_ITEM_LOCATOR)
+    if page % 10 == 0:
+        group_index = page // 10
+        if group_index > 2:
+            group_index = 2
+        try:
+            next_group_button = driver.find_element(By.XPATH, f'//*[@id="prdReview"]/div/div[3]/div[2]/a[{group_index}]')
+        except NoSuchElementException:
             try:
-                if page % 10 == 0:
-                    group_index = page // 10
-                    if group_index > 2:
-                        group_index = 2
-                    next_group_button = None
-                    try:
-                        next_group_button = driver.find_element(By.XPATH, f'//*[@id="prdReview"]/div/div[3]/div[2]/a[{group_index}]')
-                    except NoSuchElementException:
-                        try:
-                            next_group_button = driver.find_element(By.XPATH, f'//*[@id="prdReview"]/div/div[4]/div[2]/a[{group_index}]')
-                        except NoSuchElementException:
-                            print("[리뷰] 다음 그룹 버튼 찾을 수 없음")
-                            break
-                    if next_group_button:
-                        driver.execute_script("arguments[0].click();", next_group_button)
-                        time.sleep(2)
-                else:
-                    next_page_text = str(page + 1)
-                    next_page_button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.LINK_TEXT, next_page_text))
-                    )
-                    driver.execute_script("arguments[0].click();", next_page_button)
-                    time.sleep(2)
-            except Exception as e:
-                print(f"[리뷰] 페이지 이동 오류: {e}")
+                next_group_button = driver.find_element(By.XPATH, f'//*[@id="prdReview"]/div/div[4]/div[2]/a[{group_index}]')
+            except NoSuchElementException:
+                raise NoSuchElementException("다음 그룹 버튼 찾을 수 없음")
+        driver.execute_script("arguments[0].click();", next_group_button)
+        wait_for(driver, content_changed(REVIEW_ITEM_LOCATOR, previous_reviews), "review_page_group")
+    else:
+        next_page_text = str(page + 1)
+        next_page_button = WebDriverWait(driver, 5).until(
+            EC.element_to_be_clickable((By.LINK_TEXT, next_page_text))
+        )
+        driver.execute_script("arguments[0].click();", next_page_button)
+        wait_for(driver, content_changed(REVIEW_ITEM_LOCATOR, previous_reviews), "review_page")
+
+def crawl_concert_reviews(driver, concert, full_crawl=False, checkpoint=None, step=None):
+    """
+    1) 리뷰 크롤링
+    2) DB에 중복 없으면 저장
+    3) 시트에 없으면 append / 있으면 update
+    4) 끝나면 sync_reviews_sheet_to_db()로 시트→DB 동기화
+
+    증분 크롤링:
+    - 총 리뷰 수가 지난 크롤링(review_last_total)과 같으면 공연 전체를 건너뜀
+    - 지난 최신 리뷰(review_last_key)를 만나면 페이지 이동 중단
+    - 커서는 마지막 페이지 또는 지난 최신 리뷰까지 도달한 크롤링에서만 저장 (중간에 끊긴 크롤링이 남긴 구간을 다음에 다시 확인)
+    full_crawl=True이면 커서를 무시하고 모든 페이지를 처리합니다.
+
+    checkpoint(CrawlCheckpoint)를 주면 페이지를 저장할 때마다 진행 위치를 기록하고,
+    중단된 체크포인트라면 저장된 페이지까지는 리뷰를 읽지 않고 페이지만 넘깁니다.
+    끝까지 완료하면 체크포인트를 완료로 표시합니다.
+
+    step(공연 단위 StepTimer)을 주면 페이지마다 하위 단계(소요 시간, 저장/중복 건수, 오류)를 기록합니다.
+
+    추출한 페이지는 WriterPipeline의 writer 스레드가 정규화/저장하고, 그동안 브라우저는 다음 페이지로 이동합니다.
+    (이미 수집한 구간 도달은 저장이 끝난 페이지 기준으로 판단하므로 최대 큐 크기만큼 페이지를 더 읽을 수 있음)
+    """
+    if step is None:
+        step = StepTimer(None, CrawlStep.KIND_CONCERT, concert)
+
+    # 관람후기 탭 열기 및 총 개수 파악
+    review_total_count = open_review_tab(driver, concert)
+    if review_total_count is None:
+        return
+
+    writer = ReviewWriter(concert)
+    if not full_crawl and writer.is_unchanged(review_total_count):
+        print(f"[리뷰] 총 리뷰 수({review_total_count}) 변화 없음 -> 크롤링 건너뜀")
+        if checkpoint is not None:
+            checkpoint.finish()
+        return
+
+    review_num_pages = (review_total_count + 14) // 15
+    start_page = resume_review_page(writer, checkpoint)
+    completed = True
+
+    with WriterPipeline(f"review-writer-{concert.pk}") as pipeline:
+        for page in range(1, review_num_pages + 1):
+            # 페이지 단계: 리뷰 추출 + 다음 페이지로 이동 + 저장 완료까지
+            # (단계 종료도 writer 스레드에서 저장 작업 다음 순서로 실행되어 저장/중복 건수가 반영됨)
+            page_step = step.child(CrawlStep.KIND_REVIEW_PAGE, f"{page} 페이지")
+            if page < start_page:
+                # 체크포인트까지 저장된 페이지는 읽지 않고 넘기기만 함
+                print(f"[리뷰] {page}/{review_num_pages} 페이지 저장 완료 -> 건너뜀")
+            else:
+                print(f"[리뷰] {page}/{review_num_pages} 페이지 처리 중")
+                pipeline.submit(
+                    store_review_page, writer, page, extract_review_page(driver), full_crawl, checkpoint, page_step
+                )
+
+            # 저장이 끝난 페이지에서 이미 수집한 구간에 도달했으면 중단
+            if pipeline.stop_requested:
+                pipeline.submit(page_step.finish)
                 break
 
+            # 페이지 이동 (이전 페이지 저장과 동시에 진행)
+            if page < review_num_pages:
+                try:
+                    go_to_next_review_page(driver, page)
+                except Exception as e:
+                    print(f"[리뷰] 페이지 이동 오류: {e}")
+                    pipeline.submit(page_step.finish, error=e)
+                    completed = False
+                    break
+
+            pipeline.submit(page_step.finish)
+
+    # 중간에 페이지 이동이 실패했다면 다음 크롤링에서 다시 확인하도록 커서를 갱신하지 않음
+    if completed and review_total_count > 0:
+        writer.save_cursor(review_total_count)
+        print(f"[리뷰] 커서 저장: 총 {review_total_count}개, 최신 리뷰 {writer.newest_key}")
+    if completed and checkpoint is not None:
+        checkpoint.finish()
+
     # sync_reviews_sheet_to_db()
     # print("[리뷰] 시트 전체 → DB 동기화 완료")
 
-def crawl_concert_seats(driver, concert):
+def crawl_concert_seats(driver, concert, checkpoint=None, step=None):
     """
-    1) 좌석 정보 크롤링
-    2) DB에 저장
+    1) 좌석 정보 크롤링 (SeatCalendarWalker로 한 번 로드한 달력을 월/날짜/회차 순으로 순회)
+    2) 날짜 하나의 모든 회차를 모아 지난 상태와 달라진 좌석만 DB에 일괄 저장 (한 번의 크롤링은 동일한 created_at)
     3) 시트에 저장
     4) 마지막에 시트 전체 → DB 동기화
-    """
-    while True:
-        current_month = driver.find_element(By.XPATH, '//li[@data-view="month current"]').text
-        print(f"[좌석] 현재 달: {current_month}")
 
-        days = driver.find_elements(By.XPATH, '//ul[@data-view="days"]/li[not(contains(@class, "disabled")) and not(contains(@class, "muted"))]')
-        print(f"[좌석] 활성화된 날짜 수: {len(days)}")
+    checkpoint(CrawlCheckpoint)를 주면 날짜를 저장할 때마다 진행 위치를 기록하고,
+    중단된 체크포인트라면 저장된 날짜 다음부터, 처음 시작한 시각(started_at)을 created_at으로 이어서 진행합니다.
 
-        for day in days:
-            day_num = day.text
+    step(공연 단위 StepTimer)을 주면 달력 월마다 하위 단계(소요 시간, 저장 건수, stale 재시도)를 기록합니다.
 
-            try:
-                WebDriverWait(driver, 10).until(EC.element_to_be_clickable(day))
-                driver.execute_script("arguments[0].click();", day)
-                print(f"[좌석] 날짜 클릭: {current_month}-{day_num}")
-            except Exception as e:
-                print(f"[좌석] 날짜 클릭 실패: {e}")
-                continue
-
-            time.sleep(2)
-
-            # 회차별
-            rounds = driver.find_elements(By.CLASS_NAME, 'timeTableLabel')
-            for round_element in rounds:
-                round_text = round_element.get_attribute('data-text').split()
-                round_name = round_text[0]
-                round_time_str = round_text[1] if len(round_text) > 1 else ""
+    회차별 행 추가와 날짜 단위 저장은 WriterPipeline의 writer 스레드에서 실행하고, 그동안 브라우저는 다음 회차를 읽습니다.
 
-                try:
-                    driver.execute_script("arguments[0].click();", round_element)
-                except Exception as e:
-                    print(f"[좌석] 회차 클릭 실패: {e}")
-                    continue
-                time.sleep(2)
-
-                seats = driver.find_elements(By.CLASS_NAME, 'seatTableItem')
-                for seat_el in seats:
-                    seat_class = seat_el.find_element(By.CLASS_NAME, 'seatTableName').text
-                    count_text = seat_el.find_element(By.CLASS_NAME, 'seatTableStatus').text
-                    try:
-                        seat_count = int(''.join(filter(str.isdigit, count_text)))
-                    except ValueError:
-                        seat_count = 0
-
-                    # 배우 정보
-                    try:
-                        actors_element = driver.find_element(By.XPATH, '//*[@id="productSide"]/div/div[1]/div[3]/div[2]/div/p')
-                        actors = actors_element.text
-                    except NoSuchElementException:
-                        actors = ""
-
-                    # 날짜 정보 처리
-                    date_parts = current_month.split('.')  # 예: ["2025","01"]
-                    year = int(date_parts[0])
-                    month = int(date_parts[1])
-                    day_num_int = int(day_num)
-
-                    # 요일 계산
-                    KOREAN_DAYS = ['월', '화', '수', '목', '금', '토', '일']
-                    def get_korean_day_of_week(y, m, d):
-                        try:
-                            dt_obj = datetime(y, m, d)
-                            return KOREAN_DAYS[dt_obj.weekday()]
-                        except:
-                            return ''
-                    day_str = get_korean_day_of_week(year, month, day_num_int)
-
-                    new_seat = Seat.objects.create(
-                        concert=concert,
-                        year=year,
-                        month=month,
-                        day_num=day_num_int,
-                        day_str=day_str,
-                        round_name=round_name,
-                        round_time=round_time_str,
-                        seat_class=seat_class,
-                        seat_count=seat_count,
-                        actors=actors
-                    )
-                    print(f"[좌석][DB 저장] {new_seat}")
-
-                    # 시트에 저장
-                    # create_or_update_seat_in_sheet(new_seat)
-                    # print(f"[좌석][시트 저장] {new_seat}")
-
-            # 날짜 처리 후 뒤로가기
-            driver.back()
-            time.sleep(2)
-
-        # 다음 달 버튼
+    SEAT_CRAWL_MODE가 'network'이면 화면 대신 좌석 API 응답(JSON)에서 회차/잔여석을 읽습니다. (calendars.NetworkSeatCalendarWalker)
+    """
+    if step is None:
+        step = StepTimer(None, CrawlStep.KIND_CONCERT, concert)
+    resume_after = None
+    created_at = None
+    if checkpoint is not None:
+        created_at = checkpoint.started_at
+        if checkpoint.day_num:
+            resume_after = (checkpoint.year, checkpoint.month, checkpoint.day_num)
+            print(f"[좌석] 체크포인트: {checkpoint.year}.{checkpoint.month:02d}-{checkpoint.day_num}까지 저장됨 -> 이어서 진행")
+
+    writer = SeatSnapshotWriter(concert, created_at=created_at)
+    walker = seat_calendar_walker(driver, resume_after=resume_after)
+    current_day = None
+    last_round = None
+    month_step = step.child(CrawlStep.KIND_SEAT_MONTH)
+    retries_seen = 0
+
+    # writer 스레드에서 실행하는 작업 (month_step은 생산자 쪽에서 바뀌므로 인자로 전달)
+    def add_round(round_seats, month_step):
+        for seat_class, seat_count in round_seats["seats"]:
+            added = writer.add(
+                year=round_seats["year"],
+                month=round_seats["month"],
+                day_num=round_seats["day_num"],
+                round_name=round_seats["round_name"],
+                round_time=round_seats["round_time"],
+                seat_class=seat_class,
+                seat_count=seat_count,
+                actors=round_seats["actors"]
+            )
+            if not added:
+                month_step.skipped += 1
+
+    def flush_day(day, last_round, month_step):
+        # 날짜 단위로 저장하고 체크포인트 기록
+        # (오류로 중단된 날짜는 저장하지 않고 다음 실행에서 그 날짜부터 다시 수집)
+        saved_count = writer.flush()
+        month_step.inserted += saved_count
+        print(f"[좌석][DB 저장] {concert} {day[0]}.{day[1]:02d}-{day[2]} 변경된 좌석 {saved_count}건 저장 (수집 시각: {writer.created_at})")
+        if checkpoint is not None:
+            checkpoint.save_seat_day(*day, last_key=f"{last_round['round_name']}|{last_round['round_time']}")
+
+    def finish_month(pipeline, error=None):
+        # 달력 월 단계 기록 (날짜 클릭 stale 재시도 횟수 포함)
+        nonlocal retries_seen
+        if not month_step.label and error is None:
+            return  # 수집한 회차가 없는 경우
+        month_step.retries += walker.retry_count - retries_seen
+        retries_seen = walker.retry_count
         try:
-            next_month_btn = driver.find_element(By.XPATH, '//li[@data-view="month next" and not(contains(@class, "disabled"))]')
-            driver.execute_script("arguments[0].click();", next_month_btn)
-            time.sleep(2)
-        except NoSuchElementException:
-            print("[좌석] 더 이상 다음 달 없음 -> 종료")
-            break
+            pipeline.submit(month_step.finish, error=error)
+        except Exception:
+            # writer 스레드가 이미 실패한 경우 바로 기록
+            month_step.finish(error=error)
+
+    with WriterPipeline(f"seat-writer-{concert.pk}") as pipeline:
+        try:
+            for round_seats in walker.walk():
+                day = (round_seats["year"], round_seats["month"], round_seats["day_num"])
+                if current_day is not None and day != current_day:
+                    pipeline.submit(flush_day, current_day, last_round, month_step)
+                    if day[:2] != current_day[:2]:
+                        finish_month(pipeline)
+                        month_step = step.child(CrawlStep.KIND_SEAT_MONTH)
+                month_step.label = f"{round_seats['year']}.{round_seats['month']:02d}"
+                current_day = day
+                last_round = round_seats
+
+                pipeline.submit(add_round, round_seats, month_step)
+                print(
+                    f"[좌석] {round_seats['year']}.{round_seats['month']:02d}-{round_seats['day_num']} "
+                    f"{round_seats['round_name']} 좌석 {len(round_seats['seats'])}건 수집"
+                )
+
+            if current_day is not None:
+                pipeline.submit(flush_day, current_day, last_round, month_step)
+        except Exception as e:
+            finish_month(pipeline, error=e)
+            raise
+        finish_month(pipeline)
+    print(f"[좌석][DB 저장] {concert} 변경된 좌석 총 {writer.created_count}건 저장 (변경 없음 {writer.unchanged_count}건)")
+    if checkpoint is not None:
+        checkpoint.finish()
 
     # 마지막에 시트 전체 → DB 동기화
     # sync_seats_sheet_to_db()
-    # print("[좌석] 시트 전체 → DB 동기화 완료")
\ No newline at end of file
+    # print("[좌석] 시트 전체 → DB 동기화 완료")
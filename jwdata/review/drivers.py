@@ -0,0 +1,321 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+from django.conf import settings
+
+from .captures import clear_performance_log, performance_logging_enabled
+from .waits import wait_for, element_absent
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+HOME_URL = "https://tickets.interpark.com/"
+POPUP_LOCATOR = (By.XPATH, '//*[@id="popup-prdGuide"]')
+POPUP_CLOSE_XPATH = '//*[@id="popup-prdGuide"]/div/div[3]/button'
+
+
+# 브라우저 프로필
+# - full: 기본 headless Chrome (모든 리소스 로드)
+# - lean: 크롤러가 쓰지 않는 이미지/폰트/미디어와 추적 스크립트를 차단하고 작은 창, 확장 프로그램 비활성화
+BROWSER_PROFILES = ("full", "lean")
+
+# 차단할 리소스 종류별 URL 패턴 (Network.setBlockedURLs 와일드카드)
+RESOURCE_TYPE_URL_PATTERNS = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*"),
+    "font": ("*.woff*", "*.ttf*", "*.otf*", "*.eot*"),
+    "media": ("*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*"),
+}
+
+
+def browser_profile(profile=None):
+    """브라우저 프로필 이름. profile을 주지 않으면 CRAWL_BROWSER_PROFILE 설정을 사용합니다."""
+    profile = profile or settings.CRAWL_BROWSER_PROFILE
+    if profile not in BROWSER_PROFILES:
+        raise ValueError(f"알 수 없는 브라우저 프로필: {profile} (사용 가능: {', '.join(BROWSER_PROFILES)})")
+    return profile
+
+
+def blocked_url_patterns():
+    """lean 프로필에서 차단할 URL 패턴 (CRAWL_BLOCKED_RESOURCE_TYPES + CRAWL_BLOCKED_URL_PATTERNS)."""
+    patterns = []
+    for resource_type in settings.CRAWL_BLOCKED_RESOURCE_TYPES:
+        patterns.extend(RESOURCE_TYPE_URL_PATTERNS.get(resource_type.lower(), ()))
+    patterns.extend(settings.CRAWL_BLOCKED_URL_PATTERNS)
+    return patterns
+
+
+def build_chrome_options(profile=None):
+    """headless 크롤링용 Chrome 옵션."""
+    profile = browser_profile(profile)
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')         # 화면 없이 동작
+    chrome_options.add_argument('--no-sandbox')        # 리눅스 환경에서 권한 문제 방지
+    chrome_options.add_argument('--disable-dev-shm-usage') # /dev/shm 사용 비활성화(메모리 부족 문제 회피)
+    chrome_options.add_argument('--disable-gpu')       # GPU 비활성화 (일부 환경에서 필요)
+    if performance_logging_enabled():
+        # 좌석 API 응답 캡처용 네트워크 이벤트 로그 (SEAT_CRAWL_MODE='network')
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    if profile == "full":
+        chrome_options.add_argument('--window-size=1920,1080') # 넉넉한 가상 화면 크기 지정
+        return chrome_options
+
+    chrome_options.add_argument(f'--window-size={settings.CRAWL_WINDOW_SIZE}') # 작은 창 (렌더링 메모리 절약)
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-notifications')
+    chrome_options.add_argument('--mute-audio')
+    if "image" in [resource_type.lower() for resource_type in settings.CRAWL_BLOCKED_RESOURCE_TYPES]:
+        # <img>, CSS 배경 이미지를 디코딩하지 않도록 이미지 로드 자체를 끔
+        chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+    return chrome_options
+
+
+def apply_resource_blocking(driver, profile=None):
+    """lean 프로필이면 DevTools(Network.setBlockedURLs)로 차단 패턴에 맞는 요청을 보내지 않게 합니다."""
+    if browser_profile(profile) != "lean":
+        return
+    patterns = blocked_url_patterns()
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except WebDriverException as e:
+        logger.warning(f"[driver] 리소스 차단 설정 실패 (무시): {e}")
+
+
+def get_chrome_driver(headless=False, profile=None):
+    """
+    Chrome 드라이버를 반환하는 함수.
+    headless=True이면 크론 실행 환경(백그라운드)에서 UI 없는 크롤링을 가능하게 함.
+    profile(기본 CRAWL_BROWSER_PROFILE)이 'lean'이면 이미지/폰트/미디어/추적 스크립트를 차단합니다.
+    """
+    if headless:
+        driver = webdriver.Chrome(options=build_chrome_options(profile))
+        apply_resource_blocking(driver, profile)
+        return driver
+
+    return webdriver.Chrome()
+
+
+def close_guide_popup(driver):
+    """예매 안내 팝업이 떠 있으면 닫습니다. 닫았으면 True를 반환합니다."""
+    try:
+        popup_close_button = driver.find_element(By.XPATH, POPUP_CLOSE_XPATH)
+    except NoSuchElementException:
+        return False
+
+    driver.execute_script("arguments[0].click();", popup_close_button)
+    wait_for(driver, element_absent(POPUP_LOCATOR), "popup_close")
+    return True
+
+
+def set_driver_timeouts(driver, timeout):
+    """페이지 로딩/스크립트 실행 타임아웃(초)을 설정합니다."""
+    driver.set_page_load_timeout(timeout)
+    driver.set_script_timeout(timeout)
+
+
+class DriverSession:
+    """풀에서 관리하는 브라우저 세션 하나. 쿠키와 로컬 저장소가 사용 사이에 유지됩니다."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+    def is_healthy(self):
+        """브라우저가 살아 있고 명령에 응답하는지 확인합니다."""
+        try:
+            return self.driver.execute_script("return 1") == 1 and bool(self.driver.window_handles)
+        except WebDriverException:
+            return False
+
+    def reset_windows(self):
+        """이전 작업에서 열린 추가 창(탭)을 닫고 첫 번째 창으로 돌아갑니다."""
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class DriverPool:
+    """
+    미리 띄워 둔(warm) headless Chrome 세션을 빌려주는 풀.
+    - 세션은 사용 후 닫지 않고 반납되어 다음 작업에서 재사용 (쿠키, 닫힌 안내 팝업 상태 유지)
+    - 빌려줄 때마다 상태를 확인하여 응답하지 않는 세션은 새로 띄운 세션으로 교체
+    - max_uses번 사용한 세션은 메모리 누적을 막기 위해 교체
+    """
+
+    def __init__(self, size=None, page_load_timeout=None, max_uses=None):
+        self.size = size or settings.CRAWL_POOL_SIZE
+        self.page_load_timeout = page_load_timeout or settings.CRAWL_WORKER_TIMEOUT
+        self.max_uses = max_uses or settings.DRIVER_POOL_MAX_USES
+        # 반납된 세션 (마지막에 반납된 세션부터 빌려줌) / 띄운 세션 수. 둘 다 _available로 보호
+        self._idle = []
+        self._created = 0
+        # 세션이 반납되거나 폐기되어 빌릴 수 있게 되면 기다리는 acquire()를 깨움
+        self._available = threading.Condition()
+
+    def _create_session(self):
+        driver = get_chrome_driver(headless=True)
+        set_driver_timeouts(driver, self.page_load_timeout)
+        session = DriverSession(driver)
+
+        # 홈 페이지를 한 번 열어 쿠키를 받고, 안내 팝업을 미리 닫아 둠
+        try:
+            driver.get(HOME_URL)
+            close_guide_popup(driver)
+        except WebDriverException as e:
+            logger.warning(f"[driver_pool] 세션 예열 중 오류 (무시): {e}")
+
+        logger.info(f"[driver_pool] 새 세션 생성 ({self._created}/{self.size})")
+        return session
+
+    def _forget(self):
+        """띄운 세션 수를 하나 줄이고, 새 세션을 띄울 자리가 났다고 기다리는 acquire()에 알립니다."""
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    def _discard(self, session):
+        session.quit()
+        self._forget()
+
+    def warm_up(self, count=None):
+        """count개(기본 풀 크기)까지 세션을 미리 띄워 둡니다."""
+        count = min(count or self.size, self.size)
+        while True:
+            with self._available:
+                if self._created >= count:
+                    break
+                self._created += 1
+            try:
+                session = self._create_session()
+            except Exception:
+                self._forget()
+                raise
+            with self._available:
+                self._idle.append(session)
+                self._available.notify()
+
+    def _take(self, deadline):
+        """
+        반납된 세션을 꺼내거나(세션 반환), 새로 띄울 자리를 예약합니다(None 반환).
+        둘 다 안 되면 반납/폐기될 때까지 기다리며, deadline이 지나면 queue.Empty가 발생합니다.
+        """
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise queue.Empty
+                self._available.wait(remaining)
+
+    def acquire(self, timeout=None):
+        """
+        세션을 하나 빌립니다. 남는 세션이 없고 풀이 가득 차 있으면 반납(또는 폐기)될 때까지 기다립니다.
+        timeout(기본 DRIVER_POOL_ACQUIRE_TIMEOUT) 안에 빌리지 못하면 queue.Empty가 발생합니다.
+        """
+        if timeout is None:
+            timeout = settings.DRIVER_POOL_ACQUIRE_TIMEOUT
+        deadline = time.monotonic() + timeout
+
+        while True:
+            session = self._take(deadline)
+            if session is None:
+                try:
+                    session = self._create_session()
+                except Exception:
+                    self._forget()
+                    raise
+
+            if session.is_healthy():
+                session.uses += 1
+                return session
+
+            logger.warning("[driver_pool] 응답하지 않는 세션을 폐기하고 새로 띄웁니다.")
+            self._discard(session)
+
+    def release(self, session, broken=False):
+        """세션을 반납합니다. broken이거나 사용 횟수를 다 쓴 세션은 종료합니다."""
+        if not broken and session.uses < self.max_uses:
+            try:
+                session.reset_windows()
+                clear_performance_log(session.driver)
+            except WebDriverException:
+                pass
+            else:
+                with self._available:
+                    self._idle.append(session)
+                    self._available.notify()
+                return
+        self._discard(session)
+
+    @contextmanager
+    def session(self, page_load_timeout=None):
+        """
+        with 블록 동안 드라이버를 빌려주는 컨텍스트 매니저. 블록에서 WebDriver 오류가 나면 세션을 폐기합니다.
+        page_load_timeout(초)을 주면 블록 동안만 그 타임아웃을 쓰고, 반납하기 전에 풀 기본값으로 되돌립니다.
+        (다음에 빌리는 작업이 바뀐 타임아웃을 물려받지 않도록)
+        """
+        session = self.acquire()
+        broken = False
+        try:
+            if page_load_timeout:
+                set_driver_timeouts(session.driver, page_load_timeout)
+            yield session.driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            if page_load_timeout and not broken:
+                try:
+                    set_driver_timeouts(session.driver, self.page_load_timeout)
+                except WebDriverException:
+                    broken = True
+            self.release(session, broken=broken)
+
+    def shutdown(self):
+        """대기 중인 모든 세션을 종료합니다."""
+        with self._available:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._discard(session)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """프로세스 전역 드라이버 풀. 스케줄러/웹 서버처럼 오래 사는 프로세스에서 세션이 재사용됩니다."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -0,0 +1,101 @@
+import json
+import logging
+
+from django.conf import settings
+
+from .parsers import (
+    REVIEW_FIELDS,
+    REVIEW_ITEM_XPATH,
+    SEAT_ACTORS_XPATH,
+    SEAT_FIELDS,
+    SEAT_ITEM_XPATH,
+    parse_seat_count,
+)
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+EXTRACTION_MODES = ("script", "element")
+
+# 페이지의 항목 전체를 브라우저 안에서 한 번에 읽어 JSON 문자열로 반환하는 스크립트
+# arguments: [항목 XPath, [[키, 항목 기준 XPath, 속성명 또는 null], ...], 추가로 읽을 텍스트 XPath 또는 null]
+# 반환: '{"rows": [{키: 값, ...}, ...], "text": "..."}' (찾지 못한 필드는 null)
+EXTRACT_ROWS_SCRIPT = """
+const [itemXpath, fields, textXpath] = arguments;
+const first = (xpath, context) => document.evaluate(
+    xpath, context, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+const items = document.evaluate(itemXpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const rows = [];
+for (let i = 0; i < items.snapshotLength; i++) {
+    const item = items.snapshotItem(i);
+    const row = {};
+    for (const [key, xpath, attribute] of fields) {
+        const node = first(xpath, item);
+        if (node === null) {
+            row[key] = null;
+        } else if (attribute) {
+            row[key] = node.getAttribute(attribute);
+        } else {
+            row[key] = node.innerText.trim();
+        }
+    }
+    rows.push(row);
+}
+const textNode = textXpath ? first(textXpath, document) : null;
+return JSON.stringify({rows: rows, text: textNode === null ? "" : textNode.innerText.trim()});
+"""
+
+
+def extraction_mode(mode=None):
+    """추출 방식. mode를 주지 않으면 CRAWL_EXTRACTION_MODE 설정을 사용합니다."""
+    mode = mode or settings.CRAWL_EXTRACTION_MODE
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"알 수 없는 추출 방식: {mode} (사용 가능: {', '.join(EXTRACTION_MODES)})")
+    return mode
+
+
+def run_extraction(driver, item_xpath, fields, text_xpath=None):
+    """
+    EXTRACT_ROWS_SCRIPT를 한 번 실행해 (rows, text)를 반환합니다.
+    텍스트 필드가 없는 항목은 로그만 남기고 제외합니다. (속성 필드는 None 허용)
+    결과 형식이 잘못되면 ValueError가 발생합니다.
+    """
+    payload = driver.execute_script(
+        EXTRACT_ROWS_SCRIPT,
+        item_xpath,
+        [list(field) for field in fields],
+        text_xpath,
+    )
+    try:
+        result = json.loads(payload)
+    except (TypeError, ValueError):
+        raise ValueError(f"추출 스크립트 결과가 JSON이 아님: {payload!r:.100}")
+    if not isinstance(result, dict) or not isinstance(result.get("rows"), list):
+        raise ValueError(f"추출 스크립트 결과 형식 오류: {payload!r:.100}")
+
+    text_keys = [key for key, _, attribute in fields if attribute is None]
+    attribute_keys = [key for key, _, attribute in fields if attribute is not None]
+    rows = []
+    for index, row in enumerate(result["rows"]):
+        if not isinstance(row, dict):
+            logger.warning(f"[추출] {index + 1}번째 항목 형식 오류: {row!r:.100}")
+            continue
+        missing = [key for key in text_keys if not isinstance(row.get(key), str)]
+        if missing:
+            logger.warning(f"[추출] {index + 1}번째 항목 필드 없음: {', '.join(missing)}")
+            continue
+        rows.append({key: row.get(key) for key in text_keys + attribute_keys})
+    return rows, result.get("text") or ""
+
+
+def extract_review_rows(driver):
+    """현재 리뷰 목록 페이지의 리뷰 원본 필드 목록을 스크립트 한 번으로 추출합니다."""
+    rows, _ = run_extraction(driver, REVIEW_ITEM_XPATH, REVIEW_FIELDS)
+    return rows
+
+
+def extract_seat_round(driver):
+    """현재 선택된 회차의 (배우 문자열, [(seat_class, seat_count), ...])를 스크립트 한 번으로 추출합니다."""
+    rows, actors = run_extraction(driver, SEAT_ITEM_XPATH, SEAT_FIELDS, SEAT_ACTORS_XPATH)
+    return actors, [(row["seat_class"], parse_seat_count(row["status"])) for row in rows]
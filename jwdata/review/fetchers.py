@@ -0,0 +1,116 @@
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from django.conf import settings
+
+from .crawls import resume_review_page, store_review_page
+from .models import CrawlStep
+from .telemetry import StepTimer
+from .parsers import parse_review_items, parse_review_total
+from .writers import ReviewWriter
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 스레드별 HTTP 세션 (세션 안에서 커넥션 풀을 재사용)
+_local = threading.local()
+
+
+class HttpCrawlError(Exception):
+    """HTTP 리뷰 크롤링이 불가능한 경우. 호출하는 쪽에서 Selenium 크롤링으로 대체합니다."""
+
+
+def get_http_session():
+    """
+    현재 스레드의 requests 세션을 반환합니다.
+    세션은 keep-alive 커넥션 풀(REVIEW_HTTP_POOL_SIZE)과 5xx 재시도 설정을 가지고 스레드마다 한 번만 만들어집니다.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+        adapter = HTTPAdapter(
+            pool_connections=settings.REVIEW_HTTP_POOL_SIZE,
+            pool_maxsize=settings.REVIEW_HTTP_POOL_SIZE,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": settings.REVIEW_HTTP_USER_AGENT})
+        _local.session = session
+    return session
+
+
+def review_page_url(concert, page):
+    """REVIEW_HTTP_PAGE_URL 템플릿({url}, {page})으로 공연의 리뷰 목록 페이지 URL을 만듭니다."""
+    return settings.REVIEW_HTTP_PAGE_URL.format(url=concert.crawling_url, page=page)
+
+
+def fetch_review_page(session, concert, page):
+    url = review_page_url(concert, page)
+    try:
+        response = session.get(url, timeout=settings.REVIEW_HTTP_TIMEOUT)
+    except requests.RequestException as e:
+        raise HttpCrawlError(f"{url} 요청 실패: {e}") from e
+
+    if response.status_code != 200:
+        raise HttpCrawlError(f"{url} 응답 코드 {response.status_code}")
+    return response.text
+
+
+def crawl_concert_reviews_http(concert, full_crawl=False, session=None, checkpoint=None, step=None):
+    """
+    브라우저 없이 HTTP 요청과 lxml 파싱으로 리뷰를 수집합니다.
+    crawl_concert_reviews와 같은 필드, 같은 중복 기준, 같은 증분 커서를 사용합니다.
+    checkpoint를 주면 crawl_concert_reviews와 같이 저장된 페이지 다음부터 이어서 진행하고,
+    step을 주면 페이지마다 하위 단계를 기록합니다.
+    첫 페이지에서 리뷰 목록 구조를 찾지 못하면 HttpCrawlError를 발생시킵니다.
+    """
+    if not concert.crawling_url:
+        raise HttpCrawlError(f"[{concert}] crawling_url 없음")
+
+    session = session or get_http_session()
+    if step is None:
+        step = StepTimer(None, CrawlStep.KIND_CONCERT, concert)
+
+    html = fetch_review_page(session, concert, 1)
+    review_total_count = parse_review_total(html)
+    if review_total_count is None:
+        raise HttpCrawlError(f"[{concert}] 리뷰 총 개수를 찾을 수 없음")
+
+    writer = ReviewWriter(concert)
+    if not full_crawl and writer.is_unchanged(review_total_count):
+        logger.info(f"[리뷰][HTTP] [{concert}] 총 리뷰 수({review_total_count}) 변화 없음 -> 크롤링 건너뜀")
+        if checkpoint is not None:
+            checkpoint.finish()
+        return writer.created_count
+
+    review_num_pages = (review_total_count + 14) // 15
+    start_page = resume_review_page(writer, checkpoint)
+    for page in range(start_page, review_num_pages + 1):
+        page_step = step.child(CrawlStep.KIND_REVIEW_PAGE, f"{page} 페이지")
+        try:
+            if page > 1:
+                html = fetch_review_page(session, concert, page)
+            logger.info(f"[리뷰][HTTP] [{concert}] {page}/{review_num_pages} 페이지 처리 중")
+
+            stop = store_review_page(writer, page, parse_review_items(html), full_crawl, checkpoint, page_step)
+        except Exception as e:
+            page_step.finish(error=e)
+            raise
+        page_step.finish()
+        if stop:
+            break
+
+    # 페이지 요청이 실패하면 HttpCrawlError로 빠져나가므로 여기까지 오면 완료된 크롤링
+    if review_total_count > 0:
+        writer.save_cursor(review_total_count)
+    if checkpoint is not None:
+        checkpoint.finish()
+
+    logger.info(f"[리뷰][HTTP] [{concert}] 신규 리뷰 {writer.created_count}개 저장")
+    return writer.created_count
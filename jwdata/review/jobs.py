@@ -0,0 +1,240 @@
+from contextlib import contextmanager
+from datetime import timedelta
+import logging
+import os
+import socket
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+
+from .models import CrawlJob
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+def default_worker_name():
+    """호스트명:프로세스 id (여러 워커 프로세스를 구분)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_job(concert, kind, source=CrawlJob.SOURCE_MANUAL, priority=0, max_attempts=None):
+    """
+    크롤링 작업을 등록하고 (job, created)를 반환합니다.
+    같은 공연/종류의 대기·실행 중인 작업이 이미 있으면 새로 만들지 않고 그 작업을 반환합니다.
+    (대기 중인 작업은 우선순위만 더 높은 값으로 올림)
+    """
+    if max_attempts is None:
+        max_attempts = settings.CRAWL_JOB_MAX_ATTEMPTS
+    active = CrawlJob.objects.filter(concert=concert, kind=kind, status__in=CrawlJob.ACTIVE_STATUSES)
+    job = active.first()
+    if job is None:
+        try:
+            with transaction.atomic():
+                return CrawlJob.objects.create(
+                    concert=concert,
+                    kind=kind,
+                    source=source,
+                    priority=priority,
+                    max_attempts=max_attempts,
+                ), True
+        except IntegrityError:
+            # 다른 프로세스가 동시에 등록함
+            job = active.get()
+    if job.status == CrawlJob.STATUS_PENDING and priority > job.priority:
+        active.filter(pk=job.pk, status=CrawlJob.STATUS_PENDING).update(priority=priority)
+        job.priority = priority
+    return job, False
+
+
+def enqueue_jobs(concerts, kind, source=CrawlJob.SOURCE_MANUAL, priorities=None):
+    """
+    여러 공연의 작업을 등록하고 새로 등록한 작업 수를 반환합니다.
+    priorities: {concert_id: 우선순위} (스케줄러 점수)
+    """
+    priorities = priorities or {}
+    created_count = 0
+    for concert in concerts:
+        _, created = enqueue_job(concert, kind, source=source, priority=priorities.get(concert.id, 0))
+        created_count += created
+    return created_count
+
+
+def expire_jobs(at=None):
+    """임대가 만료된 실행 중 작업 중 최대 시도 횟수에 도달한 작업을 실패로 처리합니다. (나머지는 claim_job이 다시 가져감)"""
+    at = at or now()
+    expired = CrawlJob.objects.filter(
+        status=CrawlJob.STATUS_RUNNING,
+        lease_expires_at__lt=at,
+        attempts__gte=F("max_attempts"),
+    ).update(
+        status=CrawlJob.STATUS_FAILED,
+        finished_at=at,
+        error="하트비트 중단 (임대 만료)",
+    )
+    if expired:
+        logger.warning(f"[jobs] 임대가 만료되어 실패 처리한 작업 {expired}개")
+    return expired
+
+
+def claim_job(worker, kinds=None, lease_seconds=None, at=None):
+    """
+    실행할 작업 하나를 임대하여 반환합니다. 없으면 None.
+    대기 중이고 실행 가능 시각이 지난 작업, 또는 임대가 만료된(워커가 죽은) 실행 중 작업을 우선순위 순으로 가져옵니다.
+    여러 프로세스가 동시에 호출해도 (상태, 시도 횟수)가 그대로인 경우에만 갱신하므로 한 작업은 한 워커만 가져갑니다.
+    """
+    if lease_seconds is None:
+        lease_seconds = settings.CRAWL_JOB_LEASE_SECONDS
+    at = at or now()
+    expire_jobs(at)
+
+    candidates = CrawlJob.objects.filter(
+        Q(status=CrawlJob.STATUS_PENDING, available_at__lte=at)
+        | Q(status=CrawlJob.STATUS_RUNNING, lease_expires_at__lt=at)
+    )
+    if kinds:
+        candidates = candidates.filter(kind__in=kinds)
+
+    for job in candidates.order_by("-priority", "available_at", "id")[:10]:
+        if _claim(job, worker, lease_seconds, at):
+            if job.status == CrawlJob.STATUS_RUNNING:
+                logger.warning(f"[jobs] [{worker}] 임대가 만료된 작업을 다시 가져옴: {job} (이전 워커 {job.worker})")
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def _claim(job, worker, lease_seconds, at):
+    """(상태, 시도 횟수)가 읽었을 때 그대로인 경우에만 job을 임대합니다. 다른 워커가 먼저 가져갔으면 False."""
+    return bool(CrawlJob.objects.filter(pk=job.pk, status=job.status, attempts=job.attempts).update(
+        status=CrawlJob.STATUS_RUNNING,
+        worker=worker,
+        attempts=F("attempts") + 1,
+        lease_expires_at=at + timedelta(seconds=lease_seconds),
+        heartbeat_at=at,
+        started_at=at,
+    ))
+
+
+def claim_concert_job(concert, kind, worker, source=CrawlJob.SOURCE_MANUAL, lease_seconds=None, at=None):
+    """
+    직접 크롤링 경로(crawl_all_concerts_reviews 등)에서 공연 하나의 작업을 바로 임대하여 반환합니다.
+    대기 중인 작업이 있으면 그 작업을 가져오고, 없으면 재시도 없는 작업(max_attempts=1)을 새로 등록하여 임대합니다.
+    다른 워커가 임대 중(임대 만료 전)이면 None을 반환합니다. (같은 공연을 두 곳에서 동시에 크롤링하지 않도록)
+    """
+    if lease_seconds is None:
+        lease_seconds = settings.CRAWL_JOB_LEASE_SECONDS
+    at = at or now()
+    job, _ = enqueue_job(concert, kind, source=source, max_attempts=1)
+    if job.status == CrawlJob.STATUS_RUNNING and job.lease_expires_at and job.lease_expires_at >= at:
+        return None
+    if not _claim(job, worker, lease_seconds, at):
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def _owned(job):
+    """job을 임대한 워커가 아직 그 임대를 갖고 있는 경우의 queryset."""
+    return CrawlJob.objects.filter(pk=job.pk, status=CrawlJob.STATUS_RUNNING, worker=job.worker, attempts=job.attempts)
+
+
+def heartbeat(job, lease_seconds=None):
+    """임대를 연장합니다. 임대를 잃었으면(다른 워커가 가져감) False."""
+    if lease_seconds is None:
+        lease_seconds = settings.CRAWL_JOB_LEASE_SECONDS
+    at = now()
+    return bool(_owned(job).update(heartbeat_at=at, lease_expires_at=at + timedelta(seconds=lease_seconds)))
+
+
+def complete_job(job):
+    """완료로 표시합니다. 임대를 잃었으면 아무것도 바꾸지 않고 False."""
+    return bool(_owned(job).update(status=CrawlJob.STATUS_DONE, finished_at=now(), lease_expires_at=None, error=""))
+
+
+def fail_job(job, error):
+    """
+    실패를 기록합니다. 시도 횟수가 남아 있으면 CRAWL_JOB_RETRY_DELAY_SECONDS * 2^(시도 횟수 - 1)초 뒤에 다시 실행하도록
+    대기 상태로 되돌리고, 남아 있지 않으면 실패로 표시합니다. 임대를 잃었으면 아무것도 바꾸지 않고 False.
+    """
+    at = now()
+    if job.attempts < job.max_attempts:
+        delay = settings.CRAWL_JOB_RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+        fields = dict(status=CrawlJob.STATUS_PENDING, available_at=at + timedelta(seconds=delay))
+        logger.info(f"[jobs] {job} {delay}초 후 재시도")
+    else:
+        fields = dict(status=CrawlJob.STATUS_FAILED, finished_at=at)
+    return bool(_owned(job).update(lease_expires_at=None, error=str(error), **fields))
+
+
+def prune_jobs(days=None):
+    """보관 기간(기본 CRAWL_CHECKPOINT_RETENTION_DAYS일)이 지난 완료/실패 작업을 삭제합니다."""
+    if days is None:
+        days = settings.CRAWL_CHECKPOINT_RETENTION_DAYS
+    deleted, _ = CrawlJob.objects.filter(
+        status__in=(CrawlJob.STATUS_DONE, CrawlJob.STATUS_FAILED),
+        created_at__lt=now() - timedelta(days=days),
+    ).delete()
+    if deleted:
+        logger.info(f"[jobs] 오래된 크롤링 작업 {deleted}개 삭제")
+    return deleted
+
+
+@contextmanager
+def leased_concert_job(concert, kind, worker=None, source=CrawlJob.SOURCE_MANUAL):
+    """
+    with 블록(직접 크롤링) 동안 공연 하나의 작업을 임대하고 하트비트로 연장합니다.
+    다른 워커가 임대 중이면 None을 넘기며 블록에서 건너뛰어야 합니다.
+    블록이 끝나면 완료로, 예외가 나면 실패로 기록한 뒤 예외를 다시 발생시킵니다.
+    """
+    worker = worker or default_worker_name()
+    job = claim_concert_job(concert, kind, worker, source=source)
+    if job is None:
+        logger.info(f"[jobs] [{worker}] 다른 워커가 실행 중이어서 건너뜀: {concert} ({kind})")
+        yield None
+        return
+    try:
+        with Heartbeat(job):
+            yield job
+    except Exception as e:
+        fail_job(job, e)
+        raise
+    if not complete_job(job):
+        logger.warning(f"[jobs] [{worker}] 임대를 잃어 완료로 표시하지 못했습니다: {job}")
+
+
+class Heartbeat:
+    """
+    with 블록(작업 실행) 동안 CRAWL_JOB_HEARTBEAT_SECONDS초마다 임대를 연장하는 스레드.
+    임대를 잃으면 lost가 True가 됩니다. (실행 결과는 complete_job/fail_job에서 반영되지 않음)
+    """
+
+    def __init__(self, job, interval=None):
+        self.job = job
+        self.interval = settings.CRAWL_JOB_HEARTBEAT_SECONDS if interval is None else interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                if not heartbeat(self.job):
+                    self.lost = True
+                    logger.warning(f"[jobs] 작업 임대를 잃었습니다: {self.job}")
+                    break
+        finally:
+            # 스레드별 DB 커넥션 정리
+            connection.close()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{self.job.pk}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
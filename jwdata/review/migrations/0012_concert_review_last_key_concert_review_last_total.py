@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-19 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0011_concert_is_sentiment_enabled'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='concert',
+            name='review_last_key',
+            field=models.CharField(blank=True, max_length=500, null=True, verbose_name='마지막 크롤링 최신 리뷰 키'),
+        ),
+        migrations.AddField(
+            model_name='concert',
+            name='review_last_total',
+            field=models.IntegerField(blank=True, null=True, verbose_name='마지막 크롤링 리뷰 총 개수'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-19 00:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0012_concert_review_last_key_concert_review_last_total'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='concert',
+            name='product_code',
+            field=models.CharField(blank=True, max_length=50, null=True, verbose_name='상품 코드'),
+        ),
+        migrations.AddField(
+            model_name='concert',
+            name='product_url',
+            field=models.URLField(blank=True, help_text='사이트 검색으로 찾은 상세 페이지 URL을 저장하여 다음 크롤링부터 바로 접속합니다.', max_length=500, null=True, verbose_name='상품 상세 URL'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.2 on 2026-10-19 00:52
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0013_concert_product_code_concert_product_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('review', '리뷰'), ('seat', '좌석')], max_length=10, verbose_name='크롤링 종류')),
+                ('window_start', models.DateTimeField(help_text='같은 구간 안에서 완료된 공연은 다시 크롤링하지 않습니다.', verbose_name='스케줄 구간 시작 시각')),
+                ('status', models.CharField(choices=[('running', '진행 중'), ('done', '완료'), ('failed', '실패')], default='running', max_length=10, verbose_name='상태')),
+                ('page', models.IntegerField(blank=True, null=True, verbose_name='마지막 저장 페이지')),
+                ('year', models.IntegerField(blank=True, null=True, verbose_name='마지막 저장 연도')),
+                ('month', models.IntegerField(blank=True, null=True, verbose_name='마지막 저장 월')),
+                ('day_num', models.IntegerField(blank=True, null=True, verbose_name='마지막 저장 일')),
+                ('last_key', models.CharField(blank=True, max_length=500, null=True, verbose_name='마지막 저장 키')),
+                ('head_key', models.CharField(blank=True, max_length=500, null=True, verbose_name='이번 크롤링 최신 리뷰 키')),
+                ('error', models.TextField(blank=True, verbose_name='마지막 오류')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='시작 시간')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신 시간')),
+                ('concert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='crawl_checkpoints', to='review.concert', verbose_name='공연')),
+            ],
+            options={
+                'verbose_name': '크롤링 체크포인트',
+                'verbose_name_plural': '크롤링 체크포인트',
+                'unique_together': {('concert', 'kind', 'window_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.0.2 on 2026-10-19 00:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0014_crawlcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(choices=[('reviews', '전체 리뷰 크롤링'), ('seats', '전체 좌석 크롤링'), ('specific_review', '특정 공연 리뷰 크롤링')], max_length=30, verbose_name='작업')),
+                ('status', models.CharField(choices=[('running', '진행 중'), ('success', '성공'), ('failed', '실패')], default='running', max_length=10, verbose_name='상태')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='시작 시간')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='종료 시간')),
+                ('duration_seconds', models.FloatField(blank=True, null=True, verbose_name='소요 시간(초)')),
+                ('concert_count', models.IntegerField(default=0, verbose_name='처리 공연 수')),
+                ('inserted_count', models.IntegerField(default=0, verbose_name='저장 건수')),
+                ('skipped_count', models.IntegerField(default=0, verbose_name='중복/건너뜀 건수')),
+                ('retry_count', models.IntegerField(default=0, verbose_name='재시도 횟수')),
+                ('error_count', models.IntegerField(default=0, verbose_name='오류 횟수')),
+                ('wait_summary', models.JSONField(blank=True, default=dict, help_text='대기 종류별 {count, avg, max, total, timeouts}', verbose_name='대기 통계')),
+                ('error', models.TextField(blank=True, verbose_name='오류')),
+            ],
+            options={
+                'verbose_name': '크롤링 실행 기록',
+                'verbose_name_plural': '크롤링 실행 기록',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CrawlStep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('concert', '공연'), ('review_page', '리뷰 페이지'), ('seat_month', '좌석 달력 월')], max_length=20, verbose_name='단계 종류')),
+                ('label', models.CharField(blank=True, help_text='예: 3 페이지, 2025.01', max_length=100, verbose_name='단계')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='시작 시간')),
+                ('duration_seconds', models.FloatField(default=0, verbose_name='소요 시간(초)')),
+                ('inserted_count', models.IntegerField(default=0, verbose_name='저장 건수')),
+                ('skipped_count', models.IntegerField(default=0, verbose_name='중복/건너뜀 건수')),
+                ('retry_count', models.IntegerField(default=0, verbose_name='재시도 횟수')),
+                ('error', models.TextField(blank=True, verbose_name='오류')),
+                ('concert', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='crawl_steps', to='review.concert', verbose_name='공연')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='steps', to='review.crawlrun', verbose_name='실행 기록')),
+            ],
+            options={
+                'verbose_name': '크롤링 단계 기록',
+                'verbose_name_plural': '크롤링 단계 기록',
+                'ordering': ['started_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.0.2 on 2026-10-19 01:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_seat_history(apps, schema_editor):
+    """기존 Seat 행(크롤링마다 전체 복사본)으로 수집 기록(SeatSnapshot)과 좌석별 최신 상태(SeatState)를 채웁니다."""
+    Seat = apps.get_model('review', 'Seat')
+    SeatSnapshot = apps.get_model('review', 'SeatSnapshot')
+    SeatState = apps.get_model('review', 'SeatState')
+
+    SeatSnapshot.objects.bulk_create(
+        [
+            SeatSnapshot(
+                concert_id=row['concert_id'],
+                created_at=row['created_at'],
+                seen_count=row['rows'],
+                changed_count=row['rows'],
+            )
+            for row in Seat.objects.values('concert_id', 'created_at').annotate(rows=Count('id')).order_by()
+        ],
+        batch_size=500,
+    )
+
+    states = {}
+    rows = Seat.objects.order_by('created_at', 'id').values(
+        'concert_id', 'year', 'month', 'day_num', 'round_name', 'round_time',
+        'seat_class', 'seat_count', 'actors', 'created_at',
+    )
+    for row in rows.iterator(chunk_size=2000):
+        key = (row['concert_id'], row['year'], row['month'], row['day_num'], row['round_name'], row['seat_class'])
+        state = states.get(key)
+        if state is None:
+            state = states[key] = SeatState(
+                concert_id=row['concert_id'],
+                year=row['year'],
+                month=row['month'],
+                day_num=row['day_num'],
+                round_name=row['round_name'],
+                seat_class=row['seat_class'],
+                changed_at=row['created_at'],
+            )
+        elif state.seat_count != row['seat_count'] or state.actors != row['actors']:
+            state.changed_at = row['created_at']
+        state.round_time = row['round_time']
+        state.seat_count = row['seat_count']
+        state.actors = row['actors']
+        state.last_seen_at = row['created_at']
+    SeatState.objects.bulk_create(states.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0015_crawlrun_crawlstep'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeatSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(verbose_name='수집 시간')),
+                ('seen_count', models.IntegerField(default=0, verbose_name='확인한 좌석 수')),
+                ('changed_count', models.IntegerField(default=0, verbose_name='변경된 좌석 수')),
+                ('concert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seat_snapshots', to='review.concert', verbose_name='공연')),
+            ],
+            options={
+                'verbose_name': '좌석 수집 기록',
+                'verbose_name_plural': '좌석 수집 기록',
+                'ordering': ['created_at'],
+                'unique_together': {('concert', 'created_at')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SeatState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(verbose_name='연도')),
+                ('month', models.IntegerField(verbose_name='월')),
+                ('day_num', models.IntegerField(verbose_name='일')),
+                ('round_name', models.CharField(max_length=10, verbose_name='회차 번호')),
+                ('round_time', models.TimeField(verbose_name='회차 시간')),
+                ('seat_class', models.CharField(max_length=10, verbose_name='좌석 등급')),
+                ('seat_count', models.IntegerField(verbose_name='잔여 좌석')),
+                ('actors', models.TextField(blank=True, verbose_name='캐스팅 배우들')),
+                ('changed_at', models.DateTimeField(help_text='마지막으로 Seat 행을 추가한 크롤링 시각', verbose_name='마지막 변경 시간')),
+                ('last_seen_at', models.DateTimeField(help_text='마지막으로 이 좌석을 확인한 크롤링 시각', verbose_name='마지막 확인 시간')),
+                ('concert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seat_states', to='review.concert', verbose_name='공연')),
+            ],
+            options={
+                'verbose_name': '좌석 최신 상태',
+                'verbose_name_plural': '좌석 최신 상태',
+                'unique_together': {('concert', 'year', 'month', 'day_num', 'round_name', 'seat_class')},
+            },
+        ),
+        migrations.RunPython(backfill_seat_history, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.2 on 2026-10-19 01:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0016_seatsnapshot_seatstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('review', '리뷰'), ('seat', '좌석')], max_length=10, verbose_name='크롤링 종류')),
+                ('source', models.CharField(choices=[('scheduler', '스케줄러'), ('manual', '수동 실행')], default='manual', max_length=20, verbose_name='등록 경로')),
+                ('priority', models.FloatField(default=0, help_text='높을수록 먼저 실행합니다.', verbose_name='우선순위')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '실행 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('attempts', models.IntegerField(default=0, verbose_name='시도 횟수')),
+                ('max_attempts', models.IntegerField(default=3, verbose_name='최대 시도 횟수')),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, help_text='재시도 대기 중이면 이 시각 이후에 다시 실행합니다.', verbose_name='실행 가능 시각')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='실행 워커')),
+                ('lease_expires_at', models.DateTimeField(blank=True, help_text='하트비트가 끊겨 이 시각이 지나면 다른 워커가 가져갑니다.', null=True, verbose_name='임대 만료 시각')),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True, verbose_name='마지막 하트비트')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='등록 시간')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작 시간')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='종료 시간')),
+                ('error', models.TextField(blank=True, verbose_name='마지막 오류')),
+                ('concert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='crawl_jobs', to='review.concert', verbose_name='공연')),
+            ],
+            options={
+                'verbose_name': '크롤링 작업',
+                'verbose_name_plural': '크롤링 작업',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='review_craw_status_f57fde_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='crawljob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('concert', 'kind'), name='unique_active_crawl_job'),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.0.2 on 2026-10-19 01:19
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+from review.parsers import split_actors
+
+
+def backfill_round_castings(apps, schema_editor):
+    """좌석 최신 상태(SeatState)의 캐스팅 문자열로 배우(Actor)와 회차별 캐스팅(RoundCasting)을 채웁니다."""
+    SeatState = apps.get_model('review', 'SeatState')
+    Actor = apps.get_model('review', 'Actor')
+    RoundCasting = apps.get_model('review', 'RoundCasting')
+
+    # 회차별 최신 캐스팅 (좌석 등급별 상태 중 마지막으로 바뀐 값)
+    rounds = {}
+    states = SeatState.objects.order_by('changed_at').values(
+        'concert_id', 'year', 'month', 'day_num', 'round_name', 'round_time', 'actors', 'changed_at',
+    )
+    for state in states.iterator(chunk_size=2000):
+        key = (state['concert_id'], state['year'], state['month'], state['day_num'], state['round_name'])
+        rounds[key] = (state['round_time'], split_actors(state['actors']), state['changed_at'])
+
+    names = {name[:100] for _, actors, _ in rounds.values() for name in actors}
+    Actor.objects.bulk_create([Actor(name=name) for name in names], batch_size=500, ignore_conflicts=True)
+    actor_ids = dict(Actor.objects.values_list('name', 'id'))
+
+    RoundCasting.objects.bulk_create(
+        [
+            RoundCasting(
+                concert_id=key[0],
+                year=key[1],
+                month=key[2],
+                day_num=key[3],
+                round_name=key[4],
+                round_time=round_time,
+                actor_id=actor_ids[name[:100]],
+                position=position,
+                updated_at=changed_at,
+            )
+            for key, (round_time, actors, changed_at) in rounds.items()
+            for position, name in enumerate(actors)
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0017_crawljob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Actor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='배우명')),
+            ],
+            options={
+                'verbose_name': '배우',
+                'verbose_name_plural': '배우',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RoundCasting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(verbose_name='연도')),
+                ('month', models.IntegerField(verbose_name='월')),
+                ('day_num', models.IntegerField(verbose_name='일')),
+                ('round_name', models.CharField(max_length=10, verbose_name='회차 번호')),
+                ('round_time', models.TimeField(verbose_name='회차 시간')),
+                ('position', models.IntegerField(default=0, verbose_name='캐스팅 순서')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='갱신 시간')),
+                ('actor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='castings', to='review.actor', verbose_name='배우')),
+                ('concert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='round_castings', to='review.concert', verbose_name='공연')),
+            ],
+            options={
+                'verbose_name': '회차별 캐스팅',
+                'verbose_name_plural': '회차별 캐스팅',
+                'ordering': ['year', 'month', 'day_num', 'round_name', 'position'],
+                'indexes': [models.Index(fields=['actor', 'concert'], name='review_roun_actor_i_0878d0_idx')],
+                'unique_together': {('concert', 'year', 'month', 'day_num', 'round_name', 'actor')},
+            },
+        ),
+        migrations.RunPython(backfill_round_castings, migrations.RunPython.noop),
+    ]
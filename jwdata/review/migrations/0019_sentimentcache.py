@@ -0,0 +1,28 @@
+# Generated by Django 5.0.2 on 2026-10-19 01:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0018_actor_roundcasting'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SentimentCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_hash', models.CharField(max_length=64, verbose_name='리뷰 내용 해시')),
+                ('prompt_version', models.CharField(max_length=16, verbose_name='프롬프트 버전')),
+                ('sentiment', models.CharField(max_length=10, verbose_name='감정')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')),
+            ],
+            options={
+                'verbose_name': '감정 분석 캐시',
+                'verbose_name_plural': '감정 분석 캐시',
+                'unique_together': {('text_hash', 'prompt_version')},
+            },
+        ),
+    ]
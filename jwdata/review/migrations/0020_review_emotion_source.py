@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-19 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0019_sentimentcache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='emotion_source',
+            field=models.CharField(blank=True, max_length=10, null=True, verbose_name='감정 분석 방법'),
+        ),
+    ]
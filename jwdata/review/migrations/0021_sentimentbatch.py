@@ -0,0 +1,39 @@
+# Generated by Django 5.0.2 on 2026-10-19 01:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0020_review_emotion_source'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SentimentBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_id', models.CharField(blank=True, default='', max_length=100, verbose_name='배치 작업 ID')),
+                ('input_file_id', models.CharField(blank=True, default='', max_length=100, verbose_name='요청 파일 ID')),
+                ('output_file_id', models.CharField(blank=True, default='', max_length=100, verbose_name='결과 파일 ID')),
+                ('status', models.CharField(choices=[('submitted', '제출됨'), ('completed', '완료'), ('failed', '실패')], default='submitted', max_length=10, verbose_name='상태')),
+                ('remote_status', models.CharField(blank=True, default='', max_length=20, verbose_name='API 상태')),
+                ('prompt_version', models.CharField(max_length=16, verbose_name='프롬프트 버전')),
+                ('request_path', models.CharField(blank=True, default='', max_length=500, verbose_name='요청 파일 경로')),
+                ('chunks', models.JSONField(default=dict, verbose_name='요청별 리뷰 id')),
+                ('duplicates', models.JSONField(default=dict, verbose_name='같은 내용의 리뷰 id')),
+                ('review_count', models.IntegerField(default=0, verbose_name='리뷰 수')),
+                ('applied_count', models.IntegerField(default=0, verbose_name='저장한 리뷰 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='제출 시간')),
+                ('checked_at', models.DateTimeField(blank=True, null=True, verbose_name='마지막 확인 시간')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='완료 시간')),
+                ('error', models.TextField(blank=True, default='', verbose_name='오류')),
+            ],
+            options={
+                'verbose_name': '감정 분석 배치 작업',
+                'verbose_name_plural': '감정 분석 배치 작업',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
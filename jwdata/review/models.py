@@ -14,6 +14,10 @@ class Concert(models.Model):
     slack_channel_id = models.CharField(max_length=100, verbose_name="슬랙 채널 ID", null=True, blank=True)
     is_slack_enabled = models.BooleanField(verbose_name="슬랙 알림 활성화 여부", default=False)
     is_sentiment_enabled = models.BooleanField(verbose_name="감정분석 활성화 여부", default=False)
+    review_last_total = models.IntegerField(verbose_name="마지막 크롤링 리뷰 총 개수", null=True, blank=True)
+    review_last_key = models.CharField(verbose_name="마지막 크롤링 최신 리뷰 키", max_length=500, null=True, blank=True)
+    product_url = models.URLField(verbose_name="상품 상세 URL", max_length=500, null=True, blank=True, help_text="사이트 검색으로 찾은 상세 페이지 URL을 저장하여 다음 크롤링부터 바로 접속합니다.")
+    product_code = models.CharField(verbose_name="상품 코드", max_length=50, null=True, blank=True)
 
     class Meta:
         verbose_name = "공연 정보"
@@ -25,6 +29,8 @@ class Concert(models.Model):
 
 # 리뷰 정보를 저장하는 모델
 class Review(models.Model):
+    EMOTION_SOURCE_LOCAL = "local"
+
     concert = models.ForeignKey(Concert, on_delete=models.CASCADE, related_name="reviews", verbose_name="공연")
     nickname = models.CharField(max_length=100, verbose_name="리뷰 작성자 닉네임")
     date = models.DateField(verbose_name="리뷰 작성일")
@@ -34,6 +40,8 @@ class Review(models.Model):
     description = models.TextField(verbose_name="리뷰 내용", null=True, blank=True)
     star_rating = models.FloatField(verbose_name="리뷰 별점", null=True, blank=True)
     emotion = models.CharField(max_length=100, verbose_name="리뷰 감정", null=True, blank=True)
+    # 감정을 정한 방법: 비어 있으면 GPT(캐시 포함), "local"이면 로컬 분류기 (분류기 학습에는 GPT 결과만 사용)
+    emotion_source = models.CharField(max_length=10, verbose_name="감정 분석 방법", null=True, blank=True)
 
     class Meta:
         verbose_name = "리뷰"
@@ -63,3 +71,359 @@ class Seat(models.Model):
 
     def __str__(self):
         return f"{self.concert.name} - {self.year}-{self.month:02d}-{self.day_num:02d} {self.round_name} {self.seat_class}"
+
+
+# (공연, 날짜, 회차, 좌석 등급)별 마지막으로 확인한 잔여석을 저장하는 모델
+# 좌석 크롤링은 이 값과 잔여석/캐스팅이 달라진 경우에만 Seat 행을 추가합니다.
+class SeatState(models.Model):
+    concert = models.ForeignKey(Concert, on_delete=models.CASCADE, related_name="seat_states", verbose_name="공연")
+    year = models.IntegerField(verbose_name="연도")
+    month = models.IntegerField(verbose_name="월")
+    day_num = models.IntegerField(verbose_name="일")
+    round_name = models.CharField(verbose_name="회차 번호", max_length=10)
+    round_time = models.TimeField(verbose_name="회차 시간")
+    seat_class = models.CharField(verbose_name="좌석 등급", max_length=10)
+    seat_count = models.IntegerField(verbose_name="잔여 좌석")
+    actors = models.TextField(verbose_name="캐스팅 배우들", blank=True)
+    changed_at = models.DateTimeField(verbose_name="마지막 변경 시간", help_text="마지막으로 Seat 행을 추가한 크롤링 시각")
+    last_seen_at = models.DateTimeField(verbose_name="마지막 확인 시간", help_text="마지막으로 이 좌석을 확인한 크롤링 시각")
+
+    class Meta:
+        verbose_name = "좌석 최신 상태"
+        verbose_name_plural = "좌석 최신 상태"
+        unique_together = ("concert", "year", "month", "day_num", "round_name", "seat_class")
+
+    def __str__(self):
+        return f"{self.concert.name} - {self.year}-{self.month:02d}-{self.day_num:02d} {self.round_name} {self.seat_class}: {self.seat_count}"
+
+
+# 공연별 좌석 크롤링 한 번(수집 시각)을 기록하는 모델
+# 변경분만 저장된 Seat를 수집 시각별 전체 현황으로 복원할 때 시간 축으로 사용합니다.
+class SeatSnapshot(models.Model):
+    concert = models.ForeignKey(Concert, on_delete=models.CASCADE, related_name="seat_snapshots", verbose_name="공연")
+    created_at = models.DateTimeField(verbose_name="수집 시간")
+    seen_count = models.IntegerField(verbose_name="확인한 좌석 수", default=0)
+    changed_count = models.IntegerField(verbose_name="변경된 좌석 수", default=0)
+
+    class Meta:
+        verbose_name = "좌석 수집 기록"
+        verbose_name_plural = "좌석 수집 기록"
+        unique_together = ("concert", "created_at")
+        ordering = ["created_at"]
+
+    def __str__(self):
+        return f"{self.concert.name} - {self.created_at:%Y-%m-%d %H:%M} (변경 {self.changed_count}/{self.seen_count})"
+
+
+# 배우 (캐스팅 색인)
+class Actor(models.Model):
+    name = models.CharField(verbose_name="배우명", max_length=100, unique=True)
+
+    class Meta:
+        verbose_name = "배우"
+        verbose_name_plural = "배우"
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+# 회차별 캐스팅 색인 (Seat.actors 문자열을 배우 단위로 나눈 최신 캐스팅)
+# 좌석 크롤링에서 회차의 캐스팅이 바뀔 때마다 갱신되며, 배우별 회차/잔여석 조회에 사용합니다.
+class RoundCasting(models.Model):
+    concert = models.ForeignKey(Concert, on_delete=models.CASCADE, related_name="round_castings", verbose_name="공연")
+    actor = models.ForeignKey(Actor, on_delete=models.CASCADE, related_name="castings", verbose_name="배우")
+    year = models.IntegerField(verbose_name="연도")
+    month = models.IntegerField(verbose_name="월")
+    day_num = models.IntegerField(verbose_name="일")
+    round_name = models.CharField(verbose_name="회차 번호", max_length=10)
+    round_time = models.TimeField(verbose_name="회차 시간")
+    position = models.IntegerField(verbose_name="캐스팅 순서", default=0)
+    updated_at = models.DateTimeField(verbose_name="갱신 시간", default=now)
+
+    class Meta:
+        verbose_name = "회차별 캐스팅"
+        verbose_name_plural = "회차별 캐스팅"
+        unique_together = ("concert", "year", "month", "day_num", "round_name", "actor")
+        indexes = [
+            models.Index(fields=["actor", "concert"]),
+        ]
+        ordering = ["year", "month", "day_num", "round_name", "position"]
+
+    def __str__(self):
+        return f"{self.concert.name} - {self.year}-{self.month:02d}-{self.day_num:02d} {self.round_name} {self.actor.name}"
+
+
+# 크롤링 진행 상황(체크포인트)을 저장하는 모델
+class CrawlCheckpoint(models.Model):
+    KIND_REVIEW = "review"
+    KIND_SEAT = "seat"
+    KIND_CHOICES = [
+        (KIND_REVIEW, "리뷰"),
+        (KIND_SEAT, "좌석"),
+    ]
+
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, "진행 중"),
+        (STATUS_DONE, "완료"),
+        (STATUS_FAILED, "실패"),
+    ]
+
+    concert = models.ForeignKey(Concert, on_delete=models.CASCADE, related_name="crawl_checkpoints", verbose_name="공연")
+    kind = models.CharField(verbose_name="크롤링 종류", max_length=10, choices=KIND_CHOICES)
+    window_start = models.DateTimeField(verbose_name="스케줄 구간 시작 시각", help_text="같은 구간 안에서 완료된 공연은 다시 크롤링하지 않습니다.")
+    status = models.CharField(verbose_name="상태", max_length=10, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+    page = models.IntegerField(verbose_name="마지막 저장 페이지", null=True, blank=True)
+    year = models.IntegerField(verbose_name="마지막 저장 연도", null=True, blank=True)
+    month = models.IntegerField(verbose_name="마지막 저장 월", null=True, blank=True)
+    day_num = models.IntegerField(verbose_name="마지막 저장 일", null=True, blank=True)
+    last_key = models.CharField(verbose_name="마지막 저장 키", max_length=500, null=True, blank=True)
+    head_key = models.CharField(verbose_name="이번 크롤링 최신 리뷰 키", max_length=500, null=True, blank=True)
+    error = models.TextField(verbose_name="마지막 오류", blank=True)
+    started_at = models.DateTimeField(verbose_name="시작 시간", default=now)
+    updated_at = models.DateTimeField(verbose_name="갱신 시간", auto_now=True)
+
+    class Meta:
+        verbose_name = "크롤링 체크포인트"
+        verbose_name_plural = "크롤링 체크포인트"
+        unique_together = ("concert", "kind", "window_start")
+
+    def __str__(self):
+        return f"{self.concert.name} - {self.get_kind_display()} {self.window_start:%Y-%m-%d %H:%M} ({self.get_status_display()})"
+
+    @property
+    def is_done(self):
+        return self.status == self.STATUS_DONE
+
+    def save_review_page(self, page, last_key, head_key):
+        """리뷰 한 페이지를 DB에 저장한 직후 호출합니다."""
+        self.page = page
+        self.last_key = last_key
+        self.head_key = head_key
+        self.status = self.STATUS_RUNNING
+        self.save(update_fields=["page", "last_key", "head_key", "status", "updated_at"])
+
+    def save_seat_day(self, year, month, day_num, last_key):
+        """한 날짜의 모든 회차 좌석 정보를 DB에 저장한 직후 호출합니다."""
+        self.year = year
+        self.month = month
+        self.day_num = day_num
+        self.last_key = last_key
+        self.status = self.STATUS_RUNNING
+        self.save(update_fields=["year", "month", "day_num", "last_key", "status", "updated_at"])
+
+    def finish(self):
+        self.status = self.STATUS_DONE
+        self.error = ""
+        self.save(update_fields=["status", "error", "updated_at"])
+
+    def restart(self):
+        """완료된 체크포인트를 처음부터 다시 진행하도록 초기화합니다. (같은 구간에서 다시 크롤링하는 경우)"""
+        self.status = self.STATUS_RUNNING
+        self.page = None
+        self.year = None
+        self.month = None
+        self.day_num = None
+        self.last_key = None
+        self.head_key = None
+        self.error = ""
+        self.started_at = now()
+        self.save()
+
+    def fail(self, error):
+        """실패로 표시합니다. 저장된 진행 위치는 유지되어 다음 실행에서 이어서 진행합니다."""
+        self.status = self.STATUS_FAILED
+        self.error = str(error)
+        self.save(update_fields=["status", "error", "updated_at"])
+
+
+# 크롤링 작업 큐 (스케줄러/화면에서 등록, scripts/crawl_worker.py 프로세스가 임대(lease)하여 실행)
+class CrawlJob(models.Model):
+    KIND_REVIEW = CrawlCheckpoint.KIND_REVIEW
+    KIND_SEAT = CrawlCheckpoint.KIND_SEAT
+    KIND_CHOICES = CrawlCheckpoint.KIND_CHOICES
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "대기"),
+        (STATUS_RUNNING, "실행 중"),
+        (STATUS_DONE, "완료"),
+        (STATUS_FAILED, "실패"),
+    ]
+    ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+
+    SOURCE_SCHEDULER = "scheduler"
+    SOURCE_MANUAL = "manual"
+    SOURCE_CHOICES = [
+        (SOURCE_SCHEDULER, "스케줄러"),
+        (SOURCE_MANUAL, "수동 실행"),
+    ]
+
+    concert = models.ForeignKey(Concert, on_delete=models.CASCADE, related_name="crawl_jobs", verbose_name="공연")
+    kind = models.CharField(verbose_name="크롤링 종류", max_length=10, choices=KIND_CHOICES)
+    source = models.CharField(verbose_name="등록 경로", max_length=20, choices=SOURCE_CHOICES, default=SOURCE_MANUAL)
+    priority = models.FloatField(verbose_name="우선순위", default=0, help_text="높을수록 먼저 실행합니다.")
+    status = models.CharField(verbose_name="상태", max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.IntegerField(verbose_name="시도 횟수", default=0)
+    max_attempts = models.IntegerField(verbose_name="최대 시도 횟수", default=3)
+    available_at = models.DateTimeField(verbose_name="실행 가능 시각", default=now, help_text="재시도 대기 중이면 이 시각 이후에 다시 실행합니다.")
+    worker = models.CharField(verbose_name="실행 워커", max_length=100, blank=True)
+    lease_expires_at = models.DateTimeField(verbose_name="임대 만료 시각", null=True, blank=True, help_text="하트비트가 끊겨 이 시각이 지나면 다른 워커가 가져갑니다.")
+    heartbeat_at = models.DateTimeField(verbose_name="마지막 하트비트", null=True, blank=True)
+    created_at = models.DateTimeField(verbose_name="등록 시간", default=now)
+    started_at = models.DateTimeField(verbose_name="시작 시간", null=True, blank=True)
+    finished_at = models.DateTimeField(verbose_name="종료 시간", null=True, blank=True)
+    error = models.TextField(verbose_name="마지막 오류", blank=True)
+
+    class Meta:
+        verbose_name = "크롤링 작업"
+        verbose_name_plural = "크롤링 작업"
+        ordering = ["-created_at"]
+        constraints = [
+            # 공연/종류별로 대기·실행 중인 작업은 하나만 (동시에 등록해도 같은 공연을 두 번 크롤링하지 않음)
+            models.UniqueConstraint(
+                fields=["concert", "kind"],
+                condition=models.Q(status__in=["pending", "running"]),
+                name="unique_active_crawl_job",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["status", "available_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.concert.name} - {self.get_kind_display()} ({self.get_status_display()}, {self.attempts}/{self.max_attempts})"
+
+
+# 크롤링 실행 기록 (작업 한 번 = CrawlRun 하나)
+class CrawlRun(models.Model):
+    TASK_REVIEWS = "reviews"
+    TASK_SEATS = "seats"
+    TASK_SPECIFIC_REVIEW = "specific_review"
+    TASK_CHOICES = [
+        (TASK_REVIEWS, "전체 리뷰 크롤링"),
+        (TASK_SEATS, "전체 좌석 크롤링"),
+        (TASK_SPECIFIC_REVIEW, "특정 공연 리뷰 크롤링"),
+    ]
+
+    STATUS_RUNNING = "running"
+    STATUS_SUCCESS = "success"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, "진행 중"),
+        (STATUS_SUCCESS, "성공"),
+        (STATUS_FAILED, "실패"),
+    ]
+
+    task = models.CharField(verbose_name="작업", max_length=30, choices=TASK_CHOICES)
+    status = models.CharField(verbose_name="상태", max_length=10, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+    started_at = models.DateTimeField(verbose_name="시작 시간", default=now)
+    finished_at = models.DateTimeField(verbose_name="종료 시간", null=True, blank=True)
+    duration_seconds = models.FloatField(verbose_name="소요 시간(초)", null=True, blank=True)
+    concert_count = models.IntegerField(verbose_name="처리 공연 수", default=0)
+    inserted_count = models.IntegerField(verbose_name="저장 건수", default=0)
+    skipped_count = models.IntegerField(verbose_name="중복/건너뜀 건수", default=0)
+    retry_count = models.IntegerField(verbose_name="재시도 횟수", default=0)
+    error_count = models.IntegerField(verbose_name="오류 횟수", default=0)
+    wait_summary = models.JSONField(verbose_name="대기 통계", default=dict, blank=True, help_text="대기 종류별 {count, avg, max, total, timeouts}")
+    error = models.TextField(verbose_name="오류", blank=True)
+
+    class Meta:
+        verbose_name = "크롤링 실행 기록"
+        verbose_name_plural = "크롤링 실행 기록"
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"{self.get_task_display()} {self.started_at:%Y-%m-%d %H:%M} ({self.get_status_display()})"
+
+
+# 크롤링 실행 중 단계별(공연/페이지/달력 월) 소요 시간과 건수
+class CrawlStep(models.Model):
+    KIND_CONCERT = "concert"
+    KIND_REVIEW_PAGE = "review_page"
+    KIND_SEAT_MONTH = "seat_month"
+    KIND_CHOICES = [
+        (KIND_CONCERT, "공연"),
+        (KIND_REVIEW_PAGE, "리뷰 페이지"),
+        (KIND_SEAT_MONTH, "좌석 달력 월"),
+    ]
+
+    run = models.ForeignKey(CrawlRun, on_delete=models.CASCADE, related_name="steps", verbose_name="실행 기록")
+    concert = models.ForeignKey(Concert, on_delete=models.SET_NULL, related_name="crawl_steps", verbose_name="공연", null=True, blank=True)
+    kind = models.CharField(verbose_name="단계 종류", max_length=20, choices=KIND_CHOICES)
+    label = models.CharField(verbose_name="단계", max_length=100, blank=True, help_text="예: 3 페이지, 2025.01")
+    started_at = models.DateTimeField(verbose_name="시작 시간", default=now)
+    duration_seconds = models.FloatField(verbose_name="소요 시간(초)", default=0)
+    inserted_count = models.IntegerField(verbose_name="저장 건수", default=0)
+    skipped_count = models.IntegerField(verbose_name="중복/건너뜀 건수", default=0)
+    retry_count = models.IntegerField(verbose_name="재시도 횟수", default=0)
+    error = models.TextField(verbose_name="오류", blank=True)
+
+    class Meta:
+        verbose_name = "크롤링 단계 기록"
+        verbose_name_plural = "크롤링 단계 기록"
+        ordering = ["started_at"]
+
+    def __str__(self):
+        return f"{self.run} - {self.get_kind_display()} {self.label}"
+
+
+# 감정 분석 결과 캐시 (정규화한 리뷰 내용의 해시 + 프롬프트/모델 버전별 결과)
+# 같은 내용의 리뷰(복사한 리뷰, 시트 동기화로 다시 들어온 리뷰 등)는 API에 다시 보내지 않습니다.
+class SentimentCache(models.Model):
+    text_hash = models.CharField(verbose_name="리뷰 내용 해시", max_length=64)
+    prompt_version = models.CharField(verbose_name="프롬프트 버전", max_length=16)
+    sentiment = models.CharField(verbose_name="감정", max_length=10)
+    created_at = models.DateTimeField(verbose_name="생성 시간", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "감정 분석 캐시"
+        verbose_name_plural = "감정 분석 캐시"
+        unique_together = ("text_hash", "prompt_version")
+
+    def __str__(self):
+        return f"{self.text_hash[:12]} ({self.prompt_version}) {self.sentiment}"
+
+
+# 감정 분석 배치 작업 (대량 감정 분석을 JSONL 요청 파일로 제출하고 완료되면 결과를 한 번에 저장)
+class SentimentBatch(models.Model):
+    STATUS_SUBMITTED = "submitted"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_SUBMITTED, "제출됨"),
+        (STATUS_COMPLETED, "완료"),
+        (STATUS_FAILED, "실패"),
+    ]
+
+    batch_id = models.CharField(verbose_name="배치 작업 ID", max_length=100, blank=True, default="")
+    input_file_id = models.CharField(verbose_name="요청 파일 ID", max_length=100, blank=True, default="")
+    output_file_id = models.CharField(verbose_name="결과 파일 ID", max_length=100, blank=True, default="")
+    status = models.CharField(verbose_name="상태", max_length=10, choices=STATUS_CHOICES, default=STATUS_SUBMITTED)
+    remote_status = models.CharField(verbose_name="API 상태", max_length=20, blank=True, default="")
+    prompt_version = models.CharField(verbose_name="프롬프트 버전", max_length=16)
+    request_path = models.CharField(verbose_name="요청 파일 경로", max_length=500, blank=True, default="")
+    # {custom_id: [리뷰 id, ...]} (요청 한 줄에 리뷰 SENTIMENT_BATCH_SIZE개)
+    chunks = models.JSONField(verbose_name="요청별 리뷰 id", default=dict)
+    # {요청한 리뷰 id: [같은 내용의 다른 리뷰 id, ...]}
+    duplicates = models.JSONField(verbose_name="같은 내용의 리뷰 id", default=dict)
+    review_count = models.IntegerField(verbose_name="리뷰 수", default=0)
+    applied_count = models.IntegerField(verbose_name="저장한 리뷰 수", default=0)
+    created_at = models.DateTimeField(verbose_name="제출 시간", auto_now_add=True)
+    checked_at = models.DateTimeField(verbose_name="마지막 확인 시간", null=True, blank=True)
+    completed_at = models.DateTimeField(verbose_name="완료 시간", null=True, blank=True)
+    error = models.TextField(verbose_name="오류", blank=True, default="")
+
+    class Meta:
+        verbose_name = "감정 분석 배치 작업"
+        verbose_name_plural = "감정 분석 배치 작업"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.batch_id or self.pk} ({self.get_status_display()}, 리뷰 {self.review_count}개)"
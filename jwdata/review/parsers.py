@@ -0,0 +1,275 @@
+from datetime import datetime
+import logging
+import re
+
+import lxml.html
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# Selenium 크롤러와 동일한 XPath (lxml용)
+REVIEW_ITEM_XPATH = '//ul[@class="bbsList reviewList"]/li[@class="bbsItem"]'
+REVIEW_TOTAL_XPATHS = (
+    '//*[@id="prdReview"]/div/div[3]/div[1]/div[1]/div[1]/strong/span',
+    '//*[@id="prdReview"]/div/div[4]/div[1]/div[1]/div[1]/strong/span',
+)
+SEAT_ITEM_XPATH = '//*[contains(concat(" ", normalize-space(@class), " "), " seatTableItem ")]'
+SEAT_ACTORS_XPATH = '//*[@id="productSide"]/div/div[1]/div[3]/div[2]/div/p'
+
+
+def _class_xpath(class_name):
+    """By.CLASS_NAME과 같이 class 속성에 class_name 토큰이 포함된 하위 요소를 찾는 XPath."""
+    return f'.//*[contains(concat(" ", normalize-space(@class), " "), " {class_name} ")]'
+
+
+# 리뷰/좌석 항목 하나에서 읽는 필드: (키, 항목 기준 XPath, 속성명 또는 None(텍스트))
+# lxml 파서와 Selenium 단일 스크립트 추출(extractors)이 함께 사용
+REVIEW_FIELDS = (
+    ("nickname", _class_xpath("name"), None),
+    ("date", './/li[@class="bbsItemInfoList"][2]', None),
+    ("view_count", './/li[@class="bbsItemInfoList"][3]', None),
+    ("like_count", './/li[@class="bbsItemInfoList"][4]', None),
+    ("title", _class_xpath("bbsTitleText"), None),
+    ("description", _class_xpath("bbsText"), None),
+    ("star_rating", _class_xpath("prdStarIcon"), "data-star"),
+)
+SEAT_FIELDS = (
+    ("seat_class", _class_xpath("seatTableName"), None),
+    ("status", _class_xpath("seatTableStatus"), None),
+)
+
+
+def _text(element):
+    """<br>을 줄바꿈으로 바꾸고 앞뒤 공백을 제거한 텍스트 (Selenium .text와 최대한 동일하게)."""
+    for br in element.iter("br"):
+        br.tail = "\n" + (br.tail or "")
+    return element.text_content().strip()
+
+
+def _first_text(element, xpath):
+    found = element.xpath(xpath)
+    if not found:
+        raise ValueError(f"요소를 찾을 수 없음: {xpath}")
+    return _text(found[0])
+
+
+def _read_fields(element, fields):
+    """fields 정의대로 항목의 필드를 읽습니다. 텍스트 필드가 없으면 ValueError, 속성이 없으면 None."""
+    row = {}
+    for key, xpath, attribute in fields:
+        if attribute is None:
+            row[key] = _first_text(element, xpath)
+        else:
+            found = element.xpath(xpath)
+            row[key] = found[0].get(attribute) if found else None
+    return row
+
+
+def parse_count(text):
+    """'조회 1,234' 같은 문자열에서 숫자만 뽑아 정수로 변환합니다."""
+    return int("".join(filter(str.isdigit, text)))
+
+
+def parse_seat_count(text):
+    """'12석' 같은 잔여석 문자열을 정수로 변환합니다. 숫자가 없으면(매진 등) 0."""
+    try:
+        return parse_count(text)
+    except ValueError:
+        return 0
+
+
+def split_actors(text):
+    """
+    캐스팅 문자열을 배우 이름 목록으로 나눕니다. (쉼표, 줄바꿈, '/', '·', '|' 구분)
+    '역할 : 배우' 형식이면 배우 이름만 남기고, 중복은 처음 나온 순서대로 한 번만 남깁니다.
+    """
+    names = []
+    for part in re.split(r"[,\n/·|]", text or ""):
+        name = part.split(":")[-1].strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def normalize_review(raw):
+    """
+    리뷰 한 건의 원본 문자열 필드를 Review 모델 필드 값으로 변환합니다.
+    raw 키: nickname, date, view_count, like_count, title, description, star_rating
+    값이 잘못되면 ValueError/KeyError/TypeError가 발생합니다.
+    """
+    return {
+        "nickname": raw["nickname"].strip(),
+        "date": datetime.strptime(raw["date"].strip(), "%Y.%m.%d").date(),
+        "view_count": parse_count(raw["view_count"]),
+        "like_count": parse_count(raw["like_count"]),
+        "title": raw["title"].strip(),
+        "description": raw["description"].strip(),
+        "star_rating": float(raw["star_rating"]),
+    }
+
+
+def normalize_reviews(raw_reviews):
+    """원본 리뷰 목록을 변환하고, 변환에 실패한 리뷰는 로그만 남기고 제외합니다."""
+    reviews = []
+    for raw in raw_reviews:
+        try:
+            reviews.append(normalize_review(raw))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"[리뷰 파싱] 처리 중 오류 발생: {e}")
+    return reviews
+
+
+def parse_review_items(html):
+    """
+    리뷰 목록 HTML(ul.bbsList.reviewList > li.bbsItem)에서 리뷰별 원본 필드를 추출합니다.
+    필드를 찾지 못한 리뷰는 로그만 남기고 제외합니다.
+    """
+    document = lxml.html.fromstring(html)
+    raw_reviews = []
+    for item in document.xpath(REVIEW_ITEM_XPATH):
+        try:
+            raw_reviews.append(_read_fields(item, REVIEW_FIELDS))
+        except ValueError as e:
+            logger.warning(f"[리뷰 파싱] 처리 중 오류 발생: {e}")
+    return raw_reviews
+
+
+def parse_review_total(html):
+    """리뷰 탭 HTML에서 관람후기 총 개수를 읽습니다. 찾지 못하면 None을 반환합니다."""
+    document = lxml.html.fromstring(html)
+    for xpath in REVIEW_TOTAL_XPATHS:
+        found = document.xpath(xpath)
+        if found:
+            try:
+                return parse_count(_text(found[0]))
+            except ValueError:
+                return None
+    return None
+
+
+def parse_seat_items(html):
+    """
+    회차를 선택한 상세 페이지 HTML에서 좌석 등급별 잔여석(seatTableItem)을 추출합니다.
+    [(seat_class, seat_count), ...]를 반환합니다.
+    """
+    document = lxml.html.fromstring(html)
+    seats = []
+    for item in document.xpath(SEAT_ITEM_XPATH):
+        try:
+            row = _read_fields(item, SEAT_FIELDS)
+            seats.append((row["seat_class"], parse_seat_count(row["status"])))
+        except ValueError as e:
+            logger.warning(f"[좌석 파싱] 처리 중 오류 발생: {e}")
+    return seats
+
+
+def parse_seat_actors(html):
+    """회차를 선택한 상세 페이지 HTML에서 캐스팅 배우 문자열을 읽습니다. 없으면 빈 문자열."""
+    found = lxml.html.fromstring(html).xpath(SEAT_ACTORS_XPATH)
+    return _text(found[0]) if found else ""
+
+
+# 좌석 API(JSON) 응답에서 읽는 키 후보 (네트워크 캡처 좌석 크롤링, captures.SeatNetworkCapture)
+ROUND_SEQ_KEYS = ("playSeq", "playSeqNo")
+ROUND_DATE_KEYS = ("playDate", "playDt")
+ROUND_TIME_KEYS = ("playTime", "playTm")
+ROUND_CASTING_KEYS = ("casting", "castingList", "casts")
+ACTOR_NAME_KEYS = ("actorName", "castingName", "name")
+SEAT_CLASS_KEYS = ("seatGradeName", "seatGradeNm", "gradeName")
+SEAT_REMAIN_KEYS = ("remainCnt", "remainSeatCnt", "remainCount")
+
+
+def _first_value(record, keys):
+    for key in keys:
+        if record.get(key) not in (None, ""):
+            return record[key]
+    return None
+
+
+def _json_records(data):
+    """JSON 응답 안의 모든 객체(dict)를 깊이 우선으로 돌려줍니다. (응답마다 감싸는 구조가 달라도 찾을 수 있도록)"""
+    if isinstance(data, dict):
+        yield data
+        for value in data.values():
+            yield from _json_records(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from _json_records(value)
+
+
+def _format_round_time(value):
+    """'1930' → '19:30' (달력 회차 data-text와 같은 형식). 이미 '19:30'이면 그대로."""
+    text = str(value).strip()
+    if text.isdigit() and len(text) == 4:
+        return f"{text[:2]}:{text[2:]}"
+    return text
+
+
+def _format_actors(casting):
+    if isinstance(casting, str):
+        return casting.strip()
+    names = []
+    for actor in casting or []:
+        name = _first_value(actor, ACTOR_NAME_KEYS) if isinstance(actor, dict) else actor
+        if name:
+            names.append(str(name).strip())
+    return ", ".join(names)
+
+
+def parse_round_json(data):
+    """
+    회차 목록 API 응답에서 회차 목록을 추출합니다.
+    [{play_seq, year, month, day_num, round_name, round_time, actors, seats}, ...]를 날짜/시간 순으로 반환하며,
+    round_name은 달력과 같이 날짜별 시간 순서대로 '1회', '2회', ...입니다.
+    actors는 응답에 캐스팅 정보가, seats는 회차별 잔여석이 없으면 None입니다.
+    """
+    rounds = {}
+    for record in _json_records(data):
+        play_seq = _first_value(record, ROUND_SEQ_KEYS)
+        play_date = _first_value(record, ROUND_DATE_KEYS)
+        if play_seq is None or play_date is None:
+            continue
+        try:
+            day = datetime.strptime(str(play_date).replace("-", "").replace(".", "")[:8], "%Y%m%d")
+        except ValueError:
+            logger.warning(f"[좌석 API] 회차 날짜 형식 오류: {play_date!r}")
+            continue
+        casting_key = next((key for key in ROUND_CASTING_KEYS if key in record), None)
+        rounds[str(play_seq)] = {
+            "play_seq": str(play_seq),
+            "year": day.year,
+            "month": day.month,
+            "day_num": day.day,
+            "round_time": _format_round_time(_first_value(record, ROUND_TIME_KEYS) or ""),
+            "actors": _format_actors(record[casting_key]) if casting_key else None,
+            # 월 단위 응답처럼 회차마다 잔여석이 함께 오는 경우
+            "seats": parse_remain_seat_json(record)[1] or None,
+        }
+
+    ordered = sorted(rounds.values(), key=lambda r: (r["year"], r["month"], r["day_num"], r["round_time"], r["play_seq"]))
+    number = 0
+    previous_day = None
+    for round_info in ordered:
+        day = (round_info["year"], round_info["month"], round_info["day_num"])
+        number = number + 1 if day == previous_day else 1
+        previous_day = day
+        round_info["round_name"] = f"{number}회"
+    return ordered
+
+
+def parse_remain_seat_json(data):
+    """
+    잔여석 API 응답에서 (play_seq 또는 None, [(seat_class, seat_count), ...])를 추출합니다.
+    좌석 등급이 하나도 없으면 잔여석 응답이 아닌 것으로 보고 (None, [])를 반환합니다.
+    """
+    play_seq = None
+    seats = []
+    for record in _json_records(data):
+        seat_class = _first_value(record, SEAT_CLASS_KEYS)
+        remain = _first_value(record, SEAT_REMAIN_KEYS)
+        if seat_class is None or remain is None:
+            continue
+        seats.append((str(seat_class).strip(), parse_seat_count(str(remain))))
+        if play_seq is None and _first_value(record, ROUND_SEQ_KEYS) is not None:
+            play_seq = str(_first_value(record, ROUND_SEQ_KEYS))
+    return play_seq, seats
@@ -0,0 +1,99 @@
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import connection
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+_CLOSE = object()
+
+
+class WriterPipeline:
+    """
+    브라우저 스레드(생산자)가 넘긴 저장 작업을 writer 스레드(소비자)가 순서대로 실행하는 파이프라인.
+    페이지 N을 저장하는 동안 브라우저는 페이지 N+1로 이동/추출할 수 있습니다.
+
+    - submit(job, *args): 작업을 큐에 넣습니다. 큐(maxsize, 기본 CRAWL_PIPELINE_QUEUE_SIZE)가 가득 차면
+      writer가 따라올 때까지 기다립니다. (브라우저가 DB보다 너무 앞서 나가지 않도록)
+    - 작업이 True를 반환하면 stop_requested가 설정됩니다. (리뷰: 이미 수집한 구간 도달 → 페이지 이동 중단)
+    - writer 스레드에서 예외가 나면 이후 작업은 실행하지 않고, 다음 submit() 또는 close()에서 다시 발생합니다.
+    - maxsize가 0이면 스레드 없이 submit()에서 바로 실행합니다. (순차 실행)
+    with 문으로 사용하면 블록이 끝날 때 남은 작업을 모두 실행하고 writer 스레드를 종료합니다.
+    """
+
+    def __init__(self, name="writer", maxsize=None):
+        if maxsize is None:
+            maxsize = settings.CRAWL_PIPELINE_QUEUE_SIZE
+        self.name = name
+        self.threaded = maxsize > 0
+        self.error = None
+        self.job_count = 0
+        self._stop = threading.Event()
+        self._queue = queue.Queue(maxsize=maxsize) if self.threaded else None
+        self._thread = None
+        self._closed = False
+
+    @property
+    def stop_requested(self):
+        return self._stop.is_set()
+
+    def start(self):
+        if self.threaded and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def _execute(self, job, args, kwargs):
+        if job(*args, **kwargs) is True:
+            self._stop.set()
+        self.job_count += 1
+
+    def _run(self):
+        try:
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is _CLOSE:
+                        break
+                    if self.error is not None:
+                        continue  # 오류 이후 작업은 버림
+                    try:
+                        self._execute(*item)
+                    except Exception as e:
+                        logger.error(f"[{self.name}] 저장 작업 실패: {e}")
+                        self.error = e
+                        self._stop.set()
+                finally:
+                    self._queue.task_done()
+        finally:
+            # 스레드별 DB 커넥션 정리
+            connection.close()
+
+    def submit(self, job, *args, **kwargs):
+        if self.error is not None:
+            raise self.error
+        if not self.threaded:
+            self._execute(job, args, kwargs)
+            return
+        self.start()
+        self._queue.put((job, args, kwargs))
+
+    def close(self, raise_error=True):
+        """남은 작업을 모두 실행할 때까지 기다리고 writer 스레드를 종료합니다."""
+        if not self._closed:
+            self._closed = True
+            if self._thread is not None:
+                self._queue.put(_CLOSE)
+                self._thread.join()
+        if raise_error and self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        # 블록에서 예외가 났으면 그 예외를 우선하고 writer 오류는 로그로만 남김
+        self.close(raise_error=exc is None)
@@ -0,0 +1,300 @@
+import json
+import logging
+import re
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+
+from .calendars import SeatCalendarWalker, extract_round_seats
+from .crawls import extract_review_page, go_to_next_review_page, open_review_tab
+from .parsers import parse_review_items, parse_review_total, parse_seat_items
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+REVIEW_PAGE_NAME = "reviews.html"
+BENCHMARK_BACKENDS = ("lxml", "http", "selenium", "script")
+
+
+def fixture_root():
+    return Path(settings.CRAWL_FIXTURE_DIR)
+
+
+def fixture_dir_for(concert, root=None):
+    """공연별 fixture 디렉터리. 상품 코드가 있으면 상품 코드, 없으면 공연 id로 이름을 정합니다."""
+    name = concert.product_code or f"concert-{concert.pk}"
+    return Path(root or fixture_root()) / re.sub(r"[^\w.-]", "_", name)
+
+
+def load_manifest(directory):
+    with open(Path(directory) / MANIFEST_NAME, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_fixture_dirs(root=None):
+    """manifest.json이 있는 fixture 디렉터리를 이름 순으로 반환합니다."""
+    root = Path(root or fixture_root())
+    if not root.exists():
+        return []
+    return sorted(path.parent for path in root.glob(f"*/{MANIFEST_NAME}"))
+
+
+# ==================================================================
+# 녹화 (실제 사이트 → fixture)
+# ==================================================================
+
+class PageRecorder:
+    """
+    Selenium으로 연 실제 상세 페이지의 렌더링된 HTML(page_source)을 fixture 디렉터리에 저장합니다.
+    - product.html: 상세 페이지
+    - reviews_p{N}.html: 관람후기 탭 N페이지
+    - seats_{YYYYMMDD}_{N}.html: 날짜/회차를 선택한 상태의 상세 페이지 (좌석 테이블 포함)
+    - manifest.json: 파일 목록과 녹화 당시 Selenium으로 추출한 값 (replay 결과 비교용)
+    """
+
+    def __init__(self, driver, concert, directory=None):
+        self.driver = driver
+        self.concert = concert
+        self.directory = Path(directory or fixture_dir_for(concert))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest = {
+            "concert": concert.name,
+            "product_url": driver.current_url,
+            "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "product": None,
+            "review_total": None,
+            "reviews": [],
+            "seats": [],
+        }
+
+    def save(self, name):
+        (self.directory / name).write_text(self.driver.page_source, encoding="utf-8")
+        return name
+
+    def record_product(self):
+        self.manifest["product"] = self.save("product.html")
+
+    def record_reviews(self, max_pages):
+        review_total_count = open_review_tab(self.driver, self.concert)
+        if review_total_count is None:
+            return
+        self.manifest["review_total"] = review_total_count
+
+        review_num_pages = min((review_total_count + 14) // 15, max_pages)
+        for page in range(1, review_num_pages + 1):
+            self.manifest["reviews"].append({
+                "file": self.save(f"reviews_p{page}.html"),
+                "page": page,
+                "count": len(extract_review_page(self.driver, "element")),
+            })
+            if page < review_num_pages:
+                go_to_next_review_page(self.driver, page)
+
+    def record_seats(self, max_rounds):
+        counter = 0
+        for round_seats in SeatCalendarWalker(self.driver).walk():
+            counter += 1
+            date_str = f"{round_seats['year']}{round_seats['month']:02d}{round_seats['day_num']:02d}"
+            self.manifest["seats"].append({
+                "file": self.save(f"seats_{date_str}_{counter}.html"),
+                "year": round_seats["year"],
+                "month": round_seats["month"],
+                "day_num": round_seats["day_num"],
+                "round_name": round_seats["round_name"],
+                "round_time": round_seats["round_time"],
+                "count": len(round_seats["seats"]),
+            })
+            if counter >= max_rounds:
+                break
+
+    def write_manifest(self):
+        with open(self.directory / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+
+
+def record_concert(driver, concert, directory=None, max_review_pages=3, max_rounds=20):
+    """
+    상세 페이지가 열린 driver에서 상품/리뷰/좌석 페이지를 녹화합니다.
+    리뷰 탭을 연 뒤에는 달력 상태가 바뀔 수 있으므로 좌석을 먼저 녹화하고, 상세 페이지를 다시 열어 리뷰를 녹화합니다.
+    fixture 디렉터리 경로를 반환합니다.
+    """
+    recorder = PageRecorder(driver, concert, directory)
+    product_url = driver.current_url
+
+    recorder.record_product()
+    recorder.record_seats(max_rounds)
+
+    driver.get(product_url)
+    recorder.record_reviews(max_review_pages)
+
+    recorder.write_manifest()
+    logger.info(
+        f"[replay] [{concert}] 녹화 완료: 리뷰 {len(recorder.manifest['reviews'])}페이지, "
+        f"좌석 {len(recorder.manifest['seats'])}회차 -> {recorder.directory}"
+    )
+    return recorder.directory
+
+
+# ==================================================================
+# 재생 (fixture → 로컬 HTTP 서버)
+# ==================================================================
+
+class ReplayServer:
+    """
+    fixture 디렉터리를 로컬 HTTP로 제공하는 서버. Selenium과 HTTP 백엔드가 실제 사이트 대신 접속합니다.
+    - /<fixture>/<파일>: fixture 파일 그대로
+    - /<fixture>/reviews.html?page=N: reviews_pN.html
+      (공연 crawling_url을 url_for(fixture, "reviews.html")로 두면 REVIEW_HTTP_PAGE_URL 기본값과 맞음)
+    with 문으로 사용하면 백그라운드 스레드에서 실행하고 종료 시 정리합니다.
+    """
+
+    def __init__(self, root=None, host="127.0.0.1", port=0):
+        self.root = Path(root or fixture_root())
+        root_dir = str(self.root)
+
+        class Handler(SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=root_dir, **kwargs)
+
+            def translate_path(self, path):
+                parsed = urlparse(path)
+                if parsed.path.endswith(f"/{REVIEW_PAGE_NAME}"):
+                    page = parse_qs(parsed.query).get("page", ["1"])[0]
+                    path = parsed.path[: -len(REVIEW_PAGE_NAME)] + f"reviews_p{page}.html"
+                return super().translate_path(path)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, fixture, name):
+        return f"{self.base_url}/{Path(fixture).name}/{name}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ==================================================================
+# 벤치마크
+# ==================================================================
+
+class ParserBenchmark:
+    """
+    fixture 페이지에 대해 백엔드별 리뷰/좌석 파싱 속도를 측정합니다.
+    - lxml: 디스크의 HTML을 parsers 모듈로 파싱 (파싱 시간만)
+    - http: ReplayServer에서 requests로 받아 lxml로 파싱 (요청 + 파싱 시간)
+    - selenium: ReplayServer 페이지를 Chrome으로 연 뒤 크롤러의 요소별 추출로 추출 (추출 시간만, 페이지 로드는 별도 집계)
+    - script: selenium과 같지만 페이지당 스크립트 한 번으로 추출 (CRAWL_EXTRACTION_MODE='script')
+    """
+
+    def __init__(self, directories, repeat=3, server=None, driver=None, session=None):
+        self.directories = [Path(directory) for directory in directories]
+        self.repeat = repeat
+        self.server = server
+        self.driver = driver
+        self.session = session
+
+    def _pages(self, kind):
+        for directory in self.directories:
+            manifest = load_manifest(directory)
+            for entry in manifest.get(kind, []):
+                yield directory, entry["file"]
+
+    def _parse(self, backend, kind, directory, name):
+        """(추출한 건수, 측정 시간, 페이지 로드 시간)"""
+        if backend == "lxml":
+            html = (directory / name).read_text(encoding="utf-8")
+            started = time.perf_counter()
+            items = parse_review_items(html) if kind == "reviews" else parse_seat_items(html)
+            return len(items), time.perf_counter() - started, 0.0
+
+        url = self.server.url_for(directory, name)
+        if backend == "http":
+            started = time.perf_counter()
+            response = self.session.get(url, timeout=settings.REVIEW_HTTP_TIMEOUT)
+            response.raise_for_status()
+            items = parse_review_items(response.text) if kind == "reviews" else parse_seat_items(response.text)
+            return len(items), time.perf_counter() - started, 0.0
+
+        mode = "script" if backend == "script" else "element"
+        loaded = time.perf_counter()
+        self.driver.get(url)
+        started = time.perf_counter()
+        if kind == "reviews":
+            items = extract_review_page(self.driver, mode)
+        else:
+            _, items = extract_round_seats(self.driver, mode)
+        return len(items), time.perf_counter() - started, started - loaded
+
+    def run(self, backend):
+        """
+        백엔드 하나를 측정하고 {kind: {pages, items, seconds, load_seconds, per_sec}}를 반환합니다.
+        items/seconds는 repeat회 반복한 합계입니다.
+        """
+        result = {}
+        for kind in ("reviews", "seats"):
+            pages = items = 0
+            seconds = load_seconds = 0.0
+            for _ in range(self.repeat):
+                for directory, name in self._pages(kind):
+                    count, elapsed, load_elapsed = self._parse(backend, kind, directory, name)
+                    pages += 1
+                    items += count
+                    seconds += elapsed
+                    load_seconds += load_elapsed
+            result[kind] = {
+                "pages": pages,
+                "items": items,
+                "seconds": seconds,
+                "load_seconds": load_seconds,
+                "per_sec": items / seconds if seconds else 0.0,
+            }
+        return result
+
+
+def check_fixture(directory):
+    """
+    fixture를 lxml로 파싱한 결과가 녹화 당시 Selenium 추출 건수와 같은지 확인합니다.
+    다른 페이지의 [(파일, 녹화 건수, 파싱 건수), ...]를 반환합니다.
+    """
+    directory = Path(directory)
+    manifest = load_manifest(directory)
+    mismatches = []
+    for entry in manifest.get("reviews", []):
+        html = (directory / entry["file"]).read_text(encoding="utf-8")
+        if entry["page"] == 1 and manifest.get("review_total") is not None:
+            total = parse_review_total(html)
+            if total != manifest["review_total"]:
+                mismatches.append((entry["file"] + " (total)", manifest["review_total"], total))
+        parsed = len(parse_review_items(html))
+        if parsed != entry["count"]:
+            mismatches.append((entry["file"], entry["count"], parsed))
+    for entry in manifest.get("seats", []):
+        parsed = len(parse_seat_items((directory / entry["file"]).read_text(encoding="utf-8")))
+        if parsed != entry["count"]:
+            mismatches.append((entry["file"], entry["count"], parsed))
+    return mismatches
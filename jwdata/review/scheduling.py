@@ -0,0 +1,190 @@
+from datetime import timedelta
+import logging
+
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from django.utils.timezone import now
+
+from .models import Concert, CrawlRun, CrawlStep, Review, SeatSnapshot
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 작업별로 마지막 크롤링 시각을 판단할 실행 기록 종류
+TASK_RUN_TYPES = {
+    CrawlRun.TASK_REVIEWS: (CrawlRun.TASK_REVIEWS, CrawlRun.TASK_SPECIFIC_REVIEW),
+    CrawlRun.TASK_SEATS: (CrawlRun.TASK_SEATS,),
+}
+
+
+def proximity_score(concert, today):
+    """
+    공연 기간 기준 점수.
+    - 개막 전 CRAWL_PROXIMITY_DAYS일 이내, 폐막 전 CRAWL_PROXIMITY_DAYS일 이내: 1.0 (예매/후기가 몰리는 시기)
+    - 공연 중: 0.5
+    - 그 외(개막 한참 전, 폐막 후): 0
+    """
+    days = settings.CRAWL_PROXIMITY_DAYS
+    if concert.start_date and 0 <= (concert.start_date - today).days <= days:
+        return 1.0
+    if concert.start_date and concert.end_date and concert.start_date <= today <= concert.end_date:
+        return 1.0 if (concert.end_date - today).days <= days else 0.5
+    return 0.0
+
+
+def is_finished(concert, today):
+    """종료일 + CRAWL_END_GRACE_DAYS일이 지난 공연이면 True. (막공 후기가 올라오는 기간까지만 크롤링)"""
+    return bool(concert.end_date) and today > concert.end_date + timedelta(days=settings.CRAWL_END_GRACE_DAYS)
+
+
+def retry_hours(failures):
+    """연속 실패 횟수에 따른 재시도 간격(시간): CRAWL_FAILURE_RETRY_HOURS * 2^(실패 횟수 - 1), 최대 간격으로 제한."""
+    return min(settings.CRAWL_MAX_INTERVAL_HOURS, settings.CRAWL_FAILURE_RETRY_HOURS * 2 ** (failures - 1))
+
+
+def interval_for_score(score):
+    """
+    점수에 따른 크롤링 간격(시간). 기본 간격을 (1 + 점수)로 나누고 최소/최대 간격으로 제한합니다.
+    점수가 CRAWL_COLD_SCORE 미만인 공연은 최대 간격으로 뒤로 미룹니다.
+    """
+    if score < settings.CRAWL_COLD_SCORE:
+        return settings.CRAWL_MAX_INTERVAL_HOURS
+    hours = settings.CRAWL_BASE_INTERVAL_HOURS / (1 + score)
+    return max(settings.CRAWL_MIN_INTERVAL_HOURS, min(settings.CRAWL_MAX_INTERVAL_HOURS, hours))
+
+
+class CrawlScheduler:
+    """
+    공연별 크롤링 우선순위 점수와 다음 크롤링 시각을 계산합니다.
+    점수 = 최근 리뷰 속도 + 좌석 변동률 + 공연 기간 근접도
+    - 리뷰 속도: 최근 CRAWL_VELOCITY_DAYS일 작성 리뷰 수/일 ÷ CRAWL_HOT_REVIEWS_PER_DAY (최대 2)
+    - 좌석 변동률: 같은 기간 좌석 수집에서 바뀐 좌석 비율 ÷ CRAWL_HOT_SEAT_CHURN (최대 2)
+    - 근접도: proximity_score
+    점수가 높을수록 자주, 낮을수록 드물게 크롤링하며 종료일 + 유예 기간이 지난 공연은 크롤링하지 않습니다.
+    다음 크롤링 시각은 마지막 시도 기준이며, 마지막 시도가 실패했으면 점수 간격 대신 retry_hours로 재시도합니다.
+    (계속 실패하는 공연이 매 실행마다 다시 크롤링되지 않도록)
+    """
+
+    def __init__(self, task=CrawlRun.TASK_REVIEWS, at=None):
+        self.task = task
+        self.at = at or now()
+        self.today = self.at.date()
+        self.since = self.at - timedelta(days=settings.CRAWL_VELOCITY_DAYS)
+
+    def _review_velocity(self, concert_ids):
+        rows = (
+            Review.objects.filter(concert_id__in=concert_ids, date__gte=self.since.date())
+            .values("concert_id")
+            .annotate(reviews=Count("id"))
+        )
+        days = settings.CRAWL_VELOCITY_DAYS
+        return {row["concert_id"]: row["reviews"] / days for row in rows}
+
+    def _seat_churn(self, concert_ids):
+        rows = (
+            SeatSnapshot.objects.filter(concert_id__in=concert_ids, created_at__gte=self.since)
+            .values("concert_id")
+            .annotate(seen=Sum("seen_count"), changed=Sum("changed_count"))
+        )
+        return {row["concert_id"]: row["changed"] / row["seen"] for row in rows if row["seen"]}
+
+    def _steps(self, concert_ids):
+        return CrawlStep.objects.filter(
+            concert_id__in=concert_ids,
+            kind=CrawlStep.KIND_CONCERT,
+            run__task__in=TASK_RUN_TYPES.get(self.task, (self.task,)),
+        )
+
+    def _last_attempts(self, concert_ids):
+        """
+        공연별 (마지막 성공 시각, 마지막 시도 시각, 마지막 성공 이후 연속 실패 횟수).
+        한 번도 성공하지 못한 공연은 성공 시각이 None이고, 실패한 시도도 모두 연속 실패로 셉니다.
+        """
+        steps = self._steps(concert_ids)
+        succeeded = {
+            row["concert_id"]: row["last"]
+            for row in steps.filter(error="").values("concert_id").annotate(last=Max("started_at"))
+        }
+        attempted = {
+            row["concert_id"]: row["last"]
+            for row in steps.values("concert_id").annotate(last=Max("started_at"))
+        }
+        failures = {}
+        for concert_id, started_at in steps.exclude(error="").values_list("concert_id", "started_at"):
+            last_success = succeeded.get(concert_id)
+            if last_success is None or started_at > last_success:
+                failures[concert_id] = failures.get(concert_id, 0) + 1
+        return {
+            concert_id: (succeeded.get(concert_id), last_at, failures.get(concert_id, 0))
+            for concert_id, last_at in attempted.items()
+        }
+
+    def plan(self, concerts=None):
+        """
+        공연별 계획 목록을 점수 높은 순으로 반환합니다.
+        [{concert, score, velocity, churn, proximity, interval_hours, last_crawled_at, last_attempted_at, failures,
+          next_at, is_due, is_finished}, ...]
+        """
+        if concerts is None:
+            concerts = Concert.objects.filter(is_crawling_enabled=True)
+        concerts = list(concerts)
+        concert_ids = [concert.id for concert in concerts]
+        velocity = self._review_velocity(concert_ids)
+        churn = self._seat_churn(concert_ids)
+        last_attempts = self._last_attempts(concert_ids)
+
+        plans = []
+        for concert in concerts:
+            finished = is_finished(concert, self.today)
+            review_rate = velocity.get(concert.id, 0.0)
+            seat_churn = churn.get(concert.id, 0.0)
+            proximity = proximity_score(concert, self.today)
+            score = (
+                min(review_rate / settings.CRAWL_HOT_REVIEWS_PER_DAY, 2.0)
+                + min(seat_churn / settings.CRAWL_HOT_SEAT_CHURN, 2.0)
+                + proximity
+            )
+            interval_hours = interval_for_score(score)
+            last_crawled_at, last_attempted_at, failures = last_attempts.get(concert.id, (None, None, 0))
+            if finished:
+                next_at = None
+            elif last_attempted_at is None:
+                next_at = self.at
+            else:
+                next_at = last_attempted_at + timedelta(hours=retry_hours(failures) if failures else interval_hours)
+            plans.append({
+                "concert": concert,
+                "score": score,
+                "velocity": review_rate,
+                "churn": seat_churn,
+                "proximity": proximity,
+                "interval_hours": interval_hours,
+                "last_crawled_at": last_crawled_at,
+                "last_attempted_at": last_attempted_at,
+                "failures": failures,
+                "next_at": next_at,
+                "is_due": next_at is not None and next_at <= self.at,
+                "is_finished": finished,
+            })
+
+        plans.sort(key=lambda plan: plan["score"], reverse=True)
+        return plans
+
+    def due_plans(self, concerts=None):
+        """지금 크롤링할 공연의 계획 목록 (점수 높은 순). 종료된 공연과 대상 공연을 로그로 남깁니다."""
+        plans = self.plan(concerts)
+        finished = [plan["concert"].name for plan in plans if plan["is_finished"]]
+        if finished:
+            logger.info(f"[scheduling] 종료 후 유예 기간이 지나 크롤링하지 않는 공연 {len(finished)}개: {', '.join(finished)}")
+        due = [plan for plan in plans if plan["is_due"]]
+        for plan in due:
+            logger.info(
+                f"[scheduling] [{plan['concert']}] 점수 {plan['score']:.2f} "
+                f"(리뷰 {plan['velocity']:.1f}/일, 좌석 변동 {plan['churn']:.0%}, 근접도 {plan['proximity']}) "
+                f"간격 {plan['interval_hours']:.1f}시간" + (f", 연속 실패 {plan['failures']}회" if plan["failures"] else "")
+            )
+        return due
+
+    def due_concert_ids(self, concerts=None):
+        """지금 크롤링할 공연 id 목록 (점수 높은 순)."""
+        return [plan["concert"].id for plan in self.due_plans(concerts)]
@@ -0,0 +1,563 @@
+import asyncio
+import hashlib
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from openai import APIConnectionError, APITimeoutError, AsyncOpenAI, InternalServerError, RateLimitError
+
+from .models import Concert, Review, SentimentCache
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+SENTIMENT_LABELS = ("긍정", "중립", "부정")
+SENTIMENT_SYSTEM_PROMPT = "당신은 공연 리뷰 감정 분석 전문가입니다."
+SENTIMENT_CRITERIA = """
+    분석 기준:
+    1. 공연 특수성 고려
+    - 슬픈 내용의 공연에서 울었다는 것은 긍정적 반응
+    - 배우의 연기가 너무 실감나서 불편했다는 것은 긍정적 반응
+    - 공연장 시설, 관람 환경 관련 내용은 별도로 구분
+
+    2. 감정 판단 기준
+    - 긍정: 감동, 재미, 만족, 호평, 추천 의사 등
+    - 중립: 장단점 공존, 객관적 서술만 있는 경우
+    - 부정: 실망, 불만족, 비추천, 부정적 경험
+
+    3. 주의사항
+    - 공연 자체의 내용과 관람 경험을 구분하여 판단
+    - 티켓 가격 대비 만족도 고려
+    - 공연의 장르별 특성 반영
+"""
+
+
+def normalize_sentiment(text):
+    """응답 문자열에서 '긍정', '중립', '부정' 중 하나를 찾습니다. 없으면 None."""
+    for label in SENTIMENT_LABELS:
+        if label in (text or ""):
+            return label
+    return None
+
+
+def build_batch_sentiment_prompt(items):
+    """
+    여러 리뷰를 한 번에 분류하는 프롬프트.
+    items: [(review_id, 리뷰 내용), ...] (리뷰 내용은 SENTIMENT_MAX_REVIEW_CHARS자까지만 보냄)
+    """
+    reviews = "\n".join(
+        json.dumps({"id": review_id, "review": text[:settings.SENTIMENT_MAX_REVIEW_CHARS]}, ensure_ascii=False)
+        for review_id, text in items
+    )
+    return f"""
+    아래 공연 리뷰 {len(items)}개의 감정을 각각 분석해주세요.
+{SENTIMENT_CRITERIA}
+    위 기준을 바탕으로 리뷰마다 '긍정', '중립', '부정' 중 하나를 골라
+    아래 JSON 형식으로만 답변해주세요. 모든 id를 한 번씩 포함해야 합니다.
+    {{"results": [{{"id": 리뷰 id, "sentiment": "긍정"}}, ...]}}
+
+    리뷰 목록 (한 줄에 리뷰 하나, JSON):
+{reviews}
+    """
+
+
+def batch_sentiment_request(items):
+    """리뷰 배치 분류 요청 본문 (chat.completions 인자, 배치 작업 JSONL의 body)"""
+    return {
+        "model": settings.SENTIMENT_MODEL,
+        "messages": [
+            {"role": "system", "content": SENTIMENT_SYSTEM_PROMPT},
+            {"role": "user", "content": build_batch_sentiment_prompt(items)},
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0,
+    }
+
+def parse_batch_sentiments(content, review_ids):
+    """
+    배치 응답(JSON)에서 {review_id: 감정}을 읽습니다.
+    요청하지 않은 id, 알 수 없는 감정, 형식이 맞지 않는 항목은 버립니다. (호출한 쪽에서 빠진 id만 다시 요청)
+    """
+    content = (content or "").strip()
+    if content.startswith("```"):
+        # 코드 블록으로 감싼 응답
+        content = content.strip("`").removeprefix("json").strip()
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return {}
+
+    if isinstance(data, dict):
+        records = data.get("results")
+        if records is None:
+            # {"리뷰 id": "감정", ...} 형식
+            records = [{"id": key, "sentiment": value} for key, value in data.items()]
+    else:
+        records = data
+    if not isinstance(records, list):
+        return {}
+
+    ids = {str(review_id): review_id for review_id in review_ids}
+    sentiments = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        review_id = ids.get(str(record.get("id")))
+        sentiment = normalize_sentiment(str(record.get("sentiment", "")))
+        if review_id is not None and sentiment:
+            sentiments[review_id] = sentiment
+    return sentiments
+
+
+def estimate_tokens(prompt, review_count):
+    """요청 토큰 수 추정치 (한글은 글자당 1토큰 안팎으로 보고 크게 잡음, 응답은 리뷰당 15토큰)"""
+    return len(SENTIMENT_SYSTEM_PROMPT) + len(prompt) + review_count * 15
+
+
+def retry_after_seconds(error):
+    """429 응답의 retry-after(-ms) 헤더 값(초). 없으면 None."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+class TokenBucket:
+    """
+    분당 한도(per_minute)만큼 채워지는 토큰 버킷. acquire(amount)는 토큰이 쌓일 때까지 기다립니다.
+    per_minute가 0 이하이면 제한하지 않습니다. 이벤트 루프 안에서 만들어야 합니다.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        at = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (at - self.updated) * self.rate)
+        self.updated = at
+
+    async def acquire(self, amount=1):
+        if self.capacity <= 0:
+            return
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+    def adjust(self, amount):
+        """추정치와 실제 사용량의 차이를 돌려주거나(+) 더 뺍니다(-)."""
+        if self.capacity > 0:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def drain(self):
+        """429를 받았을 때 쌓인 토큰을 비워 다른 요청도 함께 늦춥니다."""
+        if self.capacity > 0:
+            self._refill()
+            self.tokens = min(self.tokens, 0)
+
+
+class SentimentEngine:
+    """
+    비동기 OpenAI 클라이언트로 리뷰 배치(SENTIMENT_BATCH_SIZE개)를 동시에 여러 개 분류하는 엔진.
+    - 동시 요청 수: 최대 SENTIMENT_CONCURRENCY개, 429를 받으면 절반으로 줄이고 성공할 때마다 하나씩 회복
+    - 분당 요청 수/토큰 수: SENTIMENT_REQUESTS_PER_MINUTE, SENTIMENT_TOKENS_PER_MINUTE 토큰 버킷
+      (토큰은 요청 전에 추정치로 빼고 응답의 usage로 보정)
+    - 429/일시적 오류: retry-after 헤더 또는 지수 백오프(최대 SENTIMENT_MAX_BACKOFF_SECONDS초) 동안 모든 요청을 멈추고
+      SENTIMENT_API_MAX_RETRIES번까지 재시도
+    - 응답에서 빠진 리뷰만 SENTIMENT_BATCH_MAX_RETRIES번까지 다시 요청 (chatgpt.analyze_sentiments와 같음)
+    이벤트 루프는 별도 스레드에서 돌고, 결과는 run()을 호출한 스레드에서 on_result로 전달됩니다. (DB 저장은 호출한 스레드에서)
+    """
+
+    def __init__(self, client=None, concurrency=None, requests_per_minute=None, tokens_per_minute=None,
+                 batch_size=None, max_retries=None, api_max_retries=None, max_backoff=None):
+        self.client = client
+        self.concurrency = concurrency or settings.SENTIMENT_CONCURRENCY
+        self.requests_per_minute = settings.SENTIMENT_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+        self.tokens_per_minute = settings.SENTIMENT_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        self.batch_size = batch_size or settings.SENTIMENT_BATCH_SIZE
+        self.max_retries = settings.SENTIMENT_BATCH_MAX_RETRIES if max_retries is None else max_retries
+        self.api_max_retries = settings.SENTIMENT_API_MAX_RETRIES if api_max_retries is None else api_max_retries
+        self.max_backoff = settings.SENTIMENT_MAX_BACKOFF_SECONDS if max_backoff is None else max_backoff
+        self.stats = {"requests": 0, "rate_limited": 0, "errors": 0, "tokens": 0}
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # 동시 요청 수 / 백오프
+    # ------------------------------------------------------------------
+    async def _acquire_slot(self):
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < self._limit)
+            self._in_flight += 1
+
+    async def _release_slot(self, succeeded=False):
+        """슬롯을 반납합니다. 성공한 요청이면 동시 요청 수를 하나 늘린 뒤 기다리는 요청을 깨웁니다."""
+        async with self._slots:
+            self._in_flight -= 1
+            if succeeded:
+                self._on_success()
+            self._slots.notify_all()
+
+    async def _wait_cooldown(self):
+        loop = asyncio.get_running_loop()
+        while loop.time() < self._resume_at:
+            await asyncio.sleep(self._resume_at - loop.time())
+
+    def _back_off(self, error, rate_limited):
+        self._consecutive_errors += 1
+        delay = retry_after_seconds(error) if rate_limited else None
+        if delay is None:
+            delay = min(self.max_backoff, 2 ** (self._consecutive_errors - 1))
+        delay += random.uniform(0, delay * 0.1)
+        self._resume_at = max(self._resume_at, asyncio.get_running_loop().time() + delay)
+        if rate_limited:
+            self.stats["rate_limited"] += 1
+            self._limit = max(1, self._limit // 2)
+            self._requests.drain()
+            self._tokens.drain()
+        else:
+            self.stats["errors"] += 1
+        logger.warning(f"[sentiments] {type(error).__name__}: {delay:.1f}초 대기, 동시 요청 {self._limit}개로 조정")
+
+    def _on_success(self):
+        self._consecutive_errors = 0
+        self._limit = min(self.concurrency, self._limit + 1)
+
+    # ------------------------------------------------------------------
+    # 요청
+    # ------------------------------------------------------------------
+    async def _request(self, items):
+        """배치 한 번 요청하여 {review_id: 감정}을 반환합니다. 재시도 횟수를 넘기면 마지막 오류를 발생시킵니다."""
+        prompt = build_batch_sentiment_prompt(items)
+        estimated = estimate_tokens(prompt, len(items))
+        for attempt in range(self.api_max_retries + 1):
+            await self._wait_cooldown()
+            await self._requests.acquire(1)
+            await self._tokens.acquire(estimated)
+            await self._acquire_slot()
+            succeeded = False
+            try:
+                self.stats["requests"] += 1
+                response = await self._client.chat.completions.create(
+                    messages=[
+                        {"role": "system", "content": SENTIMENT_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    model=settings.SENTIMENT_MODEL,
+                    response_format={"type": "json_object"},
+                    temperature=0,
+                )
+                succeeded = True
+            except (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError) as e:
+                if attempt >= self.api_max_retries:
+                    raise
+                self._back_off(e, rate_limited=isinstance(e, RateLimitError))
+                continue
+            finally:
+                await self._release_slot(succeeded)
+
+            usage = getattr(response, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                self.stats["tokens"] += usage.total_tokens
+                self._tokens.adjust(estimated - usage.total_tokens)
+            return parse_batch_sentiments(response.choices[0].message.content, [review_id for review_id, _ in items])
+
+    async def _classify(self, items):
+        sentiments = {}
+        pending = items
+        for attempt in range(self.max_retries + 1):
+            sentiments.update(await self._request(pending))
+            pending = [(review_id, text) for review_id, text in pending if review_id not in sentiments]
+            if not pending:
+                break
+        return sentiments
+
+    async def _worker(self, batches, results):
+        while not self._stop.is_set():
+            try:
+                batch = batches.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                results.put((batch, await self._classify(batch), None))
+            except Exception as e:
+                results.put((batch, {}, e))
+
+    async def _run(self, batches, results):
+        self._client = self.client or AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self._requests = TokenBucket(self.requests_per_minute)
+        self._tokens = TokenBucket(self.tokens_per_minute)
+        self._slots = asyncio.Condition()
+        self._in_flight = 0
+        self._limit = self.concurrency
+        self._resume_at = 0
+        self._consecutive_errors = 0
+
+        queued = asyncio.Queue()
+        for batch in batches:
+            queued.put_nowait(batch)
+        try:
+            await asyncio.gather(*(self._worker(queued, results) for _ in range(self.concurrency)))
+        finally:
+            if self.client is None:
+                await self._client.close()
+
+    def run(self, items, on_result):
+        """
+        items([(review_id, 리뷰 내용), ...])를 분류합니다.
+        배치가 끝날 때마다 호출한 스레드에서 on_result(batch, {review_id: 감정}, error)를 실행합니다. (error는 실패한 배치만)
+        on_result에서 예외가 나면 남은 배치는 요청하지 않고 그 예외를 다시 발생시킵니다.
+        """
+        batches = [items[start:start + self.batch_size] for start in range(0, len(items), self.batch_size)]
+        results = queue.Queue()
+        errors = []
+
+        def loop():
+            try:
+                asyncio.run(self._run(batches, results))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                results.put(_DONE)
+
+        thread = threading.Thread(target=loop, name="sentiment-engine", daemon=True)
+        started = time.monotonic()
+        thread.start()
+        try:
+            while (item := results.get()) is not _DONE:
+                on_result(*item)
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+        logger.info(
+            f"[sentiments] 리뷰 {len(items)}개, 배치 {len(batches)}개 {time.monotonic() - started:.1f}초 "
+            f"(요청 {self.stats['requests']}회, 429 {self.stats['rate_limited']}회, 오류 {self.stats['errors']}회, 토큰 {self.stats['tokens']})"
+        )
+        return self.stats
+
+
+def normalize_review_text(text):
+    """캐시 키용 정규화: 유니코드(NFKC), 소문자, 문장부호/이모지/공백 차이는 무시"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return NON_WORD_PATTERN.sub(" ", text).strip()
+
+
+def review_text_hash(text):
+    return hashlib.sha256(normalize_review_text(text).encode("utf-8")).hexdigest()
+
+
+def sentiment_prompt_version():
+    """
+    모델과 프롬프트(시스템 프롬프트, 분석 기준, 배치 프롬프트 형식, 보내는 글자 수)의 해시.
+    프롬프트를 바꾸면 버전이 바뀌어 그 버전의 캐시만 새로 채워집니다. (이전 버전의 결과는 그대로 남음)
+    """
+    source = "\n".join([
+        settings.SENTIMENT_MODEL,
+        SENTIMENT_SYSTEM_PROMPT,
+        build_batch_sentiment_prompt([]),
+        str(settings.SENTIMENT_MAX_REVIEW_CHARS),
+    ])
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+def enabled_concert_ids(reviews):
+    """리뷰들의 공연 중 지금 감정분석이 활성화된 공연 id (저장 직전에 다시 확인하는 용도)"""
+    return set(Concert.objects.filter(
+        id__in={review.concert_id for review in reviews}, is_sentiment_enabled=True
+    ).values_list("id", flat=True))
+
+
+def skip_disabled_reviews(reviews, results):
+    """감정분석이 비활성화된 공연의 리뷰를 건너뜀으로 기록하고, 활성화된 공연의 리뷰 목록을 반환합니다."""
+    enabled_ids = enabled_concert_ids(reviews)
+    for review in reviews:
+        if review.concert_id not in enabled_ids:
+            results["skipped"] += 1
+            results["errors"].append({
+                "review_id": review.id,
+                "title": review.title,
+                "error": "공연의 감정분석이 비활성화되어 있음"
+            })
+    return [review for review in reviews if review.concert_id in enabled_ids]
+
+
+def apply_sentiment_cache(reviews, results, version=None):
+    """
+    캐시에 결과가 있는 리뷰는 감정을 바로 저장하고, 나머지는 같은 내용(정규화 해시)끼리 묶어 첫 리뷰만 남깁니다.
+    감정분석이 비활성화된 공연의 리뷰는 저장하지도 요청하지도 않습니다.
+    (요청할 리뷰 목록, {요청할 리뷰 id: [같은 내용의 다른 리뷰, ...]}, {리뷰 id: 해시})를 반환합니다.
+    """
+    version = version or sentiment_prompt_version()
+    reviews = skip_disabled_reviews(reviews, results)
+    hashes = {review.id: review_text_hash(review.description) for review in reviews}
+    unique_hashes = list(set(hashes.values()))
+    cached = {}
+    for start in range(0, len(unique_hashes), 500):
+        cached.update(SentimentCache.objects.filter(
+            prompt_version=version, text_hash__in=unique_hashes[start:start + 500]
+        ).values_list("text_hash", "sentiment"))
+
+    hits = []
+    requests = []
+    duplicates = defaultdict(list)
+    first_by_hash = {}
+    for review in reviews:
+        text_hash = hashes[review.id]
+        if text_hash in cached:
+            review.emotion = cached[text_hash]
+            hits.append(review)
+        elif text_hash in first_by_hash:
+            duplicates[first_by_hash[text_hash].id].append(review)
+        else:
+            first_by_hash[text_hash] = review
+            requests.append(review)
+
+    if hits:
+        with transaction.atomic():
+            Review.objects.bulk_update(hits, ["emotion"], batch_size=settings.SENTIMENT_WRITE_BATCH_SIZE)
+        results["success"] += len(hits)
+    logger.info(
+        f"[sentiments] 리뷰 {len(reviews)}개 중 캐시 {len(hits)}개, "
+        f"같은 내용 {sum(len(group) for group in duplicates.values())}개, 요청 {len(requests)}개 (버전 {version})"
+    )
+    return requests, duplicates, hashes
+
+
+def cache_sentiments(sentiments, version=None):
+    """{해시: 감정}을 캐시에 저장합니다. (이미 있는 해시는 그대로 둠)"""
+    version = version or sentiment_prompt_version()
+    SentimentCache.objects.bulk_create(
+        [SentimentCache(text_hash=text_hash, prompt_version=version, sentiment=sentiment) for text_hash, sentiment in sentiments.items()],
+        batch_size=settings.SENTIMENT_WRITE_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def fill_sentiment_cache(requests, duplicates, hashes, results, version=None):
+    """GPT에 요청한 리뷰의 결과를 캐시에 저장하고, 같은 내용의 다른 리뷰에도 같은 감정을 저장합니다."""
+    cache_sentiments(
+        {hashes[review.id]: review.emotion for review in requests if review.emotion in SENTIMENT_LABELS},
+        version=version,
+    )
+    copy_duplicate_sentiments(requests, duplicates, results)
+
+
+def copy_duplicate_sentiments(reviews, duplicates, results):
+    """
+    reviews의 감정(과 감정 분석 방법)을 같은 내용의 다른 리뷰에 복사하여 저장합니다.
+    감정분석이 비활성화된 공연의 리뷰에는 저장하지 않습니다.
+    """
+    enabled_ids = enabled_concert_ids([duplicate for review in reviews for duplicate in duplicates.get(review.id, [])])
+    copies = []
+    for review in reviews:
+        for duplicate in duplicates.get(review.id, []):
+            if duplicate.concert_id not in enabled_ids:
+                results["skipped"] += 1
+                results["errors"].append({
+                    "review_id": duplicate.id,
+                    "title": duplicate.title,
+                    "error": "공연의 감정분석이 비활성화되어 있음"
+                })
+            elif review.emotion in SENTIMENT_LABELS:
+                duplicate.emotion = review.emotion
+                duplicate.emotion_source = review.emotion_source
+                copies.append(duplicate)
+            else:
+                results["skipped"] += 1
+                results["errors"].append({
+                    "review_id": duplicate.id,
+                    "title": duplicate.title,
+                    "error": "같은 내용 리뷰의 감정 분석 결과가 없음"
+                })
+    if copies:
+        with transaction.atomic():
+            Review.objects.bulk_update(copies, ["emotion", "emotion_source"], batch_size=settings.SENTIMENT_WRITE_BATCH_SIZE)
+        results["success"] += len(copies)
+
+
+def update_reviews_sentiment_async(reviews, results):
+    """
+    리뷰 목록을 SentimentEngine으로 분류하고 SENTIMENT_WRITE_BATCH_SIZE개씩 bulk_update로 저장합니다.
+    저장할 때 공연의 감정분석 활성화 상태를 다시 확인합니다. results는 chatgpt의 결과 집계 dict.
+    비활성화되어 저장하지 않는 리뷰의 결과도 캐시에는 남깁니다. (이미 비용을 낸 결과)
+    """
+    reviews = {review.id: review for review in reviews}
+    pending = []
+
+    def flush():
+        if not pending:
+            return
+        enabled_ids = enabled_concert_ids(pending)
+        updated = []
+        disabled = {}
+        for review in pending:
+            if review.concert_id in enabled_ids:
+                updated.append(review)
+                results["success"] += 1
+            else:
+                disabled[review_text_hash(review.description)] = review.emotion
+                review.emotion = None
+                results["skipped"] += 1
+                results["errors"].append({
+                    "review_id": review.id,
+                    "title": review.title,
+                    "error": "공연의 감정분석이 비활성화되어 있음"
+                })
+        with transaction.atomic():
+            Review.objects.bulk_update(updated, ["emotion"], batch_size=settings.SENTIMENT_WRITE_BATCH_SIZE)
+            cache_sentiments(disabled)
+        logger.info(f"[sentiments] 감정 {len(updated)}개 저장 ({results['success']}/{results['total']})")
+        pending.clear()
+
+    def on_result(batch, sentiments, error):
+        for review_id, _ in batch:
+            review = reviews[review_id]
+            if error is not None:
+                results["failed"] += 1
+                results["errors"].append({"review_id": review.id, "title": review.title, "error": str(error)})
+            elif review_id in sentiments:
+                review.emotion = sentiments[review_id]
+                pending.append(review)
+            else:
+                results["skipped"] += 1
+                results["errors"].append({"review_id": review.id, "title": review.title, "error": "감정 분석 결과가 없음"})
+        if error is not None:
+            logger.error(f"[sentiments] 리뷰 {len(batch)}개 (ID {batch[0][0]}~{batch[-1][0]}) 분석 실패: {error}")
+        if len(pending) >= settings.SENTIMENT_WRITE_BATCH_SIZE:
+            flush()
+
+    try:
+        SentimentEngine().run([(review.id, review.description) for review in reviews.values()], on_result)
+    finally:
+        # 중간에 실패해도 받은 결과는 저장
+        flush()
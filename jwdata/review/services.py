@@ -1,15 +1,17 @@
-from django.db.models import Avg, Count, F, Min
-from django.db.models.functions import Cast, Concat, Length
+from django.db.models import Avg, Count, F, Min, Max, Q, Sum
+from django.db.models.functions import Cast, Concat, Length, TruncDate
 from django.db.models import CharField, Value
+from django.utils.timezone import now
 from datetime import date, timedelta
-from .models import Review, Concert, Seat
+from .models import Review, Concert, RoundCasting, Seat, SeatSnapshot, SeatState, CrawlRun, CrawlStep
 from .utils import preprocess_text, comma_format, clean_text
 from collections import Counter, defaultdict
 import pandas as pd
 from konlpy.tag import Okt
 from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 from sklearn.cluster import KMeans
-from itertools import combinations
+from itertools import combinations, groupby
+from bisect import bisect_left, bisect_right
 
 class ConcertAnalysisService:
     def __init__(self, concert_id):
@@ -607,35 +609,8 @@ class AllAnalysisService:
         } for r in reviews]
 
     def get_seat_data(self, concert_name=None):
-        """좌석 데이터를 분석합니다."""
-        # 날짜 필드 생성
-        seats_with_date = self.seats.annotate(
-            date=Concat(
-                Cast(F("year"), output_field=CharField()),
-                Value("-"),
-                Cast(F("month"), output_field=CharField()),
-                Value("-"),
-                Cast(F("day_num"), output_field=CharField()),
-            )
-        )
-
-        # 공연 필터링
-        if concert_name:
-            seats_with_date = seats_with_date.filter(concert__name=concert_name)
-
-        # 데이터 정렬 및 필드 선택
-        seat_data = seats_with_date.order_by(
-            "concert__name", "date", "day_str", "round_name", "seat_class", "created_at"
-        ).values(
-            "concert__name",
-            "date",
-            "day_str",
-            "round_name",
-            "seat_class",
-            "created_at",
-            "seat_count",
-            "actors",
-        )
+        """좌석 데이터를 분석합니다. (공연을 선택한 경우 수집 시각별 현황을 변경분에서 복원)"""
+        seat_data = SeatHistoryService(concert_name).get_time_series() if concert_name else []
 
         return {
             "seat_data": seat_data,
@@ -724,4 +699,238 @@ class AllAnalysisService:
                 sankey_data["link"]["target"].append(node_index[target])
                 sankey_data["link"]["value"].append(1)
 
-        return sankey_data 
\ No newline at end of file
+        return sankey_data 
+
+
+class SeatHistoryService:
+    """
+    변경분만 저장된 Seat 행을 수집 시각별 전체 현황(시계열)으로 복원합니다.
+    좌석 하나의 값은 처음 저장된 시각부터 마지막으로 확인된 시각(SeatState.last_seen_at)까지
+    공연의 수집 시각(SeatSnapshot)마다 직전 변경값으로 채웁니다.
+    """
+
+    def __init__(self, concert_name=None):
+        self.concerts = Concert.objects.all()
+        if concert_name:
+            self.concerts = self.concerts.filter(name=concert_name)
+
+    def get_time_series(self):
+        """
+        수집 시각별 좌석 현황 목록. 기존 Seat.values() 결과와 같은 키와 정렬을 사용합니다.
+        [{concert__name, date, day_str, round_name, seat_class, created_at, seat_count, actors}, ...]
+        """
+        concert_ids = list(self.concerts.values_list("id", flat=True))
+        changes = list(
+            Seat.objects.filter(concert_id__in=concert_ids)
+            .order_by("concert_id", "year", "month", "day_num", "round_name", "seat_class", "created_at")
+            .values(
+                "concert_id", "concert__name", "year", "month", "day_num", "day_str",
+                "round_name", "seat_class", "created_at", "seat_count", "actors",
+            )
+        )
+
+        # 공연별 수집 시각 (수집 기록이 없는 예전 데이터는 Seat 저장 시각으로 보완)
+        timelines = defaultdict(set)
+        for concert_id, created_at in SeatSnapshot.objects.filter(concert_id__in=concert_ids).values_list("concert_id", "created_at"):
+            timelines[concert_id].add(created_at)
+        for change in changes:
+            timelines[change["concert_id"]].add(change["created_at"])
+        timelines = {concert_id: sorted(times) for concert_id, times in timelines.items()}
+
+        last_seen = {
+            (row["concert_id"], row["year"], row["month"], row["day_num"], row["round_name"], row["seat_class"]): row["last_seen_at"]
+            for row in SeatState.objects.filter(concert_id__in=concert_ids).values(
+                "concert_id", "year", "month", "day_num", "round_name", "seat_class", "last_seen_at"
+            )
+        }
+
+        def seat_key(change):
+            return (change["concert_id"], change["year"], change["month"], change["day_num"], change["round_name"], change["seat_class"])
+
+        series = []
+        for key, group in groupby(changes, key=seat_key):
+            group = list(group)
+            times = timelines[key[0]]
+            end = last_seen.get(key) or group[-1]["created_at"]
+            start_index = bisect_left(times, group[0]["created_at"])
+            end_index = bisect_right(times, max(end, group[-1]["created_at"]))
+
+            index = 0
+            for created_at in times[start_index:end_index]:
+                # created_at 시점의 값 = 그 시각 이전의 마지막 변경
+                while index + 1 < len(group) and group[index + 1]["created_at"] <= created_at:
+                    index += 1
+                change = group[index]
+                series.append({
+                    "concert__name": change["concert__name"],
+                    "date": f"{change['year']}-{change['month']}-{change['day_num']}",
+                    "day_str": change["day_str"],
+                    "round_name": change["round_name"],
+                    "seat_class": change["seat_class"],
+                    "created_at": created_at,
+                    "seat_count": change["seat_count"],
+                    "actors": change["actors"],
+                })
+
+        series.sort(key=lambda row: (
+            row["concert__name"], row["date"], row["day_str"], row["round_name"], row["seat_class"], row["created_at"]
+        ))
+        return series
+
+
+class CastingSeatService:
+    """
+    회차별 캐스팅 색인(RoundCasting)과 좌석 최신 상태(SeatState)로 배우별 잔여석 현황을 계산합니다.
+    today(기본 오늘) 이후 회차만 잔여석/매진 집계에 포함합니다.
+    """
+
+    def __init__(self, concert_name, today=None):
+        self.concert = Concert.objects.filter(name=concert_name).first()
+        self.today = today or date.today()
+
+    def _round_seats(self):
+        """{(year, month, day_num, round_name): {"round_time", "seats": {좌석 등급: 잔여석}, "remaining"}} (오늘 이후 회차)"""
+        rounds = {}
+        states = SeatState.objects.filter(concert=self.concert).values(
+            "year", "month", "day_num", "round_name", "round_time", "seat_class", "seat_count"
+        )
+        for state in states:
+            if date(state["year"], state["month"], state["day_num"]) < self.today:
+                continue
+            key = (state["year"], state["month"], state["day_num"], state["round_name"])
+            round_seats = rounds.setdefault(key, {"round_time": state["round_time"], "seats": {}, "remaining": 0})
+            round_seats["seats"][state["seat_class"]] = state["seat_count"]
+            round_seats["remaining"] += state["seat_count"]
+        return rounds
+
+    def _castings(self, actor_name=None):
+        castings = RoundCasting.objects.filter(concert=self.concert)
+        if actor_name:
+            castings = castings.filter(actor__name=actor_name)
+        return castings.values("actor__name", "year", "month", "day_num", "round_name")
+
+    def get_actor_summary(self):
+        """
+        배우별 요약을 남은 회차가 많은 순으로 반환합니다.
+        [{actor, rounds, remaining_seats, avg_remaining, sold_out_rounds}, ...]
+        """
+        if self.concert is None:
+            return []
+        round_seats = self._round_seats()
+        summary = {}
+        for casting in self._castings():
+            key = (casting["year"], casting["month"], casting["day_num"], casting["round_name"])
+            row = summary.setdefault(casting["actor__name"], {
+                "actor": casting["actor__name"], "rounds": 0, "remaining_seats": 0, "sold_out_rounds": 0,
+            })
+            if key not in round_seats:
+                continue
+            row["rounds"] += 1
+            row["remaining_seats"] += round_seats[key]["remaining"]
+            row["sold_out_rounds"] += round_seats[key]["remaining"] == 0
+        for row in summary.values():
+            row["avg_remaining"] = row["remaining_seats"] / row["rounds"] if row["rounds"] else 0
+        return sorted(summary.values(), key=lambda row: (-row["rounds"], row["actor"]))
+
+    def get_actor_rounds(self, actor_name):
+        """
+        배우가 출연하는 남은 회차 목록 (날짜/회차 순).
+        [{date, round_name, round_time, seats: [(seat_class, seat_count), ...], remaining}, ...]
+        """
+        if self.concert is None:
+            return []
+        round_seats = self._round_seats()
+        rounds = []
+        for casting in self._castings(actor_name):
+            key = (casting["year"], casting["month"], casting["day_num"], casting["round_name"])
+            if key not in round_seats:
+                continue
+            rounds.append({
+                "date": date(*key[:3]),
+                "round_name": key[3],
+                "round_time": round_seats[key]["round_time"],
+                "seats": sorted(round_seats[key]["seats"].items()),
+                "remaining": round_seats[key]["remaining"],
+            })
+        return sorted(rounds, key=lambda row: (row["date"], row["round_time"]))
+
+
+class CrawlTelemetryService:
+    """크롤링 실행 기록(CrawlRun/CrawlStep)을 대시보드용으로 집계합니다."""
+
+    def __init__(self, days=14):
+        self.days = days
+        self.since = now() - timedelta(days=days)
+        self.runs = CrawlRun.objects.filter(started_at__gte=self.since)
+        self.steps = CrawlStep.objects.filter(run__started_at__gte=self.since)
+
+    def get_recent_runs(self, limit=30):
+        return self.runs.order_by("-started_at")[:limit]
+
+    def get_daily_trends(self):
+        """작업별 일자별 평균 소요 시간과 저장 건수. {task: [{day, avg_duration, inserted, runs}, ...]}"""
+        rows = (
+            self.runs.exclude(duration_seconds__isnull=True)
+            .annotate(day=TruncDate("started_at"))
+            .values("task", "day")
+            .annotate(
+                avg_duration=Avg("duration_seconds"),
+                inserted=Sum("inserted_count"),
+                errors=Sum("error_count"),
+                runs=Count("id"),
+            )
+            .order_by("day")
+        )
+        trends = defaultdict(list)
+        for row in rows:
+            trends[row["task"]].append({
+                "day": row["day"].strftime("%Y-%m-%d"),
+                "avg_duration": round(row["avg_duration"], 1),
+                "inserted": row["inserted"] or 0,
+                "errors": row["errors"] or 0,
+                "runs": row["runs"],
+            })
+        return dict(trends)
+
+    def get_daily_page_durations(self):
+        """일자별 리뷰 페이지/좌석 달력 월 평균 소요 시간 (느려지는 추세 확인용)."""
+        rows = (
+            self.steps.exclude(kind=CrawlStep.KIND_CONCERT)
+            .annotate(day=TruncDate("started_at"))
+            .values("kind", "day")
+            .annotate(avg_duration=Avg("duration_seconds"), max_duration=Max("duration_seconds"))
+            .order_by("day")
+        )
+        trends = defaultdict(list)
+        for row in rows:
+            trends[row["kind"]].append({
+                "day": row["day"].strftime("%Y-%m-%d"),
+                "avg_duration": round(row["avg_duration"], 2),
+                "max_duration": round(row["max_duration"], 2),
+            })
+        return dict(trends)
+
+    def get_slowest_steps(self, limit=20):
+        """가장 오래 걸린 페이지/달력 월 단계."""
+        return (
+            self.steps.exclude(kind=CrawlStep.KIND_CONCERT)
+            .select_related("concert", "run")
+            .order_by("-duration_seconds")[:limit]
+        )
+
+    def get_concert_summary(self):
+        """공연별 평균 소요 시간, 저장/건너뜀 건수, 재시도/오류 횟수."""
+        return (
+            self.steps.filter(kind=CrawlStep.KIND_CONCERT)
+            .values("concert__name", "run__task")
+            .annotate(
+                crawls=Count("id"),
+                avg_duration=Avg("duration_seconds"),
+                max_duration=Max("duration_seconds"),
+                inserted=Sum("inserted_count"),
+                skipped=Sum("skipped_count"),
+                retries=Sum("retry_count"),
+                errors=Count("id", filter=~Q(error="")),
+            )
+            .order_by("-avg_duration")
+        )
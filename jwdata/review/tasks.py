@@ -1,17 +1,40 @@
 from datetime import datetime
+import re
 import time
+import queue
 import logging
+import threading
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
-
-from .models import Concert
 
+from .models import Concert, CrawlCheckpoint, CrawlJob, CrawlRun, CrawlStep
+from .checkpoints import done_concert_ids, open_checkpoint, prune_checkpoints
+from .jobs import (
+    Heartbeat,
+    claim_job,
+    complete_job,
+    default_worker_name,
+    enqueue_jobs,
+    fail_job,
+    leased_concert_job,
+    prune_jobs,
+)
+from .scheduling import CrawlScheduler
+from .telemetry import crawl_run, record_step
+from .drivers import HOME_URL, close_guide_popup, get_driver_pool
+from .fetchers import HttpCrawlError, crawl_concert_reviews_http
+from .waits import (
+    wait_for,
+    wait_stats,
+    element_present,
+    window_count_at_least,
+)
+
+from django.conf import settings
+from django.db import connection
 from django.test import RequestFactory
 from review.chatgpt import summarize_positive_reviews, summarize_negative_reviews
 
@@ -23,220 +46,479 @@ from .views import (
 # 로거 설정
 logger = logging.getLogger(__name__)
 
-def get_chrome_driver():
+# 대기 조건에 사용하는 locator
+PRODUCT_BODY_LOCATOR = (By.ID, 'productMainBody')
+SEARCH_BOX_XPATH = '//*[@id="__next"]/div/header/div[2]/div[1]/div/div[3]/div'
+SEARCH_INPUT_LOCATOR = (By.XPATH, '//*[@id="__next"]/div/header/div[2]/div[1]/div/div[3]/div/input')
+SEARCH_RESULT_XPATHS = (
+    '//*[@id="contents"]/div/div/div[1]/div[2]/a[1]/ul',
+    '//*[@id="contents"]/div/div/div[2]/div[2]/a[1]/ul',
+)
+PRODUCT_CODE_PATTERN = re.compile(r'/goods/(\w+)')
+
+def extract_product_code(url):
+    """상세 페이지 URL(https://tickets.interpark.com/goods/24012345)에서 상품 코드를 추출합니다."""
+    match = PRODUCT_CODE_PATTERN.search(url or '')
+    return match.group(1) if match else None
+
+def search_product_page(driver, concert_name):
     """
-    Headless Chrome 드라이버를 반환하는 함수.
-    크론 실행 환경(백그라운드)에서 UI 없는 크롤링을 가능하게 함.
+    사이트 검색창에 공연명을 입력하고 첫 번째 검색 결과의 상세 페이지로 이동합니다.
+    상세 페이지가 새 창으로 열리면 그 창으로 전환합니다. 성공하면 True를 반환합니다.
     """
-    # chrome_options = Options()
-    # chrome_options.add_argument('--headless')         # 화면 없이 동작
-    # chrome_options.add_argument('--no-sandbox')        # 리눅스 환경에서 권한 문제 방지
-    # chrome_options.add_argument('--disable-dev-shm-usage') # /dev/shm 사용 비활성화(메모리 부족 문제 회피)
-    # chrome_options.add_argument('--disable-gpu')       # GPU 비활성화 (일부 환경에서 필요)
-    # chrome_options.add_argument('--window-size=1920,1080') # 넉넉한 가상 화면 크기 지정
+    driver.get(HOME_URL)
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.XPATH, SEARCH_BOX_XPATH))
+    )
+
+    # 검색 실행
+    search_box = driver.find_element(By.XPATH, SEARCH_BOX_XPATH)
+    search_box.click()
+
+    active_input = wait_for(driver, element_present(SEARCH_INPUT_LOCATOR), "search_input")
+    if active_input is None:
+        logger.error(f"[ERROR] [{concert_name}] 검색 입력창을 찾을 수 없습니다.")
+        return False
+    active_input.send_keys(concert_name)
+    active_input.send_keys(Keys.RETURN)
+    logger.debug(f"[DEBUG] '{concert_name}' 검색 완료, 검색 결과 페이지 로딩 중...")
+
+    # 첫 번째 검색 결과 클릭
+    try:
+        element = WebDriverWait(driver, 10).until(
+            EC.any_of(*[EC.element_to_be_clickable((By.XPATH, xpath)) for xpath in SEARCH_RESULT_XPATHS])
+        )
+        window_count = len(driver.window_handles)
+        element.click()
+        wait_for(driver, window_count_at_least(window_count + 1), "search_result_open")
+        logger.debug(f"[DEBUG] '{concert_name}' 검색 결과 첫 번째 항목 클릭 성공")
+    except Exception as e:
+        logger.error(f"[ERROR] [{concert_name}] 검색 결과 클릭 실패: {e}")
+        return False
+
+    # 새 창으로 전환(인터파크 상세 페이지)
+    if len(driver.window_handles) > 1:
+        driver.switch_to.window(driver.window_handles[-1])
+        logger.debug("[DEBUG] 상세 페이지로 전환")
+    return wait_for(driver, element_present(PRODUCT_BODY_LOCATOR), "product_page") is not None
+
+def open_product_page(driver, concert, search_name=None):
+    """
+    공연 상세 페이지를 엽니다.
+    저장된 product_url이 있으면 검색 없이 바로 접속하고, 404이거나 다른 상품으로 리다이렉트되면
+    사이트 검색으로 다시 찾습니다. 검색으로 찾은 URL과 상품 코드는 Concert에 저장합니다.
+    성공하면 True를 반환합니다.
+    """
+    if concert.product_url:
+        driver.get(concert.product_url)
+        if (
+            extract_product_code(driver.current_url) == concert.product_code
+            and wait_for(driver, element_present(PRODUCT_BODY_LOCATOR), "product_page") is not None
+        ):
+            logger.debug(f"[DEBUG] '{concert.name}' 저장된 상세 페이지 URL로 바로 접속")
+            return True
+        logger.info(f"[INFO] [{concert.name}] 저장된 상세 페이지 URL이 유효하지 않아 검색으로 다시 찾습니다: {concert.product_url}")
+
+    if not search_product_page(driver, (search_name or concert.name).strip()):
+        return False
+
+    product_code = extract_product_code(driver.current_url)
+    if product_code:
+        concert.product_url = driver.current_url
+        concert.product_code = product_code
+        Concert.objects.filter(pk=concert.pk).update(
+            product_url=concert.product_url,
+            product_code=concert.product_code,
+        )
+        logger.info(f"[INFO] [{concert.name}] 상세 페이지 URL 저장: {concert.product_url}")
+    return True
 
-    # return webdriver.Chrome(options=chrome_options)
-    return webdriver.Chrome()
+def close_product_window(driver):
+    """검색 결과로 열린 상세 페이지 창이 있으면 닫고 메인 창으로 돌아갑니다."""
+    if len(driver.window_handles) > 1:
+        driver.close()
+        driver.switch_to.window(driver.window_handles[0])
 
-def crawl_all_concerts_reviews():
+def crawl_reviews_for_concert(driver, concert, checkpoint=None, step=None):
     """
-    매일 저녁 8시에 실행:
-    크롤링이 활성화된 공연(Concert)을 대상으로 리뷰 크롤링을 수행.
-    각 공연의 crawling_url로 직접 접속하여 리뷰를 수집합니다.
+    공연 하나의 crawling_url로 직접 접속하여 리뷰를 수집합니다.
     """
-    logger.info("[crawl_all_concerts_reviews] 시작")
-    driver = get_chrome_driver()
+    concert_name = concert.name.strip()
+    if not concert_name:
+        logger.warning("[WARN] 공연 이름이 비어있어 스킵합니다.")
+        return
+
+    logger.info(f"[INFO] 공연명: {concert_name}에 대한 리뷰 크롤링 시작")
+
+    # crawling_url로 직접 접속
     try:
-        # 크롤링이 활성화된 공연만 필터링
-        concerts = Concert.objects.filter(
-            is_crawling_enabled=True,
-            crawling_url__isnull=False
-        ).exclude(crawling_url='')
-        
-        logger.info(f"[crawl_all_concerts_reviews] 크롤링이 활성화된 공연 {concerts.count()}개에 대해 리뷰 크롤링을 시도합니다.")
-
-        for concert in concerts:
-            concert_name = concert.name.strip()
-            if not concert_name:
-                logger.warning("[WARN] 공연 이름이 비어있어 스킵합니다.")
-                continue
-
-            logger.info(f"[INFO] 공연명: {concert_name}에 대한 리뷰 크롤링 시작")
-            
-            # crawling_url로 직접 접속
+        driver.get(concert.crawling_url)
+        wait_for(driver, element_present(PRODUCT_BODY_LOCATOR), "product_page")
+        logger.debug(f"[DEBUG] '{concert_name}' 상세 페이지 직접 접속 완료")
+    except Exception as e:
+        logger.error(f"[ERROR] [{concert_name}] crawling_url 접속 실패: {e}")
+        return
+
+    # 예매 안내 팝업 닫기 (풀 세션에서 이미 닫혀 있으면 건너뜀)
+    if close_guide_popup(driver):
+        logger.debug("[DEBUG] 팝업 닫기 성공")
+
+    # 리뷰 크롤링
+    crawl_concert_reviews(driver, concert, checkpoint=checkpoint, step=step)
+    logger.info("[INFO] 리뷰 크롤링 완료")
+
+def crawl_reviews_over_http(concert, checkpoint=None, step=None):
+    """
+    REVIEW_CRAWL_BACKEND가 'http'일 때 브라우저 없이 리뷰를 수집합니다.
+    성공하면 True, HTTP 방식이 불가능해 Selenium으로 대체해야 하면 False를 반환합니다.
+    Selenium으로 대체하는 경우 step에 재시도 1회로 기록합니다.
+    """
+    if settings.REVIEW_CRAWL_BACKEND != 'http':
+        return False
+
+    try:
+        crawl_concert_reviews_http(concert, checkpoint=checkpoint, step=step)
+        logger.info(f"[INFO] [{concert.name}] HTTP 리뷰 크롤링 완료")
+        return True
+    except HttpCrawlError as e:
+        logger.warning(f"[WARN] [{concert.name}] HTTP 리뷰 크롤링 실패, Selenium으로 대체: {e}")
+        if step is not None:
+            step.retries += 1
+        return False
+
+def crawl_review_concert(concert, run=None, worker_timeout=None, restart_done=False):
+    """
+    공연 하나의 리뷰를 크롤링합니다. (작업 큐 워커와 _review_crawl_worker 공용)
+    현재 스케줄 구간의 체크포인트를 열어 중단된 위치부터 이어서 진행하고, 실패하면 실패로 기록한 뒤 예외를 다시 발생시킵니다.
+    HTTP 백엔드가 성공하면 드라이버 풀의 세션을 빌리지 않습니다.
+    """
+    if worker_timeout is None:
+        worker_timeout = settings.CRAWL_WORKER_TIMEOUT
+    checkpoint = open_checkpoint(concert, CrawlCheckpoint.KIND_REVIEW, restart_done=restart_done)
+    try:
+        with record_step(run, CrawlStep.KIND_CONCERT, concert, concert.name) as step:
+            if crawl_reviews_over_http(concert, checkpoint, step):
+                return
+            # WebDriver 오류가 나면 세션은 풀에서 폐기되고 다음 공연은 새 세션으로 진행
+            # 워커 타임아웃은 이 공연을 크롤링하는 동안만 적용되고 반납할 때 풀 기본값으로 돌아감
+            with get_driver_pool().session(page_load_timeout=worker_timeout) as driver:
+                crawl_reviews_for_concert(driver, concert, checkpoint, step)
+    except Exception as e:
+        checkpoint.fail(e)
+        raise
+
+def _review_crawl_worker(worker_name, concert_queue, worker_timeout, run=None, restart_done=False, source=CrawlJob.SOURCE_MANUAL):
+    """
+    공유 큐에서 공연 id를 하나씩 꺼내 리뷰 크롤링을 수행하는 워커.
+    공연마다 드라이버 풀에서 warm 세션을 빌려 쓰고 반납하며, 큐가 비면 종료합니다.
+    HTTP 백엔드가 성공하면 세션을 빌리지 않습니다.
+    공연마다 현재 스케줄 구간의 체크포인트를 열어 중단된 위치부터 이어서 진행하고, 실패하면 실패로 기록합니다.
+    공연 하나가 run(CrawlRun)의 공연 단계 하나로 기록됩니다.
+    restart_done=True이면 이번 구간에 이미 완료된 공연도 처음부터 다시 크롤링합니다. (스케줄러 실행)
+    공연마다 작업(CrawlJob)을 임대하여, 작업 큐 워커가 실행 중인 공연은 건너뜁니다.
+    """
+    logger.info(f"[{worker_name}] 시작")
+    try:
+        while True:
             try:
-                driver.get(concert.crawling_url)
-                time.sleep(2)
-                logger.debug(f"[DEBUG] '{concert_name}' 상세 페이지 직접 접속 완료")
-            except Exception as e:
-                logger.error(f"[ERROR] [{concert_name}] crawling_url 접속 실패: {e}")
-                continue
+                concert_id = concert_queue.get_nowait()
+            except queue.Empty:
+                break
 
-            # 예매 안내 팝업 닫기
             try:
-                popup_close_button = driver.find_element(By.XPATH, '//*[@id="popup-prdGuide"]/div/div[3]/button')
-                driver.execute_script("arguments[0].click();", popup_close_button)
-                time.sleep(2)
-                logger.debug("[DEBUG] 팝업 닫기 성공")
-            except NoSuchElementException:
-                logger.info(f"[INFO] [{concert_name}] 팝업 닫기 버튼 없음, 무시")
+                concert = Concert.objects.get(pk=concert_id)
+                # 작업 큐 워커가 같은 공연을 크롤링 중이면 건너뜀
+                with leased_concert_job(concert, CrawlJob.KIND_REVIEW, f"{default_worker_name()}:{worker_name}", source) as job:
+                    if job is not None:
+                        crawl_review_concert(concert, run, worker_timeout, restart_done=restart_done)
+            except Exception as e:
+                logger.error(f"[{worker_name}] 공연 id={concert_id} 리뷰 크롤링 실패: {e}")
+            finally:
+                concert_queue.task_done()
+    finally:
+        # 스레드별 DB 커넥션 정리
+        connection.close()
+        logger.info(f"[{worker_name}] 종료")
 
-            # 리뷰 크롤링
-            crawl_concert_reviews(driver, concert)
-            logger.info("[INFO] 리뷰 크롤링 완료")
+def crawl_all_concerts_reviews(pool_size=None, worker_timeout=None, concert_ids=None):
+    """
+    크롤링이 활성화된 공연(Concert)을 대상으로 리뷰 크롤링을 수행. (스케줄러는 crawl_scheduled_concerts_reviews 사용)
+    pool_size개의 워커가 공유 큐에서 공연을 하나씩 가져가 드라이버 풀의 headless 브라우저로 처리합니다.
+    pool_size, worker_timeout(초)을 생략하면 settings의 CRAWL_POOL_SIZE, CRAWL_WORKER_TIMEOUT을 사용합니다.
+    같은 스케줄 구간(CRAWL_REVIEW_WINDOW_HOURS)에 다시 실행하면 완료된 공연은 건너뛰고 중단된 공연은 이어서 진행합니다.
+    실행 한 번이 CrawlRun 하나로 기록됩니다.
+    concert_ids를 주면(스케줄러) 그 공연만 크롤링하며, 이번 구간에 이미 완료된 공연도 다시 크롤링합니다.
+    작업 큐 워커가 임대하여 크롤링 중인 공연은 건너뜁니다.
+    """
+    logger.info("[crawl_all_concerts_reviews] 시작")
+    wait_stats.reset()
+    prune_checkpoints()
+    with crawl_run(CrawlRun.TASK_REVIEWS) as run:
+        if pool_size is None:
+            pool_size = settings.CRAWL_POOL_SIZE
+        if worker_timeout is None:
+            worker_timeout = settings.CRAWL_WORKER_TIMEOUT
 
-    finally:
-        driver.quit()
-        logger.info("[crawl_all_concerts_reviews] 종료")
+        # 크롤링이 활성화된 공연만 필터링
+        scheduled = concert_ids is not None
+        crawlable_ids = list(crawlable_review_concerts().values_list('id', flat=True))
+        if scheduled:
+            # 스케줄러가 정한 순서(점수 높은 순)를 유지
+            crawlable = set(crawlable_ids)
+            concert_ids = [concert_id for concert_id in concert_ids if concert_id in crawlable]
+        else:
+            concert_ids = crawlable_ids
+
+        # 이번 스케줄 구간에서 이미 완료된 공연은 제외 (스케줄러가 고른 공연은 다시 크롤링)
+        done_ids = set() if scheduled else done_concert_ids(CrawlCheckpoint.KIND_REVIEW)
+        if done_ids:
+            logger.info(f"[crawl_all_concerts_reviews] 이번 구간에 완료된 공연 {len(done_ids & set(concert_ids))}개는 건너뜁니다.")
+            concert_ids = [concert_id for concert_id in concert_ids if concert_id not in done_ids]
+
+        logger.info(f"[crawl_all_concerts_reviews] 크롤링이 활성화된 공연 {len(concert_ids)}개에 대해 리뷰 크롤링을 시도합니다.")
+        if not concert_ids:
+            logger.info("[crawl_all_concerts_reviews] 종료")
+            return
+
+        concert_queue = queue.Queue()
+        for concert_id in concert_ids:
+            concert_queue.put(concert_id)
+
+        worker_count = max(1, min(pool_size, len(concert_ids)))
+        logger.info(f"[crawl_all_concerts_reviews] 워커 {worker_count}개, 워커 타임아웃 {worker_timeout}초")
+
+        workers = [
+            threading.Thread(
+                target=_review_crawl_worker,
+                args=(
+                    f"review-worker-{index}", concert_queue, worker_timeout, run, scheduled,
+                    CrawlJob.SOURCE_SCHEDULER if scheduled else CrawlJob.SOURCE_MANUAL,
+                ),
+                name=f"review-worker-{index}",
+                daemon=True,
+            )
+            for index in range(1, worker_count + 1)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    wait_stats.log_summary("[crawl_all_concerts_reviews][wait]")
+    logger.info("[crawl_all_concerts_reviews] 종료")
+
+def crawlable_review_concerts():
+    """리뷰 크롤링 대상 공연 (크롤링 활성화 + 크롤링 URL 있음)."""
+    return Concert.objects.filter(
+        is_crawling_enabled=True,
+        crawling_url__isnull=False
+    ).exclude(crawling_url='')
+
+def enqueue_all_concerts_reviews(source=CrawlJob.SOURCE_MANUAL):
+    """
+    크롤링 대상 공연 전체의 리뷰 크롤링 작업을 등록합니다. (화면의 "리뷰 크롤링 실행")
+    이번 스케줄 구간에 이미 완료된 공연은 제외하며, 이미 대기/실행 중인 공연은 다시 등록하지 않습니다.
+    (새로 등록한 작업 수, 대상 공연 수)를 반환합니다.
+    """
+    done_ids = done_concert_ids(CrawlCheckpoint.KIND_REVIEW)
+    concerts = [concert for concert in crawlable_review_concerts() if concert.id not in done_ids]
+    created = enqueue_jobs(concerts, CrawlJob.KIND_REVIEW, source=source)
+    logger.info(f"[enqueue_all_concerts_reviews] 공연 {len(concerts)}개 중 {created}개 리뷰 크롤링 작업 등록")
+    return created, len(concerts)
+
+def crawl_scheduled_concerts_reviews():
+    """
+    스케줄러에서 CRAWL_SCHEDULER_TICK_MINUTES분마다 실행:
+    공연별 우선순위 점수(리뷰 속도, 좌석 변동률, 공연 기간 근접도)로 정한 크롤링 간격이 지난 공연만 리뷰 크롤링합니다.
+    종료일 + CRAWL_END_GRACE_DAYS일이 지난 공연은 크롤링하지 않습니다.
+    CRAWL_JOB_QUEUE가 켜져 있으면 직접 크롤링하지 않고 점수를 우선순위로 하는 작업을 등록합니다. (scripts/crawl_worker.py가 실행)
+    """
+    plans = CrawlScheduler(CrawlRun.TASK_REVIEWS).due_plans(crawlable_review_concerts())
+    if not plans:
+        logger.info("[crawl_scheduled_concerts_reviews] 크롤링할 시점이 된 공연이 없습니다.")
+        return
+    if settings.CRAWL_JOB_QUEUE:
+        created = enqueue_jobs(
+            [plan["concert"] for plan in plans],
+            CrawlJob.KIND_REVIEW,
+            source=CrawlJob.SOURCE_SCHEDULER,
+            priorities={plan["concert"].id: plan["score"] for plan in plans},
+        )
+        logger.info(f"[crawl_scheduled_concerts_reviews] 공연 {len(plans)}개 중 {created}개 리뷰 크롤링 작업 등록 (나머지는 이미 대기/실행 중)")
+        return
+    logger.info(f"[crawl_scheduled_concerts_reviews] 공연 {len(plans)}개 리뷰 크롤링")
+    crawl_all_concerts_reviews(concert_ids=[plan["concert"].id for plan in plans])
 
 def crawl_all_concerts_seats():
     """
     매일 00시,06시,12시,18시에 실행:
     DB에 있는 모든 공연(Concert)에 대해 좌석 정보 크롤링 수행.
+    같은 스케줄 구간(CRAWL_SEAT_WINDOW_HOURS)에 다시 실행하면 완료된 공연은 건너뛰고 중단된 공연은 이어서 진행합니다.
+    실행 한 번이 CrawlRun 하나로, 공연마다 공연 단계 하나로 기록됩니다.
+    작업 큐 워커가 임대하여 크롤링 중인 공연은 건너뜁니다.
     """
     logger.info("[crawl_all_concerts_seats] 시작")
-    driver = get_chrome_driver()
-    try:
-        concerts = Concert.objects.all()
-        logger.info(f"[crawl_all_concerts_seats] 총 {concerts.count()}개의 공연에 대해 좌석 크롤링을 시도합니다.")
-
-        for concert in concerts:
-            concert_name = concert.name.strip()
-            if not concert_name:
-                logger.warning("[WARN] 공연 이름이 비어있어 스킵합니다.")
-                continue
-
-            logger.info(f"[INFO] 공연명: {concert_name}에 대한 좌석 크롤링 시작")
-            # 인터파크 메인 페이지 접근
-            driver.get("https://tickets.interpark.com/")
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, '//*[@id="__next"]/div/header/div[2]/div[1]/div/div[3]/div'))
-            )
-            time.sleep(2)
+    wait_stats.reset()
+    prune_checkpoints()
+    done_ids = done_concert_ids(CrawlCheckpoint.KIND_SEAT)
+    with crawl_run(CrawlRun.TASK_SEATS) as run:
+        with get_driver_pool().session() as driver:
+            concerts = Concert.objects.all()
+            logger.info(f"[crawl_all_concerts_seats] 총 {concerts.count()}개의 공연에 대해 좌석 크롤링을 시도합니다.")
+
+            for concert in concerts:
+                if concert.id in done_ids:
+                    logger.info(f"[INFO] [{concert.name.strip()}] 이번 구간에 좌석 크롤링 완료 -> 스킵합니다.")
+                    continue
+                # 작업 큐 워커가 같은 공연을 크롤링 중이면 건너뜀
+                with leased_concert_job(concert, CrawlJob.KIND_SEAT) as job:
+                    if job is not None:
+                        crawl_seats_for_concert(driver, concert, run)
+
+    wait_stats.log_summary("[crawl_all_concerts_seats][wait]")
+    logger.info("[crawl_all_concerts_seats] 종료")
+
+def crawl_seats_for_concert(driver, concert, run=None):
+    """
+    공연 하나의 상세 페이지를 열어 공연 정보와 좌석 정보를 크롤링합니다. (crawl_all_concerts_seats와 작업 큐 워커 공용)
+    상세 페이지를 열지 못하거나 공연 정보가 없으면 False를 반환하고, 좌석 크롤링이 실패하면 체크포인트를 실패로 기록한 뒤 예외를 다시 발생시킵니다.
+    """
+    concert_name = concert.name.strip()
+    if not concert_name:
+        logger.warning("[WARN] 공연 이름이 비어있어 스킵합니다.")
+        return False
 
-            # 검색 실행
-            search_box = driver.find_element(By.XPATH, '//*[@id="__next"]/div/header/div[2]/div[1]/div/div[3]/div')
-            search_box.click()
-            time.sleep(2)
+    logger.info(f"[INFO] 공연명: {concert_name}에 대한 좌석 크롤링 시작")
+    # 상세 페이지 접속 (저장된 URL 우선, 없거나 무효하면 검색)
+    if not open_product_page(driver, concert):
+        close_product_window(driver)
+        return False
 
-            active_input = driver.find_element(By.XPATH, '//*[@id="__next"]/div/header/div[2]/div[1]/div/div[3]/div/input')
-            active_input.send_keys(concert_name)
-            time.sleep(2)
-            active_input.send_keys(Keys.RETURN)
-            logger.debug(f"[DEBUG] '{concert_name}' 검색 완료, 검색 결과 페이지 로딩 중...")
+    # 예매 안내 팝업 닫기 (풀 세션에서 이미 닫혀 있으면 건너뜀)
+    if close_guide_popup(driver):
+        logger.debug("[DEBUG] 팝업 닫기 성공")
 
-            # 첫 번째 검색 결과 클릭
-            try:
-                element = WebDriverWait(driver, 10).until(
-                    EC.any_of(
-                        EC.element_to_be_clickable((By.XPATH, '//*[@id="contents"]/div/div/div[1]/div[2]/a[1]/ul')),
-                        EC.element_to_be_clickable((By.XPATH, '//*[@id="contents"]/div/div/div[2]/div[2]/a[1]/ul'))
-                    )
-                )
-                element.click()
-                time.sleep(2)
-                logger.debug(f"[DEBUG] '{concert_name}' 검색 결과 첫 번째 항목 클릭 성공")
-            except Exception as e:
-                logger.error(f"[ERROR] [{concert_name}] 검색 결과 클릭 실패: {e}")
-                continue
+    # 공연 정보 크롤링
+    crawled_concert = crawl_concert_info(driver)
 
-            # 새 창으로 전환(인터파크 상세 페이지)
-            if len(driver.window_handles) > 1:
-                driver.switch_to.window(driver.window_handles[1])
-                time.sleep(2)
-                logger.debug("[DEBUG] 상세 페이지로 전환")
+    if crawled_concert is None:
+        logger.warning(f"[WARN] [{concert_name}] 공연 정보가 None이어서 좌석 크롤링을 스킵합니다.")
+        close_product_window(driver)
+        return False
 
-            # 예매 안내 팝업 닫기
-            try:
-                popup_close_button = driver.find_element(By.XPATH, '//*[@id="popup-prdGuide"]/div/div[3]/button')
-                driver.execute_script("arguments[0].click();", popup_close_button)
-                time.sleep(2)
-                logger.debug("[DEBUG] 팝업 닫기 성공")
-            except NoSuchElementException:
-                logger.info(f"[INFO] [{concert_name}] 팝업 닫기 버튼 없음, 무시")
-
-            # 공연 정보 크롤링
-            crawled_concert = crawl_concert_info(driver)
-
-            if crawled_concert is None:
-                logger.warning(f"[WARN] [{concert_name}] 공연 정보가 None이어서 좌석 크롤링을 스킵합니다.")
-                driver.close()
-                driver.switch_to.window(driver.window_handles[0])
-                time.sleep(2)
-                continue            
-
-            logger.info(f"[INFO] 공연 정보 크롤링 완료: {crawled_concert}")
-
-            # 좌석 크롤링
-            crawl_concert_seats(driver, crawled_concert)
-            logger.info("[INFO] 좌석 크롤링 완료")
-
-            # 상세 페이지 닫기
-            driver.close()
-            driver.switch_to.window(driver.window_handles[0])
-            time.sleep(2)
-            logger.debug("[DEBUG] 상세 페이지 닫기 및 메인 창 전환 완료")
+    logger.info(f"[INFO] 공연 정보 크롤링 완료: {crawled_concert}")
 
-    finally:
-        driver.quit()
-        logger.info("[crawl_all_concerts_seats] 종료")
+    # 좌석 크롤링 (중단된 체크포인트가 있으면 저장된 날짜 다음부터)
+    checkpoint = open_checkpoint(crawled_concert, CrawlCheckpoint.KIND_SEAT)
+    try:
+        with record_step(run, CrawlStep.KIND_CONCERT, crawled_concert, crawled_concert.name) as step:
+            crawl_concert_seats(driver, crawled_concert, checkpoint, step)
+    except Exception as e:
+        checkpoint.fail(e)
+        raise
+    logger.info("[INFO] 좌석 크롤링 완료")
+
+    # 상세 페이지 닫기
+    close_product_window(driver)
+    logger.debug("[DEBUG] 상세 페이지 닫기 및 메인 창 전환 완료")
+    return True
+
+def run_crawl_job(job):
+    """
+    임대한 작업 하나를 실행합니다. 작업 하나가 CrawlRun 하나로 기록됩니다.
+    스케줄러가 등록한 리뷰 작업은 이번 구간에 이미 완료된 공연도 처음부터 다시 크롤링합니다.
+    """
+    concert = job.concert
+    if job.kind == CrawlJob.KIND_SEAT:
+        with crawl_run(CrawlRun.TASK_SEATS) as run:
+            with get_driver_pool().session() as driver:
+                if not crawl_seats_for_concert(driver, concert, run):
+                    raise RuntimeError(f"[{concert.name}] 상세 페이지 또는 공연 정보를 가져오지 못했습니다.")
+        return
+    with crawl_run(CrawlRun.TASK_REVIEWS) as run:
+        crawl_review_concert(concert, run, restart_done=job.source == CrawlJob.SOURCE_SCHEDULER)
+
+def crawl_job_worker(worker=None, kinds=None, once=False, poll_seconds=None, stop_event=None):
+    """
+    작업 큐 워커 (scripts/crawl_worker.py). 작업을 하나씩 임대하여 실행하고, 실행하는 동안 하트비트로 임대를 연장합니다.
+    실패한 작업은 fail_job이 재시도 대기로 되돌리거나 실패로 표시합니다.
+    여러 프로세스에서 동시에 실행해도 한 공연/종류의 작업은 한 워커만 실행합니다.
+    once=True이면 실행할 작업이 없을 때 종료하고, 아니면 poll_seconds(기본 CRAWL_WORKER_POLL_SECONDS)초마다 다시 확인합니다.
+    처리한 작업 수를 반환합니다.
+    """
+    worker = worker or default_worker_name()
+    if poll_seconds is None:
+        poll_seconds = settings.CRAWL_WORKER_POLL_SECONDS
+    stop_event = stop_event or threading.Event()
+    logger.info(f"[crawl_job_worker] [{worker}] 시작 (종류: {', '.join(kinds) if kinds else '전체'})")
+    prune_jobs()
+
+    processed = 0
+    while not stop_event.is_set():
+        job = claim_job(worker, kinds=kinds)
+        if job is None:
+            if once:
+                break
+            stop_event.wait(poll_seconds)
+            continue
+
+        logger.info(f"[crawl_job_worker] [{worker}] 작업 시작: {job}")
+        wait_stats.reset()
+        started = time.perf_counter()
+        try:
+            with Heartbeat(job):
+                run_crawl_job(job)
+        except Exception as e:
+            logger.error(f"[crawl_job_worker] [{worker}] 작업 실패: {job} ({e})")
+            fail_job(job, e)
+        else:
+            if not complete_job(job):
+                logger.warning(f"[crawl_job_worker] [{worker}] 임대를 잃어 완료로 표시하지 못했습니다: {job}")
+        processed += 1
+        wait_stats.log_summary(f"[crawl_job_worker][{worker}][wait]")
+        logger.info(f"[crawl_job_worker] [{worker}] 작업 종료: {job} ({time.perf_counter() - started:.1f}초)")
+
+    logger.info(f"[crawl_job_worker] [{worker}] 종료 (처리 {processed}개)")
+    return processed
 
 def crawl_specific_concert_review(concert_name):
     logger.info(f"[crawl_specific_concert_review] '{concert_name}' 리뷰 크롤링 시작")
-    driver = get_chrome_driver()
-
-    try:
-        concert_qs = Concert.objects.filter(name__icontains=concert_name.strip())
-        if not concert_qs.exists():
-            logger.error(f"[ERROR] '{concert_name}'에 해당하는 Concert 객체를 찾을 수 없습니다.")
-            return
+    wait_stats.reset()
 
-        concert = concert_qs.first()
-
-        # 공연 검색 및 상세 페이지 진입 로직 복사
-        driver.get("https://tickets.interpark.com/")
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, '//*[@id="__next"]/div/header/div[2]/div[1]/div/div[3]/div'))
-        )
-        time.sleep(2)
+    concert_qs = Concert.objects.filter(name__icontains=concert_name.strip())
+    if not concert_qs.exists():
+        logger.error(f"[ERROR] '{concert_name}'에 해당하는 Concert 객체를 찾을 수 없습니다.")
+        return
 
-        search_box = driver.find_element(By.XPATH, '//*[@id="__next"]/div/header/div[2]/div[1]/div/div[3]/div')
-        search_box.click()
-        time.sleep(2)
+    concert = concert_qs.first()
 
-        active_input = driver.find_element(By.XPATH, '//*[@id="__next"]/div/header/div[2]/div[1]/div/div[3]/div/input')
-        active_input.send_keys(concert_name)
-        time.sleep(2)
-        active_input.send_keys(Keys.RETURN)
-        time.sleep(2)
+    # 작업 큐 워커가 같은 공연을 크롤링 중이면 건너뜀
+    with leased_concert_job(concert, CrawlJob.KIND_REVIEW) as job:
+        if job is None:
+            logger.warning(f"[crawl_specific_concert_review] '{concert.name}' 리뷰를 다른 워커가 크롤링 중이어서 건너뜁니다.")
+            return
+        with crawl_run(CrawlRun.TASK_SPECIFIC_REVIEW) as run:
+            _crawl_specific_concert_review(concert, concert_name, run)
 
-        element = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, '//*[@id="contents"]/div/div/div[1]/div[2]/a[1]/ul'))
-        )
-        element.click()
-        time.sleep(2)
+    wait_stats.log_summary("[crawl_specific_concert_review][wait]")
 
-        if len(driver.window_handles) > 1:
-            driver.switch_to.window(driver.window_handles[1])
-            time.sleep(2)
+def _crawl_specific_concert_review(concert, concert_name, run):
+    with get_driver_pool().session() as driver:
+        # 상세 페이지 접속 (저장된 URL 우선, 없거나 무효하면 검색)
+        if not open_product_page(driver, concert, search_name=concert_name):
+            logger.error(f"[ERROR] '{concert_name}' 상세 페이지 접속 실패")
+            return
 
-        try:
-            popup_close_button = driver.find_element(By.XPATH, '//*[@id="popup-prdGuide"]/div/div[3]/button')
-            driver.execute_script("arguments[0].click();", popup_close_button)
-            time.sleep(2)
-        except NoSuchElementException:
-            pass
+        close_guide_popup(driver)
 
         # 공연 정보 크롤링 (옵션)
         crawl_concert_info(driver)
 
         # 리뷰 크롤링
-        crawl_concert_reviews(driver, concert)
+        with record_step(run, CrawlStep.KIND_CONCERT, concert, concert.name) as step:
+            crawl_concert_reviews(driver, concert, step=step)
         logger.info("[crawl_specific_concert_review] 완료")
 
-    finally:
-        driver.quit()
-
 def summarize_reviews_cron():
     # 더미 request 생성 (view 함수를 호출하기 위해)
     request = RequestFactory().get("/")
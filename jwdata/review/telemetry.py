@@ -0,0 +1,126 @@
+import time
+import logging
+from contextlib import contextmanager
+
+from django.db.models import Count, Q, Sum
+from django.utils.timezone import now
+
+from .models import CrawlRun, CrawlStep
+from .waits import wait_stats
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+class StepTimer:
+    """
+    크롤링 단계(공연, 리뷰 페이지, 좌석 달력 월) 하나의 소요 시간과 건수를 재는 타이머.
+    finish() 시 CrawlStep으로 저장하고, parent가 있으면 건수를 parent에 더합니다.
+    run이 None이면(수동 실행 등) 저장하지 않고 건수만 셉니다.
+    """
+
+    def __init__(self, run, kind, concert=None, label="", parent=None):
+        self.run = run
+        self.kind = kind
+        self.concert = concert
+        self.label = label
+        self.parent = parent
+        self.inserted = 0
+        self.skipped = 0
+        self.retries = 0
+        self.started_at = now()
+        self._started = time.monotonic()
+        self._finished = False
+
+    def child(self, kind, label=""):
+        """같은 실행/공연에 속한 하위 단계 타이머를 시작합니다."""
+        return StepTimer(self.run, kind, self.concert, label, parent=self)
+
+    def finish(self, error=None):
+        if self._finished:
+            return
+        self._finished = True
+        duration = time.monotonic() - self._started
+
+        if self.parent is not None:
+            self.parent.inserted += self.inserted
+            self.parent.skipped += self.skipped
+            self.parent.retries += self.retries
+
+        if self.run is None:
+            return
+        try:
+            CrawlStep.objects.create(
+                run=self.run,
+                concert=self.concert,
+                kind=self.kind,
+                label=self.label[:100],
+                started_at=self.started_at,
+                duration_seconds=duration,
+                inserted_count=self.inserted,
+                skipped_count=self.skipped,
+                retry_count=self.retries,
+                error=str(error) if error else "",
+            )
+        except Exception as e:
+            # 기록 실패로 크롤링이 중단되지 않도록 로그만 남김
+            logger.warning(f"[telemetry] 단계 기록 저장 실패: {e}")
+
+
+@contextmanager
+def record_step(run, kind, concert=None, label=""):
+    """with 블록 하나를 단계로 기록합니다. 블록에서 예외가 나면 오류를 기록하고 다시 발생시킵니다."""
+    step = StepTimer(run, kind, concert, label)
+    try:
+        yield step
+    except Exception as e:
+        step.finish(error=e)
+        raise
+    else:
+        step.finish()
+
+
+def start_run(task):
+    return CrawlRun.objects.create(task=task)
+
+
+def finish_run(run, error=None):
+    """단계 기록을 집계해 실행 기록을 마무리합니다. 공연 단계 합계가 실행 전체의 건수가 됩니다."""
+    concert_steps = run.steps.filter(kind=CrawlStep.KIND_CONCERT).aggregate(
+        concert_count=Count("id"),
+        inserted=Sum("inserted_count"),
+        skipped=Sum("skipped_count"),
+        retries=Sum("retry_count"),
+        errors=Count("id", filter=~Q(error="")),
+    )
+
+    run.finished_at = now()
+    run.duration_seconds = (run.finished_at - run.started_at).total_seconds()
+    run.concert_count = concert_steps["concert_count"]
+    run.inserted_count = concert_steps["inserted"] or 0
+    run.skipped_count = concert_steps["skipped"] or 0
+    run.retry_count = concert_steps["retries"] or 0
+    run.error_count = concert_steps["errors"] + (1 if error else 0)
+    run.wait_summary = wait_stats.summary()
+    run.status = CrawlRun.STATUS_FAILED if error else CrawlRun.STATUS_SUCCESS
+    run.error = str(error) if error else ""
+    run.save()
+
+    logger.info(
+        f"[telemetry] {run.get_task_display()} 종료: {run.duration_seconds:.1f}초, 공연 {run.concert_count}개, "
+        f"저장 {run.inserted_count}건, 건너뜀 {run.skipped_count}건, 재시도 {run.retry_count}회, 오류 {run.error_count}회"
+    )
+    return run
+
+
+@contextmanager
+def crawl_run(task):
+    """작업 래퍼(tasks.crawl_all_* 등) 전체를 하나의 CrawlRun으로 기록합니다."""
+    run = start_run(task)
+    try:
+        yield run
+    except Exception as e:
+        finish_run(run, error=e)
+        raise
+    else:
+        finish_run(run)
@@ -1,21 +1,1574 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import asyncio
+import contextlib
+import json
 import os
+import queue
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+from unittest import mock
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
-from review.tasks import log
+import httpx
+from openai import OpenAI, RateLimitError
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, WebDriverException
 
-class LogFunctionTest(TestCase):
-    def test_log_function(self):
-        log_file_path = '/tmp/cron_test.log'
-        if os.path.exists(log_file_path):
-            os.remove(log_file_path)
+from review import chatgpt, crawls, tasks
+from django.contrib.auth.models import User
+from django.urls import reverse
 
-        test_message = "Test log message"
-        log(test_message)
+from review.models import Concert, Review, Seat, SeatSnapshot, CrawlCheckpoint, CrawlJob, CrawlRun, CrawlStep, RoundCasting, SentimentBatch, SentimentCache
+from review.batches import apply_batch_output, pending_reviews, poll_sentiment_batches, submit_sentiment_batch
+from review.checkpoints import done_concert_ids, open_checkpoint
+from review.classifiers import load_sentiment_classifier, train_sentiment_classifier, training_reviews
+from review.jobs import claim_job, complete_job, enqueue_job, fail_job, leased_concert_job
+from review.telemetry import crawl_run, record_step
+from review.fetchers import HttpCrawlError, crawl_concert_reviews_http, get_http_session
+from review.parsers import normalize_reviews, parse_review_items, parse_review_total, parse_seat_items, split_actors
+from review.extractors import extract_review_rows, extract_seat_round
+from review.calendars import (
+    ACTIVE_DAYS_XPATH,
+    ACTORS_XPATH,
+    CURRENT_MONTH_LOCATOR,
+    NEXT_MONTH_XPATH,
+    ROUND_LOCATOR,
+    SEAT_ITEM_LOCATOR,
+    SeatCalendarWalker,
+    seat_calendar_walker,
+)
+from review.captures import SeatNetworkCapture
+from review.pipelines import WriterPipeline
+from review.writers import ReviewWriter, SeatSnapshotWriter
+from review.services import CastingSeatService, SeatHistoryService
+from review.scheduling import CrawlScheduler
+from review.sentiments import SentimentEngine, TokenBucket, apply_sentiment_cache, review_text_hash, sentiment_prompt_version, update_reviews_sentiment_async
+from review.drivers import DriverPool, DriverSession, blocked_url_patterns, build_chrome_options
+from review.waits import content_changed, element_present, elements_count_stable, snapshot, wait_for, wait_stats
+from review.replay import ParserBenchmark, ReplayServer, check_fixture, iter_fixture_dirs
 
-        # 로그 파일이 생성되었는지 확인
-        self.assertTrue(os.path.exists(log_file_path), "로그 파일이 생성되지 않았습니다.")
+def build_review_page_html(total, reviews):
+    """인터파크 관람후기 탭과 같은 구조의 리뷰 목록 HTML을 만듭니다."""
+    items = "".join(
+        f"""
+        <li class="bbsItem">
+          <div class="bbsItemHead">
+            <div class="prdStarIcon" data-star="{review['star']}"></div>
+            <ul>
+              <li class="bbsItemInfoList"><span class="name">{review['nickname']}</span></li>
+              <li class="bbsItemInfoList">{review['date']}</li>
+              <li class="bbsItemInfoList">조회 {review['views']}</li>
+              <li class="bbsItemInfoList">좋아요 {review['likes']}</li>
+            </ul>
+          </div>
+          <strong class="bbsTitleText">{review['title']}</strong>
+          <p class="bbsText">{review['text']}</p>
+        </li>"""
+        for review in reviews
+    )
+    return f"""
+    <html><body>
+    <div id="prdReview"><div>
+      <div></div><div></div>
+      <div><div><div><div><strong>관람후기 <span>{total}</span></strong></div></div></div></div>
+      <ul class="bbsList reviewList">{items}</ul>
+    </div></div>
+    </body></html>"""
 
-        # 로그 파일의 내용 확인
-        with open(log_file_path, 'r') as f:
-            content = f.read()
-            self.assertIn(test_message, content, "로그 메시지가 파일에 기록되지 않았습니다.")
+
+class ReviewFixtureServer:
+    """
+    티켓 사이트 대신 리뷰 목록 페이지를 응답하는 로컬 HTTP 서버.
+    /product?page=N 요청에 리뷰 15개씩 잘라서 응답하고, 요청된 페이지 번호를 기록합니다.
+    """
+
+    def __init__(self, reviews):
+        self.reviews = reviews
+        self.requested_pages = []
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                page = int(parse_qs(urlparse(self.path).query).get("page", ["1"])[0])
+                fixture.requested_pages.append(page)
+                chunk = fixture.reviews[(page - 1) * 15:page * 15]
+                body = build_review_page_html(len(fixture.reviews), chunk).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/product"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_fixture_reviews(count, offset=0):
+    # 최신 리뷰가 앞에 오도록 번호가 큰 리뷰부터
+    return [
+        {
+            "nickname": f"user{index}",
+            "date": f"2025.01.{index % 28 + 1:02d}",
+            "views": index * 10,
+            "likes": index,
+            "star": "4.5",
+            "title": f"리뷰 제목 {index}",
+            "text": f"리뷰 내용 {index}<br>두 번째 줄",
+        }
+        for index in range(offset + count, offset, -1)
+    ]
+
+
+@override_settings(REVIEW_HTTP_PAGE_URL='{url}?page={page}')
+class HttpReviewCrawlTest(TestCase):
+    def setUp(self):
+        self.concert = Concert.objects.create(
+            name="뮤지컬 테스트",
+            place="테스트 극장",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 1),
+        )
+
+    def test_parse_review_page(self):
+        html = build_review_page_html(40, make_fixture_reviews(2))
+        self.assertEqual(parse_review_total(html), 40)
+
+        raw = parse_review_items(html)
+        self.assertEqual(len(raw), 2)
+        self.assertEqual(raw[0]["nickname"], "user2")
+        self.assertEqual(raw[0]["date"], "2025.01.03")
+        self.assertEqual(raw[0]["star_rating"], "4.5")
+        self.assertEqual(raw[0]["description"], "리뷰 내용 2\n두 번째 줄")
+
+    def test_crawl_reviews_over_http(self):
+        with ReviewFixtureServer(make_fixture_reviews(40)) as server:
+            self.concert.crawling_url = server.url
+            created = crawl_concert_reviews_http(self.concert)
+
+        self.assertEqual(created, 40)
+        self.assertEqual(server.requested_pages, [1, 2, 3])
+        review = Review.objects.get(concert=self.concert, nickname="user40")
+        self.assertEqual(review.view_count, 400)
+        self.assertEqual(review.star_rating, 4.5)
+
+        self.concert.refresh_from_db()
+        self.assertEqual(self.concert.review_last_total, 40)
+        self.assertEqual(self.concert.review_last_key, "user40|2025-01-13|리뷰 제목 40")
+
+    def test_incremental_crawl_stops_at_known_reviews(self):
+        with ReviewFixtureServer(make_fixture_reviews(40)) as server:
+            self.concert.crawling_url = server.url
+            crawl_concert_reviews_http(self.concert)
+
+            # 총 개수가 같으면 첫 페이지만 보고 건너뜀
+            server.requested_pages.clear()
+            self.assertEqual(crawl_concert_reviews_http(self.concert), 0)
+            self.assertEqual(server.requested_pages, [1])
+
+            # 새 리뷰 3개가 앞에 추가되면 지난 최신 리뷰가 있는 1페이지에서 중단
+            server.reviews = make_fixture_reviews(3, offset=40) + server.reviews
+            server.requested_pages.clear()
+            self.assertEqual(crawl_concert_reviews_http(self.concert), 3)
+            self.assertEqual(server.requested_pages, [1])
+
+        self.assertEqual(Review.objects.filter(concert=self.concert).count(), 43)
+
+    def test_cut_off_crawl_does_not_skip_older_pages(self):
+        with ReviewFixtureServer(make_fixture_reviews(40)) as server:
+            self.concert.crawling_url = server.url
+            # 1페이지만 저장하고 끊긴 첫 크롤링 (커서 없음)
+            with mock.patch("review.fetchers.fetch_review_page", side_effect=[
+                build_review_page_html(40, server.reviews[:15]), HttpCrawlError("timeout"),
+            ]):
+                with self.assertRaises(HttpCrawlError):
+                    crawl_concert_reviews_http(self.concert)
+            self.concert.refresh_from_db()
+            self.assertEqual((self.concert.review_last_total, self.concert.review_last_key), (None, None))
+            self.concert.crawling_url = server.url
+
+            # 다음 구간: 1페이지가 모두 저장된 리뷰여도 지난 최신 리뷰가 없으므로 끝까지 진행한 뒤 커서 저장
+            self.assertEqual(crawl_concert_reviews_http(self.concert), 25)
+            self.assertEqual(server.requested_pages, [1, 2, 3])
+
+        self.concert.refresh_from_db()
+        self.assertEqual(self.concert.review_last_key, "user40|2025-01-13|리뷰 제목 40")
+        self.assertEqual(Review.objects.filter(concert=self.concert).count(), 40)
+
+    def test_resume_from_checkpoint(self):
+        with ReviewFixtureServer(make_fixture_reviews(40)) as server:
+            self.concert.crawling_url = server.url
+
+            # 2페이지까지 저장하고 중단된 크롤링을 흉내냄
+            checkpoint = open_checkpoint(self.concert, CrawlCheckpoint.KIND_REVIEW)
+            checkpoint.save_review_page(2, "user11|2025-01-12|리뷰 제목 11", "user40|2025-01-13|리뷰 제목 40")
+            checkpoint.fail("chrome crashed")
+
+            self.assertEqual(crawl_concert_reviews_http(self.concert, checkpoint=checkpoint), 10)
+            self.assertEqual(server.requested_pages, [1, 3])
+
+        checkpoint.refresh_from_db()
+        self.assertTrue(checkpoint.is_done)
+        self.assertEqual(checkpoint.page, 3)
+        self.assertIn(self.concert.id, done_concert_ids(CrawlCheckpoint.KIND_REVIEW))
+
+        self.concert.refresh_from_db()
+        self.assertEqual(self.concert.review_last_key, "user40|2025-01-13|리뷰 제목 40")
+
+    def test_crawl_run_records_steps(self):
+        with ReviewFixtureServer(make_fixture_reviews(40)) as server:
+            self.concert.crawling_url = server.url
+            with crawl_run(CrawlRun.TASK_REVIEWS) as run:
+                with record_step(run, CrawlStep.KIND_CONCERT, self.concert, self.concert.name) as step:
+                    crawl_concert_reviews_http(self.concert, step=step)
+
+        run.refresh_from_db()
+        self.assertEqual(run.status, CrawlRun.STATUS_SUCCESS)
+        self.assertEqual(run.concert_count, 1)
+        self.assertEqual(run.inserted_count, 40)
+        pages = run.steps.filter(kind=CrawlStep.KIND_REVIEW_PAGE).order_by("started_at")
+        self.assertEqual([page.label for page in pages], ["1 페이지", "2 페이지", "3 페이지"])
+        self.assertEqual([page.inserted_count for page in pages], [15, 15, 10])
+
+        user = User.objects.create_user("tester", password="pw")
+        self.client.force_login(user)
+        response = self.client.get(reverse("review:crawl_dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.concert.name)
+
+
+class FakeReviewBoard:
+    """관람후기 탭 흉내: 현재 페이지 번호와 방문한 페이지를 기록 (crawls.crawl_concert_reviews 검증용)"""
+
+    def __init__(self, reviews):
+        self.reviews = reviews
+        self.page = 1
+        self.visited = []
+
+    def open(self, driver, concert):
+        self.page = 1
+        self.visited = []
+        return len(self.reviews)
+
+    def extract(self, driver, mode=None):
+        self.visited.append(self.page)
+        chunk = self.reviews[(self.page - 1) * 15:self.page * 15]
+        return parse_review_items(build_review_page_html(len(self.reviews), chunk))
+
+    def next_page(self, driver, page):
+        self.page = page + 1
+
+    def crawl(self, concert, **kwargs):
+        with mock.patch.object(crawls, "open_review_tab", self.open), \
+                mock.patch.object(crawls, "extract_review_page", self.extract), \
+                mock.patch.object(crawls, "go_to_next_review_page", self.next_page):
+            crawls.crawl_concert_reviews(None, concert, **kwargs)
+        concert.refresh_from_db()
+        return self.visited
+
+
+@override_settings(CRAWL_PIPELINE_QUEUE_SIZE=0)
+class SeleniumReviewCrawlTest(TestCase):
+    def setUp(self):
+        self.concert = Concert.objects.create(name="뮤지컬 셀레니움", place="테스트 극장", start_date=date(2025, 1, 1), end_date=date(2025, 3, 1))
+
+    def test_incremental_crawl_stops_at_cursor(self):
+        board = FakeReviewBoard(make_fixture_reviews(40))
+        self.assertEqual(board.crawl(self.concert), [1, 2, 3])
+        self.assertEqual((self.concert.review_last_total, self.concert.review_last_key), (40, "user40|2025-01-13|리뷰 제목 40"))
+
+        # 총 개수가 그대로면 리뷰를 읽지 않음
+        self.assertEqual(board.crawl(self.concert), [])
+
+        # 새 리뷰 20개: 지난 최신 리뷰(user40)가 있는 2페이지에서 중단하고 커서를 새 최신 리뷰로 옮김
+        board.reviews = make_fixture_reviews(20, offset=40) + board.reviews
+        self.assertEqual(board.crawl(self.concert), [1, 2])
+        self.assertEqual((self.concert.review_last_total, self.concert.review_last_key), (60, "user60|2025-01-05|리뷰 제목 60"))
+        self.assertEqual(Review.objects.filter(concert=self.concert).count(), 60)
+
+        # full_crawl이면 커서를 무시하고 모든 페이지를 확인
+        self.assertEqual(board.crawl(self.concert, full_crawl=True), [1, 2, 3, 4])
+
+    def test_writer_dedupes_in_memory_and_bulk_inserts(self):
+        reviews = normalize_reviews(parse_review_items(build_review_page_html(5, make_fixture_reviews(5))))
+        for review in reviews[3:]:
+            Review.objects.create(concert=self.concert, **review)
+
+        # 기존 키는 생성 시 한 번만 읽고, 페이지 추가는 쿼리 없이 메모리에서 판단 (같은 페이지 안의 중복도 제외)
+        with self.assertNumQueries(1):
+            writer = ReviewWriter(self.concert)
+        with self.assertNumQueries(0):
+            self.assertEqual(writer.add_page(reviews + reviews[:1]), (6, 3, False))
+        self.assertEqual(len(writer.pending), 3)
+
+        # 새 리뷰는 한 번의 INSERT로 저장 (트랜잭션 savepoint 쿼리 제외)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(writer.flush(), 3)
+        self.assertEqual(len([query for query in queries if query["sql"].startswith("INSERT")]), 1)
+        self.assertEqual(Review.objects.filter(concert=self.concert).count(), 5)
+        self.assertEqual(writer.flush(), 0)
+
+
+class ReviewCrawlPoolTest(TransactionTestCase):
+    """워커 스레드가 각자 DB 커넥션을 쓰므로 커밋된 데이터로 검증"""
+
+    def test_workers_share_concert_queue(self):
+        concerts = [
+            Concert.objects.create(name=f"뮤지컬 풀 {i}", place="테스트 극장", start_date=date(2025, 1, 1), end_date=date(2025, 3, 1),
+                                   crawling_url=f"https://tickets.interpark.com/goods/{i}", is_crawling_enabled=True)
+            for i in range(4)
+        ]
+        Concert.objects.create(name="뮤지컬 비활성", place="테스트 극장", start_date=date(2025, 1, 1), end_date=date(2025, 3, 1),
+                               crawling_url="https://tickets.interpark.com/goods/9", is_crawling_enabled=False)
+        crawled = []
+
+        def crawl(concert, run, worker_timeout, restart_done=False):
+            crawled.append((threading.current_thread().name, concert.id))
+            time.sleep(0.05)
+            if concert.id == concerts[0].id:
+                raise RuntimeError("chrome crashed")
+
+        # 테스트 DB(공유 캐시 in-memory SQLite)는 스레드 동시 쓰기를 기다리지 않으므로 작업 임대는 생략
+        with mock.patch.object(tasks, "crawl_review_concert", side_effect=crawl), \
+                mock.patch.object(tasks, "leased_concert_job", side_effect=lambda *args: contextlib.nullcontext(True)):
+            tasks.crawl_all_concerts_reviews(pool_size=2, worker_timeout=5)
+
+        # 실패한 공연이 있어도 나머지 공연을 계속 처리하고, 두 워커가 나눠 가져감
+        self.assertEqual(sorted(concert_id for _, concert_id in crawled), [concert.id for concert in concerts])
+        self.assertEqual({name for name, _ in crawled}, {"review-worker-1", "review-worker-2"})
+        run = CrawlRun.objects.get()
+        self.assertEqual((run.task, run.status), (CrawlRun.TASK_REVIEWS, CrawlRun.STATUS_SUCCESS))
+
+
+def build_seat_page_html(seats):
+    """회차를 선택한 상세 페이지의 좌석 테이블 구조를 흉내낸 HTML."""
+    items = "".join(
+        f'''<li class="seatTableItem"><span class="seatTableName">{seat_class}</span>
+        <span class="seatTableStatus">{count}석</span></li>'''
+        for seat_class, count in seats
+    )
+    return f'<html><body><ul class="seatTable">{items}<li class="seatTableItem soldOut"><span class="seatTableName">A석</span><span class="seatTableStatus">매진</span></li></ul></body></html>'
+
+
+class ReplayHarnessTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.fixture = os.path.join(self.tmp.name, "24000001")
+        os.makedirs(self.fixture)
+
+        # 녹화 결과와 같은 구조의 fixture (리뷰 2페이지, 좌석 1회차)
+        reviews = make_fixture_reviews(20)
+        manifest = {"concert": "뮤지컬 테스트", "review_total": 20, "reviews": [], "seats": []}
+        for page in (1, 2):
+            name = f"reviews_p{page}.html"
+            chunk = reviews[(page - 1) * 15:page * 15]
+            with open(os.path.join(self.fixture, name), "w", encoding="utf-8") as f:
+                f.write(build_review_page_html(20, chunk))
+            manifest["reviews"].append({"file": name, "page": page, "count": len(chunk)})
+        with open(os.path.join(self.fixture, "seats_20250103_1.html"), "w", encoding="utf-8") as f:
+            f.write(build_seat_page_html([("VIP석", 12), ("R석", 3)]))
+        manifest["seats"].append({"file": "seats_20250103_1.html", "count": 3})
+        with open(os.path.join(self.fixture, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+    def test_parse_seat_items(self):
+        html = build_seat_page_html([("VIP석", 12), ("R석", 3)])
+        self.assertEqual(parse_seat_items(html), [("VIP석", 12), ("R석", 3), ("A석", 0)])
+
+    def test_replay_fixture_to_http_crawler_and_benchmark(self):
+        self.assertEqual(check_fixture(self.fixture), [])
+
+        concert = Concert.objects.create(
+            name="뮤지컬 테스트",
+            place="테스트 극장",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 1),
+        )
+        with ReplayServer(self.tmp.name) as server:
+            # reviews.html?page=N 요청이 reviews_pN.html로 재생됨
+            concert.crawling_url = server.url_for(self.fixture, "reviews.html")
+            self.assertEqual(crawl_concert_reviews_http(concert), 20)
+
+            benchmark = ParserBenchmark(iter_fixture_dirs(self.tmp.name), repeat=2, server=server, session=get_http_session())
+            for backend in ("lxml", "http"):
+                result = benchmark.run(backend)
+                self.assertEqual(result["reviews"]["items"], 40)
+                self.assertEqual(result["seats"]["items"], 6)
+                self.assertGreater(result["reviews"]["per_sec"], 0)
+
+
+class ScriptPayloadDriver:
+    """execute_script 결과만 돌려주는 가짜 driver (단일 스크립트 추출 결과 검증용)."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        return self.payload
+
+
+class ScriptExtractionTest(TestCase):
+    def test_review_rows_are_validated(self):
+        row = {
+            "nickname": "관객1",
+            "date": "2025.01.02",
+            "view_count": "조회 10",
+            "like_count": "좋아요 2",
+            "title": "제목",
+            "description": "내용",
+            "star_rating": "9.0",
+        }
+        payload = json.dumps({"rows": [row, dict(row, title=None), "잘못된 항목"], "text": ""})
+        driver = ScriptPayloadDriver(payload)
+
+        self.assertEqual(extract_review_rows(driver), [row])
+        self.assertEqual(driver.calls, 1)
+
+        with self.assertRaises(ValueError):
+            extract_review_rows(ScriptPayloadDriver(None))
+
+    def test_seat_round(self):
+        payload = json.dumps({
+            "rows": [{"seat_class": "VIP석", "status": "12석"}, {"seat_class": "R석", "status": "매진"}],
+            "text": "배우A, 배우B",
+        })
+        self.assertEqual(
+            extract_seat_round(ScriptPayloadDriver(payload)),
+            ("배우A, 배우B", [("VIP석", 12), ("R석", 0)]),
+        )
+
+
+class PerformanceLogDriver:
+    """성능 로그와 응답 본문만 돌려주는 가짜 driver (좌석 API 응답 캡처 검증용)."""
+
+    def __init__(self):
+        self.entries = []
+        self.bodies = {}
+
+    def respond(self, request_id, url, body=None):
+        self.entries.append({"method": "Network.responseReceived", "params": {"requestId": request_id, "response": {"url": url}}})
+        self.entries.append({"method": "Network.loadingFinished", "params": {"requestId": request_id}})
+        if body is not None:
+            self.bodies[request_id] = json.dumps(body)
+
+    def get_log(self, log_type):
+        entries, self.entries = self.entries, []
+        return [{"message": json.dumps({"message": entry})} for entry in entries]
+
+    def execute_cdp_cmd(self, command, params):
+        if command == "Network.getResponseBody":
+            if params["requestId"] not in self.bodies:
+                raise WebDriverException("No resource with given identifier found")
+            return {"body": self.bodies[params["requestId"]], "base64Encoded": False}
+        return {}
+
+
+class FakeElement:
+    def __init__(self, text="", on_click=None, attrs=None, children=None):
+        self.text = text
+        self.on_click = on_click
+        self.attrs = attrs or {}
+        self.children = children or {}
+
+    def get_attribute(self, name):
+        return self.attrs.get(name)
+
+    def find_element(self, by, value):
+        return self.children[value]
+
+    def is_enabled(self):
+        return True
+
+
+class StaleElement(FakeElement):
+    """DOM에서 떨어진 요소 흉내"""
+
+    def is_enabled(self):
+        raise StaleElementReferenceException("element is not attached to the page document")
+
+
+class FrameDriver:
+    """find_elements를 호출할 때마다 frames의 다음 요소 목록을 돌려주는 가짜 driver (마지막 목록은 계속 유지)"""
+
+    def __init__(self, *frames):
+        self.frames = list(frames)
+        self.calls = 0
+
+    def find_elements(self, by, value):
+        self.calls += 1
+        return self.frames.pop(0) if len(self.frames) > 1 else self.frames[0]
+
+
+@override_settings(CRAWL_WAIT_POLL=0.01, CRAWL_WAIT_TIMEOUT=0.2, CRAWL_WAIT_SETTLE=0.05)
+class WaitEngineTest(TestCase):
+    def setUp(self):
+        wait_stats.reset()
+
+    def test_wait_for_returns_condition_value_and_records_timeouts(self):
+        first = FakeElement("첫 리뷰")
+        driver = FrameDriver([], [], [first, FakeElement("둘째 리뷰")])
+        self.assertIs(wait_for(driver, element_present(("class name", "bbsItem")), "review_list"), first)
+        self.assertEqual(driver.calls, 3)
+
+        # 조건을 만족하지 못하면 예외 없이 None을 반환하고 타임아웃으로 기록
+        started = time.monotonic()
+        self.assertIsNone(wait_for(FrameDriver([]), element_present(("class name", "bbsItem")), "review_list"))
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+        stats = wait_stats.summary()["review_list"]
+        self.assertEqual((stats["count"], stats["timeouts"]), (2, 1))
+
+    def test_content_changed(self):
+        locator = ("class name", "timeTableLabel")
+        previous = snapshot(FrameDriver([FakeElement("1회 14:00")]), locator)
+
+        # 텍스트가 바뀌면 변경
+        changed = [FakeElement("1회 19:30")]
+        self.assertEqual(content_changed(locator, previous)(FrameDriver(changed)), changed)
+        # 같은 요소, 같은 텍스트면 기다리고, unchanged_after초 동안 유지되면 그대로 진행 (회차 구성이 같은 날짜)
+        same = FrameDriver([FakeElement("1회 14:00")])
+        self.assertFalse(content_changed(locator, previous)(same))
+        self.assertIsNone(wait_for(same, content_changed(locator, previous), "seat_date", timeout=0.1))
+        self.assertEqual(len(wait_for(same, content_changed(locator, previous, unchanged_after=0.05), "seat_date")), 1)
+
+        # 텍스트가 같아도 이전 첫 요소가 DOM에서 떨어졌으면 다시 그려진 것으로 봄
+        previous["first"] = StaleElement("1회 14:00")
+        redrawn = [FakeElement("1회 14:00")]
+        self.assertEqual(content_changed(locator, previous)(FrameDriver(redrawn)), redrawn)
+
+    def test_elements_count_stable_waits_for_list_to_settle(self):
+        seats = [FakeElement(f"좌석 {i}") for i in range(3)]
+        driver = FrameDriver([], seats[:1], seats[:2], seats)
+        started = time.monotonic()
+        self.assertEqual(wait_for(driver, elements_count_stable(("class name", "seatTableItem")), "seat_round"), seats)
+        # 마지막으로 개수가 바뀐 뒤 CRAWL_WAIT_SETTLE초 동안 그대로일 때 반환
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertGreaterEqual(driver.calls, 5)
+
+
+class FakeCalendarDriver:
+    """
+    예매 달력 화면 흉내 (SeatCalendarWalker 검증용).
+    months: {"2025.01": {일: [(회차, 시간, 배우, [(좌석 등급, 잔여석), ...]), ...]}, ...}
+    성능 로그는 없어서 get_log는 WebDriverException을 발생시킵니다.
+    seat_delay: 회차를 클릭한 뒤 좌석 테이블을 조회해도 앞 회차의 잔여석이 남아 있는 횟수 (늦게 그려지는 화면 흉내)
+    """
+
+    def __init__(self, months, seat_delay=0):
+        self.months = months
+        self.month_keys = sorted(months)
+        self.month_index = 0
+        self.day = None
+        self.round = None
+        self.shown_round = None
+        self.seat_delay = seat_delay
+        self.seat_delay_left = 0
+        self.clicked_days = []
+
+    @property
+    def current_days(self):
+        return self.months[self.month_keys[self.month_index]]
+
+    def _select_day(self, day):
+        self.day = day
+        self.round = None
+        self.clicked_days.append((self.month_keys[self.month_index], day))
+
+    def _select_round(self, round_info):
+        self.round = round_info
+        self.seat_delay_left = self.seat_delay
+
+    def _next_month(self):
+        self.month_index += 1
+        self.day = None
+        self.round = None
+
+    def find_element(self, by, value):
+        if value == CURRENT_MONTH_LOCATOR[1]:
+            return FakeElement(self.month_keys[self.month_index])
+        if value == NEXT_MONTH_XPATH:
+            if self.month_index + 1 >= len(self.month_keys):
+                raise NoSuchElementException("no next month")
+            return FakeElement(on_click=self._next_month)
+        if value.startswith(ACTIVE_DAYS_XPATH + "["):
+            day = int(value.rsplit('"', 2)[1])
+            if day not in self.current_days:
+                raise NoSuchElementException(value)
+            return FakeElement(str(day), on_click=lambda: self._select_day(day))
+        if value == ACTORS_XPATH and self.shown_round is not None:
+            return FakeElement(self.shown_round[2])
+        raise NoSuchElementException(value)
+
+    def find_elements(self, by, value):
+        if value == CURRENT_MONTH_LOCATOR[1]:
+            return [self.find_element(by, value)]
+        if value == ACTIVE_DAYS_XPATH:
+            return [FakeElement(str(day)) for day in sorted(self.current_days)]
+        if value == ROUND_LOCATOR[1] and self.day is not None:
+            return [
+                FakeElement(f"{r[0]} {r[1]}", on_click=lambda r=r: self._select_round(r), attrs={"data-text": f"{r[0]} {r[1]}"})
+                for r in self.current_days[self.day]
+            ]
+        if value == SEAT_ITEM_LOCATOR[1]:
+            if self.seat_delay_left:
+                self.seat_delay_left -= 1
+            elif self.round is not None:
+                self.shown_round = self.round
+            if self.shown_round is None:
+                return []
+            return [
+                FakeElement(
+                    f"{seat_class} {count}석",
+                    children={"seatTableName": FakeElement(seat_class), "seatTableStatus": FakeElement(f"{count}석")},
+                )
+                for seat_class, count in self.shown_round[3]
+            ]
+        return []
+
+    def execute_script(self, script, *args):
+        if "click" in script and args:
+            args[0].on_click()
+            return None
+        raise WebDriverException("script not supported")
+
+    def get_log(self, log_type):
+        raise WebDriverException("log type 'performance' not found")
+
+
+@override_settings(CRAWL_WAIT_POLL=0.01, CRAWL_WAIT_SETTLE=0, CRAWL_WAIT_UNCHANGED_GRACE=0)
+class SeatCalendarWalkerTest(TestCase):
+    MONTHS = {
+        month: {day: [("1회", "19:30", "배우A", [("R석", day)])] for day in days}
+        for month, days in (("2024.12", (28,)), ("2025.01", (3, 4, 10)), ("2025.02", (1,)))
+    }
+
+    def test_walks_all_months(self):
+        driver = FakeCalendarDriver(self.MONTHS)
+        rounds = list(SeatCalendarWalker(driver).walk())
+        self.assertEqual(
+            [(r["year"], r["month"], r["day_num"], r["seats"]) for r in rounds],
+            [(2024, 12, 28, [("R석", 28)]), (2025, 1, 3, [("R석", 3)]), (2025, 1, 4, [("R석", 4)]),
+             (2025, 1, 10, [("R석", 10)]), (2025, 2, 1, [("R석", 1)])],
+        )
+
+    def test_resume_skips_saved_months_and_days(self):
+        driver = FakeCalendarDriver(self.MONTHS)
+        rounds = list(SeatCalendarWalker(driver, resume_after=(2025, 1, 4)).walk())
+        # 저장된 달과 저장된 날짜까지는 클릭하지 않음
+        self.assertEqual(driver.clicked_days, [("2025.01", 10), ("2025.02", 1)])
+        self.assertEqual([(r["year"], r["month"], r["day_num"]) for r in rounds], [(2025, 1, 10), (2025, 2, 1)])
+
+    @override_settings(CRAWL_WAIT_UNCHANGED_GRACE=1)
+    def test_waits_for_seat_counts_of_clicked_round(self):
+        # 두 회차의 좌석 등급은 같고 잔여석만 다르며, 클릭 후 몇 번은 앞 회차의 잔여석이 그대로 보임
+        driver = FakeCalendarDriver({"2025.01": {3: [
+            ("1회", "14:00", "배우A", [("VIP석", 2), ("R석", 5)]),
+            ("2회", "19:30", "배우B", [("VIP석", 0), ("R석", 1)]),
+        ]}}, seat_delay=3)
+        started = time.monotonic()
+        rounds = list(SeatCalendarWalker(driver).walk())
+        self.assertEqual(
+            [(r["round_name"], r["actors"], r["seats"]) for r in rounds],
+            [("1회", "배우A", [("VIP석", 2), ("R석", 5)]), ("2회", "배우B", [("VIP석", 0), ("R석", 1)])],
+        )
+        # 잔여석이 바뀌면 CRAWL_WAIT_UNCHANGED_GRACE를 기다리지 않고 바로 진행
+        self.assertLess(time.monotonic() - started, 1)
+
+
+@override_settings(SEAT_NETWORK_URL_PATTERN=r"api\.test/v1/goods/")
+class NetworkSeatCaptureTest(TestCase):
+    def test_rounds_and_remain_seats_from_responses(self):
+        driver = PerformanceLogDriver()
+        capture = SeatNetworkCapture(driver).start()
+        driver.respond("1", "https://api.test/v1/goods/25000001/playSeq?startDate=20250101&endDate=20250131", {
+            "data": [
+                {"playSeq": "001", "playDate": "20250103", "playTime": "1930", "casting": [{"actorName": "배우A"}, {"actorName": "배우B"}]},
+                {"playSeq": "002", "playDate": "20250103", "playTime": "1400"},
+                {"playSeq": "003", "playDate": "20250104", "playTime": "1400",
+                 "remainSeat": [{"seatGradeName": "VIP석", "remainCnt": 7}]},
+            ]
+        })
+        driver.respond("2", "https://api.test/v1/goods/25000001/playSeq/PlaySeq/001/REMAINSEAT", {
+            "data": {"remainSeat": [{"seatGradeName": "VIP석", "remainCnt": 3}, {"seatGradeName": "R석", "remainCnt": "0"}]}
+        })
+        driver.respond("3", "https://other.test/banner.json", {"seatGradeName": "무시", "remainCnt": 1})
+        driver.respond("4", "https://api.test/v1/goods/25000001/playSeq/PlaySeq/002/REMAINSEAT")  # 본문 없음
+
+        self.assertEqual(capture.collect(), 2)
+        self.assertEqual(capture.error_count, 1)
+        rounds = capture.rounds_for((2025, 1, 3))
+        self.assertEqual(
+            [(r["play_seq"], r["round_name"], r["round_time"], r["actors"]) for r in rounds],
+            [("002", "1회", "14:00", None), ("001", "2회", "19:30", "배우A, 배우B")],
+        )
+        self.assertEqual(capture.seats_for("001"), [("VIP석", 3), ("R석", 0)])
+        self.assertIsNone(capture.seats_for("002"))
+        # 월 단위 응답에 함께 온 회차별 잔여석
+        self.assertEqual(capture.seats_for("003"), [("VIP석", 7)])
+
+    @override_settings(CRAWL_WAIT_POLL=0.01, CRAWL_WAIT_SETTLE=0, CRAWL_WAIT_UNCHANGED_GRACE=0, SEAT_NETWORK_TIMEOUT=5)
+    def test_walker_falls_back_to_dom_without_performance_log(self):
+        driver = FakeCalendarDriver({"2025.01": {3: [("1회", "14:00", "배우A", [("VIP석", 2)])], 4: [("1회", "19:30", "배우B", [("R석", 0)])]}})
+        capture = SeatNetworkCapture(driver).start()
+        self.assertFalse(capture.available)
+        self.assertEqual(capture.collect(), 0)
+
+        started = time.monotonic()
+        rounds = list(seat_calendar_walker(driver, mode="network").walk())
+        # 응답을 기다리지 않고(SEAT_NETWORK_TIMEOUT) 바로 화면에서 추출
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(
+            [(r["day_num"], r["round_name"], r["round_time"], r["actors"], r["seats"]) for r in rounds],
+            [(3, "1회", "14:00", "배우A", [("VIP석", 2)]), (4, "1회", "19:30", "배우B", [("R석", 0)])],
+        )
+
+
+class WriterPipelineTest(TestCase):
+    def test_jobs_run_in_order_on_writer_thread(self):
+        done = []
+        producer = threading.current_thread()
+
+        def store(page):
+            self.assertIsNot(threading.current_thread(), producer)
+            done.append(page)
+            return page == 3  # 이미 수집한 구간 도달
+
+        with WriterPipeline("test-writer", maxsize=1) as pipeline:
+            for page in range(1, 6):
+                pipeline.submit(store, page)
+        self.assertEqual(done, [1, 2, 3, 4, 5])
+        self.assertTrue(pipeline.stop_requested)
+
+    def test_writer_error_is_raised_to_producer(self):
+        def fail():
+            raise RuntimeError("DB 오류")
+
+        pipeline = WriterPipeline("test-writer", maxsize=2).start()
+        pipeline.submit(fail)
+        with self.assertRaises(RuntimeError):
+            pipeline.close()
+
+        # maxsize=0이면 submit에서 바로 실행
+        inline = WriterPipeline(maxsize=0)
+        with self.assertRaises(RuntimeError):
+            inline.submit(fail)
+
+
+class BrowserProfileTest(TestCase):
+    @override_settings(CRAWL_BLOCKED_RESOURCE_TYPES=["image", "font"], CRAWL_BLOCKED_URL_PATTERNS=["*tracker.example*"])
+    def test_lean_profile(self):
+        options = build_chrome_options("lean")
+        self.assertIn("--disable-extensions", options.arguments)
+        self.assertEqual(options.experimental_options["prefs"]["profile.managed_default_content_settings.images"], 2)
+
+        patterns = blocked_url_patterns()
+        self.assertIn("*.woff*", patterns)
+        self.assertIn("*tracker.example*", patterns)
+        self.assertNotIn("*.mp4*", patterns)
+
+        full = build_chrome_options("full")
+        self.assertIn("--window-size=1920,1080", full.arguments)
+        self.assertNotIn("prefs", full.experimental_options)
+
+
+class FakeBrowser:
+    """DriverPool 테스트용 가짜 드라이버 (execute_script로 상태 확인, quit 기록)"""
+
+    def __init__(self, number):
+        self.number = number
+        self.healthy = True
+        self.closed = False
+        self.window_handles = ["main"]
+        self.switch_to = SimpleNamespace(window=lambda handle: None)
+        self.timeouts = {}
+
+    def set_page_load_timeout(self, timeout):
+        self.timeouts["page_load"] = timeout
+
+    def set_script_timeout(self, timeout):
+        self.timeouts["script"] = timeout
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise WebDriverException("browser died")
+        return 1
+
+    def quit(self):
+        self.closed = True
+
+
+class FakeDriverPool(DriverPool):
+    def __init__(self, size):
+        super().__init__(size=size, page_load_timeout=10, max_uses=3)
+        self.browsers = []
+
+    def _create_session(self):
+        self.browsers.append(FakeBrowser(len(self.browsers) + 1))
+        return DriverSession(self.browsers[-1])
+
+
+class DriverPoolTest(TestCase):
+    def test_reuse_and_replace_sessions(self):
+        pool = FakeDriverPool(size=2)
+        pool.warm_up()
+        self.assertEqual(len(pool.browsers), 2)
+
+        first = pool.acquire(timeout=1)
+        pool.release(first)
+        # 반납된 세션을 다시 빌려줌 (새로 띄우지 않음)
+        self.assertIs(pool.acquire(timeout=1), first)
+        self.assertEqual(first.uses, 2)
+
+        # 응답하지 않는 세션은 폐기하고 남은 세션을 빌려주며, 빈 자리에는 새로 띄움
+        pool.release(first)
+        first.driver.healthy = False
+        second = pool.acquire(timeout=1)
+        self.assertTrue(first.driver.closed)
+        self.assertIsNot(second, first)
+        self.assertEqual(pool._created, 1)
+        replaced = pool.acquire(timeout=1)
+        self.assertEqual(replaced.driver.number, 3)
+        self.assertEqual(pool._created, 2)
+
+        # max_uses번 사용한 세션은 반납할 때 종료
+        replaced.uses = 3
+        pool.release(replaced)
+        self.assertTrue(replaced.driver.closed)
+        self.assertEqual(pool._created, 1)
+
+    def test_discard_wakes_waiting_acquire(self):
+        pool = FakeDriverPool(size=1)
+        session = pool.acquire(timeout=1)
+        with self.assertRaises(queue.Empty):
+            pool.acquire(timeout=0.05)
+
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=5)))
+        started = time.monotonic()
+        waiter.start()
+        time.sleep(0.1)
+        # 오류로 폐기된 세션 자리에 기다리던 워커가 바로 새 세션을 띄움
+        pool.release(session, broken=True)
+        waiter.join(5)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual([s.driver.number for s in acquired], [2])
+        self.assertEqual(pool._created, 1)
+
+    def test_session_timeout_is_restored_on_release(self):
+        pool = FakeDriverPool(size=1)
+        with pool.session(page_load_timeout=5) as driver:
+            self.assertEqual(driver.timeouts, {"page_load": 5, "script": 5})
+        # 다음에 빌리는 작업(좌석 크롤링 등)은 풀 기본 타임아웃을 씀
+        self.assertEqual(driver.timeouts, {"page_load": 10, "script": 10})
+        with pool.session() as reused:
+            self.assertIs(reused, driver)
+            self.assertEqual(reused.timeouts, {"page_load": 10, "script": 10})
+
+
+class FakeProductDriver:
+    """상세 페이지 흉내: redirects로 URL 이동을, live_codes로 본문이 있는(404가 아닌) 상품을 지정"""
+
+    def __init__(self, redirects=None, live_codes=()):
+        self.redirects = redirects or {}
+        self.live_codes = set(live_codes)
+        self.current_url = ""
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = self.redirects.get(url, url)
+
+    def find_elements(self, by, value):
+        code = tasks.extract_product_code(self.current_url)
+        return [FakeElement("")] if code in self.live_codes else []
+
+
+@override_settings(CRAWL_WAIT_TIMEOUT=0.05, CRAWL_WAIT_POLL=0.01)
+class ProductPageTest(TestCase):
+    def setUp(self):
+        self.concert = Concert.objects.create(
+            name="뮤지컬 상세",
+            place="테스트 극장",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 1),
+            product_url="https://tickets.interpark.com/goods/25000001",
+            product_code="25000001",
+        )
+        self.new_url = "https://tickets.interpark.com/goods/25000002"
+
+    def open(self, driver):
+        def search(driver, name):
+            driver.current_url = self.new_url
+            return True
+
+        with mock.patch.object(tasks, "search_product_page", side_effect=search) as search_mock:
+            opened = tasks.open_product_page(driver, self.concert)
+        self.concert.refresh_from_db()
+        return opened, search_mock
+
+    def test_valid_cached_url_skips_search(self):
+        driver = FakeProductDriver(live_codes=["25000001"])
+        opened, search_mock = self.open(driver)
+        self.assertTrue(opened)
+        search_mock.assert_not_called()
+        self.assertEqual(driver.visited, ["https://tickets.interpark.com/goods/25000001"])
+
+    def test_redirected_cached_url_falls_back_to_search(self):
+        driver = FakeProductDriver(
+            redirects={"https://tickets.interpark.com/goods/25000001": "https://tickets.interpark.com/goods/24999999"},
+            live_codes=["24999999", "25000002"],
+        )
+        opened, search_mock = self.open(driver)
+        self.assertTrue(opened)
+        search_mock.assert_called_once_with(driver, "뮤지컬 상세")
+        self.assertEqual((self.concert.product_url, self.concert.product_code), (self.new_url, "25000002"))
+
+    def test_missing_cached_page_falls_back_to_search(self):
+        # 상품 코드는 같지만 본문이 없는 404 페이지
+        opened, search_mock = self.open(FakeProductDriver(live_codes=["25000002"]))
+        self.assertTrue(opened)
+        search_mock.assert_called_once()
+        self.assertEqual((self.concert.product_url, self.concert.product_code), (self.new_url, "25000002"))
+
+    def test_failed_search_keeps_cached_url(self):
+        driver = FakeProductDriver()
+        with mock.patch.object(tasks, "search_product_page", return_value=False):
+            self.assertFalse(tasks.open_product_page(driver, self.concert))
+        self.concert.refresh_from_db()
+        self.assertEqual(self.concert.product_code, "25000001")
+
+
+class SeatChangeCaptureTest(TestCase):
+    def crawl(self, concert, created_at, seats):
+        writer = SeatSnapshotWriter(concert, created_at=created_at)
+        for seat_class, seat_count in seats:
+            writer.add(2025, 1, 3, "1회", "19:30", seat_class, seat_count, "배우A")
+        return writer.flush()
+
+    def test_only_changes_are_stored_and_series_is_rebuilt(self):
+        concert = Concert.objects.create(
+            name="뮤지컬 좌석",
+            place="테스트 극장",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 1),
+        )
+        t1, t2, t3 = (datetime(2025, 1, 1, hour) for hour in (0, 6, 12))
+
+        self.assertEqual(self.crawl(concert, t1, [("VIP석", 3), ("R석", 10), ("S석", 5)]), 3)
+        self.assertEqual(self.crawl(concert, t2, [("VIP석", 3), ("R석", 10), ("S석", 4)]), 1)
+        # 변경이 없어도 수집 기록은 남음, VIP석은 더 이상 보이지 않음 (매진 후 목록에서 제외 등)
+        self.assertEqual(self.crawl(concert, t3, [("R석", 10), ("S석", 4)]), 0)
+
+        self.assertEqual(Seat.objects.filter(concert=concert).count(), 4)
+        self.assertEqual(list(SeatSnapshot.objects.values_list("seen_count", "changed_count")), [(3, 3), (3, 1), (2, 0)])
+
+        series = SeatHistoryService("뮤지컬 좌석").get_time_series()
+        counts = defaultdict(list)
+        for row in series:
+            self.assertEqual(row["date"], "2025-1-3")
+            counts[row["seat_class"]].append((row["created_at"], row["seat_count"]))
+        self.assertEqual(counts["R석"], [(t1, 10), (t2, 10), (t3, 10)])
+        self.assertEqual(counts["S석"], [(t1, 5), (t2, 4), (t3, 4)])
+        self.assertEqual(counts["VIP석"], [(t1, 3), (t2, 3)])
+
+    def test_flush_writes_in_chunks_into_one_snapshot(self):
+        concert = Concert.objects.create(name="뮤지컬 청크", place="테스트 극장", start_date=date(2025, 1, 1), end_date=date(2025, 3, 1))
+        created_at = datetime(2025, 1, 1, 9)
+        writer = SeatSnapshotWriter(concert, chunk_size=2, created_at=created_at)
+        for day_num in (3, 4, 5, 6, 7):
+            self.assertTrue(writer.add(2025, 1, day_num, "1회", "19:30", "R석", 10, "배우A"))
+        # 회차 시간이 없는 행은 저장할 수 없어 건너뜀
+        self.assertFalse(writer.add(2025, 1, 8, "1회", "", "R석", 10, "배우A"))
+
+        # 5개 행을 chunk_size(2)씩 나누어 INSERT
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(writer.flush(), 5)
+        seat_inserts = [query for query in queries if query["sql"].startswith('INSERT INTO "review_seat"')]
+        self.assertEqual(len(seat_inserts), 3)
+
+        # 같은 적재기로 이어서 저장하면 같은 created_at의 수집 기록 하나에 누적
+        self.assertFalse(writer.add(2025, 1, 3, "1회", "19:30", "R석", 10, "배우A"))
+        self.assertTrue(writer.add(2025, 1, 4, "1회", "19:30", "R석", 9, "배우A"))
+        self.assertEqual(writer.flush(), 1)
+        self.assertEqual(writer.flush(), 0)
+
+        self.assertEqual(writer.created_count, 6)
+        self.assertEqual(Seat.objects.filter(concert=concert, created_at=created_at).count(), 6)
+        self.assertEqual(list(SeatSnapshot.objects.filter(concert=concert).values_list("seen_count", "changed_count")), [(7, 6)])
+
+
+class CastingIndexTest(TestCase):
+    def test_split_actors(self):
+        self.assertEqual(split_actors("배우A, 배우B / 배우A"), ["배우A", "배우B"])
+        self.assertEqual(split_actors("햄릿: 배우A\n오필리어: 배우B"), ["배우A", "배우B"])
+        self.assertEqual(split_actors(""), [])
+
+    def test_castings_follow_seat_crawls(self):
+        concert = Concert.objects.create(
+            name="뮤지컬 캐스팅",
+            place="테스트 극장",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 1),
+        )
+        writer = SeatSnapshotWriter(concert, created_at=datetime(2025, 1, 1))
+        writer.add(2025, 1, 3, "1회", "14:00", "R석", 0, "배우A, 배우B")
+        writer.add(2025, 1, 3, "1회", "14:00", "S석", 0, "배우A, 배우B")
+        writer.add(2025, 1, 3, "2회", "19:30", "R석", 4, "배우A, 배우C")
+        writer.flush()
+        self.assertEqual(RoundCasting.objects.filter(concert=concert).count(), 4)
+
+        # 2회 캐스팅 변경 → 그 회차의 색인만 교체
+        writer = SeatSnapshotWriter(concert, created_at=datetime(2025, 1, 2))
+        writer.add(2025, 1, 3, "2회", "19:30", "R석", 4, "배우A, 배우B")
+        writer.flush()
+        castings = RoundCasting.objects.filter(concert=concert).values_list("round_name", "actor__name")
+        self.assertEqual(
+            sorted(castings),
+            [("1회", "배우A"), ("1회", "배우B"), ("2회", "배우A"), ("2회", "배우B")],
+        )
+
+        service = CastingSeatService("뮤지컬 캐스팅", today=date(2025, 1, 2))
+        summary = {row["actor"]: row for row in service.get_actor_summary()}
+        self.assertEqual((summary["배우B"]["rounds"], summary["배우B"]["remaining_seats"]), (2, 4))
+        self.assertEqual(summary["배우B"]["sold_out_rounds"], 1)
+        self.assertEqual([row["round_name"] for row in service.get_actor_rounds("배우A")], ["1회", "2회"])
+
+
+class FakeChatClient:
+    """chat.completions.create 요청을 기록하고 리뷰 id별 감정을 JSON으로 돌려주는 가짜 OpenAI 클라이언트."""
+
+    def __init__(self, sentiments, drop_once=()):
+        self.sentiments = sentiments
+        self.drop_once = set(drop_once)  # 첫 응답에서 빠뜨릴 리뷰 id
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **kwargs):
+        ids = [json.loads(line)["id"] for line in messages[-1]["content"].splitlines() if line.startswith('{"id"')]
+        self.requests.append(ids)
+        results = [{"id": review_id, "sentiment": self.sentiments[review_id]} for review_id in ids if review_id not in self.drop_once]
+        self.drop_once.clear()
+        content = json.dumps({"results": results}, ensure_ascii=False)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@override_settings(SENTIMENT_ENGINE="sync", SENTIMENT_BATCH_SIZE=3, SENTIMENT_BATCH_MAX_RETRIES=2, SENTIMENT_BATCH_SLEEP_SECONDS=0)
+class BatchSentimentTest(TestCase):
+    def test_parse_batch_sentiments(self):
+        content = '```json\n{"results": [{"id": 1, "sentiment": "긍정"}, {"id": "2", "sentiment": "부정적"}, {"id": 9, "sentiment": "중립"}, {"id": 3, "sentiment": "?"}]}\n```'
+        self.assertEqual(chatgpt.parse_batch_sentiments(content, [1, 2, 3]), {1: "긍정", 2: "부정"})
+        self.assertEqual(chatgpt.parse_batch_sentiments("긍정", [1]), {})
+
+    def test_batches_and_retries_only_missing_reviews(self):
+        concert = Concert.objects.create(
+            name="뮤지컬 감정",
+            place="테스트 극장",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 1),
+            is_sentiment_enabled=True,
+        )
+        reviews = [
+            Review.objects.create(concert=concert, nickname=f"관객{i}", date=date(2025, 1, 2), title=f"리뷰 {i}", description=f"내용 {i}")
+            for i in range(5)
+        ]
+        labels = ["긍정", "중립", "부정", "긍정", "긍정"]
+        fake = FakeChatClient({review.id: label for review, label in zip(reviews, labels)}, drop_once=[reviews[1].id])
+
+        with mock.patch.object(chatgpt, "client", fake):
+            results = chatgpt.update_reviews_with_sentiment_cron()
+
+        ids = [review.id for review in reviews]
+        self.assertEqual(fake.requests, [ids[:3], [ids[1]], ids[3:]])
+        self.assertEqual((results["success"], results["failed"], results["skipped"]), (5, 0, 0))
+        self.assertEqual(list(Review.objects.order_by("id").values_list("emotion", flat=True)), labels)
+
+
+class FakeAsyncChatClient(FakeChatClient):
+    """비동기 클라이언트 흉내. 처음 rate_limited번은 429(retry-after 0초)를 돌려줌."""
+
+    def __init__(self, sentiments, rate_limited=0):
+        super().__init__(sentiments)
+        self.rate_limited = rate_limited
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.acreate))
+
+    async def acreate(self, messages, **kwargs):
+        if self.rate_limited:
+            self.rate_limited -= 1
+            response = httpx.Response(429, headers={"retry-after": "0"}, request=httpx.Request("POST", "http://test"))
+            raise RateLimitError("rate limited", response=response, body=None)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.create(messages, **kwargs)
+
+
+@override_settings(SENTIMENT_BATCH_SIZE=2, SENTIMENT_WRITE_BATCH_SIZE=3, SENTIMENT_MAX_BACKOFF_SECONDS=0)
+class SentimentEngineTest(TestCase):
+    def test_engine_runs_batches_concurrently_and_backs_off(self):
+        items = [(review_id, f"내용 {review_id}") for review_id in range(1, 10)]
+        fake = FakeAsyncChatClient({review_id: "긍정" for review_id, _ in items}, rate_limited=1)
+        done = []
+        engine = SentimentEngine(client=fake, concurrency=3, requests_per_minute=0, tokens_per_minute=0)
+        stats = engine.run(items, lambda batch, sentiments, error: done.append((len(batch), len(sentiments), error)))
+
+        self.assertEqual(sorted(done), [(1, 1, None)] + [(2, 2, None)] * 4)
+        self.assertEqual(stats["rate_limited"], 1)
+        self.assertGreater(fake.max_in_flight, 1)
+        self.assertLessEqual(fake.max_in_flight, 3)
+
+    def test_successful_request_wakes_waiters_when_limit_grows(self):
+        async def acquire_after_success():
+            engine = SentimentEngine(client=FakeAsyncChatClient({}), concurrency=3)
+            engine._slots = asyncio.Condition()
+            engine._in_flight = 0
+            engine._limit = 1
+            engine._consecutive_errors = 0
+            await engine._acquire_slot()
+            waiters = [asyncio.create_task(engine._acquire_slot()) for _ in range(2)]
+            await asyncio.sleep(0)
+            # 성공한 요청이 슬롯을 반납하면 동시 요청 수가 2로 늘어 기다리던 두 요청이 모두 진행
+            await engine._release_slot(succeeded=True)
+            await asyncio.wait_for(asyncio.gather(*waiters), timeout=1)
+            return engine._limit, engine._in_flight
+
+        self.assertEqual(asyncio.run(acquire_after_success()), (2, 2))
+
+    def test_async_update_writes_in_bulk(self):
+        concert = Concert.objects.create(
+            name="뮤지컬 비동기",
+            place="테스트 극장",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 1),
+            is_sentiment_enabled=True,
+        )
+        reviews = [
+            Review.objects.create(concert=concert, nickname=f"관객{i}", date=date(2025, 1, 2), title=f"리뷰 {i}", description=f"내용 {i}")
+            for i in range(5)
+        ]
+        fake = FakeAsyncChatClient({review.id: "부정" for review in reviews})
+        fake.close = mock.AsyncMock()
+        with mock.patch("review.sentiments.AsyncOpenAI", return_value=fake):
+            results = chatgpt.update_reviews_with_sentiment_cron()
+
+        self.assertEqual(results["success"], 5)
+        self.assertEqual(set(Review.objects.values_list("emotion", flat=True)), {"부정"})
+
+    def test_token_bucket_waits_for_refill(self):
+        async def take():
+            bucket = TokenBucket(per_minute=600)  # 초당 10개
+            await bucket.acquire(600)
+            started = time.monotonic()
+            await bucket.acquire(2)
+            return time.monotonic() - started
+
+        self.assertGreaterEqual(asyncio.run(take()), 0.15)
+
+
+@override_settings(SENTIMENT_ENGINE="sync", SENTIMENT_BATCH_SIZE=10, SENTIMENT_BATCH_SLEEP_SECONDS=0)
+class SentimentCacheTest(TestCase):
+    def test_duplicate_texts_are_sent_once_and_cached(self):
+        concert = Concert.objects.create(
+            name="뮤지컬 캐시",
+            place="테스트 극장",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 1),
+            is_sentiment_enabled=True,
+        )
+
+        def add_reviews(*texts):
+            return [
+                Review.objects.create(concert=concert, nickname=f"관객{i}", date=date(2025, 1, 2), title="리뷰", description=text)
+                for i, text in enumerate(texts)
+            ]
+
+        def run(reviews, label):
+            fake = FakeChatClient({review.id: label for review in reviews})
+            with mock.patch.object(chatgpt, "client", fake):
+                chatgpt.update_reviews_with_sentiment_cron()
+            return fake.requests
+
+        first = add_reviews("정말 좋아요!!", "정말  좋아요", "별로였어요")
+        self.assertEqual(run(first, "긍정"), [[first[0].id, first[2].id]])
+        self.assertEqual(set(Review.objects.values_list("emotion", flat=True)), {"긍정"})
+
+        # 다시 들어온 같은 내용은 요청하지 않음
+        second = add_reviews("정말 좋아요 ♥", "처음 보는 리뷰")
+        self.assertEqual(run(second, "중립"), [[second[1].id]])
+        self.assertEqual(Review.objects.get(id=second[0].id).emotion, "긍정")
+
+        # 프롬프트(모델)가 바뀌면 그 버전의 캐시만 새로 채움
+        third = add_reviews("정말 좋아요")
+        with override_settings(SENTIMENT_MODEL="gpt-4o-mini"):
+            self.assertEqual(run(third, "부정"), [[third[0].id]])
+        self.assertEqual(SentimentCache.objects.filter(text_hash=review_text_hash("정말 좋아요")).count(), 2)
+
+    def test_disabled_concerts_are_not_written_but_results_are_cached(self):
+        enabled, disabled = (
+            Concert.objects.create(name=name, place="테스트 극장", start_date=date(2025, 1, 1), end_date=date(2025, 3, 1), is_sentiment_enabled=flag)
+            for name, flag in (("뮤지컬 활성", True), ("뮤지컬 비활성", False))
+        )
+        SentimentCache.objects.create(text_hash=review_text_hash("캐시된 리뷰"), prompt_version=sentiment_prompt_version(), sentiment="긍정")
+        hit, blocked, copy = (
+            Review.objects.create(concert=concert, nickname="관객", date=date(2025, 1, 2), title="리뷰", description=text)
+            for concert, text in ((enabled, "캐시된 리뷰"), (disabled, "캐시된 리뷰"), (disabled, "새 리뷰"))
+        )
+        results = {"total": 3, "success": 0, "failed": 0, "skipped": 0, "errors": []}
+        requests, duplicates, _ = apply_sentiment_cache([hit, blocked, copy], results)
+        self.assertEqual((requests, dict(duplicates)), ([], {}))
+        self.assertEqual((results["success"], results["skipped"]), (1, 2))
+        self.assertEqual(dict(Review.objects.values_list("id", "emotion")), {hit.id: "긍정", blocked.id: None, copy.id: None})
+
+        # 요청 중에 비활성화된 공연의 결과는 저장하지 않지만 캐시에는 남김
+        fake = FakeAsyncChatClient({copy.id: "부정"})
+        fake.close = mock.AsyncMock()
+        results = {"total": 1, "success": 0, "failed": 0, "skipped": 0, "errors": []}
+        with mock.patch("review.sentiments.AsyncOpenAI", return_value=fake):
+            update_reviews_sentiment_async([copy], results)
+        self.assertEqual(results["skipped"], 1)
+        self.assertIsNone(Review.objects.get(id=copy.id).emotion)
+        self.assertEqual(SentimentCache.objects.get(text_hash=review_text_hash("새 리뷰")).sentiment, "부정")
+
+
+@override_settings(SENTIMENT_ENGINE="sync", SENTIMENT_BATCH_SLEEP_SECONDS=0, SENTIMENT_CLASSIFIER_MIN_SAMPLES=30)
+class SentimentClassifierTest(TestCase):
+    TEXTS = {
+        "긍정": "배우들 연기가 정말 감동적이고 최고였어요 강력 추천합니다",
+        "중립": "무대는 평범했고 좌석은 보통이었어요 그냥 그랬습니다",
+        "부정": "너무 지루하고 실망스러웠어요 돈이 아까웠습니다",
+    }
+
+    def test_confident_reviews_skip_gpt(self):
+        concert = Concert.objects.create(
+            name="뮤지컬 분류기",
+            place="테스트 극장",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 1),
+            is_sentiment_enabled=True,
+        )
+        for label, text in self.TEXTS.items():
+            for i in range(20):
+                Review.objects.create(concert=concert, nickname=f"관객{i}", date=date(2025, 1, 2), title="리뷰", description=f"{text} {i}번째", emotion=label)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "classifier.joblib")
+            with override_settings(SENTIMENT_CLASSIFIER_PATH=path):
+                classifier = train_sentiment_classifier(threshold=0.6)
+                self.assertGreaterEqual(classifier.report["accuracy"], 0.9)
+                self.assertEqual(load_sentiment_classifier().threshold, 0.6)
+
+                easy = Review.objects.create(concert=concert, nickname="새 관객", date=date(2025, 1, 3), title="리뷰", description="연기가 감동적이고 최고였어요 추천합니다")
+                hard = Review.objects.create(concert=concert, nickname="새 관객2", date=date(2025, 1, 3), title="리뷰", description="티켓팅 앱 로그인")
+                fake = FakeChatClient({hard.id: "중립"})
+                with mock.patch.object(chatgpt, "client", fake):
+                    chatgpt.update_reviews_with_sentiment_cron()
+
+        self.assertEqual(fake.requests, [[hard.id]])
+        easy.refresh_from_db()
+        self.assertEqual((easy.emotion, easy.emotion_source), ("긍정", Review.EMOTION_SOURCE_LOCAL))
+        # 로컬 분류기가 정한 감정은 다시 학습할 때 쓰지 않음
+        self.assertNotIn(easy.description, [text for text, _ in training_reviews()])
+
+
+class BatchApiStub:
+    """
+    OpenAI 배치 작업 API(/v1/files, /v1/batches) 대신 응답하는 로컬 HTTP 서버.
+    제출한 작업은 두 번째 조회부터 완료로 응답하고, 결과 파일은 labels({리뷰 id: 감정})로 만듭니다. (dropped id는 응답에서 뺌)
+    """
+
+    def __init__(self, labels, dropped=()):
+        self.labels = labels
+        self.dropped = set(dropped)
+        self.requests = []  # 제출된 요청 파일의 줄 (JSON)
+        self.retrieve_count = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, data, content_type="application/json"):
+                body = data if isinstance(data, bytes) else json.dumps(data).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+                if self.path.endswith("/files"):
+                    # multipart 본문에서 요청 줄만 꺼냄
+                    stub.requests = [json.loads(line) for line in body.splitlines() if line.startswith('{"custom_id"')]
+                    self._send({"id": "file-input", "object": "file", "bytes": len(body), "created_at": 0,
+                                "filename": "requests.jsonl", "purpose": "batch", "status": "processed"})
+                else:
+                    self._send(stub.batch(json.loads(body)["input_file_id"], "validating"))
+
+            def do_GET(self):
+                if self.path.endswith("/content"):
+                    self._send(stub.output().encode("utf-8"), "application/octet-stream")
+                else:
+                    stub.retrieve_count += 1
+                    self._send(stub.batch("file-input", "completed" if stub.retrieve_count >= 2 else "in_progress"))
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def batch(self, input_file_id, status):
+        return {
+            "id": "batch-1", "object": "batch", "endpoint": "/v1/chat/completions", "input_file_id": input_file_id,
+            "completion_window": "24h", "status": status, "created_at": 0,
+            "output_file_id": "file-output" if status == "completed" else None,
+        }
+
+    def output(self):
+        lines = []
+        for request in self.requests:
+            prompt = request["body"]["messages"][-1]["content"]
+            ids = [json.loads(line)["id"] for line in prompt.splitlines() if line.startswith('{"id"')]
+            results = [{"id": review_id, "sentiment": self.labels[review_id]} for review_id in ids if review_id not in self.dropped]
+            completion = {"choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps({"results": results}, ensure_ascii=False)}}]}
+            lines.append(json.dumps({"custom_id": request["custom_id"], "response": {"status_code": 200, "body": completion}, "error": None}))
+        return "\n".join(lines)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@override_settings(SENTIMENT_ENGINE="sync", SENTIMENT_BATCH_SIZE=2, SENTIMENT_BATCH_SLEEP_SECONDS=0)
+class SentimentBatchJobTest(TestCase):
+    def test_submit_poll_and_apply(self):
+        concert = Concert.objects.create(
+            name="뮤지컬 배치",
+            place="테스트 극장",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 1),
+            is_sentiment_enabled=True,
+        )
+        texts = ["최고의 공연", "최고의 공연!", "좌석이 불편했어요", "그저 그랬어요", "다시 보고 싶어요"]
+        reviews = [
+            Review.objects.create(concert=concert, nickname=f"관객{i}", date=date(2025, 1, 2), title="리뷰", description=text)
+            for i, text in enumerate(texts)
+        ]
+        labels = {reviews[0].id: "긍정", reviews[2].id: "부정", reviews[3].id: "중립", reviews[4].id: "긍정"}
+
+        with tempfile.TemporaryDirectory() as directory, BatchApiStub(labels, dropped=[reviews[4].id]) as stub:
+            client = OpenAI(api_key="test", base_url=stub.url, max_retries=0)
+            with override_settings(SENTIMENT_BATCH_JOB_DIR=directory):
+                batch = submit_sentiment_batch(client=client)
+
+                # 같은 내용(0, 1번)은 한 번만, 요청 한 줄에 리뷰 2개
+                self.assertEqual(batch.review_count, 5)
+                self.assertEqual(list(batch.chunks.values()), [[reviews[0].id, reviews[2].id], [reviews[3].id, reviews[4].id]])
+                with open(batch.request_path, encoding="utf-8") as f:
+                    self.assertEqual(len(f.readlines()), 2)
+                self.assertEqual(len(stub.requests), 2)
+
+            # 결과를 기다리는 동안 다른 감정 분석은 이 리뷰들을 요청하지 않음
+            fake = FakeChatClient({})
+            with mock.patch.object(chatgpt, "client", fake):
+                chatgpt.update_reviews_with_sentiment_cron()
+            self.assertEqual(fake.requests, [])
+
+            self.assertEqual(poll_sentiment_batches(client), [])
+            finished = poll_sentiment_batches(client)
+
+        self.assertEqual([batch.status for batch in finished], [SentimentBatch.STATUS_COMPLETED])
+        self.assertEqual(finished[0].applied_count, 4)
+        emotions = dict(Review.objects.values_list("id", "emotion"))
+        self.assertEqual([emotions[review.id] for review in reviews], ["긍정", "긍정", "부정", "중립", None])
+        self.assertEqual(SentimentCache.objects.count(), 3)
+        # 결과가 없던 리뷰는 다음 제출 대상
+        self.assertEqual([review.id for review in pending_reviews()], [reviews[4].id])
+
+    def test_disabled_concert_results_are_cached(self):
+        disabled, enabled = (
+            Concert.objects.create(name=name, place="테스트 극장", start_date=date(2025, 1, 1), end_date=date(2025, 3, 1), is_sentiment_enabled=flag)
+            for name, flag in (("뮤지컬 비활성", False), ("뮤지컬 활성", True))
+        )
+        review = Review.objects.create(concert=disabled, nickname="관객1", date=date(2025, 1, 2), title="리뷰", description="최고의 공연")
+        duplicate = Review.objects.create(concert=enabled, nickname="관객2", date=date(2025, 1, 2), title="리뷰", description="최고의 공연")
+        batch = SentimentBatch.objects.create(
+            prompt_version=sentiment_prompt_version(),
+            chunks={"reviews-0": [review.id]},
+            duplicates={str(review.id): [duplicate.id]},
+            review_count=2,
+        )
+        content = json.dumps({
+            "custom_id": "reviews-0",
+            "response": {"status_code": 200, "body": {"choices": [{"message": {"content": json.dumps({str(review.id): "긍정"})}}]}},
+        })
+
+        # 제출 후 비활성화된 공연의 리뷰는 저장하지 않지만, 비용을 낸 결과는 캐시와 다른 공연의 같은 내용 리뷰에 반영
+        self.assertEqual(apply_batch_output(batch, content), 1)
+        emotions = dict(Review.objects.values_list("id", "emotion"))
+        self.assertEqual((emotions[review.id], emotions[duplicate.id]), (None, "긍정"))
+        self.assertEqual(list(SentimentCache.objects.values_list("text_hash", "sentiment")), [(review_text_hash("최고의 공연"), "긍정")])
+
+
+@override_settings(
+    CRAWL_VELOCITY_DAYS=7,
+    CRAWL_HOT_REVIEWS_PER_DAY=10,
+    CRAWL_PROXIMITY_DAYS=7,
+    CRAWL_END_GRACE_DAYS=3,
+    CRAWL_COLD_SCORE=0.1,
+    CRAWL_BASE_INTERVAL_HOURS=24,
+    CRAWL_MIN_INTERVAL_HOURS=4,
+    CRAWL_MAX_INTERVAL_HOURS=72,
+)
+class CrawlSchedulerTest(TestCase):
+    def test_hot_concerts_are_crawled_more_often(self):
+        at = datetime(2025, 6, 15, 12, 0)
+        hot, cold, ended = (
+            Concert.objects.create(name=name, place="테스트 극장", start_date=start, end_date=end, is_crawling_enabled=True)
+            for name, start, end in (
+                ("뮤지컬 인기", date(2025, 5, 1), date(2025, 8, 31)),
+                ("뮤지컬 한산", date(2025, 5, 1), date(2025, 8, 31)),
+                ("뮤지컬 종료", date(2025, 4, 1), date(2025, 6, 1)),
+            )
+        )
+        # 최근 7일 동안 하루 20건 → 리뷰 속도 점수 2 (상한)
+        Review.objects.bulk_create(
+            Review(concert=hot, nickname=f"user{i}", date=date(2025, 6, 14) - timedelta(days=i % 7), title="후기")
+            for i in range(140)
+        )
+        run = CrawlRun.objects.create(task=CrawlRun.TASK_REVIEWS)
+        for concert in (hot, cold, ended):
+            CrawlStep.objects.create(run=run, concert=concert, kind=CrawlStep.KIND_CONCERT, started_at=at - timedelta(hours=10))
+
+        plans = {plan["concert"].name: plan for plan in CrawlScheduler(CrawlRun.TASK_REVIEWS, at=at).plan()}
+        # 점수 = 리뷰 속도 2 + 공연 중 0.5 → 24 / 3.5시간, 리뷰 없는 공연은 근접도 0.5만 → 16시간
+        self.assertAlmostEqual(plans["뮤지컬 인기"]["interval_hours"], 24 / 3.5)
+        self.assertTrue(plans["뮤지컬 인기"]["is_due"])
+        self.assertEqual(plans["뮤지컬 한산"]["interval_hours"], 16)
+        self.assertFalse(plans["뮤지컬 한산"]["is_due"])
+        self.assertTrue(plans["뮤지컬 종료"]["is_finished"])
+        self.assertIsNone(plans["뮤지컬 종료"]["next_at"])
+
+        self.assertEqual(CrawlScheduler(CrawlRun.TASK_REVIEWS, at=at).due_concert_ids(), [hot.id])
+        # 한 번도 크롤링하지 않은 공연은 바로 대상
+        new = Concert.objects.create(name="뮤지컬 신규", place="테스트 극장", start_date=date(2025, 6, 20), end_date=date(2025, 9, 1), is_crawling_enabled=True)
+        self.assertEqual(CrawlScheduler(CrawlRun.TASK_REVIEWS, at=at).due_concert_ids(), [hot.id, new.id])
+
+    @override_settings(CRAWL_FAILURE_RETRY_HOURS=1)
+    def test_failing_concert_backs_off(self):
+        at = datetime(2025, 6, 15, 12, 0)
+        concert = Concert.objects.create(name="뮤지컬 실패", place="테스트 극장", start_date=date(2025, 5, 1), end_date=date(2025, 8, 31), is_crawling_enabled=True)
+        run = CrawlRun.objects.create(task=CrawlRun.TASK_REVIEWS)
+
+        def plan(hours_later=0):
+            return CrawlScheduler(CrawlRun.TASK_REVIEWS, at=at + timedelta(hours=hours_later)).plan()[0]
+
+        # 한 번도 성공하지 못한 공연도 실패 직후에는 대상이 아님 (1시간, 2시간, 4시간 ... 뒤 재시도)
+        CrawlStep.objects.create(run=run, concert=concert, kind=CrawlStep.KIND_CONCERT, started_at=at - timedelta(minutes=30), error="timeout")
+        self.assertEqual((plan()["failures"], plan()["is_due"]), (1, False))
+        self.assertTrue(plan(1)["is_due"])
+        CrawlStep.objects.create(run=run, concert=concert, kind=CrawlStep.KIND_CONCERT, started_at=at + timedelta(hours=1), error="timeout")
+        self.assertFalse(plan(2)["is_due"])
+        self.assertTrue(plan(3)["is_due"])
+
+        # 성공하면 실패 횟수가 초기화되고 점수 간격(공연 중 0.5 → 16시간) 뒤 대상
+        CrawlStep.objects.create(run=run, concert=concert, kind=CrawlStep.KIND_CONCERT, started_at=at + timedelta(hours=3))
+        self.assertEqual((plan(4)["failures"], plan(4)["last_crawled_at"]), (0, at + timedelta(hours=3)))
+        self.assertFalse(plan(18)["is_due"])
+        self.assertTrue(plan(19)["is_due"])
+
+
+@override_settings(CRAWL_JOB_LEASE_SECONDS=60, CRAWL_JOB_RETRY_DELAY_SECONDS=10, CRAWL_JOB_MAX_ATTEMPTS=2)
+class CrawlJobQueueTest(TestCase):
+    def test_lease_retry_and_reclaim(self):
+        concert = Concert.objects.create(name="뮤지컬 작업", place="테스트 극장", start_date=date(2025, 1, 1), end_date=date(2025, 3, 1))
+        job, created = enqueue_job(concert, CrawlJob.KIND_REVIEW)
+        self.assertTrue(created)
+        # 같은 공연을 다시 등록해도 대기 중인 작업 하나만 유지
+        self.assertEqual(enqueue_job(concert, CrawlJob.KIND_REVIEW, priority=5), (job, False))
+        self.assertEqual(CrawlJob.objects.count(), 1)
+
+        at = job.available_at
+        first = claim_job("worker-1", at=at)
+        self.assertEqual((first.pk, first.worker, first.attempts), (job.pk, "worker-1", 1))
+        self.assertIsNone(claim_job("worker-2", at=at))
+
+        # 실패하면 재시도 대기 (10초 * 2^0)
+        self.assertTrue(fail_job(first, "timeout"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, CrawlJob.STATUS_PENDING)
+        self.assertIsNone(claim_job("worker-2", at=at))
+        retry_at = job.available_at
+        second = claim_job("worker-2", at=retry_at)
+        self.assertEqual((second.worker, second.attempts), ("worker-2", 2))
+
+        # worker-2가 하트비트 없이 멈추면 임대 만료 후 최대 시도 횟수 도달로 실패 처리
+        self.assertIsNone(claim_job("worker-3", at=retry_at + timedelta(seconds=61)))
+        job.refresh_from_db()
+        self.assertEqual(job.status, CrawlJob.STATUS_FAILED)
+        # 뒤늦게 끝난 worker-2는 결과를 덮어쓰지 못함
+        self.assertFalse(complete_job(second))
+
+        # 실패한 작업이 있어도 새 작업은 등록 가능, 임대가 만료된 작업은 다른 워커가 다시 가져감
+        job, created = enqueue_job(concert, CrawlJob.KIND_REVIEW)
+        self.assertTrue(created)
+        stale = claim_job("worker-1", at=job.available_at)
+        reclaimed = claim_job("worker-3", at=job.available_at + timedelta(seconds=61))
+        self.assertEqual((reclaimed.pk, reclaimed.worker, reclaimed.attempts), (stale.pk, "worker-3", 2))
+        self.assertFalse(complete_job(stale))
+        self.assertTrue(complete_job(reclaimed))
+        job.refresh_from_db()
+        self.assertEqual(job.status, CrawlJob.STATUS_DONE)
+
+    def test_direct_crawl_skips_concert_leased_by_worker(self):
+        busy = Concert.objects.create(name="뮤지컬 임대", place="테스트 극장", start_date=date(2025, 1, 1), end_date=date(2025, 3, 1))
+        idle = Concert.objects.create(name="뮤지컬 대기", place="테스트 극장", start_date=date(2025, 1, 1), end_date=date(2025, 3, 1))
+        enqueue_job(busy, CrawlJob.KIND_SEAT)
+        leased = claim_job("worker-1")
+        # 대기 중인 작업은 직접 크롤링이 가져가 실행
+        pending, _ = enqueue_job(idle, CrawlJob.KIND_SEAT)
+
+        crawled = []
+        with mock.patch.object(tasks, "get_driver_pool"), \
+                mock.patch.object(tasks, "crawl_seats_for_concert", side_effect=lambda driver, concert, run: crawled.append(concert.id)):
+            tasks.crawl_all_concerts_seats()
+        self.assertEqual(crawled, [idle.id])
+        leased.refresh_from_db()
+        self.assertEqual((leased.status, leased.worker), (CrawlJob.STATUS_RUNNING, "worker-1"))
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, CrawlJob.STATUS_DONE)
+
+        # 직접 크롤링 중인 공연은 워커가 가져가지 않고, 실패하면 재시도 없이 실패로 남음
+        with self.assertRaises(RuntimeError):
+            with leased_concert_job(idle, CrawlJob.KIND_REVIEW, "direct") as job:
+                self.assertEqual(job.worker, "direct")
+                self.assertIsNone(claim_job("worker-2", kinds=[CrawlJob.KIND_REVIEW]))
+                # 화면에서 같은 공연을 등록해도 실행 중인 작업을 그대로 반환
+                self.assertEqual(enqueue_job(idle, CrawlJob.KIND_REVIEW), (job, False))
+                raise RuntimeError("timeout")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (CrawlJob.STATUS_FAILED, "timeout"))
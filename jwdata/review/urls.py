@@ -39,6 +39,12 @@ urlpatterns = [
     # 잔여 좌석 분석
     path("all_seats/", views.AllSeatsView.as_view(), name="all_seats"),
 
+    # 배우별 잔여 좌석
+    path("cast_seats/", views.CastingSeatsView.as_view(), name="cast_seats"),
+
+    # 크롤링 실행 기록 대시보드
+    path("crawl_runs/", views.CrawlDashboardView.as_view(), name="crawl_dashboard"),
+
     # DB -> Google Sheet 동기화
     path('sync-db-to-sheet/', views.sync_all_db_to_sheet, name='sync_db_to_sheet'),
 
@@ -1,7 +1,7 @@
 from django.db.models import Avg, Count, F, Min
 from django.db.models.functions import Cast, Concat, Length
 from django.db.models import CharField, Value
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from collections import Counter, defaultdict
 from konlpy.tag import Okt
 import re
@@ -76,4 +76,12 @@ def preprocess_text(texts):
 def comma_format(num):
     if not num:
         return "0"
-    return f"{num:,}" 
\ No newline at end of file
+    return f"{num:,}"
+
+KOREAN_DAYS = ['월', '화', '수', '목', '금', '토', '일']
+
+def get_korean_day_of_week(year, month, day):
+    try:
+        return KOREAN_DAYS[datetime(year, month, day).weekday()]
+    except ValueError:
+        return ''
@@ -38,6 +38,7 @@ from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 from sklearn.cluster import KMeans
 
 from django.contrib.auth.decorators import login_required
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import DetailView, TemplateView, ListView, CreateView, UpdateView, DeleteView
 from django.views.decorators.http import require_POST, require_http_methods
@@ -61,7 +62,7 @@ from .sheets import (
     sync_seats_sheet_to_db,
 )
 
-from .services import ConcertAnalysisService, HomeAnalysisService, ReviewAnalysisService, AllAnalysisService
+from .services import ConcertAnalysisService, HomeAnalysisService, ReviewAnalysisService, AllAnalysisService, CrawlTelemetryService, SeatHistoryService, CastingSeatService
 
 from django.urls import reverse_lazy
 import json
@@ -359,34 +360,8 @@ def analyze_all_seats(request):
     # GET 요청에서 필터 값 가져오기
     selected_concert = request.GET.get("concert")
 
-    # 날짜를 'YYYY-MM-DD' 형태로 연결해서 가상 필드 date 생성
-    seats_with_date = Seat.objects.annotate(
-        date=Concat(
-            Cast(F("year"), output_field=CharField()),
-            Value("-"),
-            Cast(F("month"), output_field=CharField()),
-            Value("-"),
-            Cast(F("day_num"), output_field=CharField()),
-        )
-    )
-
-    # 공연 필터링
-    if selected_concert:
-        seats_with_date = seats_with_date.filter(concert__name=selected_concert)
-
-    # 데이터 정렬 및 필요한 필드 선택
-    seat_data = seats_with_date.order_by(
-        "concert__name", "date", "day_str", "round_name", "seat_class", "created_at"
-    ).values(
-        "concert__name",
-        "date",
-        "day_str",
-        "round_name",
-        "seat_class",
-        "created_at",
-        "seat_count",
-        "actors",
-    )
+    # 수집 시각별 좌석 현황 (변경분만 저장된 Seat를 시계열로 복원, 공연을 선택한 경우에만)
+    seat_data = SeatHistoryService(selected_concert).get_time_series() if selected_concert else []
 
     # 모든 공연 이름 리스트
     all_concerts = (
@@ -806,34 +781,8 @@ class AllSeatsView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         selected_concert = self.request.GET.get("concert")
 
-        # 날짜를 'YYYY-MM-DD' 형태로 연결해서 가상 필드 date 생성
-        seats_with_date = Seat.objects.annotate(
-            date=Concat(
-                Cast(F("year"), output_field=CharField()),
-                Value("-"),
-                Cast(F("month"), output_field=CharField()),
-                Value("-"),
-                Cast(F("day_num"), output_field=CharField()),
-            )
-        )
-
-        # 공연 필터링
-        if selected_concert:
-            seats_with_date = seats_with_date.filter(concert__name=selected_concert)
-
-        # 데이터 정렬 및 필요한 필드 선택
-        seat_data = seats_with_date.order_by(
-            "concert__name", "date", "day_str", "round_name", "seat_class", "created_at"
-        ).values(
-            "concert__name",
-            "date",
-            "day_str",
-            "round_name",
-            "seat_class",
-            "created_at",
-            "seat_count",
-            "actors",
-        )
+        # 수집 시각별 좌석 현황 (변경분만 저장된 Seat를 시계열로 복원, 공연을 선택한 경우에만)
+        seat_data = SeatHistoryService(selected_concert).get_time_series() if selected_concert else []
 
         # 모든 공연 이름 리스트
         all_concerts = (
@@ -855,6 +804,26 @@ class AllSeatsView(LoginRequiredMixin, TemplateView):
         })
         return context
 
+class CastingSeatsView(LoginRequiredMixin, TemplateView):
+    """배우별 잔여석 현황 (회차별 캐스팅 색인 기준, 오늘 이후 회차)"""
+    template_name = "review/cast_seats.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        selected_concert = self.request.GET.get("concert")
+        selected_actor = self.request.GET.get("actor")
+
+        service = CastingSeatService(selected_concert) if selected_concert else None
+        context.update({
+            "all_concerts": Concert.objects.values_list("name", flat=True).distinct().order_by("name"),
+            "selected_concert": selected_concert,
+            "selected_actor": selected_actor,
+            "actor_summary": service.get_actor_summary() if service else [],
+            "actor_rounds": service.get_actor_rounds(selected_actor) if service and selected_actor else [],
+        })
+        return context
+
+
 class AllPatternView(LoginRequiredMixin, TemplateView):
     template_name = "review/all_pattern.html"
 
@@ -985,6 +954,28 @@ class AllPatternView(LoginRequiredMixin, TemplateView):
 # Concert Management
 # ==================================================================
 
+class CrawlDashboardView(LoginRequiredMixin, TemplateView):
+    """크롤링 실행 기록 대시보드: 작업별 소요 시간 추세, 느린 페이지, 공연별 요약."""
+    template_name = "review/crawl_dashboard.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        try:
+            days = int(self.request.GET.get("days", 14))
+        except ValueError:
+            days = 14
+
+        service = CrawlTelemetryService(days=days)
+        context.update({
+            "days": days,
+            "recent_runs": service.get_recent_runs(),
+            "run_trends": json.dumps(service.get_daily_trends(), ensure_ascii=False),
+            "step_trends": json.dumps(service.get_daily_page_durations(), ensure_ascii=False),
+            "slowest_steps": service.get_slowest_steps(),
+            "concert_summary": service.get_concert_summary(),
+        })
+        return context
+
 class ConcertListView(LoginRequiredMixin, ListView):
     model = Concert
     template_name = 'review/concert_list.html'
@@ -1074,6 +1065,14 @@ def execute_crawl_reviews(request):
     """크롤링 실행 뷰"""
     if request.method == 'POST':
         try:
+            if settings.CRAWL_JOB_QUEUE:
+                # 작업 큐에 등록만 하고 바로 응답 (scripts/crawl_worker.py가 실행)
+                from .tasks import enqueue_all_concerts_reviews
+                created, total = enqueue_all_concerts_reviews()
+                return JsonResponse({
+                    'success': True,
+                    'message': f'리뷰 크롤링 작업 {created}개를 등록했습니다. (대상 공연 {total}개 중 {total - created}개는 이미 대기/실행 중)'
+                })
             from .tasks import crawl_all_concerts_reviews
             crawl_all_concerts_reviews()
             return JsonResponse({
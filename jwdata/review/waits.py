@@ -0,0 +1,225 @@
+import time
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+class WaitStats:
+    """
+    대기 종류(label)별 대기 시간을 모아두는 통계 객체.
+    여러 크롤링 워커 스레드에서 동시에 기록할 수 있도록 lock으로 보호합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(list)
+        self._timeouts = defaultdict(int)
+
+    def record(self, label, elapsed, timed_out=False):
+        with self._lock:
+            self._samples[label].append(elapsed)
+            if timed_out:
+                self._timeouts[label] += 1
+
+    def summary(self):
+        """label별 {count, avg, max, total, timeouts} 딕셔너리를 반환합니다."""
+        with self._lock:
+            result = {}
+            for label, samples in self._samples.items():
+                result[label] = {
+                    "count": len(samples),
+                    "avg": sum(samples) / len(samples),
+                    "max": max(samples),
+                    "total": sum(samples),
+                    "timeouts": self._timeouts[label],
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._timeouts.clear()
+
+    def log_summary(self, prefix="[wait]"):
+        for label, stat in sorted(self.summary().items()):
+            logger.info(
+                f"{prefix} {label}: {stat['count']}회, 평균 {stat['avg']:.2f}초, "
+                f"최대 {stat['max']:.2f}초, 합계 {stat['total']:.1f}초, 타임아웃 {stat['timeouts']}회"
+            )
+
+
+# 프로세스 전역 대기 통계
+wait_stats = WaitStats()
+
+
+def wait_for(driver, condition, label, timeout=None):
+    """
+    condition(driver)이 참 값을 반환할 때까지 대기하고 그 값을 반환합니다.
+    timeout(기본 CRAWL_WAIT_TIMEOUT) 안에 조건이 만족되지 않으면 예외 없이 None을 반환하여
+    기존 고정 sleep처럼 크롤링이 계속 진행되도록 합니다.
+    """
+    if timeout is None:
+        timeout = settings.CRAWL_WAIT_TIMEOUT
+
+    started = time.monotonic()
+    timed_out = False
+    try:
+        result = WebDriverWait(
+            driver,
+            timeout,
+            poll_frequency=settings.CRAWL_WAIT_POLL,
+            ignored_exceptions=(StaleElementReferenceException,),
+        ).until(condition)
+    except TimeoutException:
+        timed_out = True
+        result = None
+        logger.warning(f"[wait] {label}: {timeout}초 내 조건 미충족, 계속 진행")
+
+    wait_stats.record(label, time.monotonic() - started, timed_out)
+    return result
+
+
+# ==================================================================
+# 대기 조건
+# ==================================================================
+
+def document_ready():
+    """document.readyState가 complete가 될 때까지."""
+    def _condition(driver):
+        return driver.execute_script("return document.readyState") == "complete"
+    return _condition
+
+
+def element_present(locator):
+    """locator에 해당하는 요소가 하나 이상 나타날 때까지. 첫 요소를 반환합니다."""
+    def _condition(driver):
+        elements = driver.find_elements(*locator)
+        return elements[0] if elements else False
+    return _condition
+
+
+def any_element_present(*locators):
+    """여러 locator 중 하나라도 나타날 때까지. 처음 찾은 요소를 반환합니다."""
+    def _condition(driver):
+        for locator in locators:
+            elements = driver.find_elements(*locator)
+            if elements:
+                return elements[0]
+        return False
+    return _condition
+
+
+def element_absent(locator):
+    """locator에 해당하는 요소가 없어지거나 화면에서 숨겨질 때까지."""
+    def _condition(driver):
+        try:
+            return all(not el.is_displayed() for el in driver.find_elements(*locator))
+        except StaleElementReferenceException:
+            return True
+    return _condition
+
+
+def window_count_at_least(count):
+    """브라우저 창(탭)이 count개 이상이 될 때까지."""
+    def _condition(driver):
+        return len(driver.window_handles) >= count
+    return _condition
+
+
+def snapshot(driver, locator):
+    """
+    locator 요소 목록의 현재 상태(첫 요소 참조와 전체 텍스트)를 저장합니다.
+    이후 content_changed 조건에서 변경 여부 비교에 사용합니다.
+    """
+    try:
+        elements = driver.find_elements(*locator)
+        return {
+            "first": elements[0] if elements else None,
+            "texts": [el.text for el in elements],
+        }
+    except (StaleElementReferenceException, WebDriverException):
+        return {"first": None, "texts": None}
+
+
+def content_changed(locator, previous, unchanged_after=None):
+    """
+    locator 요소 목록이 snapshot(previous) 이후 새로 그려질 때까지.
+    이전 첫 요소가 DOM에서 떨어졌거나(stale) 텍스트가 바뀌었으면 변경된 것으로 봅니다.
+    unchanged_after(초)를 주면, 목록이 그 시간 동안 이전과 같은 상태로 유지될 때도 조건을 만족한 것으로 봅니다.
+    (예: 날짜를 바꿔도 회차 구성이 같아 DOM이 그대로인 경우)
+    새 요소 목록을 반환합니다.
+    """
+    state = {"since": None}
+
+    def _condition(driver):
+        elements = driver.find_elements(*locator)
+        if not elements:
+            return False
+
+        first = previous.get("first")
+        if first is not None:
+            try:
+                first.is_enabled()
+            except StaleElementReferenceException:
+                return elements
+
+        if previous.get("texts") is None:
+            return elements
+        if [el.text for el in elements] != previous["texts"]:
+            return elements
+
+        if unchanged_after is not None:
+            now = time.monotonic()
+            if state["since"] is None:
+                state["since"] = now
+            elif now - state["since"] >= unchanged_after:
+                return elements
+        return False
+    return _condition
+
+
+def text_changed(locator, previous_text):
+    """locator 요소의 텍스트가 previous_text와 달라질 때까지. 새 텍스트를 반환합니다."""
+    def _condition(driver):
+        elements = driver.find_elements(*locator)
+        if not elements:
+            return False
+        text = elements[0].text
+        return text if text != previous_text else False
+    return _condition
+
+
+def elements_count_stable(locator, settle=None, min_count=1):
+    """
+    locator 요소 개수가 min_count 이상이고 settle초 동안 변하지 않을 때까지.
+    비동기로 한 줄씩 그려지는 목록(좌석 테이블 등)이 다 그려졌는지 확인할 때 사용합니다.
+    요소 목록을 반환합니다.
+    """
+    if settle is None:
+        settle = settings.CRAWL_WAIT_SETTLE
+    state = {"count": None, "since": None}
+
+    def _condition(driver):
+        elements = driver.find_elements(*locator)
+        count = len(elements)
+        now = time.monotonic()
+        if count != state["count"]:
+            state["count"] = count
+            state["since"] = now
+            return False
+        if count >= min_count and now - state["since"] >= settle:
+            return elements
+        return False
+    return _condition
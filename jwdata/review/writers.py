@@ -0,0 +1,237 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils.timezone import now
+
+from .castings import replace_round_castings, round_key
+from .models import Concert, Review, Seat, SeatSnapshot, SeatState
+from .utils import get_korean_day_of_week
+
+
+def review_key(nickname, date, title):
+    """리뷰 중복 판단 기준(닉네임, 작성일, 제목)을 하나의 문자열 키로 만듭니다."""
+    return f"{nickname}|{date}|{title}"
+
+
+class ReviewWriter:
+    """
+    공연 하나의 리뷰를 모아서 저장하는 적재기.
+    - 공연의 기존 (닉네임, 작성일, 제목) 키를 한 번만 읽어 메모리에서 중복을 판단
+    - 새 리뷰는 버퍼에 모았다가 flush() 시 하나의 트랜잭션에서 bulk_create
+    - 증분 크롤링 커서(review_last_total, review_last_key) 판단과 저장
+    """
+
+    def __init__(self, concert):
+        self.concert = concert
+        self.known_keys = set(
+            Review.objects.filter(concert=concert).values_list("nickname", "date", "title")
+        )
+        self.pending = []
+        self.created_count = 0
+        self.newest_key = None
+        self.last_key = None
+
+    def is_known(self, nickname, date, title):
+        return (nickname, date, title) in self.known_keys
+
+    def add(self, nickname, date, title, **fields):
+        """
+        새 리뷰면 버퍼에 추가하고 True, 이미 저장된(또는 이번 크롤링에서 본) 리뷰면 False를 반환합니다.
+        date는 datetime.date 객체여야 합니다.
+        """
+        key = (nickname, date, title)
+        if key in self.known_keys:
+            return False
+
+        self.known_keys.add(key)
+        self.pending.append(
+            Review(concert=self.concert, nickname=nickname, date=date, title=title, **fields)
+        )
+        return True
+
+    def add_page(self, reviews):
+        """
+        한 페이지의 정규화된 리뷰(parsers.normalize_review 결과) 목록을 추가합니다.
+        (처리한 리뷰 수, 이미 저장된 리뷰 수, 지난 최신 리뷰 포함 여부)를 반환합니다.
+        """
+        known_count = 0
+        cursor_reached = False
+        for review in reviews:
+            key = review_key(review["nickname"], review["date"], review["title"])
+            if self.newest_key is None:
+                self.newest_key = key
+            self.last_key = key
+            if key == self.concert.review_last_key:
+                cursor_reached = True
+            if not self.add(**review):
+                known_count += 1
+        return len(reviews), known_count, cursor_reached
+
+    def is_unchanged(self, total_count):
+        """총 리뷰 수가 지난 크롤링 때와 같으면 True."""
+        return total_count > 0 and self.concert.review_last_total == total_count
+
+    def save_cursor(self, total_count):
+        """
+        리뷰 크롤링이 마지막 페이지 또는 지난 최신 리뷰까지 도달한 경우에만 호출하여 공연별 커서(총 개수, 최신 리뷰 키)를 저장합니다.
+        커서는 "이 리뷰와 그 이전 리뷰는 모두 저장됨"을 뜻하므로 중간에 끊긴 크롤링에서 저장하면 이전 페이지를 영영 건너뜁니다.
+        """
+        self.concert.review_last_total = total_count
+        if self.newest_key:
+            self.concert.review_last_key = self.newest_key
+        Concert.objects.filter(pk=self.concert.pk).update(
+            review_last_total=self.concert.review_last_total,
+            review_last_key=self.concert.review_last_key,
+        )
+
+    def flush(self):
+        """버퍼에 모인 리뷰를 저장하고 저장한 개수를 반환합니다."""
+        if not self.pending:
+            return 0
+
+        with transaction.atomic():
+            Review.objects.bulk_create(self.pending)
+
+        count = len(self.pending)
+        self.created_count += count
+        self.pending = []
+        return count
+
+
+def seat_key(year, month, day_num, round_name, seat_class):
+    """좌석 변경 판단 기준(날짜, 회차, 좌석 등급) 키."""
+    return (year, month, day_num, round_name, seat_class)
+
+
+class SeatSnapshotWriter:
+    """
+    공연 하나에 대한 한 번의 좌석 크롤링 결과를 변경분만 저장하는 적재기.
+    - 공연의 좌석별 최신 상태(SeatState)를 한 번만 읽어 메모리에서 비교
+    - 잔여석이나 캐스팅이 달라졌거나 처음 보는 좌석만 Seat 행으로 추가 (모든 행은 같은 created_at)
+    - flush() 시 하나의 트랜잭션에서 Seat 추가, SeatState 갱신(변경/확인 시각), SeatSnapshot(수집 기록) 집계
+    - 캐스팅이 바뀐(또는 처음 보는) 회차는 같은 트랜잭션에서 회차별 캐스팅 색인(RoundCasting)도 교체
+    수집 시각별 전체 현황은 SeatSnapshot 시각마다 마지막 변경값을 이어 붙여 복원합니다. (services.SeatHistoryService)
+    중단된 크롤링을 이어서 진행할 때는 created_at에 처음 시작 시각을 넘겨 하나의 스냅샷으로 유지합니다.
+    """
+
+    def __init__(self, concert, chunk_size=None, created_at=None):
+        self.concert = concert
+        self.chunk_size = chunk_size or settings.SEAT_WRITE_CHUNK_SIZE
+        self.created_at = created_at or now()
+        self.states = {}
+        self.round_actors = {}
+        self._load_states()
+        self.pending = []
+        self.pending_states = {}
+        self.pending_castings = {}
+        self.pending_seen_ids = set()
+        self.pending_seen_count = 0
+        self.created_count = 0
+        self.unchanged_count = 0
+
+    def _load_states(self):
+        self.states = {
+            seat_key(state.year, state.month, state.day_num, state.round_name, state.seat_class): state
+            for state in SeatState.objects.filter(concert=self.concert)
+        }
+        self.round_actors = {
+            round_key(state.year, state.month, state.day_num, state.round_name): state.actors
+            for state in sorted(self.states.values(), key=lambda state: state.changed_at)
+        }
+
+    def add(self, year, month, day_num, round_name, round_time, seat_class, seat_count, actors):
+        """
+        지난 상태와 달라진 좌석이면 Seat 행을 버퍼에 추가하고 True를 반환합니다.
+        잔여석/캐스팅이 그대로면 확인 시각만 갱신하고 False를 반환합니다.
+        회차 시간이 없는 행은 Seat.round_time(NOT NULL)에 저장할 수 없으므로 False를 반환하고 건너뜁니다.
+        """
+        if not round_time:
+            return False
+
+        self.pending_seen_count += 1
+        key = seat_key(year, month, day_num, round_name, seat_class)
+        state = self.states.get(key)
+        if state is not None and state.seat_count == seat_count and state.actors == actors:
+            if state.pk is not None:
+                self.pending_seen_ids.add(state.pk)
+            self.unchanged_count += 1
+            return False
+
+        if state is None:
+            state = SeatState(
+                concert=self.concert,
+                year=year,
+                month=month,
+                day_num=day_num,
+                round_name=round_name,
+                seat_class=seat_class,
+            )
+            self.states[key] = state
+        state.round_time = round_time
+        state.seat_count = seat_count
+        state.actors = actors
+        rkey = round_key(year, month, day_num, round_name)
+        if self.round_actors.get(rkey) != actors:
+            self.round_actors[rkey] = actors
+            self.pending_castings[rkey] = (round_time, actors)
+        state.changed_at = self.created_at
+        state.last_seen_at = self.created_at
+        self.pending_states[key] = state
+
+        self.pending.append(
+            Seat(
+                concert=self.concert,
+                year=year,
+                month=month,
+                day_num=day_num,
+                day_str=get_korean_day_of_week(year, month, day_num),
+                round_name=round_name,
+                round_time=round_time,
+                seat_class=seat_class,
+                seat_count=seat_count,
+                actors=actors,
+                created_at=self.created_at,
+            )
+        )
+        return True
+
+    def flush(self):
+        """버퍼에 모인 변경분을 저장하고 추가한 Seat 행 수를 반환합니다."""
+        if not self.pending_seen_count:
+            return 0
+
+        new_states = [state for state in self.pending_states.values() if state.pk is None]
+        changed_states = [state for state in self.pending_states.values() if state.pk is not None]
+        seen_ids = list(self.pending_seen_ids)
+
+        with transaction.atomic():
+            Seat.objects.bulk_create(self.pending, batch_size=self.chunk_size)
+            SeatState.objects.bulk_create(new_states, batch_size=self.chunk_size)
+            SeatState.objects.bulk_update(
+                changed_states,
+                ["round_time", "seat_count", "actors", "changed_at", "last_seen_at"],
+                batch_size=self.chunk_size,
+            )
+            for index in range(0, len(seen_ids), self.chunk_size):
+                SeatState.objects.filter(pk__in=seen_ids[index:index + self.chunk_size]).update(
+                    last_seen_at=self.created_at
+                )
+            replace_round_castings(self.concert, self.pending_castings, updated_at=self.created_at)
+            snapshot, _ = SeatSnapshot.objects.get_or_create(concert=self.concert, created_at=self.created_at)
+            SeatSnapshot.objects.filter(pk=snapshot.pk).update(
+                seen_count=F("seen_count") + self.pending_seen_count,
+                changed_count=F("changed_count") + len(self.pending),
+            )
+
+        # bulk_create가 pk를 채우지 못하는 DB라면 다음 비교를 위해 상태를 다시 읽음
+        if any(state.pk is None for state in new_states):
+            self._load_states()
+
+        count = len(self.pending)
+        self.created_count += count
+        self.pending = []
+        self.pending_states = {}
+        self.pending_castings = {}
+        self.pending_seen_ids = set()
+        self.pending_seen_count = 0
+        return count
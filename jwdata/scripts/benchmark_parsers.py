@@ -0,0 +1,134 @@
+# 크롤링 파서 녹화/재생 벤치마크
+#
+#   # 실제 사이트에서 공연 하나의 상품/리뷰/좌석 페이지를 fixture로 녹화
+#   python benchmark_parsers.py record "뮤지컬 공연명" --review-pages 3 --rounds 20
+#
+#   # 녹화한 fixture로 백엔드별 reviews/sec, seats/sec 측정 (네트워크 사용 안 함)
+#   python benchmark_parsers.py bench --backends lxml,http,selenium,script --repeat 5
+#
+#   # lxml 파서 결과가 녹화 당시 Selenium 추출 건수와 같은지 확인
+#   python benchmark_parsers.py check
+
+import os
+import sys
+import argparse
+import django
+
+# Django 설정 로드
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ticket.settings')
+django.setup()
+
+from review.models import Concert
+from review.drivers import get_chrome_driver, close_guide_popup
+from review.fetchers import get_http_session
+from review.replay import (
+    BENCHMARK_BACKENDS,
+    ParserBenchmark,
+    ReplayServer,
+    check_fixture,
+    fixture_root,
+    iter_fixture_dirs,
+    record_concert,
+)
+from review.tasks import open_product_page
+
+
+def run_record(args):
+    concert = Concert.objects.filter(name__icontains=args.concert.strip()).first()
+    if concert is None:
+        print(f"'{args.concert}'에 해당하는 공연이 없습니다.")
+        sys.exit(1)
+
+    driver = get_chrome_driver(headless=not args.show)
+    try:
+        if not open_product_page(driver, concert):
+            print(f"[{concert}] 상세 페이지 접속 실패")
+            sys.exit(1)
+        close_guide_popup(driver)
+        directory = record_concert(
+            driver,
+            concert,
+            directory=args.output,
+            max_review_pages=args.review_pages,
+            max_rounds=args.rounds,
+        )
+        print(f"[{concert}] 녹화 완료: {directory}")
+    finally:
+        driver.quit()
+
+
+def run_bench(args):
+    directories = iter_fixture_dirs(args.fixtures)
+    if not directories:
+        print(f"fixture가 없습니다: {args.fixtures or fixture_root()} (먼저 record를 실행하세요)")
+        sys.exit(1)
+
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    unknown = set(backends) - set(BENCHMARK_BACKENDS)
+    if unknown:
+        print(f"알 수 없는 백엔드: {', '.join(sorted(unknown))} (사용 가능: {', '.join(BENCHMARK_BACKENDS)})")
+        sys.exit(1)
+
+    print(f"fixture {len(directories)}개, 반복 {args.repeat}회")
+    print(f"{'backend':<10} {'kind':<8} {'pages':>6} {'items':>7} {'seconds':>9} {'items/sec':>11} {'load(s)':>8}")
+
+    driver = None
+    with ReplayServer(args.fixtures) as server:
+        try:
+            if {"selenium", "script"} & set(backends):
+                driver = get_chrome_driver(headless=True)
+            benchmark = ParserBenchmark(
+                directories,
+                repeat=args.repeat,
+                server=server,
+                driver=driver,
+                session=get_http_session(),
+            )
+            for backend in backends:
+                result = benchmark.run(backend)
+                for kind, stat in result.items():
+                    print(
+                        f"{backend:<10} {kind:<8} {stat['pages']:>6} {stat['items']:>7} "
+                        f"{stat['seconds']:>9.3f} {stat['per_sec']:>11.1f} {stat['load_seconds']:>8.2f}"
+                    )
+        finally:
+            if driver is not None:
+                driver.quit()
+
+
+def run_check(args):
+    failed = False
+    for directory in iter_fixture_dirs(args.fixtures):
+        mismatches = check_fixture(directory)
+        if mismatches:
+            failed = True
+            for name, recorded, parsed in mismatches:
+                print(f"[불일치] {directory.name}/{name}: 녹화 {recorded}건, lxml {parsed}건")
+        else:
+            print(f"[일치] {directory.name}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="크롤링 파서 녹화/재생 벤치마크")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="실제 사이트 페이지를 fixture로 녹화")
+    record_parser.add_argument("concert", help="공연명 (부분 일치)")
+    record_parser.add_argument("--output", help="저장할 디렉터리 (기본: CRAWL_FIXTURE_DIR/<상품 코드>)")
+    record_parser.add_argument("--review-pages", type=int, default=3, help="녹화할 리뷰 페이지 수")
+    record_parser.add_argument("--rounds", type=int, default=20, help="녹화할 최대 회차 수")
+    record_parser.add_argument("--show", action="store_true", help="브라우저 화면 표시")
+
+    bench_parser = subparsers.add_parser("bench", help="fixture로 백엔드별 파싱 속도 측정")
+    bench_parser.add_argument("--fixtures", help="fixture 루트 디렉터리 (기본: CRAWL_FIXTURE_DIR)")
+    bench_parser.add_argument("--backends", default="lxml,http", help=f"쉼표로 구분 ({', '.join(BENCHMARK_BACKENDS)})")
+    bench_parser.add_argument("--repeat", type=int, default=3, help="반복 횟수")
+
+    check_parser = subparsers.add_parser("check", help="lxml 파싱 결과와 녹화 당시 추출 건수 비교")
+    check_parser.add_argument("--fixtures", help="fixture 루트 디렉터리 (기본: CRAWL_FIXTURE_DIR)")
+
+    args = parser.parse_args()
+    {"record": run_record, "bench": run_bench, "check": run_check}[args.command](args)
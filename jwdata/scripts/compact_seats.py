@@ -0,0 +1,70 @@
+# 변경분 저장 이전에 쌓인 좌석 전체 복사본 정리
+#
+#   # 삭제 대상 건수만 확인
+#   python compact_seats.py --dry-run
+#
+#   # 특정 공연만 정리
+#   python compact_seats.py --concert "뮤지컬 공연명"
+#
+# 같은 (날짜, 회차, 좌석 등급)에서 직전 행과 잔여석/캐스팅이 같은 Seat 행을 삭제합니다.
+# 수집 시각별 현황은 SeatSnapshot 시각마다 직전 변경값으로 복원되므로 화면의 그래프는 그대로입니다.
+
+import os
+import sys
+import argparse
+import django
+
+# Django 설정 로드
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ticket.settings')
+django.setup()
+
+from django.db import transaction
+
+from review.models import Concert, Seat
+
+
+def redundant_seat_ids(concert):
+    """공연의 Seat 행 중 직전 행과 값이 같은 행의 id 목록."""
+    redundant = []
+    previous_key = None
+    previous_value = None
+    rows = (
+        Seat.objects.filter(concert=concert)
+        .order_by("year", "month", "day_num", "round_name", "seat_class", "created_at", "id")
+        .values_list("id", "year", "month", "day_num", "round_name", "seat_class", "seat_count", "actors")
+    )
+    for seat_id, year, month, day_num, round_name, seat_class, seat_count, actors in rows.iterator(chunk_size=2000):
+        key = (year, month, day_num, round_name, seat_class)
+        value = (seat_count, actors)
+        if key == previous_key and value == previous_value:
+            redundant.append(seat_id)
+        previous_key = key
+        previous_value = value
+    return redundant
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="좌석 전체 복사본에서 값이 바뀌지 않은 행 삭제")
+    parser.add_argument("--concert", help="공연명 (부분 일치, 생략하면 전체 공연)")
+    parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 건수만 출력")
+    args = parser.parse_args()
+
+    concerts = Concert.objects.all()
+    if args.concert:
+        concerts = concerts.filter(name__icontains=args.concert.strip())
+
+    total = 0
+    for concert in concerts:
+        seat_ids = redundant_seat_ids(concert)
+        if not seat_ids:
+            continue
+        total += len(seat_ids)
+        print(f"[{concert.name}] 값이 바뀌지 않은 행 {len(seat_ids)}건 / 전체 {Seat.objects.filter(concert=concert).count()}건")
+        if args.dry_run:
+            continue
+        with transaction.atomic():
+            for index in range(0, len(seat_ids), 500):
+                Seat.objects.filter(id__in=seat_ids[index:index + 500]).delete()
+
+    print(f"{'삭제 대상' if args.dry_run else '삭제'} 합계: {total}건")
@@ -0,0 +1,85 @@
+# 크롤링 작업 큐 워커
+#
+#   # 워커 1개 실행 (작업이 없으면 CRAWL_WORKER_POLL_SECONDS초마다 다시 확인)
+#   python crawl_worker.py
+#
+#   # 워커 프로세스 4개 실행 (프로세스마다 드라이버 풀을 따로 가짐)
+#   python crawl_worker.py --processes 4
+#
+#   # 리뷰 작업만 처리하고, 남은 작업이 없으면 종료
+#   python crawl_worker.py --kinds review --once
+#
+#   # 크롤링 대상 공연 전체의 좌석 크롤링 작업 등록 (실행은 워커가 담당)
+#   python crawl_worker.py --enqueue seat
+#
+# 작업은 스케줄러(scheduler.py)와 화면의 "리뷰 크롤링 실행"이 등록합니다. (CRAWL_JOB_QUEUE=True일 때, 기본은 False)
+# CRAWL_JOB_QUEUE를 켜면 스케줄러와 함께 이 워커도 실행해야 크롤링이 진행됩니다. (start_crawl_worker.bat)
+# 여러 워커가 동시에 실행되어도 한 공연/종류의 작업은 한 워커만 임대하여 실행합니다.
+
+import os
+import sys
+import signal
+import argparse
+import subprocess
+import threading
+import django
+
+# Django 설정 로드
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ticket.settings')
+django.setup()
+
+from review.models import Concert, CrawlJob
+from review.jobs import enqueue_jobs
+from review.tasks import crawl_job_worker, crawlable_review_concerts
+
+
+def run_enqueue(kind):
+    concerts = crawlable_review_concerts() if kind == CrawlJob.KIND_REVIEW else Concert.objects.all()
+    concerts = list(concerts)
+    created = enqueue_jobs(concerts, kind)
+    print(f"공연 {len(concerts)}개 중 {created}개 작업 등록 (나머지는 이미 대기/실행 중)")
+
+
+def run_processes(count, argv):
+    """자기 자신을 --processes 없이 count개 실행하고 모두 끝날 때까지 기다립니다."""
+    children = [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__)] + argv)
+        for _ in range(count)
+    ]
+    print(f"워커 프로세스 {count}개 시작: {', '.join(str(child.pid) for child in children)}")
+    try:
+        for child in children:
+            child.wait()
+    except KeyboardInterrupt:
+        for child in children:
+            child.terminate()
+        for child in children:
+            child.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="크롤링 작업 큐 워커")
+    parser.add_argument("--processes", type=int, default=1, help="실행할 워커 프로세스 수")
+    parser.add_argument("--kinds", default="", help=f"처리할 작업 종류, 쉼표로 구분 ({CrawlJob.KIND_REVIEW}, {CrawlJob.KIND_SEAT}, 기본: 전체)")
+    parser.add_argument("--name", help="워커 이름 (기본: 호스트명:pid)")
+    parser.add_argument("--once", action="store_true", help="실행할 작업이 없으면 종료")
+    parser.add_argument("--enqueue", choices=[CrawlJob.KIND_REVIEW, CrawlJob.KIND_SEAT], help="작업만 등록하고 종료")
+    args = parser.parse_args()
+
+    if args.enqueue:
+        run_enqueue(args.enqueue)
+        sys.exit(0)
+
+    if args.processes > 1:
+        argv = ["--kinds", args.kinds] + (["--once"] if args.once else [])
+        run_processes(args.processes, argv)
+        sys.exit(0)
+
+    # 종료 신호를 받으면 실행 중인 작업을 마친 뒤 종료
+    stop_event = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_event.set())
+
+    kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+    crawl_job_worker(worker=args.name, kinds=kinds or None, once=args.once, stop_event=stop_event)
@@ -0,0 +1,133 @@
+# 크롤링 브라우저 프로필별 페이지 로드 시간/메모리(RSS) 측정
+#
+#   # 상품 URL이 저장된 공연 5개를 full, lean 프로필로 각각 열어 비교
+#   python measure_browser_profile.py --concerts 5
+#
+#   # URL을 직접 지정
+#   python measure_browser_profile.py --urls https://tickets.interpark.com/goods/24000001 --repeat 3
+#
+# RSS는 chromedriver와 Chrome 하위 프로세스 전체의 합계이며 /proc을 읽으므로 리눅스에서만 측정됩니다.
+
+import os
+import sys
+import time
+import argparse
+import django
+
+# Django 설정 로드
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ticket.settings')
+django.setup()
+
+from review.models import Concert
+from review.drivers import BROWSER_PROFILES, get_chrome_driver
+
+# 네비게이션 타이밍과 리소스 요청 수/전송량
+PAGE_METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd / 1000 : null,
+    load: nav ? nav.loadEventEnd / 1000 : null,
+    resources: resources.length,
+    transfer_kb: resources.reduce((sum, r) => sum + (r.transferSize || 0), 0) / 1024,
+};
+"""
+
+
+def process_tree_rss_mb(root_pid):
+    """root_pid와 모든 하위 프로세스의 RSS 합계(MB). /proc이 없으면 None."""
+    if not os.path.isdir('/proc'):
+        return None
+
+    children = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                # pid (comm) state ppid ...  - comm에 공백이 있을 수 있어 마지막 ')' 기준으로 자름
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    total_kb = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def measure_profile(profile, urls, repeat):
+    driver = get_chrome_driver(headless=True, profile=profile)
+    driver_pid = driver.service.process.pid
+    rows = []
+    peak_rss = None
+    try:
+        for _ in range(repeat):
+            for url in urls:
+                started = time.perf_counter()
+                try:
+                    driver.get(url)
+                except Exception as e:
+                    print(f"[{profile}] 페이지 로드 실패: {url} ({e})")
+                    continue
+                wall = time.perf_counter() - started
+                metrics = driver.execute_script(PAGE_METRICS_SCRIPT)
+                rss = process_tree_rss_mb(driver_pid)
+                if rss is not None:
+                    peak_rss = max(peak_rss or 0, rss)
+                rows.append(dict(metrics, wall=wall, rss=rss))
+    finally:
+        driver.quit()
+    return rows, peak_rss
+
+
+def average(rows, key):
+    values = [row[key] for row in rows if row.get(key) is not None]
+    return sum(values) / len(values) if values else None
+
+
+def fmt(value, spec):
+    if value is None:
+        return "-".rjust(int(spec.split(".")[0]))
+    return format(value, spec)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="크롤링 브라우저 프로필별 페이지 로드 시간/RSS 측정")
+    parser.add_argument("--profiles", default=",".join(BROWSER_PROFILES), help=f"쉼표로 구분 ({', '.join(BROWSER_PROFILES)})")
+    parser.add_argument("--concerts", type=int, default=5, help="상품 URL이 저장된 공연 중 측정할 개수")
+    parser.add_argument("--urls", nargs="*", help="측정할 URL (지정하면 --concerts 무시)")
+    parser.add_argument("--repeat", type=int, default=1, help="URL 목록 반복 횟수")
+    args = parser.parse_args()
+
+    urls = args.urls or list(
+        Concert.objects.exclude(product_url__isnull=True).exclude(product_url='')
+        .values_list('product_url', flat=True)[:args.concerts]
+    )
+    if not urls:
+        print("측정할 URL이 없습니다. (--urls로 지정하거나 공연 상품 URL을 먼저 저장하세요)")
+        sys.exit(1)
+
+    profiles = [profile.strip() for profile in args.profiles.split(",") if profile.strip()]
+    print(f"URL {len(urls)}개, 반복 {args.repeat}회")
+    print(f"{'profile':<8} {'pages':>6} {'get(s)':>8} {'DCL(s)':>8} {'load(s)':>8} {'requests':>9} {'KB':>9} {'RSS(MB)':>8} {'peak':>8}")
+    for profile in profiles:
+        rows, peak_rss = measure_profile(profile, urls, args.repeat)
+        print(
+            f"{profile:<8} {len(rows):>6} {fmt(average(rows, 'wall'), '8.2f')} "
+            f"{fmt(average(rows, 'dom_content_loaded'), '8.2f')} {fmt(average(rows, 'load'), '8.2f')} "
+            f"{fmt(average(rows, 'resources'), '9.1f')} {fmt(average(rows, 'transfer_kb'), '9.1f')} "
+            f"{fmt(average(rows, 'rss'), '8.1f')} {fmt(peak_rss, '8.1f')}"
+        )
@@ -8,14 +8,14 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ticket.settings')
 django.setup()
 
-from review.tasks import crawl_all_concerts_reviews
+from review.tasks import crawl_scheduled_concerts_reviews
 from review.chatgpt import update_reviews_with_sentiment
 from review.tasks import summarize_reviews_cron
 
 def run_crawling():
     print(f"[{datetime.now()}] Starting review crawling...")
     try:
-        crawl_all_concerts_reviews()
+        crawl_scheduled_concerts_reviews()
         print(f"[{datetime.now()}] Review crawling completed successfully")
     except Exception as e:
         print(f"[{datetime.now()}] Error during crawling: {str(e)}")
@@ -4,20 +4,25 @@ import django
 from datetime import datetime
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 # Django 설정 로드
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ticket.settings')
 django.setup()
 
-from review.tasks import crawl_all_concerts_reviews
+from django.conf import settings
+
+from review.tasks import crawl_scheduled_concerts_reviews
 from review.chatgpt import update_reviews_with_sentiment_cron
+from review.batches import poll_sentiment_batches
 from review.tasks import summarize_reviews_cron
+from review.drivers import get_driver_pool
 
 def run_crawling():
     print(f"[{datetime.now()}] Starting review crawling...")
     try:
-        crawl_all_concerts_reviews()
+        crawl_scheduled_concerts_reviews()
         print(f"[{datetime.now()}] Review crawling completed successfully")
     except Exception as e:
         print(f"[{datetime.now()}] Error during crawling: {str(e)}")
@@ -30,6 +35,13 @@ def run_sentiment_analysis():
     except Exception as e:
         print(f"[{datetime.now()}] Error during sentiment analysis: {str(e)}")
 
+def run_sentiment_batch_poll():
+    try:
+        for batch in poll_sentiment_batches():
+            print(f"[{datetime.now()}] Sentiment batch {batch.batch_id} {batch.remote_status}: {batch.applied_count}/{batch.review_count} saved")
+    except Exception as e:
+        print(f"[{datetime.now()}] Error during sentiment batch poll: {str(e)}")
+
 def run_slack_notification():
     print(f"[{datetime.now()}] Starting slack notification...")
     try:
@@ -41,10 +53,14 @@ def run_slack_notification():
 if __name__ == '__main__':
     scheduler = BlockingScheduler()
     
-    # 매일 저녁 8시에 크롤링
+    # CRAWL_SCHEDULER_TICK_MINUTES분마다 크롤링 간격이 지난 공연만 크롤링
+    # (리뷰가 많이 올라오는 공연은 자주, 조용한 공연은 드물게, 종료 후 유예 기간이 지나면 중단)
     scheduler.add_job(
         run_crawling,
-        CronTrigger(hour=20, minute=0)
+        IntervalTrigger(minutes=settings.CRAWL_SCHEDULER_TICK_MINUTES),
+        next_run_time=datetime.now(),
+        max_instances=1,
+        coalesce=True,
     )
     
     # 매주 화요일 오전 9시에 감정 분석
@@ -53,11 +69,30 @@ if __name__ == '__main__':
         CronTrigger(day_of_week='tue', hour=9, minute=0)
     )
     
+    # SENTIMENT_BATCH_JOB_POLL_MINUTES분마다 제출한 감정 분석 배치 작업의 결과 확인 (scripts/sentiment_batch.py)
+    scheduler.add_job(
+        run_sentiment_batch_poll,
+        IntervalTrigger(minutes=settings.SENTIMENT_BATCH_JOB_POLL_MINUTES),
+        max_instances=1,
+        coalesce=True,
+    )
+    
     # 매주 화요일 오전 11시에 슬랙 알림
     scheduler.add_job(
         run_slack_notification,
         CronTrigger(day_of_week='tue', hour=11, minute=0)
     )
     
+    # 크롤링용 브라우저 세션을 미리 띄워 두고 작업 사이에 재사용
+    # (작업 큐를 쓰면 크롤링은 워커 프로세스가 하므로 스케줄러에는 세션이 필요 없음)
+    if settings.CRAWL_JOB_QUEUE:
+        print(f"[{datetime.now()}] CRAWL_JOB_QUEUE is on: crawling runs in crawl_worker.py (start_crawl_worker.bat)")
+    else:
+        try:
+            get_driver_pool().warm_up()
+            print(f"[{datetime.now()}] Driver pool warmed up")
+        except Exception as e:
+            print(f"[{datetime.now()}] Error during driver pool warm-up: {str(e)}")
+
     print("Scheduler started...")
     scheduler.start() 
\ No newline at end of file
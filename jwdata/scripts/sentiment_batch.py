@@ -0,0 +1,89 @@
+# 감정 분석 배치 작업 (대량 감정 분석용, 결과를 기다리는 동안 프로세스를 띄워 둘 필요 없음)
+#
+#   # 감정 분석이 활성화된 공연의 미분석 리뷰 전체를 요청 파일(JSONL)로 만들어 제출
+#   python sentiment_batch.py submit
+#
+#   # 공연 하나의 미분석 리뷰만 최대 3000개 제출
+#   python sentiment_batch.py submit --concert "뮤지컬 공연명" --limit 3000
+#
+#   # 제출한 작업의 상태를 한 번 확인하고, 끝난 작업의 결과를 저장
+#   python sentiment_batch.py poll
+#
+#   # 모든 작업이 끝날 때까지 SENTIMENT_BATCH_JOB_POLL_MINUTES분마다 확인
+#   python sentiment_batch.py poll --wait
+#
+#   # 최근 작업 목록
+#   python sentiment_batch.py status
+#
+# 스케줄러(scheduler.py)도 SENTIMENT_BATCH_JOB_POLL_MINUTES분마다 결과를 확인합니다.
+
+import os
+import sys
+import time
+import argparse
+import django
+
+# Django 설정 로드
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ticket.settings')
+django.setup()
+
+from django.conf import settings
+
+from review.models import Concert, SentimentBatch
+from review.batches import poll_sentiment_batches, submit_sentiment_batch
+
+
+def run_submit(args):
+    concert = None
+    if args.concert:
+        concert = Concert.objects.filter(name=args.concert).first()
+        if concert is None:
+            print(f"공연을 찾을 수 없습니다: {args.concert}")
+            sys.exit(1)
+    batch = submit_sentiment_batch(concert=concert, limit=args.limit)
+    if batch is None:
+        print("제출할 리뷰가 없습니다.")
+        return
+    print(f"배치 작업 {batch.batch_id} 제출: 리뷰 {batch.review_count}개, 요청 {len(batch.chunks)}개 ({batch.request_path})")
+
+
+def run_poll(args):
+    while True:
+        for batch in poll_sentiment_batches():
+            print(f"배치 작업 {batch.batch_id} {batch.remote_status}: 리뷰 {batch.review_count}개 중 {batch.applied_count}개 저장")
+        waiting = SentimentBatch.objects.filter(status=SentimentBatch.STATUS_SUBMITTED).count()
+        print(f"결과를 기다리는 작업 {waiting}개")
+        if not args.wait or not waiting:
+            return
+        time.sleep(settings.SENTIMENT_BATCH_JOB_POLL_MINUTES * 60)
+
+
+def run_status(args):
+    for batch in SentimentBatch.objects.all()[:args.count]:
+        print(
+            f"{batch.created_at:%Y-%m-%d %H:%M} {batch.batch_id or '-'} {batch.get_status_display()}"
+            f" ({batch.remote_status or '-'}) 리뷰 {batch.review_count}개, 저장 {batch.applied_count}개"
+            + (f" - {batch.error}" if batch.error else "")
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="감정 분석 배치 작업")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    submit_parser = subparsers.add_parser("submit", help="미분석 리뷰를 배치 작업으로 제출")
+    submit_parser.add_argument("--concert", help="공연명 (기본: 감정 분석이 활성화된 전체 공연)")
+    submit_parser.add_argument("--limit", type=int, help="제출할 최대 리뷰 수")
+    submit_parser.set_defaults(func=run_submit)
+
+    poll_parser = subparsers.add_parser("poll", help="제출한 작업의 상태를 확인하고 결과 저장")
+    poll_parser.add_argument("--wait", action="store_true", help="모든 작업이 끝날 때까지 확인")
+    poll_parser.set_defaults(func=run_poll)
+
+    status_parser = subparsers.add_parser("status", help="최근 작업 목록")
+    status_parser.add_argument("--count", type=int, default=10, help="보여줄 작업 수")
+    status_parser.set_defaults(func=run_status)
+
+    args = parser.parse_args()
+    args.func(args)
@@ -0,0 +1,5 @@
+@echo off
+cd /d %~dp0
+call ..\venv\Scripts\activate.bat
+if "%CRAWL_WORKER_PROCESSES%"=="" set CRAWL_WORKER_PROCESSES=2
+start /B pythonw crawl_worker.py --processes %CRAWL_WORKER_PROCESSES% > ..\logs\crawl_worker.log 2>&1 
\ No newline at end of file
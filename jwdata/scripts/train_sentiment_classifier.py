@@ -0,0 +1,76 @@
+# 로컬 감정 분류기 학습/평가
+#
+#   # GPT가 감정을 정한 리뷰로 다시 학습하고 저장 (검증용으로 20%를 떼어 보고서 출력)
+#   python train_sentiment_classifier.py train
+#
+#   # 확신도 기준을 바꿔 학습 (기준 이상인 리뷰만 GPT 없이 저장)
+#   python train_sentiment_classifier.py train --threshold 0.85
+#
+#   # 저장된 분류기를 현재 GPT 감정 결과와 비교 (정확도, 기준별 로컬 처리 비율/일치율)
+#   python train_sentiment_classifier.py report
+#
+# 학습된 분류기는 SENTIMENT_CLASSIFIER_PATH에 저장되며, 감정 분석 실행 시 자동으로 사용됩니다. (SENTIMENT_CLASSIFIER_ENABLED)
+
+import os
+import sys
+import argparse
+import django
+
+# Django 설정 로드
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ticket.settings')
+django.setup()
+
+from django.conf import settings
+
+from review.classifiers import load_sentiment_classifier, train_sentiment_classifier, training_reviews
+
+
+def print_report(report):
+    print(f"정확도: {report['accuracy']:.3f}")
+    for label, scores in report["labels"].items():
+        if isinstance(scores, dict) and label not in ("macro avg", "weighted avg"):
+            print(f"  {label}: precision {scores['precision']:.3f}, recall {scores['recall']:.3f}, 리뷰 {int(scores['support'])}개")
+    agreement = f"{report['agreement']:.1%}" if report["agreement"] is not None else "-"
+    print(f"현재 기준 {report['threshold']}: 로컬 처리 {report['coverage']:.1%}, GPT 감정과 일치 {agreement}")
+    print("기준별 로컬 처리 비율 / 일치율:")
+    for row in report["thresholds"]:
+        agreement = f"{row['agreement']:.1%}" if row["agreement"] is not None else "-"
+        print(f"  {row['threshold']:.2f}: {row['coverage']:.1%} / {agreement}")
+
+
+def run_train(args):
+    classifier = train_sentiment_classifier(test_size=args.test_size, threshold=args.threshold)
+    report = classifier.report
+    print(f"학습 {report['train_count']}개 / 검증 {report['test_count']}개 -> {settings.SENTIMENT_CLASSIFIER_PATH}")
+    print_report(report)
+
+
+def run_report(args):
+    classifier = load_sentiment_classifier()
+    if classifier is None:
+        print(f"학습된 분류기가 없습니다: {settings.SENTIMENT_CLASSIFIER_PATH}")
+        sys.exit(1)
+    if args.threshold is not None:
+        classifier.threshold = args.threshold
+    samples = training_reviews()
+    print(f"분류기 학습 시각: {classifier.trained_at:%Y-%m-%d %H:%M}, GPT 감정 리뷰 {len(samples)}개와 비교")
+    print("(학습에 쓰인 리뷰가 포함되어 있어 실제보다 높게 나옵니다. 새 리뷰가 쌓인 뒤 비교하거나 train 보고서를 참고하세요.)")
+    print_report(classifier.evaluate([text for text, _ in samples], [label for _, label in samples]))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="로컬 감정 분류기 학습/평가")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = subparsers.add_parser("train", help="GPT 감정 결과로 다시 학습하고 저장")
+    train_parser.add_argument("--threshold", type=float, help=f"확신도 기준 (기본 {settings.SENTIMENT_CLASSIFIER_THRESHOLD})")
+    train_parser.add_argument("--test-size", type=float, default=0.2, help="검증용으로 떼어 둘 비율")
+    train_parser.set_defaults(func=run_train)
+
+    report_parser = subparsers.add_parser("report", help="저장된 분류기를 현재 GPT 감정 결과와 비교")
+    report_parser.add_argument("--threshold", type=float, help="비교할 확신도 기준 (기본: 저장된 기준)")
+    report_parser.set_defaults(func=run_report)
+
+    args = parser.parse_args()
+    args.func(args)
@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 import os
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 
 # secret key
 OPENAI_API_KEY = config('OPENAI_API_KEY')
@@ -200,10 +200,125 @@ LOGGING = {
     },
 }
 
+# 크롤링 설정
+# 리뷰 크롤링 시 동시에 띄울 headless 브라우저 워커 수
+CRAWL_POOL_SIZE = config('CRAWL_POOL_SIZE', default=2, cast=int)
+# 워커별 페이지 로딩/스크립트 실행 타임아웃 (초)
+CRAWL_WORKER_TIMEOUT = config('CRAWL_WORKER_TIMEOUT', default=60, cast=int)
+# 드라이버 풀: 세션 하나를 교체하기 전까지 재사용할 횟수, 빈 세션을 기다리는 최대 시간(초)
+# (풀 크기는 CRAWL_POOL_SIZE와 같음)
+DRIVER_POOL_MAX_USES = config('DRIVER_POOL_MAX_USES', default=50, cast=int)
+DRIVER_POOL_ACQUIRE_TIMEOUT = config('DRIVER_POOL_ACQUIRE_TIMEOUT', default=600, cast=int)
+# 크롤링 브라우저 프로필: 'lean'(기본, 리소스 차단 + 작은 창 + 확장 프로그램 비활성화) 또는 'full'
+CRAWL_BROWSER_PROFILE = config('CRAWL_BROWSER_PROFILE', default='lean')
+# lean 프로필에서 차단할 리소스 종류(image, font, media)와 추가 URL 패턴(광고/추적 스크립트 등), 창 크기
+CRAWL_BLOCKED_RESOURCE_TYPES = config('CRAWL_BLOCKED_RESOURCE_TYPES', default='image,font,media', cast=Csv())
+CRAWL_BLOCKED_URL_PATTERNS = config(
+    'CRAWL_BLOCKED_URL_PATTERNS',
+    default='*google-analytics.com*,*googletagmanager.com*,*doubleclick.net*,*facebook.net*,*criteo.com*',
+    cast=Csv(),
+)
+CRAWL_WINDOW_SIZE = config('CRAWL_WINDOW_SIZE', default='1280,900')
+# DOM 조건 대기 설정: 최대 대기 시간(초), 조건 확인 주기(초), 목록 개수 안정화 판단 시간(초)
+CRAWL_WAIT_TIMEOUT = config('CRAWL_WAIT_TIMEOUT', default=10, cast=float)
+CRAWL_WAIT_POLL = config('CRAWL_WAIT_POLL', default=0.1, cast=float)
+CRAWL_WAIT_SETTLE = config('CRAWL_WAIT_SETTLE', default=0.3, cast=float)
+# 클릭 후 목록이 이전과 똑같이 유지되면 변경 없음으로 보고 진행하기까지의 시간(초)
+CRAWL_WAIT_UNCHANGED_GRACE = config('CRAWL_WAIT_UNCHANGED_GRACE', default=1.0, cast=float)
+# 리뷰 크롤링 백엔드: 'selenium'(기본) 또는 'http'(브라우저 없이 HTTP + lxml, 실패 시 Selenium으로 대체)
+REVIEW_CRAWL_BACKEND = config('REVIEW_CRAWL_BACKEND', default='selenium')
+# Selenium 리뷰/좌석 추출 방식: 'script'(기본, 페이지/회차당 execute_script 한 번으로 전체 추출) 또는 'element'(요소별 조회)
+CRAWL_EXTRACTION_MODE = config('CRAWL_EXTRACTION_MODE', default='script')
+# HTTP 백엔드 리뷰 목록 페이지 URL 템플릿 ({url}: 공연 crawling_url, {page}: 페이지 번호)
+REVIEW_HTTP_PAGE_URL = config('REVIEW_HTTP_PAGE_URL', default='{url}?page={page}')
+REVIEW_HTTP_POOL_SIZE = config('REVIEW_HTTP_POOL_SIZE', default=10, cast=int)
+REVIEW_HTTP_TIMEOUT = config('REVIEW_HTTP_TIMEOUT', default=10, cast=float)
+REVIEW_HTTP_USER_AGENT = config(
+    'REVIEW_HTTP_USER_AGENT',
+    default='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+)
+# 좌석 크롤링 방식: dom(회차를 클릭하고 화면의 좌석 테이블을 읽음) / network(페이지가 호출한 좌석 API 응답을 DevTools 성능 로그로 가로채 JSON을 읽음)
+# network 방식은 드라이버를 성능 로그와 함께 띄우며, 응답을 받지 못한 날짜/회차는 화면에서 읽음
+SEAT_CRAWL_MODE = config('SEAT_CRAWL_MODE', default='dom')
+# 가로챌 좌석 API URL 정규식과 응답 대기 시간(초)
+SEAT_NETWORK_URL_PATTERN = config('SEAT_NETWORK_URL_PATTERN', default=r'api-ticketfront\.interpark\.com/v1/goods/')
+SEAT_NETWORK_TIMEOUT = config('SEAT_NETWORK_TIMEOUT', default=5, cast=float)
+# 크롤링 저장 파이프라인: 브라우저가 앞서 읽어 둘 수 있는 저장 대기 페이지/회차 수 (0이면 writer 스레드 없이 순차 저장)
+CRAWL_PIPELINE_QUEUE_SIZE = config('CRAWL_PIPELINE_QUEUE_SIZE', default=2, cast=int)
+# 좌석 스냅샷 bulk_create 한 번에 저장할 행 수
+SEAT_WRITE_CHUNK_SIZE = config('SEAT_WRITE_CHUNK_SIZE', default=500, cast=int)
+# 크롤링 체크포인트: 스케줄 구간 길이(시간)와 보관 기간(일)
+# 같은 구간 안에서 다시 실행하면 완료된 공연은 건너뛰고 중단된 공연은 저장된 위치부터 이어서 진행
+CRAWL_REVIEW_WINDOW_HOURS = config('CRAWL_REVIEW_WINDOW_HOURS', default=24, cast=int)
+CRAWL_SEAT_WINDOW_HOURS = config('CRAWL_SEAT_WINDOW_HOURS', default=6, cast=int)
+CRAWL_CHECKPOINT_RETENTION_DAYS = config('CRAWL_CHECKPOINT_RETENTION_DAYS', default=7, cast=int)
+# 우선순위 스케줄링 (scripts/scheduler.py, crawl_scheduled_concerts_reviews)
+# 점수 = 최근 리뷰 속도 + 좌석 변동률 + 공연 기간 근접도, 간격 = 기본 간격 / (1 + 점수)를 최소~최대 간격으로 제한
+CRAWL_SCHEDULER_TICK_MINUTES = config('CRAWL_SCHEDULER_TICK_MINUTES', default=60, cast=int)
+CRAWL_MIN_INTERVAL_HOURS = config('CRAWL_MIN_INTERVAL_HOURS', default=4, cast=float)
+CRAWL_BASE_INTERVAL_HOURS = config('CRAWL_BASE_INTERVAL_HOURS', default=24, cast=float)
+CRAWL_MAX_INTERVAL_HOURS = config('CRAWL_MAX_INTERVAL_HOURS', default=72, cast=float)
+# 크롤링이 실패한 공연의 재시도 간격(시간, 연속 실패마다 2배, 최대 CRAWL_MAX_INTERVAL_HOURS)
+CRAWL_FAILURE_RETRY_HOURS = config('CRAWL_FAILURE_RETRY_HOURS', default=1, cast=float)
+# 리뷰 속도/좌석 변동률 집계 기간(일)과 "많음" 기준 (리뷰 수/일, 바뀐 좌석 비율)
+CRAWL_VELOCITY_DAYS = config('CRAWL_VELOCITY_DAYS', default=7, cast=int)
+CRAWL_HOT_REVIEWS_PER_DAY = config('CRAWL_HOT_REVIEWS_PER_DAY', default=10, cast=float)
+CRAWL_HOT_SEAT_CHURN = config('CRAWL_HOT_SEAT_CHURN', default=0.2, cast=float)
+# 개막/폐막 전 근접도 기준(일), 점수가 이 값보다 낮으면 최대 간격으로 미룸
+CRAWL_PROXIMITY_DAYS = config('CRAWL_PROXIMITY_DAYS', default=7, cast=int)
+CRAWL_COLD_SCORE = config('CRAWL_COLD_SCORE', default=0.1, cast=float)
+# 종료일 이후 크롤링을 계속할 유예 기간(일)
+CRAWL_END_GRACE_DAYS = config('CRAWL_END_GRACE_DAYS', default=3, cast=int)
+# 크롤링 작업 큐 (scripts/crawl_worker.py)
+# True이면 스케줄러와 화면의 "리뷰 크롤링 실행"은 작업만 등록하고 워커 프로세스가 실행 (워커를 따로 띄워야 함: start_crawl_worker.bat)
+# False(기본)이면 기존처럼 스케줄러/화면이 직접 크롤링
+CRAWL_JOB_QUEUE = config('CRAWL_JOB_QUEUE', default=False, cast=bool)
+# 작업 임대 시간(초): 이 시간 동안 하트비트가 없으면(워커 종료 등) 다른 워커가 작업을 가져감
+CRAWL_JOB_LEASE_SECONDS = config('CRAWL_JOB_LEASE_SECONDS', default=300, cast=int)
+CRAWL_JOB_HEARTBEAT_SECONDS = config('CRAWL_JOB_HEARTBEAT_SECONDS', default=30, cast=int)
+# 최대 시도 횟수와 재시도 대기 시간(초, 시도할 때마다 2배)
+CRAWL_JOB_MAX_ATTEMPTS = config('CRAWL_JOB_MAX_ATTEMPTS', default=3, cast=int)
+CRAWL_JOB_RETRY_DELAY_SECONDS = config('CRAWL_JOB_RETRY_DELAY_SECONDS', default=300, cast=int)
+# 실행할 작업이 없을 때 다시 확인하는 간격(초)
+CRAWL_WORKER_POLL_SECONDS = config('CRAWL_WORKER_POLL_SECONDS', default=10, cast=int)
+# 크롤링 파서 녹화/재생(replay) fixture 디렉터리 (scripts/benchmark_parsers.py)
+CRAWL_FIXTURE_DIR = config('CRAWL_FIXTURE_DIR', default=str(BASE_DIR / 'review' / 'fixtures' / 'crawl'))
+
+# 감정 분석 (review/chatgpt.py)
+SENTIMENT_MODEL = config('SENTIMENT_MODEL', default='gpt-3.5-turbo')
+# 요청 한 번에 묶어 보낼 리뷰 수, 응답에 빠진 리뷰만 다시 요청하는 최대 횟수
+SENTIMENT_BATCH_SIZE = config('SENTIMENT_BATCH_SIZE', default=20, cast=int)
+SENTIMENT_BATCH_MAX_RETRIES = config('SENTIMENT_BATCH_MAX_RETRIES', default=2, cast=int)
+# 리뷰 하나에서 보낼 최대 글자 수, 배치 사이 대기 시간(초)
+SENTIMENT_MAX_REVIEW_CHARS = config('SENTIMENT_MAX_REVIEW_CHARS', default=1500, cast=int)
+SENTIMENT_BATCH_SLEEP_SECONDS = config('SENTIMENT_BATCH_SLEEP_SECONDS', default=1, cast=float)
+# 감정 분석 실행 방식: 'async'(기본, 비동기 엔진으로 배치를 동시에 요청) 또는 'sync'(배치를 하나씩 요청)
+SENTIMENT_ENGINE = config('SENTIMENT_ENGINE', default='async')
+# 비동기 엔진: 최대 동시 요청 수, 계정 한도에 맞춘 분당 요청 수/토큰 수 (0이면 제한 없음)
+SENTIMENT_CONCURRENCY = config('SENTIMENT_CONCURRENCY', default=4, cast=int)
+SENTIMENT_REQUESTS_PER_MINUTE = config('SENTIMENT_REQUESTS_PER_MINUTE', default=500, cast=int)
+SENTIMENT_TOKENS_PER_MINUTE = config('SENTIMENT_TOKENS_PER_MINUTE', default=200000, cast=int)
+# 429/일시적 오류 재시도 횟수와 최대 대기 시간(초), 한 번에 bulk_update할 리뷰 수
+SENTIMENT_API_MAX_RETRIES = config('SENTIMENT_API_MAX_RETRIES', default=5, cast=int)
+SENTIMENT_MAX_BACKOFF_SECONDS = config('SENTIMENT_MAX_BACKOFF_SECONDS', default=60, cast=float)
+SENTIMENT_WRITE_BATCH_SIZE = config('SENTIMENT_WRITE_BATCH_SIZE', default=200, cast=int)
+# 로컬 감정 분류기 (scripts/train_sentiment_classifier.py로 학습): 확신도가 기준 이상인 리뷰는 GPT에 보내지 않음
+# 학습된 모델 파일이 없으면 모든 리뷰를 GPT로 보냄
+SENTIMENT_CLASSIFIER_ENABLED = config('SENTIMENT_CLASSIFIER_ENABLED', default=True, cast=bool)
+SENTIMENT_CLASSIFIER_PATH = config('SENTIMENT_CLASSIFIER_PATH', default=str(BASE_DIR / 'ml_models' / 'sentiment_classifier.joblib'))
+SENTIMENT_CLASSIFIER_THRESHOLD = config('SENTIMENT_CLASSIFIER_THRESHOLD', default=0.9, cast=float)
+SENTIMENT_CLASSIFIER_MIN_SAMPLES = config('SENTIMENT_CLASSIFIER_MIN_SAMPLES', default=300, cast=int)
+# 감정 분석 배치 작업 (scripts/sentiment_batch.py): 요청 파일(JSONL) 저장 위치, 완료 기한, 결과 확인 주기(분)
+# API 주소를 비워 두면 OpenAI 기본 주소 사용
+SENTIMENT_BATCH_JOB_DIR = config('SENTIMENT_BATCH_JOB_DIR', default=str(BASE_DIR / 'sentiment_batches'))
+SENTIMENT_BATCH_JOB_COMPLETION_WINDOW = config('SENTIMENT_BATCH_JOB_COMPLETION_WINDOW', default='24h')
+SENTIMENT_BATCH_JOB_POLL_MINUTES = config('SENTIMENT_BATCH_JOB_POLL_MINUTES', default=10, cast=int)
+SENTIMENT_BATCH_JOB_API_BASE = config('SENTIMENT_BATCH_JOB_API_BASE', default='')
+
 # CRONTAB List
 CRONJOBS = [
-    # 매일 저녁 8시에 모든 콘서트 리뷰 크롤링
-    ('0 20 * * *', 'review.tasks.crawl_all_concerts_reviews'),
+    # 매시 정각에 크롤링 간격이 지난 공연만 리뷰 크롤링 (공연별 우선순위 점수로 간격 결정)
+    ('0 * * * *', 'review.tasks.crawl_scheduled_concerts_reviews'),
     # 매주 화요일 오전 10시에 리뷰 감정 분석 실행
     ('0 10 * * TUE', 'review.chatgpt.update_reviews_with_sentiment'),
     # 매주 화요일 오전 11시에 리뷰 요약 슬랙 메세지 전송